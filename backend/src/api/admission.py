@@ -0,0 +1,254 @@
+"""Admission control and load shedding for chart computation."""
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the queue-wait histogram buckets
+QUEUE_WAIT_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is shed instead of being admitted."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value in whole seconds (at least 1)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens per second up to `capacity`.
+
+    Not thread-safe on its own; callers serialize access.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def try_acquire(self, now: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens if available.
+
+        Returns:
+            (acquired, seconds until enough tokens would be available)
+        """
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True, 0.0
+
+        if self.rate <= 0:
+            return False, math.inf
+        return False, (cost - self.tokens) / self.rate
+
+
+class ClientRateLimiter:
+    """
+    Per-client token buckets, bounded to the most recently seen clients.
+
+    A non-positive `rate` disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client_id: str, now: Optional[float] = None) -> None:
+        """
+        Charge one request to `client_id`.
+
+        Raises:
+            AdmissionRejectedError: 429 when the client's bucket is empty
+        """
+        if self.rate <= 0:
+            return
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, now)
+                self._buckets[client_id] = bucket
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client_id)
+            acquired, wait = bucket.try_acquire(now)
+
+        if not acquired:
+            raise AdmissionRejectedError(429, "rate_limited", wait)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionController:
+    """
+    Bounded concurrency with a short, deadline-limited wait queue.
+
+    At most `max_concurrency` computations run at once and at most
+    `max_queue` requests wait for a slot. A request that finds the queue
+    full, or that waits longer than `queue_timeout`, is rejected with 503
+    so latency for admitted work stays bounded under overload.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        rate_limiter: Optional[ClientRateLimiter] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate_limiter = rate_limiter
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._active = 0
+        self._waiting = 0
+
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+        self._rate_limited = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+        self._wait_buckets: List[int] = [0] * (len(QUEUE_WAIT_BUCKETS) + 1)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Bind the semaphore lazily to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self._active = 0
+            self._waiting = 0
+        return self._semaphore
+
+    def _retry_after(self) -> float:
+        """Rough time until a queue slot frees up."""
+        return max(self.queue_timeout, 1.0)
+
+    def _record_wait(self, waited: float) -> None:
+        self._wait_sum += waited
+        self._wait_max = max(self._wait_max, waited)
+        for i, bound in enumerate(QUEUE_WAIT_BUCKETS):
+            if waited <= bound:
+                self._wait_buckets[i] += 1
+                return
+        self._wait_buckets[-1] += 1
+
+    def check_rate(self, client_id: str) -> None:
+        """
+        Charge one request to the caller's token bucket.
+
+        Raises:
+            AdmissionRejectedError: 429 when the client is over its rate
+        """
+        if self.rate_limiter is None:
+            return
+        try:
+            self.rate_limiter.check(client_id)
+        except AdmissionRejectedError:
+            self._rate_limited += 1
+            raise
+
+    @asynccontextmanager
+    async def admit(self, client_id: Optional[str] = None) -> AsyncIterator[float]:
+        """
+        Hold a computation slot for the duration of the block.
+
+        Args:
+            client_id: When given, the client's rate limit is checked first
+
+        Yields:
+            Seconds spent waiting in the queue
+
+        Raises:
+            AdmissionRejectedError: 429 (rate limited) or 503 (overloaded)
+        """
+        if client_id is not None:
+            self.check_rate(client_id)
+
+        semaphore = self._get_semaphore()
+        start = time.perf_counter()
+
+        if semaphore.locked():
+            if self._waiting >= self.max_queue:
+                self._rejected_queue_full += 1
+                raise AdmissionRejectedError(503, "queue_full", self._retry_after())
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._rejected_timeout += 1
+                raise AdmissionRejectedError(503, "queue_timeout", self._retry_after()) from None
+            finally:
+                self._waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        waited = time.perf_counter() - start
+        self._admitted += 1
+        self._record_wait(waited)
+        self._active += 1
+        try:
+            yield waited
+        finally:
+            self._active -= 1
+            semaphore.release()
+
+    def metrics(self) -> Dict[str, object]:
+        """Snapshot of admission counters and queue-time histogram."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(QUEUE_WAIT_BUCKETS, self._wait_buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = cumulative + self._wait_buckets[-1]
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self._active,
+            "waiting": self._waiting,
+            "admitted": self._admitted,
+            "rejected_queue_full": self._rejected_queue_full,
+            "rejected_timeout": self._rejected_timeout,
+            "rate_limited": self._rate_limited,
+            "queue_wait_seconds": {
+                "count": self._admitted,
+                "sum": self._wait_sum,
+                "max": self._wait_max,
+                "buckets": buckets,
+            },
+        }
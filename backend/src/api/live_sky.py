@@ -0,0 +1,295 @@
+"""
+Shared live-sky feed: compute once per tick, fan out to every subscriber.
+
+One background task computes the current planet positions once per tick
+and, for each distinct subscriber location, the angles and house cusps.
+Each message is encoded once per location and handed to the subscribers of
+that location.
+
+Every subscriber has a one-slot mailbox. When a consumer has not taken the
+previous message by the next tick, that message is replaced by the newer
+one (and counted as dropped): a slow client always gets the latest sky,
+never an unbounded backlog. The task only runs while someone is
+subscribed.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from src.core.calculations import (
+    CITY_COORDS,
+    _get_city_coordinates,
+    _get_house_for_position,
+    get_astrological_points,
+    get_house_cusps,
+)
+from src.core.sky_cache import planet_positions
+
+logger = logging.getLogger(__name__)
+
+# (city, country) normalised to lower case; None for the location-free feed
+LocationKey = Optional[Tuple[str, str]]
+
+# Placeholder cusps (0°, 30°, ...) for the location-free planet positions;
+# houses are only reported for subscribers with a location
+_NEUTRAL_CUSPS = [30.0 * n for n in range(12)]
+
+
+def location_key(city: Optional[str], country: Optional[str]) -> LocationKey:
+    """
+    Normalise an optional subscriber location.
+
+    Raises:
+        ValueError: For a city that is not in CITY_COORDS, so that arbitrary
+            strings cannot each open a location of their own
+    """
+    if not city or not country:
+        return None
+    key = city.strip().lower(), country.strip().lower()
+    if key not in CITY_COORDS:
+        raise ValueError(f"Unknown location: {city.strip()}, {country.strip()}")
+    return key
+
+
+class Subscriber:
+    """One connected client and its one-slot mailbox."""
+
+    __slots__ = ("location", "mailbox", "dropped")
+
+    def __init__(self, location: LocationKey):
+        self.location = location
+        self.mailbox: "asyncio.Queue[str]" = asyncio.Queue(maxsize=1)
+        self.dropped = 0
+
+    def offer(self, message: str) -> bool:
+        """
+        Put `message` in the mailbox, replacing an unread one.
+
+        Returns:
+            False when an unread message was dropped
+        """
+        dropped = False
+        if self.mailbox.full():
+            self.mailbox.get_nowait()
+            self.dropped += 1
+            dropped = True
+        self.mailbox.put_nowait(message)
+        return not dropped
+
+    async def next_message(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Wait for the next message; None when `timeout` passes first."""
+        try:
+            return await asyncio.wait_for(self.mailbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SubscriberLimitError(Exception):
+    """Raised when the feed already has its maximum number of subscribers."""
+
+
+class SkyBroadcaster:
+    """
+    Periodic sky computation shared by all live-feed subscribers.
+
+    Args:
+        tick_seconds: Interval between sky updates; ticks are aligned to
+            multiples of this interval of the wall clock
+        max_subscribers: Connections accepted at once
+        clock: Wall clock in seconds since the epoch (tests)
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = 60.0,
+        max_subscribers: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive")
+        self.tick_seconds = tick_seconds
+        self.max_subscribers = max_subscribers
+        self._clock = clock
+        self._subscribers: Set[Subscriber] = set()
+        self._pending: Set[Subscriber] = set()
+        self._wake = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # State of the current tick
+        self._tick_time: Optional[datetime] = None
+        self._planets: List[Dict[str, Any]] = []
+        self._messages: Dict[LocationKey, str] = {}
+
+        self._ticks = 0
+        self._messages_sent = 0
+        self._dropped = 0
+
+    def subscribe(self, location: LocationKey = None) -> Subscriber:
+        """Register a subscriber; it receives the current sky right away."""
+        if len(self._subscribers) >= self.max_subscribers:
+            raise SubscriberLimitError(f"{self.max_subscribers} subscribers already connected")
+        self._ensure_running()
+        subscriber = Subscriber(location)
+        self._subscribers.add(subscriber)
+        message = self._messages.get(location) if self._tick_is_current() else None
+        if message is not None:
+            self._deliver(subscriber, message)
+        else:
+            self._pending.add(subscriber)
+            self._wake.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber; the task stops with the last one."""
+        self._subscribers.discard(subscriber)
+        self._pending.discard(subscriber)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Event loops differ between test clients; rebind lazily
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    def _deliver(self, subscriber: Subscriber, message: str) -> None:
+        if not subscriber.offer(message):
+            self._dropped += 1
+        self._messages_sent += 1
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            failed = False
+            try:
+                if not self._tick_is_current():
+                    await self._start_tick(self._clock())
+                    targets = set(self._subscribers)
+                else:
+                    targets = self._pending
+                self._pending = set()
+                await self._publish(targets)
+            except Exception:
+                # Keep serving; the next tick retries
+                logger.exception("Live sky computation failed")
+                failed = True
+
+            self._wake.clear()
+            if self._pending and not failed:
+                continue
+            delay = self.tick_seconds
+            if self._tick_time is not None and not failed:
+                delay = max(0.0, self._next_tick_at() - self._clock())
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _tick_is_current(self) -> bool:
+        return self._tick_time is not None and self._clock() < self._next_tick_at()
+
+    def _next_tick_at(self) -> float:
+        assert self._tick_time is not None
+        return self._tick_time.timestamp() + self.tick_seconds
+
+    async def _start_tick(self, now: float) -> None:
+        """Compute the planet positions for the tick containing `now`."""
+        aligned = now - now % self.tick_seconds
+        tick_time = datetime.fromtimestamp(aligned, tz=timezone.utc)
+        planets = await run_in_threadpool(compute_planets, tick_time)
+        # Switch ticks only once the new positions exist
+        self._tick_time, self._planets, self._messages = tick_time, planets, {}
+        self._ticks += 1
+
+    async def _publish(self, targets: Set[Subscriber]) -> None:
+        """Encode one message per location and hand it to its subscribers."""
+        by_location: Dict[LocationKey, List[Subscriber]] = {}
+        for subscriber in targets:
+            by_location.setdefault(subscriber.location, []).append(subscriber)
+
+        for location, group in by_location.items():
+            message = self._messages.get(location)
+            if message is None:
+                assert self._tick_time is not None
+                message = await run_in_threadpool(
+                    encode_sky, self._tick_time, self._planets, location
+                )
+                self._messages[location] = message
+            for subscriber in group:
+                # It may have left while the message was computed
+                if subscriber in self._subscribers:
+                    self._deliver(subscriber, message)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of feed counters."""
+        return {
+            "subscribers": len(self._subscribers),
+            "locations": len({s.location for s in self._subscribers}),
+            "tick_seconds": self.tick_seconds,
+            "ticks": self._ticks,
+            "messages": self._messages_sent,
+            "dropped": self._dropped,
+        }
+
+
+def _sky_strings(moment: datetime) -> Tuple[str, str]:
+    return moment.strftime("%Y-%m-%d"), moment.strftime("%H:%M:%S")
+
+
+def compute_planets(moment: datetime) -> List[Dict[str, Any]]:
+    """Location-independent planet positions at `moment` (UTC)."""
+    date_str, time_str = _sky_strings(moment)
+    planets = planet_positions(date_str, time_str, _NEUTRAL_CUSPS)
+    return [planet.model_dump(exclude={"house"}) for planet in planets]
+
+
+def encode_sky(
+    moment: datetime,
+    planets: List[Dict[str, Any]],
+    location: LocationKey,
+) -> str:
+    """
+    JSON message for one location (or the location-free feed).
+
+    With a location, planets carry their house and the message adds the
+    four angles and the house cusps.
+    """
+    message: Dict[str, Any] = {
+        "type": "sky",
+        "time": moment.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "planets": planets,
+    }
+    if location is not None:
+        city, country = location
+        latitude, longitude = _get_city_coordinates(city, country)
+        date_str, time_str = _sky_strings(moment)
+        houses = get_house_cusps(date_str, time_str, latitude, longitude)
+        cusps = [house.longitude for house in houses]
+        message["planets"] = [
+            {**planet, "house": _get_house_for_position(planet["longitude"], cusps)}
+            for planet in planets
+        ]
+        message["location"] = {
+            "city": city,
+            "country": country,
+            "latitude": latitude,
+            "longitude": longitude,
+            "known": location in CITY_COORDS,
+        }
+        message["points"] = [
+            point.model_dump()
+            for point in get_astrological_points(date_str, time_str, latitude, longitude)
+        ]
+        message["houses"] = [house.model_dump() for house in houses]
+    return json.dumps(message, separators=(",", ":"))
@@ -1,18 +1,75 @@
 """Main FastAPI application for the astro chart generator."""
 
 import logging
-from fastapi import FastAPI, HTTPException
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 
 from src.models import (
     Aspect,
     BirthInput,
     ChartData,
+    ElectionalInput,
+    ElectionalWindow,
+    HarmonicData,
+    HarmonicInput,
     House,
+    Location,
+    LunarCalendarData,
     Planet,
+    PlanetStatus,
     Point,
+    ProgressionData,
+    ProgressionInput,
+    RelationshipChart,
+    RelationshipInput,
+    RelocationData,
+    RelocationInput,
+    ReturnChart,
+    ReturnInput,
+    StarConjunction,
+)
+from src.api.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    ClientRateLimiter,
 )
-from src.core.calculations import calculate_natal_chart
+from src.api.live_sky import SkyBroadcaster, SubscriberLimitError, location_key
+from src.api.middleware import TracingMiddleware
+from src.api.profiling import ProfileStore, RequestProfiler
+from src.api.singleflight import SingleFlight, chart_request_key
+from src.core import sky_cache
+from src.core.astrocartography import calculate_astrocartography
+from src.core.calculations import (
+    PLANETS,
+    _calculate_jd,
+    _get_city_coordinates,
+)
+from src.core.compact import CompactChart, calculate_compact_chart, chart_selection
+from src.core.electional import search_windows
+from src.core.fixed_stars import StarCatalog, chart_conjunctions, default_catalog
+from src.core.harmonics import harmonic_spectra
+from src.core.ingress import default_index, jd_to_iso, planet_status
+from src.core.lunar_calendar import default_calendar
+from src.core.progressions import calculate_progressions
+from src.core.relationship import birth_of, composite_charts, davison_charts
+from src.core.relocation import calculate_relocation, grid_locations
+from src.core.returns import calculate_returns
+from src.core.tracing import current_span, record_span, span, tracer_from_env
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +93,93 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request tracing (TRACE_FILE / TRACE_SAMPLE_RATIO / TRACE_TRUST_PARENT, see
+# src/core/tracing.py)
+tracer = tracer_from_env()
+app.add_middleware(TracingMiddleware, get_tracer=lambda: tracer)
+
+# Admission control for chart computation (see src/api/admission.py)
+admission = AdmissionController(
+    max_concurrency=int(
+        os.environ.get("CHART_MAX_CONCURRENCY", str(os.cpu_count() or 4))
+    ),
+    max_queue=int(os.environ.get("CHART_MAX_QUEUE", "32")),
+    queue_timeout=float(os.environ.get("CHART_QUEUE_TIMEOUT", "2.0")),
+    rate_limiter=ClientRateLimiter(
+        rate=float(os.environ.get("CHART_CLIENT_RATE", "5.0")),
+        burst=float(os.environ.get("CHART_CLIENT_BURST", "20")),
+    ),
+)
+
+# Two-tier cache: planet positions per moment, houses per moment and place
+sky_cache.configure(
+    sky_entries=int(os.environ.get("SKY_CACHE_ENTRIES", str(sky_cache.DEFAULT_SKY_ENTRIES))),
+    house_entries=int(
+        os.environ.get("HOUSE_CACHE_ENTRIES", str(sky_cache.DEFAULT_HOUSE_ENTRIES))
+    ),
+)
+
+# Identical concurrent /chart requests share one computation
+chart_flights = SingleFlight()
+
+# Opt-in profiling: per request with the admin token, or a sampled share of traffic
+PROFILE_HEADER = "X-Profile-Token"
+profiler = RequestProfiler(
+    ProfileStore(
+        os.environ.get("PROFILE_DIR", "profiles"),
+        max_files=int(os.environ.get("PROFILE_MAX_FILES", "50")),
+    ),
+    admin_token=os.environ.get("PROFILE_ADMIN_TOKEN"),
+    sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", "0")),
+    samples_per_file=int(os.environ.get("PROFILE_SAMPLES_PER_FILE", "100")),
+)
+
+# Live-sky feed: one computation per tick shared by all subscribers
+sky_feed = SkyBroadcaster(
+    tick_seconds=float(os.environ.get("LIVE_SKY_TICK", "60")),
+    max_subscribers=int(os.environ.get("LIVE_SKY_MAX_SUBSCRIBERS", "10000")),
+)
+# Comment line sent on an idle event stream to keep proxies from closing it
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Longest date range served by one /calendar request
+MAX_CALENDAR_DAYS = 366
+
+
+def _client_id(request: Request) -> str:
+    """
+    Identify the caller by the X-Real-IP that nginx sets from $remote_addr.
+
+    X-Forwarded-For is not used: nginx appends to it, so its first entry
+    is whatever the client sent.
+    """
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+    if request.client is not None:
+        return request.client.host
+    return "unknown"
+
+
+def _query_list(values: Optional[List[str]]) -> Optional[List[str]]:
+    """Repeated and/or comma-separated query values as one list."""
+    if values is None:
+        return None
+    return [item.strip() for value in values for item in value.split(",") if item.strip()]
+
+
+def _overloaded(rejection: AdmissionRejectedError) -> HTTPException:
+    """Translate an admission rejection into a fast 429/503 response."""
+    logger.warning(
+        f"Chart request shed ({rejection.reason}), "
+        f"retry after {rejection.retry_after_header}s"
+    )
+    return HTTPException(
+        status_code=rejection.status_code,
+        detail=f"Server busy ({rejection.reason}). Please retry later.",
+        headers={"Retry-After": rejection.retry_after_header},
+    )
+
 
 @app.get("/health")
 async def health_check():
@@ -44,6 +188,479 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for load shedding, queueing, coalescing and caching."""
+    return {
+        "admission": admission.metrics(),
+        "singleflight": chart_flights.metrics(),
+        "live_sky": sky_feed.metrics(),
+        "cache": sky_cache.cache_metrics(),
+    }
+
+
+@app.websocket("/sky/ws")
+async def live_sky_websocket(
+    websocket: WebSocket,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+):
+    """
+    Live current-sky feed over WebSocket.
+
+    Sends a JSON message per tick with the planet positions; with `city`
+    and `country` it also carries houses, angles and cusps for that place.
+    """
+    await websocket.accept()
+    try:
+        subscriber = sky_feed.subscribe(location_key(city, country))
+    except ValueError as e:
+        # 1008: policy violation (unknown location)
+        await websocket.close(code=1008, reason=str(e))
+        return
+    except SubscriberLimitError:
+        # 1013: try again later
+        await websocket.close(code=1013)
+        return
+
+    async def send(cancel_scope: anyio.CancelScope) -> None:
+        try:
+            while True:
+                await websocket.send_text(await subscriber.next_message())
+        except (WebSocketDisconnect, RuntimeError):
+            # The client went away; the receive loop finishes the session
+            cancel_scope.cancel()
+
+    try:
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(send, task_group.cancel_scope)
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+            task_group.cancel_scope.cancel()
+    finally:
+        sky_feed.unsubscribe(subscriber)
+
+
+@app.get("/sky/stream")
+async def live_sky_stream(
+    request: Request,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+):
+    """Live current-sky feed as Server-Sent Events (same messages as /sky/ws)."""
+    try:
+        subscriber = sky_feed.subscribe(location_key(city, country))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+    except SubscriberLimitError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many live-sky subscribers. Please retry later.",
+            headers={"Retry-After": str(int(sky_feed.tick_seconds))},
+        )
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                message = await subscriber.next_message(timeout=SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: sky\ndata: {message}\n\n"
+        finally:
+            sky_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/ephemeris/status", response_model=List[PlanetStatus])
+async def ephemeris_status(
+    date: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    time: str = Query("12:00:00", pattern=r"^\d{2}:\d{2}:\d{2}$"),
+    body: Optional[List[str]] = Query(None),
+) -> List[PlanetStatus]:
+    """
+    Sign, retrograde status and surrounding ingresses/stations of planets.
+
+    Answered from the precomputed ingress index (INGRESS_INDEX_FILE, built
+    with `python -m src.tools.ingress_index`); `time` is UT and `body`
+    may be repeated (default: all planets).
+    """
+    index = default_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Ingress index is not available")
+    try:
+        jd = _calculate_jd(BirthInput.validate_date(date), BirthInput.validate_time(time))
+        return [planet_status(index, name, jd) for name in body or PLANETS]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.get("/calendar", response_model=LunarCalendarData)
+async def lunar_calendar(
+    start: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    end: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$"),
+) -> LunarCalendarData:
+    """
+    Lunar phases, void-of-course periods and eclipses from `start` (inclusive)
+    to `end` (exclusive), UTC.
+
+    Answered from the precomputed tables (LUNAR_CALENDAR_FILE, built with
+    `python -m src.tools.lunar_calendar`).
+    """
+    calendar = default_calendar()
+    if calendar is None:
+        raise HTTPException(status_code=503, detail="Lunar calendar is not available")
+    try:
+        start_jd = _calculate_jd(BirthInput.validate_date(start), "00:00:00")
+        end_jd = _calculate_jd(BirthInput.validate_date(end), "00:00:00")
+        if end_jd - start_jd > MAX_CALENDAR_DAYS:
+            raise ValueError(f"Range is longer than {MAX_CALENDAR_DAYS} days")
+        return calendar.between(start_jd, end_jd)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post("/astrocartography")
+async def astrocartography(
+    birth_input: BirthInput,
+    request: Request,
+    resolution: float = Query(1.0, ge=0.05, le=10.0),
+    max_latitude: float = Query(85.0, gt=0.0, lt=90.0),
+) -> Dict[str, Any]:
+    """
+    Astrocartography lines of the birth moment as a GeoJSON FeatureCollection.
+
+    One MultiLineString per planet and angle (ASC, DSC, MC, IC);
+    `resolution` is the latitude step of the rising/setting lines.
+    """
+    try:
+        admission.check_rate(_client_id(request))
+        async with admission.admit():
+            return await run_in_threadpool(
+                calculate_astrocartography,
+                birth_input.date,
+                birth_input.time,
+                resolution,
+                max_latitude,
+            )
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+def _coordinates(location: Location) -> Tuple[float, float]:
+    """(latitude, longitude) of a place given by coordinates or by city."""
+    if location.latitude is not None and location.longitude is not None:
+        return location.latitude, location.longitude
+    return _get_city_coordinates(location.city, location.country)
+
+
+def _relocation_targets(relocation_input: RelocationInput) -> List[Tuple[float, float]]:
+    """(latitude, longitude) of the listed locations, then of the grid."""
+    targets = [_coordinates(location) for location in relocation_input.locations]
+    grid = relocation_input.grid
+    if grid is not None:
+        targets.extend(
+            grid_locations(grid.lat_min, grid.lat_max, grid.lon_min, grid.lon_max, grid.step)
+        )
+    return targets
+
+
+@app.post("/relocation", response_model=RelocationData)
+async def relocation(relocation_input: RelocationInput, request: Request) -> RelocationData:
+    """
+    Houses and angles of one birth moment at many locations.
+
+    Planet positions are computed once; each location adds its cusps,
+    angles and planet house placements as one entry per column. Locations
+    where Placidus houses are undefined (near the poles) have None cusps
+    and angles and house 0.
+    """
+    try:
+        admission.check_rate(_client_id(request))
+        targets = _relocation_targets(relocation_input)
+        async with admission.admit():
+            return await run_in_threadpool(
+                calculate_relocation,
+                relocation_input.date,
+                relocation_input.time,
+                targets,
+            )
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post("/progressions", response_model=ProgressionData)
+async def progressions(
+    progression_input: ProgressionInput,
+    request: Request,
+) -> ProgressionData:
+    """
+    Secondary progressions and solar-arc directions for a range of ages.
+
+    Returns one column entry per age (from `start_age` to `end_age`,
+    `step` years apart) and the aspects, within 1°, of the progressed and
+    directed bodies to the natal planets, Ascendant and Midheaven.
+    """
+    birth = progression_input.birth
+    try:
+        admission.check_rate(_client_id(request))
+        async with admission.admit():
+            return await run_in_threadpool(
+                calculate_progressions,
+                birth.date,
+                birth.time,
+                birth.country,
+                birth.city,
+                progression_input.start_age,
+                progression_input.end_age,
+                progression_input.step,
+            )
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post("/returns", response_model=List[ReturnChart])
+async def returns(return_input: ReturnInput, request: Request) -> List[ReturnChart]:
+    """
+    Solar or lunar returns from `start_year` through `end_year`.
+
+    Each return is the exact moment (UTC) the Sun or Moon regains its
+    natal longitude, with a full chart cast for `location` (default: the
+    birth place).
+    """
+    birth = return_input.birth
+    try:
+        admission.check_rate(_client_id(request))
+        if return_input.location is not None:
+            location = _coordinates(return_input.location)
+        else:
+            location = _get_city_coordinates(birth.city, birth.country)
+        async with admission.admit():
+            return await run_in_threadpool(
+                calculate_returns,
+                birth.date,
+                birth.time,
+                return_input.body,
+                return_input.start_year,
+                return_input.end_year,
+                location,
+            )
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post("/composite", response_model=List[RelationshipChart])
+async def composite(
+    relationship_input: RelationshipInput,
+    request: Request,
+) -> List[RelationshipChart]:
+    """
+    Composite chart (midpoints of the two natal charts) of every pair of members.
+
+    `first` and `second` index into `members`; two members give one chart.
+    """
+    try:
+        admission.check_rate(_client_id(request))
+        births = [birth_of(member) for member in relationship_input.members]
+        async with admission.admit():
+            return await run_in_threadpool(composite_charts, births)
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post("/davison", response_model=List[RelationshipChart])
+async def davison(
+    relationship_input: RelationshipInput,
+    request: Request,
+) -> List[RelationshipChart]:
+    """
+    Davison chart (cast for the midpoint in time and place) of every pair of members.
+
+    `first` and `second` index into `members`; two members give one chart.
+    """
+    try:
+        admission.check_rate(_client_id(request))
+        births = [birth_of(member) for member in relationship_input.members]
+        async with admission.admit():
+            return await run_in_threadpool(davison_charts, births)
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+def _electional_windows(electional_input: ElectionalInput) -> List[ElectionalWindow]:
+    latitude = longitude = None
+    if electional_input.location is not None:
+        latitude, longitude = _coordinates(electional_input.location)
+    windows = search_windows(
+        _calculate_jd(electional_input.start, "00:00:00"),
+        _calculate_jd(electional_input.end, "00:00:00"),
+        electional_input.constraints,
+        latitude,
+        longitude,
+        electional_input.min_duration_minutes / 1440,
+    )
+    return [
+        ElectionalWindow(
+            start=jd_to_iso(start),
+            end=jd_to_iso(end),
+            duration_minutes=round((end - start) * 1440, 2),
+        )
+        for start, end in windows
+    ]
+
+
+@app.post("/electional", response_model=List[ElectionalWindow])
+async def electional_search(
+    electional_input: ElectionalInput,
+    request: Request,
+) -> List[ElectionalWindow]:
+    """
+    Time windows between `start` and `end` (UTC) in which every constraint holds.
+
+    Constraints on signs, houses, aspects, retrograde motion and the
+    void-of-course Moon are combined with AND; set `negate` to require a
+    condition not to hold. House and Ascendant/Midheaven conditions need
+    a `location`.
+    """
+    try:
+        admission.check_rate(_client_id(request))
+        async with admission.admit():
+            return await run_in_threadpool(_electional_windows, electional_input)
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+def _star_conjunctions(
+    catalog: StarCatalog,
+    birth_input: BirthInput,
+    orb: float,
+    max_magnitude: Optional[float],
+) -> List[StarConjunction]:
+    # The catalog precession (first use of an epoch) and the per-star
+    # matching run here too, off the event loop
+    jd = _calculate_jd(birth_input.date, birth_input.time)
+    chart = calculate_compact_chart(
+        birth_input.date,
+        birth_input.time,
+        birth_input.country,
+        birth_input.city,
+    )
+    return chart_conjunctions(catalog, chart.to_chart_data(), jd, orb, max_magnitude)
+
+
+@app.post("/fixed-stars", response_model=List[StarConjunction])
+async def fixed_stars(
+    birth_input: BirthInput,
+    request: Request,
+    orb: float = Query(1.0, gt=0.0, le=10.0),
+    max_magnitude: Optional[float] = Query(None),
+) -> List[StarConjunction]:
+    """
+    Fixed stars within `orb` degrees of longitude of each planet and point.
+
+    Uses the star catalog of FIXED_STAR_FILE (Swiss Ephemeris sefstars.txt
+    format); `max_magnitude` skips fainter stars.
+    """
+    catalog = default_catalog()
+    if catalog is None:
+        raise HTTPException(status_code=503, detail="Fixed-star catalog is not available")
+    try:
+        admission.check_rate(_client_id(request))
+        async with admission.admit():
+            return await run_in_threadpool(
+                _star_conjunctions, catalog, birth_input, orb, max_magnitude
+            )
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post("/harmonics", response_model=List[HarmonicData])
+async def harmonics(harmonic_input: HarmonicInput, request: Request) -> List[HarmonicData]:
+    """
+    Harmonic spectrum of each birth, in input order.
+
+    For each harmonic H (default 1-180) the planets, Ascendant and
+    Midheaven are multiplied by H, and the strength is the summed
+    conjunction weight of all body pairs in that harmonic chart.
+    `include_charts` also returns the harmonic charts themselves, for up
+    to 50 births per request.
+    """
+    try:
+        admission.check_rate(_client_id(request))
+        births = [birth_of(birth) for birth in harmonic_input.births]
+        async with admission.admit():
+            return await run_in_threadpool(
+                harmonic_spectra,
+                births,
+                harmonic_input.harmonics,
+                harmonic_input.orb,
+                harmonic_input.include_charts,
+            )
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.get("/admin/profiles")
+async def list_profiles(
+    x_profile_token: Optional[str] = Header(None),
+):
+    """List stored profile ids (admin only)."""
+    if not profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Profiling is not authorized")
+    return {"profiles": profiler.store.list_ids()}
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = "text",
+    sort: str = "cumulative",
+    x_profile_token: Optional[str] = Header(None),
+):
+    """
+    Fetch a stored profile (admin only).
+
+    `format=text` returns a pstats report; `format=pstats` returns the raw
+    file for snakeviz or `python -m pstats`.
+    """
+    if not profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Profiling is not authorized")
+    try:
+        if format == "pstats":
+            path = profiler.store.path(profile_id)
+            if not os.path.exists(path):
+                raise KeyError(profile_id)
+            return FileResponse(path, media_type="application/octet-stream")
+        return PlainTextResponse(profiler.store.load_text(profile_id, sort=sort))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
 def _get_mock_natal_chart() -> ChartData:
     """Generate a mock natal chart for testing."""
     planets = [
@@ -210,32 +827,110 @@ def _get_mock_natal_chart() -> ChartData:
     )
 
 
+async def _compute_chart(
+    birth_input: BirthInput,
+    selection: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None,
+) -> CompactChart:
+    """Run one chart calculation (or only the selected parts) inside an admission slot."""
+    partial = {}
+    if selection is not None:
+        partial = {"fields": selection[0], "bodies": selection[1]}
+    async with admission.admit():
+        # Run the CPU-bound calculation off the event loop
+        return await run_in_threadpool(
+            calculate_compact_chart,
+            birth_input.date,
+            birth_input.time,
+            birth_input.country,
+            birth_input.city,
+            **partial,
+        )
+
+
+def _chart_json(birth_input: BirthInput) -> bytes:
+    """Calculate and serialize a chart in one call, so a profile covers both."""
+    chart = calculate_compact_chart(
+        birth_input.date,
+        birth_input.time,
+        birth_input.country,
+        birth_input.city,
+    )
+    return chart.to_chart_data().model_dump_json().encode()
+
+
+async def _profiled_chart(birth_input: BirthInput, on_demand: bool) -> Response:
+    """
+    Compute a chart under the profiler, bypassing request coalescing.
+
+    On-demand profiles are stored individually and their id returned in the
+    X-Profile-Id header; sampled ones are merged into the rotating aggregate.
+    """
+    async with admission.admit():
+        body, stats = await run_in_threadpool(profiler.run, _chart_json, birth_input)
+
+    headers = {}
+    if on_demand:
+        profile_id = await run_in_threadpool(profiler.store.save, stats, "request")
+        headers["X-Profile-Id"] = profile_id
+        logger.info(f"Stored request profile {profile_id}")
+    else:
+        await run_in_threadpool(profiler.record_sample, stats)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.post("/chart", response_model=ChartData)
-async def generate_chart(birth_input: BirthInput) -> ChartData:
+async def generate_chart(
+    birth_input: BirthInput,
+    request: Request,
+    fields: Optional[List[str]] = Query(None),
+    bodies: Optional[List[str]] = Query(None),
+) -> ChartData:
     """
     Generate a natal chart based on birth information.
 
     Takes birth date, time, and location as input and returns
-    calculated natal chart data.
+    calculated natal chart data. Sending the admin token in the
+    X-Profile-Token header profiles the request; see /admin/profiles.
+
+    `fields` (planets, points, houses, aspects, patterns) and `bodies`
+    (planet and angle names), repeated or comma-separated, restrict the
+    computation to part of the chart; `computed` in the response lists
+    the parts that were computed. Aspect patterns are only detected when
+    `patterns` is among the requested fields.
     """
+    # Body parsing and validation ran before this handler was entered
+    record_span("validate_input")
+    started = time.perf_counter()
+    trace_id = current_span().trace_id
     logger.info(
         f"Chart generation requested for: {birth_input.city}, "
         f"{birth_input.country} on {birth_input.date} at {birth_input.time}"
+        + (f" (trace {trace_id})" if trace_id else "")
     )
 
     try:
-        # Use real calculation
-        chart = calculate_natal_chart(
-            birth_input.date,
-            birth_input.time,
-            birth_input.country,
-            birth_input.city,
-        )
+        admission.check_rate(_client_id(request))
+        selection = None
+        if fields is not None or bodies is not None:
+            selection = chart_selection(_query_list(fields), _query_list(bodies))
+        on_demand = profiler.authorized(request.headers.get(PROFILE_HEADER))
+        if selection is None and (on_demand or profiler.should_sample()):
+            return await _profiled_chart(birth_input, on_demand)
+        key = chart_request_key(birth_input) + (selection,)
+        with span("calculate_chart", **{"singleflight.coalesced": key in chart_flights}):
+            chart = await chart_flights.do(key, _compute_chart, birth_input, selection)
+        with span("encode_response") as sp:
+            # The only place the compact chart becomes pydantic models
+            body = chart.to_chart_data().model_dump_json().encode()
+            sp.set_attribute("bytes", len(body))
         logger.info(
             "Chart generated successfully for "
-            f"{birth_input.city}, {birth_input.country}"
+            f"{birth_input.city}, {birth_input.country} in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
         )
-        return chart
+        return Response(content=body, media_type="application/json")
+    except AdmissionRejectedError as rejection:
+        raise _overloaded(rejection)
     except ValueError as e:
         # Handle validation errors from calculations
         error_msg = str(e)
@@ -0,0 +1,52 @@
+"""ASGI middleware for the astro chart generator API."""
+
+from typing import Any, Callable, Dict
+
+from src.core.tracing import Tracer, format_traceparent
+
+
+class TracingMiddleware:
+    """
+    Open a root span per HTTP request.
+
+    The tracer is looked up per request through `get_tracer`, so it can be
+    swapped at runtime. Unsampled requests only pay for the sampling
+    decision. Sampled responses carry an X-Trace-Id header for correlating
+    client reports with exported traces.
+    """
+
+    def __init__(self, app: Any, get_tracer: Callable[[], Tracer]):
+        self.app = app
+        self.get_tracer = get_tracer
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        tracer = self.get_tracer()
+        if scope["type"] != "http" or tracer.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        with tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        ) as root:
+            if root.trace_id is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_trace(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-trace-id", root.trace_id.encode()))
+                    headers.append((b"traceparent", format_traceparent(root).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
@@ -0,0 +1,176 @@
+"""On-demand and sampled call-stack profiling of chart requests."""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, List, Optional, Tuple
+
+# Profile ids are generated here; anything else is rejected (no path tricks)
+_PROFILE_ID_PATTERN = re.compile(r"^(request|sampled)-\d{14}-[0-9a-f]{8}$")
+
+# Sort keys accepted by pstats.Stats.sort_stats
+SORT_KEYS = frozenset(pstats.Stats.sort_arg_dict_default)
+
+
+class ProfileStore:
+    """
+    Directory of pstats files, rotated to keep at most `max_files`.
+
+    Files are standard `.prof` dumps readable by pstats, snakeviz, etc.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def path(self, profile_id: str) -> str:
+        """Filesystem path of a profile, validating the id."""
+        if not _PROFILE_ID_PATTERN.match(profile_id):
+            raise KeyError(profile_id)
+        return os.path.join(self.directory, f"{profile_id}.prof")
+
+    def save(self, stats: pstats.Stats, kind: str) -> str:
+        """Write `stats` to a new file and return its profile id."""
+        stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        profile_id = f"{kind}-{stamp}-{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(self.path(profile_id))
+            self._rotate()
+        return profile_id
+
+    def list_ids(self) -> List[str]:
+        """Stored profile ids, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            profile_id, ext = os.path.splitext(name)
+            if ext == ".prof" and _PROFILE_ID_PATTERN.match(profile_id):
+                full = os.path.join(self.directory, name)
+                entries.append((os.path.getmtime(full), profile_id))
+        return [profile_id for _, profile_id in sorted(entries)]
+
+    def _rotate(self) -> None:
+        ids = self.list_ids()
+        for profile_id in ids[: max(0, len(ids) - self.max_files)]:
+            try:
+                os.remove(self.path(profile_id))
+            except FileNotFoundError:
+                pass
+
+    def load_text(self, profile_id: str, sort: str = "cumulative", limit: int = 60) -> str:
+        """Human-readable report of a stored profile."""
+        path = self.path(profile_id)
+        if not os.path.exists(path):
+            raise KeyError(profile_id)
+        return format_stats(pstats.Stats(path), sort=sort, limit=limit)
+
+
+def format_stats(stats: pstats.Stats, sort: str = "cumulative", limit: int = 60) -> str:
+    """Render the top `limit` entries of `stats` as text."""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(sorted(SORT_KEYS))}")
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+class RequestProfiler:
+    """
+    Opt-in profiler for chart requests.
+
+    A request is profiled on demand when it carries the admin token, or at
+    random for `sample_rate` percent of traffic. On-demand profiles are
+    stored one file per request; sampled profiles are merged into one file
+    per `samples_per_file` requests so the store holds an aggregate view of
+    live traffic.
+
+    Args:
+        store: Where profiles are written
+        admin_token: Secret expected in the profiling header; None disables
+            on-demand profiling
+        sample_rate: Percentage (0-100) of requests to profile at random
+        samples_per_file: Sampled requests aggregated into each file
+    """
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        admin_token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        samples_per_file: int = 100,
+        rng: Optional[random.Random] = None,
+    ):
+        if not 0.0 <= sample_rate <= 100.0:
+            raise ValueError("sample_rate must be a percentage between 0 and 100")
+        self.store = store
+        self.admin_token = admin_token or None
+        self.sample_rate = sample_rate
+        self.samples_per_file = max(1, samples_per_file)
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._aggregate: Optional[pstats.Stats] = None
+        self._aggregate_count = 0
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Whether `token` matches the configured admin token."""
+        if self.admin_token is None or not token:
+            return False
+        return hmac.compare_digest(token.encode(), self.admin_token.encode())
+
+    def should_sample(self) -> bool:
+        """Randomly select a request for the aggregate profile."""
+        return self.sample_rate > 0 and self._rng.random() * 100.0 < self.sample_rate
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Tuple[Any, pstats.Stats]:
+        """
+        Call `fn(*args)` under cProfile in the current thread.
+
+        cProfile only sees the thread it is enabled in, so run this inside
+        the worker thread that does the work.
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = fn(*args)
+        finally:
+            profiler.disable()
+        return result, pstats.Stats(profiler)
+
+    def record_sample(self, stats: pstats.Stats) -> Optional[str]:
+        """
+        Merge a sampled profile into the current aggregate.
+
+        Returns:
+            The profile id when the aggregate was flushed to disk
+        """
+        with self._lock:
+            if self._aggregate is None:
+                self._aggregate = stats
+            else:
+                self._aggregate.add(stats)
+            self._aggregate_count += 1
+            if self._aggregate_count < self.samples_per_file:
+                return None
+            aggregate, self._aggregate = self._aggregate, None
+            self._aggregate_count = 0
+        return self.store.save(aggregate, "sampled")
+
+    def flush(self) -> Optional[str]:
+        """Write out a partial aggregate, if any."""
+        with self._lock:
+            aggregate, self._aggregate = self._aggregate, None
+            self._aggregate_count = 0
+        if aggregate is None:
+            return None
+        return self.store.save(aggregate, "sampled")
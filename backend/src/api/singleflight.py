@@ -0,0 +1,108 @@
+"""Single-flight coalescing of identical in-flight computations."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from src.models import BirthInput
+
+
+def chart_request_key(birth_input: BirthInput) -> Tuple[str, str, str, str]:
+    """
+    Normalize a chart request so equivalent inputs share one computation.
+
+    City and country lookups are case-insensitive, so they are folded here.
+    """
+    return (
+        birth_input.date,
+        birth_input.time,
+        birth_input.country.strip().lower(),
+        birth_input.city.strip().lower(),
+    )
+
+
+class _Call:
+    """One in-flight computation and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time.
+
+    Callers arriving while a computation for the same key is running await
+    that computation instead of starting their own, and all of them receive
+    its result or its exception. The entry is removed as soon as the
+    computation settles, so this never serves stale results (it is not a
+    cache). If every waiter goes away, the computation is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        """
+        Await `fn(*args)`, sharing the call with concurrent callers of `key`.
+
+        Args:
+            key: Hashable identity of the computation
+            fn: Coroutine function started only by the first caller
+            *args: Arguments passed to `fn`
+
+        Returns:
+            The result of the shared computation
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn(*args)))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, task))
+            self._leaders += 1
+        else:
+            self._coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is left to receive the result. Forget the call now:
+                # the task settles later, and a caller arriving before that
+                # must start afresh instead of awaiting a cancelled task
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        """Drop the settled call and mark its exception as retrieved."""
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def metrics(self) -> Dict[str, int]:
+        """Snapshot of coalescing counters."""
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+        }
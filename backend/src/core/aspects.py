@@ -0,0 +1,189 @@
+"""
+Aspect and midpoint search by sorted sweep.
+
+Longitudes are sorted once around the circle; for each body and aspect
+angle only the bodies inside the orb window around `longitude ± angle` are
+examined, found by binary search. The cost is O(A·n·log n) plus the number
+of hits, instead of O(A·n²) for the plain pair loop, which matters once
+extended bodies and midpoints push a chart past a hundred points. Below
+SWEEP_MIN_BODIES bodies (the default and extended charts included) the
+sort and bisection cost more than they save with the wide major orbs, so
+find_aspects uses the pair loop there.
+
+Aspect tables map an angle to `(name, orb)`, like `MAJOR_ASPECTS`. When
+several aspects of a table match the same pair, the first one in table
+order wins, exactly as in the pair loop.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+AspectTable = Dict[int, Tuple[str, float]]
+
+# Hard aspects to midpoints (cosmobiology), with tight orbs
+MIDPOINT_ASPECTS: AspectTable = {
+    0: ("Conjunction", 1.5),
+    45: ("Semi-square", 1.5),
+    90: ("Square", 1.5),
+    135: ("Sesquiquadrate", 1.5),
+    180: ("Opposition", 1.5),
+}
+
+# Bodies from which find_aspects uses the sweep instead of the pair loop
+# (measured crossover with the major table; see src.tools.bench_aspects)
+SWEEP_MIN_BODIES = 40
+
+# Slack on window bounds so float rounding never drops an exact-orb hit;
+# every candidate is re-checked with the exact separation
+_WINDOW_SLACK = 1e-9
+
+
+def separation(lon1: float, lon2: float) -> float:
+    """Shortest angular distance (0-180) between two longitudes."""
+    diff = abs(lon1 - lon2)
+    return min(diff, 360 - diff)
+
+
+def _cross_hits(
+    sources: Sequence[float],
+    targets: Sequence[float],
+    aspects: AspectTable,
+    upper_only: bool = False,
+) -> Dict[Tuple[int, int], Tuple[int, int, float]]:
+    """
+    Best aspect per (source, target) pair.
+
+    Targets are sorted once, with a +360 copy so orb windows that cross 0°
+    are contiguous; each window is located by binary search.
+
+    Args:
+        upper_only: Only report pairs with source index < target index
+            (used when sources and targets are the same bodies)
+
+    Returns:
+        {(source index, target index): (table rank, angle, orb)}
+    """
+    size = len(targets)
+    order = sorted(range(size), key=targets.__getitem__)
+    ordered = [targets[k] % 360 for k in order]
+    values = ordered + [lon + 360 for lon in ordered]
+    order = order + order
+
+    best: Dict[Tuple[int, int], Tuple[int, int, float]] = {}
+    for rank, (angle, (_, orb)) in enumerate(aspects.items()):
+        width = 2 * (orb + _WINDOW_SLACK)
+        for i, lon in enumerate(sources):
+            for center in {(lon + angle) % 360, (lon - angle) % 360}:
+                start = (center - orb - _WINDOW_SLACK) % 360
+                end = start + width
+                k = bisect_left(values, start)
+                # The window is shorter than a full turn, so nothing repeats
+                stop = min(2 * size, k + size)
+                while k < stop and values[k] <= end:
+                    j = order[k]
+                    k += 1
+                    if upper_only and j <= i:
+                        continue
+                    diff = abs(lon - targets[j])
+                    offset = abs(min(diff, 360 - diff) - angle)
+                    if offset > orb:
+                        continue
+                    previous = best.get((i, j))
+                    if previous is None or rank < previous[0]:
+                        best[(i, j)] = (rank, angle, offset)
+    return best
+
+
+def _pair_aspects(
+    longitudes: Sequence[float],
+    aspects: AspectTable,
+) -> List[Tuple[int, int, int, float]]:
+    """Aspects between all pairs by the plain pair loop (for small charts)."""
+    found = []
+    table = [(angle, orb) for angle, (_, orb) in aspects.items()]
+    for i in range(len(longitudes)):
+        lon = longitudes[i]
+        for j in range(i + 1, len(longitudes)):
+            diff = abs(lon - longitudes[j])
+            diff = min(diff, 360 - diff)
+            for angle, orb in table:
+                offset = abs(diff - angle)
+                if offset <= orb:
+                    found.append((i, j, angle, offset))
+                    break
+    return found
+
+
+def _sweep_aspects(
+    longitudes: Sequence[float],
+    aspects: AspectTable,
+) -> List[Tuple[int, int, int, float]]:
+    """Aspects between all pairs by sorted sweep (for large charts)."""
+    hits = _cross_hits(longitudes, longitudes, aspects, upper_only=True)
+    return sorted((i, j, angle, offset) for (i, j), (_, angle, offset) in hits.items())
+
+
+def find_aspects(
+    longitudes: Sequence[float],
+    aspects: AspectTable,
+) -> List[Tuple[int, int, int, float]]:
+    """
+    Aspects between all pairs of a set of bodies.
+
+    Uses the pair loop below SWEEP_MIN_BODIES bodies and the sorted sweep
+    from there on; both give the same result.
+
+    Args:
+        longitudes: Body longitudes (0-360)
+        aspects: Aspect table, angle -> (name, orb)
+
+    Returns:
+        (index1, index2, aspect angle, orb) with index1 < index2, sorted
+        by index pair
+    """
+    if len(longitudes) < SWEEP_MIN_BODIES:
+        return _pair_aspects(longitudes, aspects)
+    return _sweep_aspects(longitudes, aspects)
+
+
+def midpoint(lon1: float, lon2: float) -> float:
+    """Midpoint of the shorter arc between two longitudes."""
+    arc = (lon2 - lon1) % 360
+    if arc <= 180:
+        return (lon1 + arc / 2) % 360
+    return (lon2 + (360 - arc) / 2) % 360
+
+
+def midpoints(longitudes: Sequence[float]) -> List[Tuple[int, int, float]]:
+    """All pair midpoints as (index1, index2, longitude), index1 < index2."""
+    return [
+        (i, j, midpoint(longitudes[i], longitudes[j]))
+        for i in range(len(longitudes))
+        for j in range(i + 1, len(longitudes))
+    ]
+
+
+def find_midpoint_aspects(
+    longitudes: Sequence[float],
+    aspects: AspectTable = MIDPOINT_ASPECTS,
+) -> List[Tuple[int, int, int, int, float]]:
+    """
+    Bodies in aspect to the midpoint of two other bodies.
+
+    Args:
+        longitudes: Body longitudes (0-360)
+        aspects: Aspect table, angle -> (name, orb)
+
+    Returns:
+        (body, midpoint index1, midpoint index2, aspect angle, orb), sorted;
+        a body is never reported against a midpoint it is part of
+    """
+    pairs = midpoints(longitudes)
+    hits = _cross_hits(longitudes, [lon for _, _, lon in pairs], aspects)
+    found = []
+    for (body, m), (_, angle, offset) in hits.items():
+        i, j, _ = pairs[m]
+        if body != i and body != j:
+            found.append((body, i, j, angle, offset))
+    found.sort()
+    return found
@@ -0,0 +1,169 @@
+"""
+Astrocartography: where on Earth each planet is angular at one moment.
+
+For a planet with right ascension α and declination δ, and Greenwich
+sidereal time θ, the lines are solved in closed form:
+
+- MC (culminating): the meridian at longitude α − θ; IC is opposite.
+- ASC / DSC (rising / setting): at latitude φ the planet is on the
+  horizon at hour angle ∓H₀ with cos H₀ = −tan φ · tan δ, so the line
+  passes through longitude α ∓ H₀ − θ. Where |tan φ · tan δ| > 1 the
+  planet never rises or sets and the line ends; ASC and DSC meet there.
+
+The horizon lines are evaluated for all planets over the whole latitude
+grid in one NumPy expression instead of one houses_ex call per grid cell.
+Positions are zodiacal: the planets are placed on the ecliptic at their
+longitude from the sky cache (src.core.sky_cache.planet_positions).
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import _calculate_jd
+from src.core.sky_cache import planet_positions
+from src.models import Planet
+
+ANGLES = ("ASC", "DSC", "MC", "IC")
+
+DEFAULT_RESOLUTION = 1.0
+DEFAULT_MAX_LATITUDE = 85.0
+
+# Placeholder cusps; houses are irrelevant to the lines
+_NEUTRAL_CUSPS = [30.0 * n for n in range(12)]
+
+Coordinates = List[List[float]]
+
+
+def _wrap_longitude(degrees: np.ndarray) -> np.ndarray:
+    """Longitudes folded into [-180, 180)."""
+    return (degrees + 180.0) % 360.0 - 180.0
+
+
+def equatorial(longitudes: np.ndarray, obliquity: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Right ascension and declination (degrees) of ecliptic longitudes."""
+    lam = np.radians(longitudes)
+    eps = np.radians(obliquity)
+    ra = np.degrees(np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam))) % 360
+    dec = np.degrees(np.arcsin(np.sin(eps) * np.sin(lam)))
+    return ra, dec
+
+
+def _split_antimeridian(points: np.ndarray) -> List[Coordinates]:
+    """
+    Split a (n, 2) lon/lat polyline where it crosses ±180°.
+
+    The crossing point is interpolated onto both edges, so the pieces
+    meet at the map border.
+    """
+    lines: List[Coordinates] = []
+    current: Coordinates = []
+    for lon, lat in points.tolist():
+        if current:
+            prev_lon, prev_lat = current[-1]
+            step = lon - prev_lon
+            if abs(step) > 180:
+                edge = 180.0 if step < 0 else -180.0
+                unwrapped = lon + (360 if step < 0 else -360)
+                fraction = (edge - prev_lon) / (unwrapped - prev_lon)
+                crossing_lat = prev_lat + fraction * (lat - prev_lat)
+                current.append([edge, crossing_lat])
+                lines.append(current)
+                current = [[-edge, crossing_lat]]
+        current.append([lon, lat])
+    if len(current) > 1:
+        lines.append(current)
+    return lines
+
+
+def _horizon_lines(
+    ra: float,
+    dec: float,
+    sidereal: float,
+    latitudes: np.ndarray,
+) -> Tuple[List[Coordinates], List[Coordinates]]:
+    """(ASC, DSC) polylines of one planet over the latitude grid."""
+    tan_dec = np.tan(np.radians(dec))
+    if tan_dec != 0.0:
+        # Latitude where the planet becomes circumpolar: ASC and DSC meet
+        limit = float(np.degrees(np.arctan(1.0 / abs(tan_dec))))
+        if limit <= latitudes[-1]:
+            latitudes = np.union1d(latitudes, [-limit, limit])
+
+    product = -np.tan(np.radians(latitudes)) * tan_dec
+    # Rounding at the limit latitude may overshoot ±1 by an ulp
+    product = np.where(np.abs(product) <= 1.0 + 1e-12, np.clip(product, -1.0, 1.0), np.nan)
+    h0 = np.degrees(np.arccos(product))
+    valid = ~np.isnan(h0)
+
+    lines = []
+    for sign in (-1.0, 1.0):
+        lon = _wrap_longitude(ra + sign * h0 - sidereal)
+        points = np.column_stack((lon, latitudes))[valid]
+        lines.append(_split_antimeridian(points) if len(points) > 1 else [])
+    return lines[0], lines[1]
+
+
+def astrocartography_lines(
+    jd: float,
+    planets: Sequence[Planet],
+    resolution: float = DEFAULT_RESOLUTION,
+    max_latitude: float = DEFAULT_MAX_LATITUDE,
+) -> Dict[str, Any]:
+    """
+    ASC, DSC, MC and IC lines of each planet as GeoJSON.
+
+    Args:
+        jd: Julian Day (UT) of the moment, from _calculate_jd
+        planets: Planet positions, as from get_planet_positions
+        resolution: Latitude step of the horizon lines in degrees
+        max_latitude: Lines are drawn between ±max_latitude
+
+    Returns:
+        GeoJSON FeatureCollection with one MultiLineString feature per
+        planet and angle (properties: planet, angle); coordinates are
+        [longitude, latitude] in [-180, 180] × [-max_latitude, max_latitude]
+    """
+    if resolution <= 0:
+        raise ValueError("resolution must be positive")
+    if not 0 < max_latitude < 90:
+        raise ValueError("max_latitude must be between 0 and 90")
+
+    obliquity = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+    sidereal = swe.sidtime(jd) * 15.0
+    ra, dec = equatorial(np.array([planet.longitude for planet in planets]), obliquity)
+
+    count = int(np.floor(2 * max_latitude / resolution)) + 1
+    latitudes = np.linspace(-max_latitude, -max_latitude + (count - 1) * resolution, count)
+    if latitudes[-1] < max_latitude:
+        latitudes = np.append(latitudes, max_latitude)
+
+    mc = _wrap_longitude(ra - sidereal)
+    features = []
+    for k, planet in enumerate(planets):
+        asc, dsc = _horizon_lines(ra[k], dec[k], sidereal, latitudes)
+        lines = {"ASC": asc, "DSC": dsc}
+        for angle, lon in (("MC", float(mc[k])), ("IC", float(_wrap_longitude(mc[k] + 180.0)))):
+            lines[angle] = [[[lon, -max_latitude], [lon, max_latitude]]]
+        for angle in ANGLES:
+            features.append(
+                {
+                    "type": "Feature",
+                    "properties": {"planet": planet.name, "angle": angle},
+                    "geometry": {"type": "MultiLineString", "coordinates": lines[angle]},
+                }
+            )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def calculate_astrocartography(
+    date_str: str,
+    time_str: str,
+    resolution: float = DEFAULT_RESOLUTION,
+    max_latitude: float = DEFAULT_MAX_LATITUDE,
+) -> Dict[str, Any]:
+    """Astrocartography lines for a birth moment (UT); see astrocartography_lines."""
+    jd = _calculate_jd(date_str, time_str)
+    planets = planet_positions(date_str, time_str, _NEUTRAL_CUSPS)
+    return astrocartography_lines(jd, planets, resolution, max_latitude)
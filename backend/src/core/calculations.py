@@ -3,6 +3,8 @@
 from typing import List, Tuple
 import swisseph as swe
 
+from src.core.aspects import find_aspects
+from src.core.tracing import span
 from src.models import (
     Aspect,
     ChartData,
@@ -43,6 +45,19 @@ PLANETS = {
     "Pluto": swe.PLUTO,
 }
 
+"""延伸天體：凱龍星、月交點、莉莉絲及四大小行星（南交點由北交點推算）"""
+# Extended bodies for pyswisseph; Chiron and the asteroids need the
+# seas_*.se1 ephemeris files and are skipped when those are missing
+EXTENDED_BODIES = {
+    "North Node": swe.TRUE_NODE,
+    "Lilith": swe.MEAN_APOG,
+    "Chiron": swe.CHIRON,
+    "Ceres": swe.CERES,
+    "Pallas": swe.PALLAS,
+    "Juno": swe.JUNO,
+    "Vesta": swe.VESTA,
+}
+
 """主要相位及其度數與容許誤差（orb），依 FR-005 規範"""
 # Major aspects with their degrees and orbs (per FR-005)
 MAJOR_ASPECTS = {
@@ -53,6 +68,12 @@ MAJOR_ASPECTS = {
     180: ("Opposition", 8),
 }
 
+"""次要相位，僅用於相位圖形偵測（上帝之指需要 150 度梅花相位）"""
+# Minor aspects, used for pattern detection only (a Yod needs the quincunx)
+MINOR_ASPECTS = {
+    150: ("Quincunx", 3),
+}
+
 """主要城市的地理座標（緯度、經度），用於出生地查詢"""
 # Geolocation data for major cities (lat, lon)
 CITY_COORDS = {
@@ -127,7 +148,8 @@ def _calculate_jd(date_str: str, time_str: str) -> float:
     time_decimal = hour + minute / 60.0 + second / 3600.0
 
     # Calculate Julian Day
-    jd = swe.julday(year, month, day, time_decimal)
+    with span("julian_day"):
+        jd = swe.julday(year, month, day, time_decimal)
     return jd
 
 
@@ -339,6 +361,20 @@ def _get_house_for_position(
     return 1  # Default to house 1
 
 
+def _find_aspects(longitudes: List[float]) -> List[Tuple[int, int, int, float]]:
+    """
+    找出一組黃經度數之間的主要相位
+
+    Args:
+        longitudes: 各天體度數（0-360）
+
+    Returns:
+        (索引1, 索引2, 相位角度, 容許誤差) 列表，依索引順序排列
+    """
+    # Pair loop for chart-sized inputs, sorted sweep for large ones
+    return find_aspects(longitudes, MAJOR_ASPECTS)
+
+
 def get_aspects(
     planets: List[Planet],
     points: List[Point],
@@ -353,8 +389,6 @@ def get_aspects(
     Returns:
         Aspect 物件列表
     """
-    aspects = []
-
     # Combine all bodies for aspect calculation
     all_bodies = []
     for planet in planets:
@@ -362,33 +396,16 @@ def get_aspects(
     for point in points:
         all_bodies.append((point.name, point.longitude))
 
-    # Check all body pairs
-    for i in range(len(all_bodies)):
-        for j in range(i + 1, len(all_bodies)):
-            name1, lon1 = all_bodies[i]
-            name2, lon2 = all_bodies[j]
-
-            # Calculate angle difference
-            diff = abs(lon1 - lon2)
-            # Use smallest angle
-            angle_diff = min(diff, 360 - diff)
-
-            # Check for major aspects
-            aspect_items = MAJOR_ASPECTS.items()
-            for aspect_angle, (aspect_type, orb_tolerance) in aspect_items:
-                # Check if angle matches aspect within orb
-                angular_offset = abs(angle_diff - aspect_angle)
-
-                if angular_offset <= orb_tolerance:
-                    aspects.append(
-                        Aspect(
-                            planet1=name1,
-                            planet2=name2,
-                            type=aspect_type,
-                            orb=angular_offset,
-                        )
-                    )
-                    break  # Each pair has at most one aspect
+    aspects = []
+    for i, j, aspect_angle, orb in _find_aspects([lon for _, lon in all_bodies]):
+        aspects.append(
+            Aspect(
+                planet1=all_bodies[i][0],
+                planet2=all_bodies[j][0],
+                type=MAJOR_ASPECTS[aspect_angle][0],
+                orb=orb,
+            )
+        )
 
     return aspects
 
@@ -412,18 +429,31 @@ def calculate_natal_chart(
         ChartData 物件，包含行星、占星點、宮位、相位
     """
     # Get coordinates for the city
-    latitude, longitude = _get_city_coordinates(city, country)
+    with span("location_lookup", city=city, country=country) as sp:
+        latitude, longitude = _get_city_coordinates(city, country)
+        sp.set_attribute(
+            "location.known", (city.lower(), country.lower()) in CITY_COORDS
+        )
 
     # Calculate houses first (needed for planet house placement)
-    houses = get_house_cusps(date_str, time_str, latitude, longitude)
-    house_cusps = [h.longitude for h in houses]
+    with span("houses", house_system="Placidus") as sp:
+        houses = get_house_cusps(date_str, time_str, latitude, longitude)
+        house_cusps = [h.longitude for h in houses]
+        sp.set_attribute("house_count", len(houses))
 
     # Calculate positions
-    planets = get_planet_positions(
-        date_str, time_str, latitude, longitude, house_cusps
-    )
-    points = get_astrological_points(date_str, time_str, latitude, longitude)
-    aspects = get_aspects(planets, points)
+    with span("planets") as sp:
+        planets = get_planet_positions(
+            date_str, time_str, latitude, longitude, house_cusps
+        )
+        sp.set_attribute("body_count", len(planets))
+    with span("points") as sp:
+        points = get_astrological_points(date_str, time_str, latitude, longitude)
+        sp.set_attribute("body_count", len(points))
+    with span("aspects") as sp:
+        aspects = get_aspects(planets, points)
+        sp.set_attribute("body_count", len(planets) + len(points))
+        sp.set_attribute("aspect_count", len(aspects))
 
     return ChartData(
         planets=planets,
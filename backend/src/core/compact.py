@@ -0,0 +1,572 @@
+"""
+Compact, array-backed internal chart representation.
+
+A `CompactChart` stores a chart as a handful of fixed-layout arrays with
+small integer codes for bodies, signs and aspect types, instead of a tree
+of ~40 pydantic objects. It is cheap to build, cache and pickle between
+processes; `to_chart_data()` converts it to the API's `ChartData` at the
+boundary.
+
+`build_partial_chart` computes only the requested parts of a chart (see
+CHART_FIELDS) for a subset of the bodies, skipping the houses_ex call,
+the calc_ut calls and the aspect and pattern stages that the selection
+does not need. Aspect patterns are opt-in: a chart without a selection
+has the DEFAULT_FIELDS only.
+"""
+
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+import swisseph as swe
+
+from src.core.aspects import (
+    MIDPOINT_ASPECTS,
+    AspectTable,
+    find_aspects,
+    find_midpoint_aspects,
+)
+from src.core.calculations import (
+    CITY_COORDS,
+    EXTENDED_BODIES,
+    MAJOR_ASPECTS,
+    MINOR_ASPECTS,
+    PLANETS,
+    ZODIAC_SIGNS,
+    _calculate_jd,
+    _degrees_to_sign_components,
+    _find_aspects,
+    _get_city_coordinates,
+    _get_house_for_position,
+)
+from src.core.patterns import AspectGraph, PatternInstance, find_patterns, pattern_models
+from src.core.sky_cache import house_positions, sky_positions
+from src.core.tracing import span
+from src.models import Aspect, ChartData, House, Planet, Point
+
+# Body codes: index into BODY_NAMES (planets, the four angles, then the
+# extended bodies, with the South Node derived from the North Node)
+POINT_NAMES = ("Ascendant", "Descendant", "Midheaven", "Imum Coeli")
+EXTENDED_NAMES = ("North Node", "South Node") + tuple(
+    name for name in EXTENDED_BODIES if name != "North Node"
+)
+BODY_NAMES: Tuple[str, ...] = tuple(PLANETS) + POINT_NAMES + EXTENDED_NAMES
+BODY_CODES = {name: code for code, name in enumerate(BODY_NAMES)}
+
+# Aspect codes: index into ASPECT_ANGLES / ASPECT_NAMES
+ASPECT_ANGLES: Tuple[int, ...] = tuple(MAJOR_ASPECTS)
+ASPECT_NAMES: Tuple[str, ...] = tuple(name for name, _ in MAJOR_ASPECTS.values())
+ASPECT_CODES = {angle: code for code, angle in enumerate(ASPECT_ANGLES)}
+
+# Default layout: the 10 planets followed by ASC, DSC, MC, IC
+DEFAULT_BODIES = array("B", range(len(PLANETS) + len(POINT_NAMES)))
+
+# House code for bodies without a house placement (the angles)
+NO_HOUSE = 0
+
+# Parts of a chart that can be requested separately, in ChartData order
+CHART_FIELDS = ("planets", "points", "houses", "aspects", "patterns")
+
+# Parts computed without a selection; pattern detection (and its quincunx
+# search) is only run when "patterns" is requested
+DEFAULT_FIELDS = ("planets", "points", "houses", "aspects")
+
+# Fields whose output needs the positions of the selected planets / angles
+_PLANET_FIELDS = frozenset(("planets", "aspects", "patterns"))
+_POINT_FIELDS = frozenset(("points", "aspects", "patterns"))
+_POINT_CODES = frozenset(BODY_CODES[name] for name in POINT_NAMES)
+
+
+class CompactChart:
+    """
+    Chart stored as parallel arrays.
+
+    Attributes:
+        jd: Julian Day (UT) of the chart
+        latitude, longitude: Geographic location
+        bodies: Body codes (see BODY_NAMES), one per slot
+        longitudes: Ecliptic longitude (0-360) per slot
+        speeds: Longitude speed in degrees/day per slot (0 for angles)
+        signs: Sign code (0-11, index into ZODIAC_SIGNS) per slot
+        houses: House number (1-12) per slot, NO_HOUSE for angles
+        cusps: The 12 house cusp longitudes
+        aspects: Flattened (slot1, slot2, aspect code) triples
+        aspect_orbs: Orb of each aspect, in the same order
+        patterns: (pattern code, slots, apex slot or -1) per aspect pattern
+        fields: Parts of CHART_FIELDS that were computed; `cusps`,
+            `aspects` and `patterns` are empty for the others
+    """
+
+    __slots__ = (
+        "jd",
+        "latitude",
+        "longitude",
+        "bodies",
+        "longitudes",
+        "speeds",
+        "signs",
+        "houses",
+        "cusps",
+        "aspects",
+        "aspect_orbs",
+        "patterns",
+        "fields",
+    )
+
+    def __init__(
+        self,
+        jd: float,
+        latitude: float,
+        longitude: float,
+        bodies: array,
+        longitudes: array,
+        speeds: array,
+        houses: array,
+        cusps: array,
+        aspects: Optional[array] = None,
+        aspect_orbs: Optional[array] = None,
+        patterns: Optional[List[PatternInstance]] = None,
+        fields: Tuple[str, ...] = DEFAULT_FIELDS,
+    ):
+        self.jd = jd
+        self.latitude = latitude
+        self.longitude = longitude
+        self.bodies = bodies
+        self.longitudes = longitudes
+        self.speeds = speeds
+        self.signs = array("b", (int(lon // 30) % 12 for lon in longitudes))
+        self.houses = houses
+        self.cusps = cusps
+        self.aspects = aspects if aspects is not None else array("B")
+        self.aspect_orbs = aspect_orbs if aspect_orbs is not None else array("d")
+        self.patterns = patterns if patterns is not None else []
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        # Charts pickled before field selection existed are complete
+        self.fields = CHART_FIELDS
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    @property
+    def aspect_count(self) -> int:
+        return len(self.aspect_orbs)
+
+    def names(self) -> List[str]:
+        """Body name per slot."""
+        return [BODY_NAMES[code] for code in self.bodies]
+
+    def slot(self, name: str) -> int:
+        """Slot index of a body, by name."""
+        return self.bodies.index(BODY_CODES[name])
+
+    def longitude_of(self, name: str) -> float:
+        return self.longitudes[self.slot(name)]
+
+    def field_slots(self, field: str) -> List[int]:
+        """Slots reported under "planets" or "points", if that field was computed."""
+        if field not in self.fields:
+            return []
+        is_point = field == "points"
+        return [
+            slot for slot, code in enumerate(self.bodies) if (code in _POINT_CODES) == is_point
+        ]
+
+    def iter_aspects(self):
+        """Yield (slot1, slot2, aspect code, orb) per aspect."""
+        aspects = self.aspects
+        for n, orb in enumerate(self.aspect_orbs):
+            yield aspects[3 * n], aspects[3 * n + 1], aspects[3 * n + 2], orb
+
+    def midpoint_aspects(
+        self, aspects: AspectTable = MIDPOINT_ASPECTS
+    ) -> List[Tuple[str, str, str, str, float]]:
+        """
+        Bodies in aspect to the midpoint of two other bodies.
+
+        Returns:
+            (body, midpoint body 1, midpoint body 2, aspect name, orb)
+        """
+        names = self.names()
+        return [
+            (names[body], names[i], names[j], aspects[angle][0], orb)
+            for body, i, j, angle, orb in find_midpoint_aspects(self.longitudes, aspects)
+        ]
+
+    def to_chart_data(self) -> ChartData:
+        """Convert to the pydantic API model."""
+        planets = []
+        for slot in self.field_slots("planets"):
+            lon = self.longitudes[slot]
+            sign, degree, minute = _degrees_to_sign_components(lon)
+            planets.append(
+                Planet(
+                    name=BODY_NAMES[self.bodies[slot]],
+                    longitude=lon,
+                    sign=sign,
+                    degree=degree,
+                    minute=minute,
+                    house=self.houses[slot],
+                )
+            )
+
+        points = []
+        for slot in self.field_slots("points"):
+            lon = self.longitudes[slot]
+            sign, degree, minute = _degrees_to_sign_components(lon)
+            points.append(
+                Point(
+                    name=BODY_NAMES[self.bodies[slot]],
+                    longitude=lon,
+                    sign=sign,
+                    degree=degree,
+                    minute=minute,
+                )
+            )
+
+        houses = [
+            House(number=n, longitude=lon, sign=ZODIAC_SIGNS[int(lon // 30) % 12])
+            for n, lon in enumerate(self.cusps, start=1)
+        ]
+
+        aspects = [
+            Aspect(
+                planet1=BODY_NAMES[self.bodies[i]],
+                planet2=BODY_NAMES[self.bodies[j]],
+                type=ASPECT_NAMES[code],
+                orb=orb,
+            )
+            for i, j, code, orb in self.iter_aspects()
+            if "aspects" in self.fields
+        ]
+
+        return ChartData(
+            planets=planets,
+            points=points,
+            houses=houses,
+            aspects=aspects,
+            patterns=(
+                pattern_models(self.names(), self.patterns) if "patterns" in self.fields else []
+            ),
+            computed=list(self.fields),
+        )
+
+
+def find_chart_aspects(longitudes: array) -> Tuple[array, array]:
+    """Major aspects of a chart as (flattened slot/code triples, orbs)."""
+    aspects = array("B")
+    aspect_orbs = array("d")
+    for i, j, aspect_angle, orb in _find_aspects(longitudes):
+        aspects.extend((i, j, ASPECT_CODES[aspect_angle]))
+        aspect_orbs.append(orb)
+    return aspects, aspect_orbs
+
+
+def find_chart_patterns(
+    bodies: array,
+    longitudes: array,
+    aspects: array,
+) -> List[PatternInstance]:
+    """
+    Aspect patterns from a chart's aspect triples.
+
+    Quincunxes (needed for Yods) are not chart aspects, so they are found
+    separately from the longitudes.
+    """
+    edges = [
+        (aspects[n], aspects[n + 1], ASPECT_NAMES[aspects[n + 2]])
+        for n in range(0, len(aspects), 3)
+    ]
+    for i, j, angle, _ in find_aspects(longitudes, MINOR_ASPECTS):
+        edges.append((i, j, MINOR_ASPECTS[angle][0]))
+    names = [BODY_NAMES[code] for code in bodies]
+    return find_patterns(AspectGraph(names, edges))
+
+
+def build_compact_chart(
+    jd: float,
+    latitude: float,
+    longitude: float,
+    extended: bool = False,
+    patterns: bool = False,
+) -> CompactChart:
+    """
+    Calculate a chart for a Julian Day and location.
+
+    One houses_ex call serves both the cusps and the four angles, and each
+    planet needs one calc_ut call; both are cached per moment (see
+    src.core.sky_cache), so a repeated moment only costs house placement.
+
+    Args:
+        jd: Julian Day (UT)
+        latitude: Geographic latitude
+        longitude: Geographic longitude
+        extended: Also include the extended bodies (nodes, Lilith, Chiron,
+            asteroids) after the angles
+        patterns: Also detect aspect patterns
+
+    Returns:
+        CompactChart
+    """
+    with span("houses", house_system="Placidus") as sp:
+        cusp_values, asc_lon, mc_lon = house_positions(jd, latitude, longitude)
+        cusps = array("d", cusp_values)
+        sp.set_attribute("house_count", len(cusps))
+
+    # Location-independent positions come from the sky tier; only the
+    # house placement below is specific to this chart
+    with span("sky_positions") as sp:
+        sky = sky_positions(jd, extended)
+        sp.set_attribute("body_count", len(sky))
+
+    longitudes = array("d")
+    speeds = array("d")
+    houses = array("b")
+
+    with span("planets") as sp:
+        for planet_name, lon, speed in sky[: len(PLANETS)]:
+            longitudes.append(lon)
+            speeds.append(speed)
+            houses.append(_get_house_for_position(lon, cusps))
+        sp.set_attribute("body_count", len(PLANETS))
+
+    with span("points") as sp:
+        for lon in (asc_lon, (asc_lon + 180) % 360, mc_lon, (mc_lon + 180) % 360):
+            longitudes.append(lon)
+            speeds.append(0.0)
+            houses.append(NO_HOUSE)
+        sp.set_attribute("body_count", len(POINT_NAMES))
+
+    bodies = array("B", DEFAULT_BODIES)
+    if extended:
+        with span("extended_bodies") as sp:
+            for name, lon, speed in sky[len(PLANETS) :]:
+                bodies.append(BODY_CODES[name])
+                longitudes.append(lon)
+                speeds.append(speed)
+                houses.append(_get_house_for_position(lon, cusps))
+            sp.set_attribute("body_count", len(bodies) - len(DEFAULT_BODIES))
+
+    with span("aspects") as sp:
+        aspects, aspect_orbs = find_chart_aspects(longitudes)
+        sp.set_attribute("body_count", len(longitudes))
+        sp.set_attribute("aspect_count", len(aspect_orbs))
+
+    found = None
+    if patterns:
+        with span("patterns") as sp:
+            found = find_chart_patterns(bodies, longitudes, aspects)
+            sp.set_attribute("pattern_count", len(found))
+
+    return CompactChart(
+        jd,
+        latitude,
+        longitude,
+        bodies,
+        longitudes,
+        speeds,
+        houses,
+        cusps,
+        aspects,
+        aspect_orbs,
+        found,
+        CHART_FIELDS if patterns else DEFAULT_FIELDS,
+    )
+
+
+def chart_selection(
+    fields: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Validate and normalize a field and body selection.
+
+    Args:
+        fields: Parts of CHART_FIELDS to compute (default: DEFAULT_FIELDS)
+        bodies: Planet and angle names to include (default: all)
+
+    Returns:
+        (fields in CHART_FIELDS order, bodies in DEFAULT_BODIES order)
+    """
+    fields = DEFAULT_FIELDS if fields is None else fields
+    unknown = sorted(set(fields) - set(CHART_FIELDS))
+    if unknown:
+        raise ValueError(
+            f"Unknown chart fields: {', '.join(unknown)} "
+            f"(expected some of {', '.join(CHART_FIELDS)})"
+        )
+    if not fields:
+        raise ValueError("at least one field is required")
+
+    names = [BODY_NAMES[code] for code in DEFAULT_BODIES]
+    bodies = names if bodies is None else bodies
+    unknown = sorted(set(bodies) - set(names))
+    if unknown:
+        raise ValueError(f"Unknown bodies: {', '.join(unknown)}")
+    if not bodies:
+        raise ValueError("at least one body is required")
+
+    return (
+        tuple(field for field in CHART_FIELDS if field in fields),
+        tuple(name for name in names if name in bodies),
+    )
+
+
+def build_partial_chart(
+    jd: float,
+    latitude: float,
+    longitude: float,
+    fields: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+) -> CompactChart:
+    """
+    Calculate only the selected parts of a chart.
+
+    Planets are computed (one calc_ut each) only if they are selected and
+    a requested field reports them: "planets" itself, or the aspects and
+    patterns among the selected bodies. houses_ex runs only for "houses",
+    for the angles, or to place the requested planets in houses. Aspects
+    are found only for "aspects" or "patterns", and patterns only for
+    "patterns".
+
+    Selecting every planet reads the sky tier like build_compact_chart; a
+    subset is computed directly, since a cache miss would compute all
+    ten planets.
+
+    Args:
+        jd: Julian Day (UT)
+        latitude: Geographic latitude
+        longitude: Geographic longitude
+        fields: Parts of CHART_FIELDS to compute (default: DEFAULT_FIELDS)
+        bodies: Planet and angle names to include (default: all)
+
+    Returns:
+        CompactChart with `fields` set to the computed parts
+    """
+    fields, bodies = chart_selection(fields, bodies)
+    wanted = set(fields)
+    codes = [BODY_CODES[name] for name in bodies]
+    planet_codes = [code for code in codes if code not in _POINT_CODES]
+    point_codes = [code for code in codes if code in _POINT_CODES]
+    if not wanted & _PLANET_FIELDS:
+        planet_codes = []
+    if not wanted & _POINT_FIELDS:
+        point_codes = []
+
+    cusps = array("d")
+    cusp_values: Tuple[float, ...] = ()
+    if "houses" in wanted or point_codes or (planet_codes and "planets" in wanted):
+        with span("houses", house_system="Placidus") as sp:
+            cusp_values, asc_lon, mc_lon = house_positions(jd, latitude, longitude)
+            if "houses" in wanted:
+                cusps = array("d", cusp_values)
+            sp.set_attribute("house_count", len(cusps))
+
+    slots = array("B")
+    longitudes = array("d")
+    speeds = array("d")
+    houses = array("b")
+
+    if planet_codes:
+        with span("sky_positions") as sp:
+            if len(planet_codes) == len(PLANETS):
+                sky = [(lon, speed) for name, lon, speed in sky_positions(jd)]
+            else:
+                planet_ids = list(PLANETS.values())
+                sky = []
+                for code in planet_codes:
+                    coords, ret_flag = swe.calc_ut(jd, planet_ids[code])
+                    sky.append((coords[0] % 360, coords[3]))
+            sp.set_attribute("body_count", len(sky))
+
+        with span("planets") as sp:
+            for code, (lon, speed) in zip(planet_codes, sky):
+                slots.append(code)
+                longitudes.append(lon)
+                speeds.append(speed)
+                placed = "planets" in wanted
+                houses.append(_get_house_for_position(lon, cusp_values) if placed else NO_HOUSE)
+            sp.set_attribute("body_count", len(planet_codes))
+
+    if point_codes:
+        with span("points") as sp:
+            angles = (asc_lon, (asc_lon + 180) % 360, mc_lon, (mc_lon + 180) % 360)
+            for code in point_codes:
+                slots.append(code)
+                longitudes.append(angles[code - len(PLANETS)])
+                speeds.append(0.0)
+                houses.append(NO_HOUSE)
+            sp.set_attribute("body_count", len(point_codes))
+
+    aspects = aspect_orbs = None
+    if wanted & {"aspects", "patterns"}:
+        with span("aspects") as sp:
+            aspects, aspect_orbs = find_chart_aspects(longitudes)
+            sp.set_attribute("body_count", len(longitudes))
+            sp.set_attribute("aspect_count", len(aspect_orbs))
+
+    patterns = None
+    if "patterns" in wanted:
+        with span("patterns") as sp:
+            patterns = find_chart_patterns(slots, longitudes, aspects)
+            sp.set_attribute("pattern_count", len(patterns))
+
+    return CompactChart(
+        jd,
+        latitude,
+        longitude,
+        slots,
+        longitudes,
+        speeds,
+        houses,
+        cusps,
+        aspects,
+        aspect_orbs,
+        patterns,
+        fields,
+    )
+
+
+def calculate_compact_chart(
+    date_str: str,
+    time_str: str,
+    country: str,
+    city: str,
+    extended: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+) -> CompactChart:
+    """
+    Calculate a natal chart in compact form.
+
+    Args:
+        date_str: Birth date (YYYY-MM-DD)
+        time_str: Birth time (HH:MM:SS)
+        country: Birth country
+        city: Birth city
+        extended: Also include the extended bodies
+        fields, bodies: Compute only part of the chart, or add "patterns"
+            (see build_partial_chart); not combined with `extended`
+
+    Returns:
+        CompactChart
+    """
+    partial = fields is not None or bodies is not None
+    if partial and extended:
+        raise ValueError("extended bodies cannot be combined with a field selection")
+
+    with span("location_lookup", city=city, country=country) as sp:
+        latitude, longitude = _get_city_coordinates(city, country)
+        sp.set_attribute(
+            "location.known", (city.lower(), country.lower()) in CITY_COORDS
+        )
+
+    jd = _calculate_jd(date_str, time_str)
+    if partial:
+        return build_partial_chart(jd, latitude, longitude, fields, bodies)
+    return build_compact_chart(jd, latitude, longitude, extended)
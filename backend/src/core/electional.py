@@ -0,0 +1,335 @@
+"""
+Electional search: time windows in which a set of conditions all hold.
+
+Each constraint (a body in a sign or house, an aspect between two
+bodies, retrograde motion, a void-of-course Moon) is a condition on the
+moment. Rather than casting a chart minute by minute, the search
+
+1. samples each condition at a step suited to how fast it can change
+   (minutes for the angles and houses, an hour for the Moon, hours for
+   the planets), starting with the coarsest, and samples every further
+   condition only inside the windows the previous ones left open;
+2. bisects only the boundaries of the surviving windows, to about a
+   second;
+3. intersects the refined intervals of all conditions.
+
+Void-of-course periods are exact intervals (see src.core.lunar_calendar)
+and need neither sampling nor refinement. A condition that holds for
+less than its sampling step between two samples can be missed.
+"""
+
+import math
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import (
+    MAJOR_ASPECTS,
+    MINOR_ASPECTS,
+    PLANETS,
+    ZODIAC_SIGNS,
+    _get_house_for_position,
+)
+from src.core.ingress import TIME_TOLERANCE_DAYS, body_position
+from src.core.lunar_calendar import build_voids
+from src.core.sky_cache import HousePositions, compute_houses
+from src.models import ElectionalConstraint
+
+ANGLE_NAMES = ("Ascendant", "Midheaven")
+
+# Sampling step in days: the angles sweep a sign in about two hours, the
+# Moon in about two and a half days, the planets far slower
+ANGLE_STEP_DAYS = 5.0 / 1440
+MOON_STEP_DAYS = 1.0 / 24
+PLANET_STEP_DAYS = 0.25
+
+# Longest search range in days
+MAX_SEARCH_DAYS = 366
+
+# Aspect name -> (angle, default orb)
+ASPECTS_BY_NAME = {
+    name: (angle, orb) for angle, (name, orb) in {**MAJOR_ASPECTS, **MINOR_ASPECTS}.items()
+}
+
+Interval = Tuple[float, float]
+
+
+class _Run(NamedTuple):
+    """
+    A stretch of samples where a condition holds.
+
+    Each boundary lies between a sample where the condition fails and one
+    where it holds; lo == hi marks a boundary that is already exact.
+    """
+
+    start_lo: float
+    start_hi: float
+    end_lo: float
+    end_hi: float
+
+
+class _Condition(NamedTuple):
+    """A compiled constraint: sampled predicate or exact intervals."""
+
+    holds: Optional[Callable[[float], bool]]
+    step: float
+    intervals: Optional[List[Interval]]
+
+
+def _body_step(body: str) -> float:
+    if body in ANGLE_NAMES:
+        return ANGLE_STEP_DAYS
+    return MOON_STEP_DAYS if body == "Moon" else PLANET_STEP_DAYS
+
+
+def _check_body(body: Optional[str], allow_angles: bool = True) -> str:
+    names = list(PLANETS) + (list(ANGLE_NAMES) if allow_angles else [])
+    if body not in names:
+        raise ValueError(f"Unknown body {body!r}; expected one of {', '.join(names)}")
+    return body
+
+
+def _houses(jd: float, latitude: Optional[float], longitude: Optional[float]) -> HousePositions:
+    if latitude is None or longitude is None:
+        raise ValueError("House and angle constraints need a location")
+    try:
+        return compute_houses(jd, latitude, longitude)
+    except swe.Error:
+        raise ValueError(f"Placidus houses are undefined at latitude {latitude}")
+
+
+def _longitude_of(
+    body: str,
+    latitude: Optional[float],
+    longitude: Optional[float],
+) -> Callable[[float], float]:
+    """Ecliptic longitude of a planet or angle as a function of time."""
+    if body in ANGLE_NAMES:
+        angle = 1 if body == "Ascendant" else 2
+
+        def angle_longitude(jd: float) -> float:
+            return _houses(jd, latitude, longitude)[angle]
+
+        return angle_longitude
+    body_id = PLANETS[body]
+
+    def planet_longitude(jd: float) -> float:
+        return body_position(jd, body_id)[0]
+
+    return planet_longitude
+
+
+def _compile(
+    constraint: ElectionalConstraint,
+    start_jd: float,
+    end_jd: float,
+    latitude: Optional[float],
+    longitude: Optional[float],
+) -> _Condition:
+    """Predicate (or exact intervals) and sampling step of one constraint."""
+    kind = constraint.kind
+    if kind == "void_of_course":
+        voids = build_voids(start_jd, end_jd + 3.0)
+        intervals = [
+            (max(start, start_jd), min(end, end_jd))
+            for start, end in zip(voids.starts.tolist(), voids.ends.tolist())
+            if start < end_jd and end > start_jd
+        ]
+        if constraint.negate:
+            intervals = _complement(intervals, start_jd, end_jd)
+        return _Condition(None, 0.0, intervals)
+
+    if kind == "sign":
+        body = _check_body(constraint.body)
+        if constraint.sign not in ZODIAC_SIGNS:
+            raise ValueError(f"Unknown sign {constraint.sign!r}")
+        sign = ZODIAC_SIGNS.index(constraint.sign)
+        lon_of = _longitude_of(body, latitude, longitude)
+
+        def base(jd: float) -> bool:
+            return int(lon_of(jd) // 30) % 12 == sign
+
+        step = _body_step(body)
+    elif kind == "house":
+        body = _check_body(constraint.body, allow_angles=False)
+        body_id, house = PLANETS[body], constraint.house
+
+        def base(jd: float) -> bool:
+            cusps = _houses(jd, latitude, longitude)[0]
+            return _get_house_for_position(body_position(jd, body_id)[0], cusps) == house
+
+        step = ANGLE_STEP_DAYS
+    elif kind == "aspect":
+        body, other = _check_body(constraint.body), _check_body(constraint.other)
+        if constraint.aspect not in ASPECTS_BY_NAME:
+            raise ValueError(
+                f"Unknown aspect {constraint.aspect!r}; "
+                f"expected one of {', '.join(ASPECTS_BY_NAME)}"
+            )
+        angle, default_orb = ASPECTS_BY_NAME[constraint.aspect]
+        orb = constraint.orb if constraint.orb is not None else default_orb
+        first = _longitude_of(body, latitude, longitude)
+        second = _longitude_of(other, latitude, longitude)
+
+        def base(jd: float) -> bool:
+            separation = abs((first(jd) - second(jd) + 180.0) % 360.0 - 180.0)
+            return abs(separation - angle) <= orb
+
+        step = min(_body_step(body), _body_step(other))
+    elif kind == "retrograde":
+        body = _check_body(constraint.body, allow_angles=False)
+        body_id = PLANETS[body]
+
+        def base(jd: float) -> bool:
+            return body_position(jd, body_id)[1] < 0
+
+        step = _body_step(body)
+    else:
+        raise ValueError(f"Unknown constraint kind {kind!r}")
+
+    negate = constraint.negate
+
+    def holds(jd: float) -> bool:
+        return base(jd) != negate
+
+    return _Condition(holds, step, None)
+
+
+def _complement(intervals: List[Interval], start_jd: float, end_jd: float) -> List[Interval]:
+    """Gaps between sorted disjoint intervals within [start_jd, end_jd]."""
+    gaps = []
+    t = start_jd
+    for start, end in intervals:
+        if start > t:
+            gaps.append((t, start))
+        t = max(t, end)
+    if t < end_jd:
+        gaps.append((t, end_jd))
+    return gaps
+
+
+def _sample_runs(holds: Callable[[float], bool], a: float, b: float, step: float) -> List[_Run]:
+    """Runs of [a, b] where `holds` is true at the sample points."""
+    n = max(1, math.ceil((b - a) / step))
+    times = np.linspace(a, b, n + 1).tolist()
+    values = [holds(t) for t in times]
+
+    runs = []
+    i = 0
+    while i <= n:
+        if not values[i]:
+            i += 1
+            continue
+        j = i
+        while j < n and values[j + 1]:
+            j += 1
+        start = (times[i - 1], times[i]) if i > 0 else (a, a)
+        end = (times[j], times[j + 1]) if j < n else (b, b)
+        runs.append(_Run(start[0], start[1], end[0], end[1]))
+        i = j + 1
+    return runs
+
+
+def _clip_runs(intervals: List[Interval], a: float, b: float) -> List[_Run]:
+    """Exact intervals clipped to [a, b], as runs."""
+    runs = []
+    for start, end in intervals:
+        start, end = max(start, a), min(end, b)
+        if start < end:
+            runs.append(_Run(start, start, end, end))
+    return runs
+
+
+def _bisect(holds: Callable[[float], bool], a: float, b: float) -> float:
+    """Where `holds` changes between a and b (holds(a) != holds(b))."""
+    at_a = holds(a)
+    while b - a > TIME_TOLERANCE_DAYS:
+        m = 0.5 * (a + b)
+        if holds(m) == at_a:
+            a = m
+        else:
+            b = m
+    return 0.5 * (a + b)
+
+
+def _refine(condition: _Condition, run: _Run) -> Interval:
+    start, end = run.start_hi, run.end_lo
+    if run.start_lo != run.start_hi:
+        start = _bisect(condition.holds, run.start_lo, run.start_hi)
+    if run.end_lo != run.end_hi:
+        end = _bisect(condition.holds, run.end_lo, run.end_hi)
+    return start, end
+
+
+def _intersect(first: List[Interval], second: List[Interval]) -> List[Interval]:
+    """Intersection of two sorted lists of disjoint intervals."""
+    found = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            found.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return found
+
+
+def _overlaps(run: _Run, windows: List[Interval]) -> bool:
+    return any(run.start_lo < end and start < run.end_hi for start, end in windows)
+
+
+def search_windows(
+    start_jd: float,
+    end_jd: float,
+    constraints: Sequence[ElectionalConstraint],
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    min_duration_days: float = 0.0,
+) -> List[Interval]:
+    """
+    Time windows in [start_jd, end_jd] where every constraint holds.
+
+    Args:
+        start_jd, end_jd: Search range as Julian Days (UT)
+        constraints: Conditions that must all hold
+        latitude, longitude: Location of house and angle constraints
+        min_duration_days: Drop shorter windows
+
+    Returns:
+        Sorted, disjoint (start, end) Julian Day pairs
+    """
+    if end_jd <= start_jd:
+        raise ValueError("Search end is not after its start")
+    if end_jd - start_jd > MAX_SEARCH_DAYS:
+        raise ValueError(f"Search range is longer than {MAX_SEARCH_DAYS} days")
+    if not constraints:
+        raise ValueError("At least one constraint is required")
+
+    conditions = [_compile(c, start_jd, end_jd, latitude, longitude) for c in constraints]
+    # Exact intervals first, then from the coarsest sampling to the finest:
+    # the expensive fine conditions are only sampled inside open windows
+    conditions.sort(key=lambda c: (c.intervals is None, -c.step))
+
+    windows: List[Interval] = [(start_jd, end_jd)]
+    all_runs: List[List[_Run]] = []
+    for condition in conditions:
+        runs = []
+        for a, b in windows:
+            if condition.intervals is not None:
+                runs.extend(_clip_runs(condition.intervals, a, b))
+            else:
+                runs.extend(_sample_runs(condition.holds, a, b, condition.step))
+        all_runs.append(runs)
+        windows = [(run.start_lo, run.end_hi) for run in runs]
+        if not windows:
+            return []
+
+    found = [(start_jd, end_jd)]
+    for condition, runs in zip(conditions, all_runs):
+        refined = [_refine(condition, run) for run in runs if _overlaps(run, windows)]
+        found = _intersect(found, refined)
+    return [(start, end) for start, end in found if end - start >= min_duration_days]
@@ -0,0 +1,252 @@
+"""
+Fixed-star catalog index for conjunction lookups.
+
+swe.fixstar searches and parses the star file on every call. Here the
+catalog (Swiss Ephemeris `sefstars.txt` format) is parsed once into
+arrays of J2000 right ascension, declination, proper motion and
+magnitude. For an epoch, all stars are moved by proper motion, precessed
+(IAU 1976) to the mean equator of date, converted to ecliptic longitude
+and latitude and corrected for nutation in longitude, all in one NumPy
+pass, and the longitudes are kept sorted. Aberration (up to ~20") is
+ignored, which is far inside any conjunction orb.
+
+Positions are cached per epoch of EPOCH_DAYS (precession moves a star
+about 4" a month), and the conjunctions of any set of longitudes are
+binary searches on the sorted array.
+"""
+
+import math
+import os
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.sky_cache import LRUCache
+from src.models import ChartData, StarConjunction
+
+# Catalog loaded by default_catalog(), if set
+CATALOG_FILE_ENV = "FIXED_STAR_FILE"
+
+# Positions are recomputed every EPOCH_DAYS
+EPOCH_DAYS = 30.0
+EPOCH_ENTRIES = 256
+
+DEFAULT_ORB = 1.0
+
+J2000 = 2451545.0
+_ARCSEC = math.pi / (180.0 * 3600.0)
+
+# Equinoxes accepted in the catalog (positions are taken as J2000)
+_J2000_EQUINOXES = ("ICRS", "2000", "J2000")
+
+
+class StarPositions(NamedTuple):
+    """
+    Ecliptic positions of all stars at one epoch, sorted by longitude.
+
+    `padded` repeats the longitudes shifted by -360 and +360 so that a
+    window crossing 0° Aries is a single searchsorted range; index k of
+    `padded` is star `order[k % n]`.
+    """
+
+    longitudes: np.ndarray
+    latitudes: np.ndarray
+    order: np.ndarray
+    padded: np.ndarray
+
+
+def _sexagesimal(degrees: str, minutes: str, seconds: str) -> float:
+    sign = -1.0 if degrees.strip().startswith("-") else 1.0
+    return sign * (abs(float(degrees)) + float(minutes) / 60 + float(seconds) / 3600)
+
+
+def precess(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    jd: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Right ascension and declination (radians) precessed from J2000 to the equator of `jd`."""
+    t = (jd - J2000) / 36525
+    zeta = (2306.2181 * t + 0.30188 * t**2 + 0.017998 * t**3) * _ARCSEC
+    z = (2306.2181 * t + 1.09468 * t**2 + 0.018203 * t**3) * _ARCSEC
+    theta = (2004.3109 * t - 0.42665 * t**2 - 0.041833 * t**3) * _ARCSEC
+
+    a = np.cos(dec) * np.sin(ra + zeta)
+    b = math.cos(theta) * np.cos(dec) * np.cos(ra + zeta) - math.sin(theta) * np.sin(dec)
+    c = math.sin(theta) * np.cos(dec) * np.cos(ra + zeta) + math.cos(theta) * np.sin(dec)
+    return np.arctan2(a, b) + z, np.arcsin(np.clip(c, -1.0, 1.0))
+
+
+class StarCatalog:
+    """
+    Fixed stars as arrays, one entry per star.
+
+    Args:
+        names: Traditional names
+        nomenclature: Bayer/Flamsteed designations (e.g. "alLeo")
+        ra, dec: J2000 right ascension and declination in radians
+        pm_ra, pm_dec: Proper motion in radians per Julian year (RA
+            motion along the great circle, i.e. mu_alpha * cos(dec))
+        magnitudes: Visual magnitudes
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        nomenclature: Sequence[str],
+        ra: np.ndarray,
+        dec: np.ndarray,
+        pm_ra: np.ndarray,
+        pm_dec: np.ndarray,
+        magnitudes: np.ndarray,
+    ):
+        self.names = list(names)
+        self.nomenclature = list(nomenclature)
+        self.ra = np.asarray(ra, dtype=np.float64)
+        self.dec = np.asarray(dec, dtype=np.float64)
+        self.pm_ra = np.asarray(pm_ra, dtype=np.float64)
+        self.pm_dec = np.asarray(pm_dec, dtype=np.float64)
+        self.magnitudes = np.asarray(magnitudes, dtype=np.float32)
+        self._epochs = LRUCache(EPOCH_ENTRIES)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def load(cls, path: str) -> "StarCatalog":
+        """
+        Parse a catalog in `sefstars.txt` format.
+
+        Each line is: name, nomenclature, equinox, RA h, m, s, Dec d, m, s,
+        pm RA and pm Dec (0.001"/yr), radial velocity, parallax, magnitude,
+        DM zone, DM number. Comments (#) and blank lines are skipped, and
+        so are stars given for an equinox other than J2000/ICRS.
+        """
+        rows = []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                fields = [field.strip() for field in line.split(",")]
+                if len(fields) < 14:
+                    raise ValueError(f"Malformed star line: {line!r}")
+                if fields[2] not in _J2000_EQUINOXES:
+                    continue
+                rows.append(
+                    (
+                        fields[0],
+                        fields[1],
+                        math.radians(15 * _sexagesimal(*fields[3:6])),
+                        math.radians(_sexagesimal(*fields[6:9])),
+                        float(fields[9]) / 1000 * _ARCSEC,
+                        float(fields[10]) / 1000 * _ARCSEC,
+                        float(fields[13]),
+                    )
+                )
+        if not rows:
+            raise ValueError(f"No J2000 stars in {path}")
+        names, nomenclature, ra, dec, pm_ra, pm_dec, magnitudes = zip(*rows)
+        return cls(names, nomenclature, ra, dec, pm_ra, pm_dec, magnitudes)
+
+    def _compute_positions(self, jd: float) -> StarPositions:
+        years = (jd - J2000) / 365.25
+        dec = self.dec + self.pm_dec * years
+        ra = self.ra + self.pm_ra * years / np.cos(self.dec)
+        ra, dec = precess(ra, dec, jd)
+
+        nutation = swe.calc_ut(jd, swe.ECL_NUT)[0]
+        eps = math.radians(nutation[1])
+        lon = np.arctan2(np.sin(ra) * math.cos(eps) + np.tan(dec) * math.sin(eps), np.cos(ra))
+        lat = np.arcsin(np.sin(dec) * math.cos(eps) - np.cos(dec) * math.sin(eps) * np.sin(ra))
+        longitudes = (np.degrees(lon) + nutation[2]) % 360
+
+        order = np.argsort(longitudes, kind="stable")
+        longitudes = longitudes[order]
+        padded = np.concatenate([longitudes - 360, longitudes, longitudes + 360])
+        return StarPositions(longitudes, np.degrees(lat)[order], order, padded)
+
+    def positions(self, jd: float) -> StarPositions:
+        """Sorted positions at the epoch containing `jd` (cached)."""
+        epoch = round(jd / EPOCH_DAYS)
+        return self._epochs.get_or_compute(
+            epoch, lambda: self._compute_positions(epoch * EPOCH_DAYS)
+        )
+
+    def conjunctions(
+        self,
+        longitudes: Sequence[float],
+        jd: float,
+        orb: float = DEFAULT_ORB,
+        max_magnitude: Optional[float] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Stars within `orb` degrees of longitude of each given longitude.
+
+        Args:
+            longitudes: Ecliptic longitudes (0-360) to test
+            jd: Julian Day (UT) of the chart
+            orb: Maximum distance in longitude, below 180
+            max_magnitude: Skip stars fainter than this
+
+        Returns:
+            (longitude index, star index, signed distance star - longitude)
+            per hit, ordered by longitude index then distance
+        """
+        if not 0 < orb < 180:
+            raise ValueError("orb must be between 0 and 180")
+        positions = self.positions(jd)
+        count = len(positions.order)
+        targets = np.asarray(longitudes, dtype=np.float64) % 360
+        lows = np.searchsorted(positions.padded, targets - orb, "left")
+        highs = np.searchsorted(positions.padded, targets + orb, "right")
+
+        hits = []
+        for k, (low, high) in enumerate(zip(lows.tolist(), highs.tolist())):
+            found = []
+            for slot in range(low, high):
+                star = int(positions.order[slot % count])
+                if max_magnitude is not None and self.magnitudes[star] > max_magnitude:
+                    continue
+                found.append((k, star, float(positions.padded[slot] - targets[k])))
+            hits.extend(sorted(found, key=lambda hit: abs(hit[2])))
+        return hits
+
+
+def chart_conjunctions(
+    catalog: StarCatalog,
+    chart: ChartData,
+    jd: float,
+    orb: float = DEFAULT_ORB,
+    max_magnitude: Optional[float] = None,
+) -> List[StarConjunction]:
+    """Fixed-star conjunctions of every planet and point of a chart."""
+    bodies = [(planet.name, planet.longitude) for planet in chart.planets]
+    bodies += [(point.name, point.longitude) for point in chart.points]
+    return [
+        StarConjunction(
+            body=bodies[k][0],
+            star=catalog.names[star],
+            nomenclature=catalog.nomenclature[star],
+            star_longitude=round((bodies[k][1] + distance) % 360, 4),
+            orb=round(abs(distance), 4),
+            magnitude=float(catalog.magnitudes[star]),
+        )
+        for k, star, distance in catalog.conjunctions(
+            [lon for name, lon in bodies], jd, orb, max_magnitude
+        )
+    ]
+
+
+_default_catalog: Optional[StarCatalog] = None
+
+
+def default_catalog() -> Optional[StarCatalog]:
+    """The catalog of FIXED_STAR_FILE, loaded on first use."""
+    global _default_catalog
+    if _default_catalog is None:
+        path = os.environ.get(CATALOG_FILE_ENV)
+        if path and os.path.exists(path):
+            _default_catalog = StarCatalog.load(path)
+    return _default_catalog
@@ -0,0 +1,157 @@
+"""
+Harmonic charts and harmonic conjunction spectra, for one chart or a batch.
+
+The H-th harmonic chart multiplies every longitude by H (mod 360), so
+bodies an H-th of the circle apart (or a multiple of it) become conjunct.
+A chart's harmonic strength at H is the sum, over all body pairs, of a
+linear conjunction weight `max(0, 1 - separation / orb)` in the H-th
+harmonic chart; plotted over H it is the chart's harmonic spectrum.
+
+Instead of one aspect pass per harmonic, the pair differences are formed
+once (H·a - H·b = H·(a - b) mod 360) and every harmonic of every chart
+of a batch is weighted in one NumPy expression over a
+(charts × harmonics × pairs) array, in blocks of BLOCK_CHARTS charts to
+bound memory.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.core.calculations import PLANETS
+from src.core.relationship import Birth
+from src.core.sky_cache import house_positions, sky_positions
+from src.models import HarmonicData
+
+# Harmonics 1..MAX_HARMONIC are available
+MAX_HARMONIC = 180
+
+# Conjunction orb in the harmonic chart (the natal conjunction orb)
+DEFAULT_ORB = 8.0
+
+# Planets and the two independent angles (DSC and IC would only add a
+# constant conjunction to every even harmonic)
+HARMONIC_BODIES = tuple(PLANETS) + ("Ascendant", "Midheaven")
+
+# Charts per block of the (charts × harmonics × pairs) working array
+BLOCK_CHARTS = 256
+
+# Births per request that may include their harmonic charts (each adds
+# ~43 KB of JSON at the full 1-180 range)
+MAX_CHART_BIRTHS = 50
+
+
+def harmonic_range(harmonics: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Validated harmonic numbers (default: 1 through MAX_HARMONIC)."""
+    if harmonics is None:
+        return np.arange(1, MAX_HARMONIC + 1)
+    values = np.asarray(harmonics, dtype=np.int64)
+    if values.ndim != 1 or not len(values):
+        raise ValueError("at least one harmonic is required")
+    if values.min() < 1 or values.max() > MAX_HARMONIC:
+        raise ValueError(f"harmonics must be between 1 and {MAX_HARMONIC}")
+    return values
+
+
+def harmonic_charts(longitudes: np.ndarray, harmonics: Sequence[int]) -> np.ndarray:
+    """
+    Harmonic chart longitudes.
+
+    Args:
+        longitudes: (..., bodies) longitudes in degrees
+        harmonics: Harmonic numbers
+
+    Returns:
+        (..., harmonics, bodies) longitudes in [0, 360)
+    """
+    lon = np.asarray(longitudes, dtype=np.float64)
+    h = np.asarray(harmonics, dtype=np.float64)
+    return (lon[..., None, :] * h[:, None]) % 360.0
+
+
+def harmonic_strengths(
+    longitudes: np.ndarray,
+    harmonics: Sequence[int],
+    orb: float = DEFAULT_ORB,
+) -> np.ndarray:
+    """
+    Conjunction strength of each harmonic chart.
+
+    Args:
+        longitudes: (bodies,) longitudes of one chart or (charts, bodies)
+            of a batch
+        harmonics: Harmonic numbers
+        orb: Conjunction orb in the harmonic chart, below 180
+
+    Returns:
+        (harmonics,) or (charts, harmonics) sums of pair weights
+    """
+    if not 0 < orb < 180:
+        raise ValueError("orb must be between 0 and 180")
+    lon = np.asarray(longitudes, dtype=np.float64)
+    single = lon.ndim == 1
+    lon = np.atleast_2d(lon)
+    h = np.asarray(harmonics, dtype=np.float64)
+
+    first, second = np.triu_indices(lon.shape[1], 1)
+    differences = lon[:, first] - lon[:, second]
+    strengths = np.empty((len(lon), len(h)))
+    for start in range(0, len(lon), BLOCK_CHARTS):
+        block = differences[start : start + BLOCK_CHARTS]
+        separation = (block[:, None, :] * h[None, :, None]) % 360.0
+        separation = np.minimum(separation, 360.0 - separation)
+        weights = np.clip(1.0 - separation / orb, 0.0, None)
+        strengths[start : start + BLOCK_CHARTS] = weights.sum(axis=2)
+    return strengths[0] if single else strengths
+
+
+def birth_longitudes(birth: Birth) -> np.ndarray:
+    """Longitudes of HARMONIC_BODIES at a birth, from the cache tiers."""
+    jd, latitude, longitude = birth
+    cusps, asc_lon, mc_lon = house_positions(jd, latitude, longitude)
+    planets = [lon for name, lon, speed in sky_positions(jd)]
+    return np.array(planets + [asc_lon, mc_lon])
+
+
+def harmonic_spectra(
+    births: Sequence[Birth],
+    harmonics: Optional[Sequence[int]] = None,
+    orb: float = DEFAULT_ORB,
+    include_charts: bool = False,
+) -> List[HarmonicData]:
+    """
+    Harmonic spectrum (and optionally the harmonic charts) of each birth.
+
+    Args:
+        births: (Julian Day, latitude, longitude) per chart
+        harmonics: Harmonic numbers (default: 1 through MAX_HARMONIC)
+        orb: Conjunction orb in the harmonic chart
+        include_charts: Also return every harmonic chart's longitudes, for
+            at most MAX_CHART_BIRTHS births
+    """
+    if not births:
+        raise ValueError("at least one birth is required")
+    if include_charts and len(births) > MAX_CHART_BIRTHS:
+        raise ValueError(f"at most {MAX_CHART_BIRTHS} births per request with include_charts")
+    h = harmonic_range(harmonics)
+    longitudes = np.stack([birth_longitudes(birth) for birth in births])
+    strengths = harmonic_strengths(longitudes, h, orb)
+    charts = harmonic_charts(longitudes, h) if include_charts else None
+
+    results = []
+    for k in range(len(births)):
+        results.append(
+            HarmonicData(
+                harmonics=h.tolist(),
+                strengths=np.round(strengths[k], 6).tolist(),
+                charts=(
+                    None
+                    if charts is None
+                    else {
+                        name: charts[k, :, b].tolist()
+                        for b, name in enumerate(HARMONIC_BODIES)
+                    }
+                ),
+            )
+        )
+    return results
@@ -0,0 +1,390 @@
+"""
+Precomputed sign-ingress and retrograde-station index.
+
+For every body of `PLANETS` the index stores, over a fixed range of Julian
+Days, the sorted times of each sign ingress (with the sign entered) and of
+each station (with the direction after it). The first entry of both
+arrays is the range start itself, carrying the state at that moment, so
+
+    sign at t = ingress_signs[searchsorted(ingress_jds, t, "right") - 1]
+
+and the same for retrograde status: a lookup is two binary searches
+instead of an ephemeris call. `get_planet_signs` answers sign-only
+queries from the installed index where it covers the moment.
+
+Building samples each body at a step shorter than its shortest retrograde
+loop, finds stations as zeros of the speed, and finds ingresses inside
+the monotonic stretches between stations, refined to about a second. The
+index is saved as one compressed `.npz` file.
+"""
+
+import math
+import os
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import (
+    PLANETS,
+    ZODIAC_SIGNS,
+    _calculate_jd,
+    _degrees_to_zodiac_sign,
+)
+from src.models import EphemerisEvent, PlanetStatus
+
+# Sampling step in days per body; each is shorter than the body's shortest
+# retrograde period and moves it well under one sign
+SAMPLE_DAYS: Dict[str, float] = {
+    "Sun": 5.0,
+    "Moon": 1.0,
+    "Mercury": 2.0,
+    "Venus": 4.0,
+    "Mars": 5.0,
+    "Jupiter": 10.0,
+    "Saturn": 10.0,
+    "Uranus": 10.0,
+    "Neptune": 10.0,
+    "Pluto": 10.0,
+}
+
+# Event times are refined to about one second
+TIME_TOLERANCE_DAYS = 1.0 / 86400
+
+# Default range of the prebuilt index
+DEFAULT_START_YEAR = 1800
+DEFAULT_END_YEAR = 2200
+
+# Prebuilt index loaded by default_index(), if set
+INDEX_FILE_ENV = "INGRESS_INDEX_FILE"
+
+
+class BodyEvents(NamedTuple):
+    """Sorted event arrays of one body; index 0 is the range start."""
+
+    ingress_jds: np.ndarray
+    ingress_signs: np.ndarray
+    station_jds: np.ndarray
+    station_retrograde: np.ndarray
+
+
+class BodyState(NamedTuple):
+    """State of one body at a moment, answered from the index."""
+
+    sign: int
+    retrograde: bool
+    previous_ingress: Optional[Tuple[float, int]]
+    next_ingress: Optional[Tuple[float, int]]
+    previous_station: Optional[Tuple[float, bool]]
+    next_station: Optional[Tuple[float, bool]]
+
+
+def body_position(jd: float, body_id: int) -> Tuple[float, float]:
+    """(longitude, speed) of a body at a Julian Day."""
+    coords, ret_flag = swe.calc_ut(jd, body_id, swe.FLG_SPEED)
+    return coords[0] % 360, coords[3]
+
+
+def wrap_degrees(degrees: float) -> float:
+    """Angle folded into [-180, 180)."""
+    return (degrees + 180.0) % 360.0 - 180.0
+
+
+def refine_root(f: Callable[[float], float], a: float, b: float, fa: float, fb: float) -> float:
+    """
+    Root of `f` in [a, b], where fa and fb have opposite signs.
+
+    Regula falsi with the Illinois modification: a few evaluations for the
+    smooth functions used here, and never leaves the bracket.
+    """
+    side = 0
+    while b - a > TIME_TOLERANCE_DAYS:
+        t = (a * fb - b * fa) / (fb - fa)
+        if not a < t < b:
+            t = 0.5 * (a + b)
+        ft = f(t)
+        if ft == 0.0:
+            return t
+        if (ft > 0) == (fb > 0):
+            b, fb = t, ft
+            if side == -1:
+                fa *= 0.5
+            side = -1
+        else:
+            a, fa = t, ft
+            if side == 1:
+                fb *= 0.5
+            side = 1
+    return 0.5 * (a + b)
+
+
+def _monotonic_ingresses(
+    body_id: int,
+    a: float,
+    b: float,
+    lon_a: float,
+    lon_b: float,
+) -> List[Tuple[float, int]]:
+    """(time, sign entered) for the ingresses of a stretch without a station."""
+    delta = wrap_degrees(lon_b - lon_a)
+    found = []
+    if delta > 0:
+        # Boundaries in (lon_a, lon_a + delta]
+        first = math.floor(lon_a / 30.0) + 1
+        last = math.floor((lon_a + delta) / 30.0)
+        boundaries = range(first, last + 1)
+    else:
+        # Boundaries in [lon_a + delta, lon_a), crossed backwards
+        first = math.ceil(lon_a / 30.0) - 1
+        last = math.ceil((lon_a + delta) / 30.0)
+        boundaries = range(first, last - 1, -1)
+
+    for k in boundaries:
+        boundary = 30.0 * k
+        fa = wrap_degrees(lon_a - boundary)
+        fb = wrap_degrees(lon_b - boundary)
+        if fb == 0.0:
+            t = b
+        elif fa == 0.0:
+            t = a
+        else:
+            t = refine_root(
+                lambda t: wrap_degrees(body_position(t, body_id)[0] - boundary), a, b, fa, fb
+            )
+        # Every boundary lies inside the monotonic stretch, so [a, b]
+        # brackets each of them
+        found.append((t, k % 12 if delta > 0 else (k - 1) % 12))
+    return found
+
+
+def body_events(name: str, start_jd: float, end_jd: float) -> BodyEvents:
+    """Scan one body over [start_jd, end_jd]."""
+    body_id = PLANETS[name]
+    step = SAMPLE_DAYS.get(name, 1.0)
+
+    lon, speed = body_position(start_jd, body_id)
+    ingress_jds, ingress_signs = [start_jd], [int(lon // 30) % 12]
+    station_jds, station_retro = [start_jd], [speed < 0]
+
+    a, lon_a, speed_a = start_jd, lon, speed
+    while a < end_jd:
+        b = min(a + step, end_jd)
+        lon_b, speed_b = body_position(b, body_id)
+        pieces = [(a, b, lon_a, lon_b)]
+        if (speed_a < 0) != (speed_b < 0):
+            t = refine_root(lambda t: body_position(t, body_id)[1], a, b, speed_a, speed_b)
+            lon_t = body_position(t, body_id)[0]
+            station_jds.append(t)
+            station_retro.append(speed_b < 0)
+            pieces = [(a, t, lon_a, lon_t), (t, b, lon_t, lon_b)]
+        for p, q, lon_p, lon_q in pieces:
+            for t, sign in _monotonic_ingresses(body_id, p, q, lon_p, lon_q):
+                ingress_jds.append(t)
+                ingress_signs.append(sign)
+        a, lon_a, speed_a = b, lon_b, speed_b
+
+    return BodyEvents(
+        np.asarray(ingress_jds, dtype=np.float64),
+        np.asarray(ingress_signs, dtype=np.int8),
+        np.asarray(station_jds, dtype=np.float64),
+        np.asarray(station_retro, dtype=np.bool_),
+    )
+
+
+class IngressIndex:
+    """
+    Sign ingresses and stations of the planets over a range of Julian Days.
+
+    Args:
+        start_jd: First Julian Day (UT) covered
+        end_jd: Last Julian Day (UT) covered
+        events: Event arrays per body name
+    """
+
+    def __init__(self, start_jd: float, end_jd: float, events: Dict[str, BodyEvents]):
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.events = events
+
+    @classmethod
+    def build(
+        cls,
+        start_jd: float,
+        end_jd: float,
+        bodies: Optional[List[str]] = None,
+    ) -> "IngressIndex":
+        """Compute the index from the ephemeris."""
+        if end_jd <= start_jd:
+            raise ValueError("end_jd must be after start_jd")
+        names = bodies or list(PLANETS)
+        return cls(start_jd, end_jd, {name: body_events(name, start_jd, end_jd) for name in names})
+
+    @classmethod
+    def build_years(cls, start_year: int, end_year: int) -> "IngressIndex":
+        """Compute the index from 1 January of `start_year` to that of `end_year`."""
+        return cls.build(swe.julday(start_year, 1, 1, 0.0), swe.julday(end_year, 1, 1, 0.0))
+
+    def save(self, path: str) -> None:
+        """Write the index as one compressed .npz file."""
+        arrays: Dict[str, np.ndarray] = {
+            "range": np.array([self.start_jd, self.end_jd]),
+            "bodies": np.array(list(self.events)),
+        }
+        for name, events in self.events.items():
+            for field, values in zip(BodyEvents._fields, events):
+                arrays[f"{name}/{field}"] = values
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "IngressIndex":
+        """Read an index written by save()."""
+        with np.load(path) as data:
+            start_jd, end_jd = (float(v) for v in data["range"])
+            events = {
+                str(name): BodyEvents(*(data[f"{name}/{field}"] for field in BodyEvents._fields))
+                for name in data["bodies"]
+            }
+        return cls(start_jd, end_jd, events)
+
+    @property
+    def bodies(self) -> List[str]:
+        return list(self.events)
+
+    def event_count(self) -> int:
+        """Number of ingresses and stations stored (range starts excluded)."""
+        return sum(
+            len(events.ingress_jds) + len(events.station_jds) - 2
+            for events in self.events.values()
+        )
+
+    def covers(self, jd: float) -> bool:
+        return self.start_jd <= jd <= self.end_jd
+
+    def _body(self, body: str, jd: float) -> BodyEvents:
+        if not self.covers(jd):
+            raise ValueError(f"Julian Day {jd} is outside the indexed range")
+        if body not in self.events:
+            raise ValueError(f"Body not indexed: {body}")
+        return self.events[body]
+
+    def sign(self, body: str, jd: float) -> int:
+        """Sign index (0 = Aries) of `body` at `jd`."""
+        events = self._body(body, jd)
+        return int(events.ingress_signs[np.searchsorted(events.ingress_jds, jd, "right") - 1])
+
+    def sign_name(self, body: str, jd: float) -> str:
+        return ZODIAC_SIGNS[self.sign(body, jd)]
+
+    def is_retrograde(self, body: str, jd: float) -> bool:
+        events = self._body(body, jd)
+        k = np.searchsorted(events.station_jds, jd, "right") - 1
+        return bool(events.station_retrograde[k])
+
+    def state(self, body: str, jd: float) -> BodyState:
+        """Sign, retrograde status and surrounding ingresses and stations."""
+        events = self._body(body, jd)
+        i = int(np.searchsorted(events.ingress_jds, jd, "right")) - 1
+        s = int(np.searchsorted(events.station_jds, jd, "right")) - 1
+
+        def ingress(k: int) -> Optional[Tuple[float, int]]:
+            # Entry 0 is the range start, not an event
+            if 0 < k < len(events.ingress_jds):
+                return float(events.ingress_jds[k]), int(events.ingress_signs[k])
+            return None
+
+        def station(k: int) -> Optional[Tuple[float, bool]]:
+            if 0 < k < len(events.station_jds):
+                return float(events.station_jds[k]), bool(events.station_retrograde[k])
+            return None
+
+        return BodyState(
+            sign=int(events.ingress_signs[i]),
+            retrograde=bool(events.station_retrograde[s]),
+            previous_ingress=ingress(i),
+            next_ingress=ingress(i + 1),
+            previous_station=station(s),
+            next_station=station(s + 1),
+        )
+
+
+def jd_to_iso(jd: float) -> str:
+    """Julian Day (UT) as an ISO 8601 UTC timestamp, to the second."""
+    year, month, day, hours = swe.revjul(jd)
+    seconds = int(round(hours * 3600))
+    if seconds >= 86400:
+        year, month, day, _ = swe.revjul(math.floor(jd - 0.5) + 1.5)
+        seconds -= 86400
+    return (
+        f"{year:04d}-{month:02d}-{day:02d}T"
+        f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}Z"
+    )
+
+
+def planet_status(index: IngressIndex, body: str, jd: float) -> PlanetStatus:
+    """API model of a body's state at `jd`, answered from the index."""
+    state = index.state(body, jd)
+
+    def event(found: Optional[Tuple[float, object]]) -> Optional[EphemerisEvent]:
+        if found is None:
+            return None
+        t = found[0]
+        return EphemerisEvent(
+            time=jd_to_iso(t),
+            sign=index.sign_name(body, t),
+            retrograde=index.is_retrograde(body, t),
+        )
+
+    return PlanetStatus(
+        name=body,
+        sign=ZODIAC_SIGNS[state.sign],
+        retrograde=state.retrograde,
+        previous_ingress=event(state.previous_ingress),
+        next_ingress=event(state.next_ingress),
+        previous_station=event(state.previous_station),
+        next_station=event(state.next_station),
+    )
+
+
+_default_index: Optional[IngressIndex] = None
+
+
+def set_default_index(index: Optional[IngressIndex]) -> None:
+    """Install (or with None, remove) the index used by fast-path lookups."""
+    global _default_index
+    _default_index = index
+
+
+def default_index() -> Optional[IngressIndex]:
+    """The installed index, loading INGRESS_INDEX_FILE on first use."""
+    global _default_index
+    if _default_index is None:
+        path = os.environ.get(INDEX_FILE_ENV)
+        if path and os.path.exists(path):
+            _default_index = IngressIndex.load(path)
+    return _default_index
+
+
+def get_planet_signs(date_str: str, time_str: str) -> Dict[str, str]:
+    """
+    Sign of each planet at a moment (UT), without degrees and minutes.
+
+    Read from the installed index when it covers the moment, otherwise
+    computed with calc_ut.
+
+    Returns:
+        Planet name -> sign name
+    """
+    jd = _calculate_jd(date_str, time_str)
+    index = default_index()
+    signs = {}
+    for planet_name, planet_id in PLANETS.items():
+        if index is not None and index.covers(jd) and planet_name in index.events:
+            signs[planet_name] = index.sign_name(planet_name, jd)
+        else:
+            coords, ret_flag = swe.calc_ut(jd, planet_id)
+            signs[planet_name] = _degrees_to_zodiac_sign(coords[0] % 360)
+    return signs
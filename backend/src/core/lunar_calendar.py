@@ -0,0 +1,421 @@
+"""
+Precomputed lunar calendar: phases, void-of-course Moon and eclipses.
+
+The tables are generated offline over a range of years and saved as one
+compressed `.npz` file of sorted columns. A range query is a pair of
+binary searches per table, so serving a month takes microseconds.
+
+- Phases: moments when the Moon–Sun elongation is 0°, 90°, 180° or 270°.
+- Void of course: from the Moon's last exact major aspect (conjunction,
+  sextile, square, trine, opposition) to a planet before it leaves a sign,
+  until its next sign ingress. The ingresses come from the ingress scan.
+- Eclipses: Swiss Ephemeris global solar and lunar eclipse searches, with
+  the first and last contact of each.
+
+All times are Julian Days (UT) in the tables and ISO 8601 UTC in the API.
+"""
+
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import MAJOR_ASPECTS, PLANETS, ZODIAC_SIGNS
+from src.core.ingress import body_events, jd_to_iso, refine_root, wrap_degrees
+from src.models import Eclipse, LunarCalendarData, LunarPhase, VoidOfCourse
+
+PHASE_NAMES = ("New Moon", "First Quarter", "Full Moon", "Last Quarter")
+ECLIPSE_KINDS = ("Solar", "Lunar")
+
+# Eclipse type flags, most specific first
+ECLIPSE_TYPES: Tuple[Tuple[int, str], ...] = (
+    (swe.ECL_ANNULAR_TOTAL, "Hybrid"),
+    (swe.ECL_TOTAL, "Total"),
+    (swe.ECL_ANNULAR, "Annular"),
+    (swe.ECL_PARTIAL, "Partial"),
+    (swe.ECL_PENUMBRAL, "Penumbral"),
+)
+ECLIPSE_TYPE_NAMES = tuple(name for _, name in ECLIPSE_TYPES)
+
+# Planets the Moon can aspect, and the Moon–planet elongations of the
+# major aspects (both sides of the opposition)
+ASPECTED_PLANETS: Tuple[str, ...] = tuple(name for name in PLANETS if name != "Moon")
+VOID_ELONGATIONS: Tuple[Tuple[float, int], ...] = tuple(
+    sorted({(float(angle), angle) for angle in MAJOR_ASPECTS} | {
+        (360.0 - angle, angle) for angle in MAJOR_ASPECTS if 0 < angle < 180
+    })
+)
+
+# Days between elongation samples; the Moon gains at most ~15° a day
+PHASE_SAMPLE_DAYS = 1.0
+
+# Aspect candidates whose linear estimate is this close to the latest one
+# are refined exactly
+VOID_CANDIDATE_DAYS = 0.25
+
+DEFAULT_START_YEAR = 1900
+DEFAULT_END_YEAR = 2100
+
+# Prebuilt calendar loaded by default_calendar(), if set
+CALENDAR_FILE_ENV = "LUNAR_CALENDAR_FILE"
+
+NO_PLANET = -1
+
+
+class PhaseTable(NamedTuple):
+    jds: np.ndarray
+    phases: np.ndarray
+    signs: np.ndarray
+
+
+class VoidTable(NamedTuple):
+    starts: np.ndarray
+    ends: np.ndarray
+    planets: np.ndarray
+    aspects: np.ndarray
+    signs: np.ndarray
+
+
+class EclipseTable(NamedTuple):
+    jds: np.ndarray
+    begins: np.ndarray
+    ends: np.ndarray
+    kinds: np.ndarray
+    types: np.ndarray
+
+
+def _longitude(jd: float, body_id: int) -> float:
+    coords, ret_flag = swe.calc_ut(jd, body_id)
+    return coords[0] % 360
+
+
+def _elongation(jd: float, body_id: int) -> float:
+    """Moon minus body longitude, 0-360."""
+    return (_longitude(jd, swe.MOON) - _longitude(jd, body_id)) % 360
+
+
+def _sign(jd: float) -> int:
+    return int(_longitude(jd, swe.MOON) // 30) % 12
+
+
+def build_phases(start_jd: float, end_jd: float) -> PhaseTable:
+    """Exact quarter phases in [start_jd, end_jd)."""
+    jds: List[float] = []
+    phases: List[int] = []
+    a, e_a = start_jd, _elongation(start_jd, swe.SUN)
+    while a < end_jd:
+        b = min(a + PHASE_SAMPLE_DAYS, end_jd)
+        e_b = _elongation(b, swe.SUN)
+        gained = (e_b - e_a) % 360
+        # Quarter boundaries in (e_a, e_a + gained]
+        for quarter in range(int(e_a // 90) + 1, int((e_a + gained) // 90) + 1):
+            target = 90.0 * quarter
+            fa, fb = wrap_degrees(e_a - target), wrap_degrees(e_b - target)
+            if fb == 0.0:
+                t = b
+            else:
+                t = refine_root(
+                    lambda t: wrap_degrees(_elongation(t, swe.SUN) - target), a, b, fa, fb
+                )
+            if t < end_jd:
+                jds.append(t)
+                phases.append(quarter % 4)
+        a, e_a = b, e_b
+    return PhaseTable(
+        np.asarray(jds, dtype=np.float64),
+        np.asarray(phases, dtype=np.int8),
+        np.asarray([_sign(t) for t in jds], dtype=np.int8),
+    )
+
+
+def _last_aspect(
+    t0: float,
+    t1: float,
+    start: Dict[str, float],
+    end: Dict[str, float],
+) -> Tuple[float, int, int]:
+    """
+    Last exact Moon aspect in [t0, t1], as (time, planet index, angle).
+
+    `start` and `end` hold the Moon–planet elongations at t0 and t1. The
+    Moon outruns every planet, so each elongation grows monotonically;
+    crossings are first placed by linear interpolation, and only the
+    latest candidates are refined.
+    """
+    candidates = []
+    for p, name in enumerate(ASPECTED_PLANETS):
+        e0 = start[name]
+        gained = (end[name] - e0) % 360
+        for elongation, angle in VOID_ELONGATIONS:
+            d = (elongation - e0) % 360
+            if 0 < d <= gained:
+                candidates.append((t0 + (t1 - t0) * d / gained, p, elongation, angle))
+    if not candidates:
+        return t0, NO_PLANET, -1
+
+    latest = max(c[0] for c in candidates)
+    best = (t0, NO_PLANET, -1)
+    for estimate, p, elongation, angle in candidates:
+        if estimate < latest - VOID_CANDIDATE_DAYS:
+            continue
+        body_id = PLANETS[ASPECTED_PLANETS[p]]
+        fa = wrap_degrees(start[ASPECTED_PLANETS[p]] - elongation)
+        fb = wrap_degrees(end[ASPECTED_PLANETS[p]] - elongation)
+        if fb == 0.0:
+            t = t1
+        else:
+            t = refine_root(
+                lambda t: wrap_degrees(_elongation(t, body_id) - elongation), t0, t1, fa, fb
+            )
+        if t > best[0] or best[1] == NO_PLANET:
+            best = (t, p, angle)
+    return best
+
+
+def build_voids(start_jd: float, end_jd: float) -> VoidTable:
+    """Void-of-course periods ending in (start_jd, end_jd]."""
+    # Start early enough to see the aspects of the sign in progress
+    moon = body_events("Moon", start_jd - 3.0, end_jd)
+    ingresses = moon.ingress_jds[1:]
+    signs = moon.ingress_signs[1:]
+
+    def elongations(t: float) -> Dict[str, float]:
+        moon_lon = _longitude(t, swe.MOON)
+        return {
+            name: (moon_lon - _longitude(t, PLANETS[name])) % 360 for name in ASPECTED_PLANETS
+        }
+
+    rows = []
+    t0, e0 = float(moon.ingress_jds[0]), elongations(float(moon.ingress_jds[0]))
+    for t1, sign in zip(ingresses.tolist(), signs.tolist()):
+        e1 = elongations(t1)
+        if t1 > start_jd:
+            t, planet, angle = _last_aspect(t0, t1, e0, e1)
+            rows.append((t, t1, planet, angle, sign))
+        t0, e0 = t1, e1
+
+    columns = list(zip(*rows)) or [[], [], [], [], []]
+    return VoidTable(
+        np.asarray(columns[0], dtype=np.float64),
+        np.asarray(columns[1], dtype=np.float64),
+        np.asarray(columns[2], dtype=np.int8),
+        np.asarray(columns[3], dtype=np.int16),
+        np.asarray(columns[4], dtype=np.int8),
+    )
+
+
+def _eclipse_type(flags: int) -> int:
+    for code, (flag, _) in enumerate(ECLIPSE_TYPES):
+        if flags & flag:
+            return code
+    raise ValueError(f"Unknown eclipse type flags: {flags}")
+
+
+def build_eclipses(start_jd: float, end_jd: float) -> EclipseTable:
+    """Solar and lunar eclipses whose maximum falls in [start_jd, end_jd)."""
+    rows = []
+    for kind in range(len(ECLIPSE_KINDS)):
+        t = start_jd
+        while True:
+            if kind == 0:
+                flags, tret = swe.sol_eclipse_when_glob(t, swe.FLG_SWIEPH, 0)
+                begin, end = tret[2], tret[3]
+            else:
+                flags, tret = swe.lun_eclipse_when(t, swe.FLG_SWIEPH, 0)
+                begin, end = tret[6], tret[7]
+            if tret[0] >= end_jd:
+                break
+            rows.append((tret[0], begin, end, kind, _eclipse_type(flags)))
+            t = tret[0] + 1.0
+    rows.sort()
+
+    columns = list(zip(*rows)) or [[], [], [], [], []]
+    return EclipseTable(
+        np.asarray(columns[0], dtype=np.float64),
+        np.asarray(columns[1], dtype=np.float64),
+        np.asarray(columns[2], dtype=np.float64),
+        np.asarray(columns[3], dtype=np.int8),
+        np.asarray(columns[4], dtype=np.int8),
+    )
+
+
+class LunarCalendar:
+    """
+    Lunar phase, void-of-course and eclipse tables over a range of Julian Days.
+
+    Args:
+        start_jd: First Julian Day (UT) covered
+        end_jd: End of the covered range (UT)
+        phases: Quarter phases, sorted by time
+        voids: Void-of-course periods, sorted by start
+        eclipses: Eclipses, sorted by maximum
+    """
+
+    def __init__(
+        self,
+        start_jd: float,
+        end_jd: float,
+        phases: PhaseTable,
+        voids: VoidTable,
+        eclipses: EclipseTable,
+    ):
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.phases = phases
+        self.voids = voids
+        self.eclipses = eclipses
+
+    @classmethod
+    def build(cls, start_jd: float, end_jd: float) -> "LunarCalendar":
+        """Compute all tables from the ephemeris."""
+        if end_jd <= start_jd:
+            raise ValueError("end_jd must be after start_jd")
+        return cls(
+            start_jd,
+            end_jd,
+            build_phases(start_jd, end_jd),
+            build_voids(start_jd, end_jd),
+            build_eclipses(start_jd, end_jd),
+        )
+
+    @classmethod
+    def build_years(cls, start_year: int, end_year: int) -> "LunarCalendar":
+        """Compute the tables from 1 January of `start_year` to that of `end_year`."""
+        return cls.build(swe.julday(start_year, 1, 1, 0.0), swe.julday(end_year, 1, 1, 0.0))
+
+    def save(self, path: str) -> None:
+        """Write all tables as one compressed .npz file."""
+        arrays: Dict[str, np.ndarray] = {"range": np.array([self.start_jd, self.end_jd])}
+        for table_name, table in (
+            ("phases", self.phases),
+            ("voids", self.voids),
+            ("eclipses", self.eclipses),
+        ):
+            for field, values in zip(table._fields, table):
+                arrays[f"{table_name}/{field}"] = values
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "LunarCalendar":
+        """Read tables written by save()."""
+        with np.load(path) as data:
+            start_jd, end_jd = (float(v) for v in data["range"])
+            tables = [
+                table(*(data[f"{name}/{field}"] for field in table._fields))
+                for name, table in (
+                    ("phases", PhaseTable),
+                    ("voids", VoidTable),
+                    ("eclipses", EclipseTable),
+                )
+            ]
+        return cls(start_jd, end_jd, *tables)
+
+    def event_counts(self) -> Dict[str, int]:
+        return {
+            "phases": len(self.phases.jds),
+            "void_of_course": len(self.voids.starts),
+            "eclipses": len(self.eclipses.jds),
+        }
+
+    def _check_range(self, start_jd: float, end_jd: float) -> None:
+        if end_jd < start_jd:
+            raise ValueError("Range end is before its start")
+        if start_jd < self.start_jd or end_jd > self.end_jd:
+            raise ValueError("Range is outside the precomputed calendar")
+
+    def phase_rows(self, start_jd: float, end_jd: float) -> slice:
+        """Rows of `phases` with start_jd <= time < end_jd."""
+        self._check_range(start_jd, end_jd)
+        jds = self.phases.jds
+        return slice(
+            int(np.searchsorted(jds, start_jd, "left")),
+            int(np.searchsorted(jds, end_jd, "left")),
+        )
+
+    def void_rows(self, start_jd: float, end_jd: float) -> slice:
+        """Rows of `voids` overlapping [start_jd, end_jd)."""
+        self._check_range(start_jd, end_jd)
+        # Periods do not overlap, so both columns are sorted
+        return slice(
+            int(np.searchsorted(self.voids.ends, start_jd, "right")),
+            int(np.searchsorted(self.voids.starts, end_jd, "left")),
+        )
+
+    def eclipse_rows(self, start_jd: float, end_jd: float) -> slice:
+        """Rows of `eclipses` overlapping [start_jd, end_jd)."""
+        self._check_range(start_jd, end_jd)
+        eclipses = self.eclipses
+        # Eclipses last hours and are weeks apart, so ends are sorted too
+        return slice(
+            int(np.searchsorted(eclipses.ends, start_jd, "right")),
+            int(np.searchsorted(eclipses.begins, end_jd, "left")),
+        )
+
+    def between(self, start_jd: float, end_jd: float) -> LunarCalendarData:
+        """All events of [start_jd, end_jd) as API models."""
+        phases, voids, eclipses = self.phases, self.voids, self.eclipses
+        p = self.phase_rows(start_jd, end_jd)
+        v = self.void_rows(start_jd, end_jd)
+        e = self.eclipse_rows(start_jd, end_jd)
+        return LunarCalendarData(
+            phases=[
+                LunarPhase(
+                    time=jd_to_iso(jd),
+                    phase=PHASE_NAMES[phase],
+                    sign=ZODIAC_SIGNS[sign],
+                )
+                for jd, phase, sign in zip(
+                    phases.jds[p].tolist(), phases.phases[p].tolist(), phases.signs[p].tolist()
+                )
+            ],
+            void_of_course=[
+                VoidOfCourse(
+                    start=jd_to_iso(start),
+                    end=jd_to_iso(end),
+                    planet=ASPECTED_PLANETS[planet] if planet != NO_PLANET else None,
+                    aspect=MAJOR_ASPECTS[angle][0] if planet != NO_PLANET else None,
+                    sign=ZODIAC_SIGNS[sign],
+                )
+                for start, end, planet, angle, sign in zip(
+                    voids.starts[v].tolist(),
+                    voids.ends[v].tolist(),
+                    voids.planets[v].tolist(),
+                    voids.aspects[v].tolist(),
+                    voids.signs[v].tolist(),
+                )
+            ],
+            eclipses=[
+                Eclipse(
+                    time=jd_to_iso(jd),
+                    begin=jd_to_iso(begin),
+                    end=jd_to_iso(end),
+                    kind=ECLIPSE_KINDS[kind],
+                    type=ECLIPSE_TYPE_NAMES[type_code],
+                )
+                for jd, begin, end, kind, type_code in zip(
+                    eclipses.jds[e].tolist(),
+                    eclipses.begins[e].tolist(),
+                    eclipses.ends[e].tolist(),
+                    eclipses.kinds[e].tolist(),
+                    eclipses.types[e].tolist(),
+                )
+            ],
+        )
+
+
+_default_calendar: Optional[LunarCalendar] = None
+
+
+def default_calendar() -> Optional[LunarCalendar]:
+    """The prebuilt calendar of LUNAR_CALENDAR_FILE, loaded on first use."""
+    global _default_calendar
+    if _default_calendar is None:
+        path = os.environ.get(CALENDAR_FILE_ENV)
+        if path and os.path.exists(path):
+            _default_calendar = LunarCalendar.load(path)
+    return _default_calendar
@@ -0,0 +1,216 @@
+"""
+Aspect-pattern detection on an aspect graph.
+
+The aspect list is turned into one adjacency bitset per body and aspect
+type (bit j of `adjacency["Trine"][i]` is set when i and j are in trine).
+Patterns are then motifs on that graph, found by intersecting neighbour
+sets instead of enumerating all 3- and 4-body combinations:
+
+- Grand Trine: triangle of trines
+- T-Square: opposition whose ends are both squared by an apex
+- Grand Cross: two oppositions squaring each other (its four T-Squares are
+  not reported separately)
+- Yod: sextile whose ends are both quincunx to an apex
+- Kite: Grand Trine plus a body opposing one corner (the apex) and
+  sextile to the other two
+- Stellium: maximal clique of 3+ mutually conjunct bodies (Bron–Kerbosch)
+
+The cost is driven by the number of aspects and patterns, not by the
+number of body combinations.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from src.core.aspects import find_aspects
+from src.core.calculations import MINOR_ASPECTS
+from src.models import AspectPattern, ChartData
+
+PATTERN_TYPES = ("Stellium", "Grand Trine", "Grand Cross", "T-Square", "Kite", "Yod")
+PATTERN_CODES = {name: code for code, name in enumerate(PATTERN_TYPES)}
+
+# Aspect types the detector uses
+GRAPH_ASPECTS = ("Conjunction", "Sextile", "Square", "Trine", "Opposition", "Quincunx")
+
+# Points that only mirror another body (ASC, MC, North Node) by 180°; they
+# would repeat every pattern of their mirror, so they are left out
+MIRROR_BODIES = frozenset(("Descendant", "Imum Coeli", "South Node"))
+
+MIN_STELLIUM = 3
+
+# (pattern code, body indices, apex index or -1)
+PatternInstance = Tuple[int, Tuple[int, ...], int]
+
+
+def _bits(mask: int) -> Iterator[int]:
+    """Indices of the set bits of `mask`, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _above(i: int) -> int:
+    """Mask of all indices greater than i."""
+    return -1 << (i + 1)
+
+
+class AspectGraph:
+    """
+    Adjacency bitsets per aspect type.
+
+    Args:
+        names: Body name per index
+        edges: (index1, index2, aspect type name) per aspect
+    """
+
+    __slots__ = ("names", "adjacency")
+
+    def __init__(self, names: Sequence[str], edges: Iterable[Tuple[int, int, str]]):
+        self.names = list(names)
+        self.adjacency: Dict[str, List[int]] = {
+            aspect: [0] * len(self.names) for aspect in GRAPH_ASPECTS
+        }
+        mirrors = {i for i, name in enumerate(self.names) if name in MIRROR_BODIES}
+        for i, j, aspect in edges:
+            rows = self.adjacency.get(aspect)
+            if rows is None or i == j or i in mirrors or j in mirrors:
+                continue
+            rows[i] |= 1 << j
+            rows[j] |= 1 << i
+
+    def edges(self, aspect: str) -> Iterator[Tuple[int, int]]:
+        """Each (i, j) with i < j joined by `aspect`."""
+        for i, mask in enumerate(self.adjacency[aspect]):
+            for j in _bits(mask & _above(i)):
+                yield i, j
+
+
+def _stelliums(conjunct: List[int], min_size: int) -> List[Tuple[int, ...]]:
+    """Maximal cliques of at least `min_size` in the conjunction graph."""
+    found: List[Tuple[int, ...]] = []
+
+    def expand(clique: int, candidates: int, excluded: int) -> None:
+        if not candidates and not excluded:
+            if bin(clique).count("1") >= min_size:
+                found.append(tuple(_bits(clique)))
+            return
+        # Pivot on the vertex covering most candidates to prune branches
+        pivot = max(
+            _bits(candidates | excluded),
+            key=lambda v: bin(candidates & conjunct[v]).count("1"),
+        )
+        for v in _bits(candidates & ~conjunct[pivot]):
+            expand(clique | (1 << v), candidates & conjunct[v], excluded & conjunct[v])
+            candidates &= ~(1 << v)
+            excluded |= 1 << v
+
+    everyone = 0
+    for i, mask in enumerate(conjunct):
+        if mask:
+            everyone |= 1 << i
+    expand(0, everyone, 0)
+    return sorted(found)
+
+
+def find_patterns(graph: AspectGraph, min_stellium: int = MIN_STELLIUM) -> List[PatternInstance]:
+    """
+    All aspect patterns of a graph.
+
+    Returns:
+        (pattern code, body indices, apex index or -1), ordered by pattern
+        type then bodies
+    """
+    conj = graph.adjacency["Conjunction"]
+    sextile = graph.adjacency["Sextile"]
+    square = graph.adjacency["Square"]
+    trine = graph.adjacency["Trine"]
+    opposition = graph.adjacency["Opposition"]
+    quincunx = graph.adjacency["Quincunx"]
+
+    found: List[PatternInstance] = []
+
+    for bodies in _stelliums(conj, min_stellium):
+        found.append((PATTERN_CODES["Stellium"], bodies, -1))
+
+    grand_trines = []
+    for a, b in graph.edges("Trine"):
+        for c in _bits(trine[a] & trine[b] & _above(b)):
+            grand_trines.append((a, b, c))
+            found.append((PATTERN_CODES["Grand Trine"], (a, b, c), -1))
+
+    crosses = set()
+    for a, b in graph.edges("Opposition"):
+        both = square[a] & square[b]
+        for c in _bits(both & _above(a)):
+            for d in _bits(opposition[c] & both & _above(c)):
+                crosses.add((a, b, c, d))
+    for cross in sorted(crosses):
+        found.append((PATTERN_CODES["Grand Cross"], tuple(sorted(cross)), -1))
+
+    # Each cross (a, b, c, d) contains four T-Squares
+    in_cross = set()
+    for a, b, c, d in crosses:
+        in_cross.update(((a, b, c), (a, b, d), (c, d, a), (c, d, b)))
+    for a, b in graph.edges("Opposition"):
+        for c in _bits(square[a] & square[b]):
+            if (a, b, c) in in_cross:
+                continue
+            found.append((PATTERN_CODES["T-Square"], tuple(sorted((a, b, c))), c))
+
+    for corners in grand_trines:
+        for apex in corners:
+            y, z = (v for v in corners if v != apex)
+            for d in _bits(opposition[apex] & sextile[y] & sextile[z]):
+                found.append((PATTERN_CODES["Kite"], tuple(sorted((*corners, d))), apex))
+
+    for a, b in graph.edges("Sextile"):
+        for c in _bits(quincunx[a] & quincunx[b]):
+            found.append((PATTERN_CODES["Yod"], tuple(sorted((a, b, c))), c))
+
+    found.sort()
+    return found
+
+
+def pattern_models(
+    names: Sequence[str],
+    instances: Iterable[PatternInstance],
+) -> List[AspectPattern]:
+    """Convert pattern instances to API models."""
+    return [
+        AspectPattern(
+            type=PATTERN_TYPES[code],
+            bodies=[names[i] for i in bodies],
+            apex=names[apex] if apex >= 0 else None,
+        )
+        for code, bodies, apex in instances
+    ]
+
+
+def detect_patterns(chart: ChartData, min_stellium: int = MIN_STELLIUM) -> List[AspectPattern]:
+    """
+    Aspect patterns of a computed chart.
+
+    Uses the chart's own aspect list; quincunxes, which the API does not
+    report as aspects, are found from the body longitudes.
+    """
+    bodies = [*chart.planets, *chart.points]
+    names = [body.name for body in bodies]
+    index = {name: i for i, name in enumerate(names)}
+    edges = [
+        (index[aspect.planet1], index[aspect.planet2], aspect.type)
+        for aspect in chart.aspects
+        if aspect.planet1 in index and aspect.planet2 in index
+    ]
+    longitudes = [body.longitude for body in bodies]
+    for i, j, angle, _ in find_aspects(longitudes, MINOR_ASPECTS):
+        edges.append((i, j, MINOR_ASPECTS[angle][0]))
+    return pattern_models(names, find_patterns(AspectGraph(names, edges), min_stellium))
+
+
+def detect_patterns_batch(
+    charts: Iterable[ChartData],
+    min_stellium: int = MIN_STELLIUM,
+) -> List[List[AspectPattern]]:
+    """Aspect patterns for each chart of a batch, in order."""
+    return [detect_patterns(chart, min_stellium) for chart in charts]
+
@@ -0,0 +1,189 @@
+"""
+Secondary progressions and solar-arc directions over a range of ages.
+
+Secondary progressions take one day after birth for each year of life:
+the progressed chart at age `a` is the sky at natal JD + `a` days.
+Solar-arc directions advance every natal body and angle by the arc the
+progressed Sun has moved since birth.
+
+All snapshots of a request share one natal chart, and their progressed
+Julian Days are formed as one array. Aspects to the natal chart are
+matched for the whole range in one vectorized pass per method, over a
+(snapshots × bodies × natal points) separation array.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import PLANETS, _calculate_jd, _get_city_coordinates
+from src.core.ingress import jd_to_iso
+from src.core.sky_cache import house_positions, sky_positions
+from src.models import ProgressionAspect, ProgressionData
+
+# Days per year of age
+TROPICAL_YEAR_DAYS = 365.24219
+
+# Progressed aspects use tight orbs (one degree is about a year of
+# progressed Sun motion)
+PROGRESSION_ASPECTS: Dict[int, Tuple[str, float]] = {
+    0: ("Conjunction", 1.0),
+    60: ("Sextile", 1.0),
+    90: ("Square", 1.0),
+    120: ("Trine", 1.0),
+    180: ("Opposition", 1.0),
+}
+
+NATAL_ANGLES = ("Ascendant", "Midheaven")
+
+# Upper bound on snapshots per request
+MAX_SNAPSHOTS = 2000
+
+
+def age_range(start_age: float, end_age: float, step: float) -> np.ndarray:
+    """Ages from start_age to end_age inclusive, `step` years apart."""
+    if step <= 0:
+        raise ValueError("step must be positive")
+    if end_age < start_age:
+        raise ValueError("end_age must not be before start_age")
+    count = int(np.floor((end_age - start_age) / step + 1e-9)) + 1
+    if count > MAX_SNAPSHOTS:
+        raise ValueError(f"at most {MAX_SNAPSHOTS} snapshots per request")
+    return start_age + step * np.arange(count)
+
+
+def aspect_hits(
+    moving: np.ndarray,
+    natal: np.ndarray,
+    aspects: Dict[int, Tuple[str, float]],
+    skip_same: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aspects between every snapshot's bodies and the natal points.
+
+    Args:
+        moving: (snapshots, bodies) longitudes
+        natal: (points,) natal longitudes; point k < bodies is body k
+        aspects: angle -> (name, orb)
+        skip_same: Ignore a body's aspects to its own natal position
+
+    Returns:
+        (snapshot, body, point, angle, orb) arrays, one entry per hit,
+        ordered by snapshot, body and point
+    """
+    separation = np.abs(moving[:, :, None] - natal[None, None, :])
+    separation = np.minimum(separation, 360.0 - separation)
+    if skip_same:
+        bodies = moving.shape[1]
+        same = np.zeros(separation.shape[1:], dtype=bool)
+        same[np.arange(bodies), np.arange(bodies)] = True
+        separation[:, same] = np.inf
+
+    parts = []
+    for angle, (_, orb) in aspects.items():
+        offset = np.abs(separation - angle)
+        snapshots, bodies, points = np.nonzero(offset <= orb)
+        parts.append(
+            (
+                snapshots,
+                bodies,
+                points,
+                np.full(len(snapshots), angle),
+                offset[snapshots, bodies, points],
+            )
+        )
+    snapshots, bodies, points, angles, orbs = (np.concatenate(column) for column in zip(*parts))
+    order = np.lexsort((points, bodies, snapshots))
+    return snapshots[order], bodies[order], points[order], angles[order], orbs[order]
+
+
+def progress(
+    natal_jd: float,
+    latitude: float,
+    longitude: float,
+    ages: Sequence[float],
+) -> ProgressionData:
+    """
+    Secondary progressions and solar arcs at each age.
+
+    Args:
+        natal_jd: Julian Day (UT) of birth
+        latitude, longitude: Birth place
+        ages: Ages in years
+
+    Returns:
+        ProgressionData with one column entry per age
+    """
+    ages = np.asarray(ages, dtype=float)
+    if not len(ages):
+        raise ValueError("at least one age is required")
+    if len(ages) > MAX_SNAPSHOTS:
+        raise ValueError(f"at most {MAX_SNAPSHOTS} snapshots per request")
+
+    names = list(PLANETS)
+    cusps, asc_lon, mc_lon = house_positions(natal_jd, latitude, longitude)
+    natal_planets = np.array([lon for name, lon, speed in sky_positions(natal_jd)])
+    natal = np.concatenate([natal_planets, [asc_lon, mc_lon]])
+    natal_names = names + list(NATAL_ANGLES)
+
+    # One day of ephemeris per year of life
+    progressed_jds = natal_jd + ages
+    progressed = np.array(
+        [
+            [swe.calc_ut(jd, body_id)[0][0] % 360 for body_id in PLANETS.values()]
+            for jd in progressed_jds.tolist()
+        ]
+    )
+
+    sun = names.index("Sun")
+    arcs = (progressed[:, sun] - natal_planets[sun]) % 360
+    directed = (natal[None, :] + arcs[:, None]) % 360
+
+    aspects: List[ProgressionAspect] = []
+    # A body is never aspected to its own natal place: for the slow
+    # planets that would be a conjunction at almost every age
+    for method, moving, moving_names in (
+        ("progressed", progressed, names),
+        ("solar_arc", directed, natal_names),
+    ):
+        snapshots, bodies, points, angles, orbs = aspect_hits(
+            moving, natal, PROGRESSION_ASPECTS, skip_same=True
+        )
+        aspects.extend(
+            ProgressionAspect(
+                age=float(ages[s]),
+                method=method,
+                body=moving_names[b],
+                natal=natal_names[p],
+                aspect=PROGRESSION_ASPECTS[angle][0],
+                orb=round(orb, 4),
+            )
+            for s, b, p, angle, orb in zip(
+                snapshots.tolist(), bodies.tolist(), points.tolist(), angles.tolist(), orbs.tolist()
+            )
+        )
+    aspects.sort(key=lambda aspect: aspect.age)
+
+    return ProgressionData(
+        ages=ages.tolist(),
+        dates=[jd_to_iso(jd)[:10] for jd in (natal_jd + ages * TROPICAL_YEAR_DAYS).tolist()],
+        progressed={name: progressed[:, k].tolist() for k, name in enumerate(names)},
+        solar_arc={name: directed[:, k].tolist() for k, name in enumerate(natal_names)},
+        aspects=aspects,
+    )
+
+
+def calculate_progressions(
+    date_str: str,
+    time_str: str,
+    country: str,
+    city: str,
+    start_age: float,
+    end_age: float,
+    step: float,
+) -> ProgressionData:
+    """Progressions for a birth (UT) over an age range; see progress."""
+    natal_jd = _calculate_jd(date_str, time_str)
+    latitude, longitude = _get_city_coordinates(city, country)
+    return progress(natal_jd, latitude, longitude, age_range(start_age, end_age, step))
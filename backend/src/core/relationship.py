@@ -0,0 +1,157 @@
+"""
+Composite and Davison relationship charts, for one couple or every pair of a group.
+
+- Composite: each body, angle and cusp at the midpoint (on the shorter
+  arc) of its two natal longitudes; planets are placed in the midpoint
+  houses.
+- Davison: an ordinary chart cast for the midpoint in time and place of
+  the two births.
+
+Natal positions come from the sky and houses tiers (src.core.sky_cache),
+so each member is computed at most once however many pairs it is in,
+and not at all if an earlier request already cached it. In group mode
+the composite midpoints and house placements of all pairs are formed as
+single NumPy expressions over (pairs × bodies) arrays.
+"""
+
+from array import array
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.core.calculations import PLANETS, _calculate_jd, _get_city_coordinates
+from src.core.compact import (
+    DEFAULT_BODIES,
+    NO_HOUSE,
+    CompactChart,
+    build_compact_chart,
+    find_chart_aspects,
+)
+from src.core.relocation import house_placements
+from src.core.sky_cache import house_positions, sky_positions
+from src.models import BirthInput, RelationshipChart
+
+# Largest group for all-pairs mode (1225 pairs)
+MAX_GROUP_SIZE = 50
+
+# (Julian Day, latitude, longitude) of a birth
+Birth = Tuple[float, float, float]
+
+
+def birth_of(birth_input: BirthInput) -> Birth:
+    """Julian Day and coordinates of a birth."""
+    latitude, longitude = _get_city_coordinates(birth_input.city, birth_input.country)
+    return _calculate_jd(birth_input.date, birth_input.time), latitude, longitude
+
+
+def midpoints(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Midpoints on the shorter arc between two arrays of longitudes."""
+    half = ((second - first + 180.0) % 360.0 - 180.0) / 2
+    return (first + half) % 360.0
+
+
+def natal_positions(births: Sequence[Birth]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Natal planets and angles of each birth, from the cache tiers.
+
+    Returns:
+        (longitudes, speeds, cusps): (births, 14) longitudes and speeds
+        in DEFAULT_BODIES order and (births, 12) cusps
+    """
+    longitudes = np.zeros((len(births), len(DEFAULT_BODIES)))
+    speeds = np.zeros((len(births), len(DEFAULT_BODIES)))
+    cusps = np.zeros((len(births), 12))
+    for k, (jd, latitude, longitude) in enumerate(births):
+        cusp_values, asc_lon, mc_lon = house_positions(jd, latitude, longitude)
+        sky = sky_positions(jd)
+        longitudes[k, : len(PLANETS)] = [lon for name, lon, speed in sky]
+        speeds[k, : len(PLANETS)] = [speed for name, lon, speed in sky]
+        angles = [asc_lon, (asc_lon + 180) % 360, mc_lon, (mc_lon + 180) % 360]
+        longitudes[k, len(PLANETS) :] = angles
+        cusps[k] = cusp_values
+    return longitudes, speeds, cusps
+
+
+def pair_indices(count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(first, second) member indices of every pair, first < second."""
+    if count < 2:
+        raise ValueError("at least two births are required")
+    if count > MAX_GROUP_SIZE:
+        raise ValueError(f"at most {MAX_GROUP_SIZE} births per group")
+    return np.triu_indices(count, 1)
+
+
+def _midpoint_birth(first: Birth, second: Birth) -> Birth:
+    """Davison midpoint: mean time, mean latitude, shorter-arc longitude."""
+    longitude = first[2] + ((second[2] - first[2] + 180.0) % 360.0 - 180.0) / 2
+    return (
+        (first[0] + second[0]) / 2,
+        (first[1] + second[1]) / 2,
+        (longitude + 180.0) % 360.0 - 180.0,
+    )
+
+
+def _compact(
+    birth: Birth,
+    longitudes: np.ndarray,
+    speeds: np.ndarray,
+    houses: np.ndarray,
+    cusps: np.ndarray,
+) -> CompactChart:
+    """Composite chart with the DEFAULT_FIELDS, like a Davison chart."""
+    lons = array("d", longitudes.tolist())
+    aspects, aspect_orbs = find_chart_aspects(lons)
+    return CompactChart(
+        birth[0],
+        birth[1],
+        birth[2],
+        array("B", DEFAULT_BODIES),
+        lons,
+        array("d", speeds.tolist()),
+        array("b", houses.tolist()),
+        array("d", cusps.tolist()),
+        aspects,
+        aspect_orbs,
+    )
+
+
+def composite_charts(births: Sequence[Birth]) -> List[RelationshipChart]:
+    """Composite chart of every pair of births."""
+    first, second = pair_indices(len(births))
+    longitudes, speeds, cusps = natal_positions(births)
+
+    pair_longitudes = midpoints(longitudes[first], longitudes[second])
+    pair_speeds = (speeds[first] + speeds[second]) / 2
+    pair_cusps = midpoints(cusps[first], cusps[second])
+    pair_houses = np.full(pair_longitudes.shape, NO_HOUSE, dtype=np.int8)
+    pair_houses[:, : len(PLANETS)] = house_placements(
+        pair_longitudes[:, : len(PLANETS)], pair_cusps
+    )
+
+    return [
+        RelationshipChart(
+            first=i,
+            second=j,
+            chart=_compact(
+                _midpoint_birth(births[i], births[j]),
+                pair_longitudes[n],
+                pair_speeds[n],
+                pair_houses[n],
+                pair_cusps[n],
+            ).to_chart_data(),
+        )
+        for n, (i, j) in enumerate(zip(first.tolist(), second.tolist()))
+    ]
+
+
+def davison_charts(births: Sequence[Birth]) -> List[RelationshipChart]:
+    """Davison chart of every pair of births."""
+    first, second = pair_indices(len(births))
+    return [
+        RelationshipChart(
+            first=i,
+            second=j,
+            chart=build_compact_chart(*_midpoint_birth(births[i], births[j])).to_chart_data(),
+        )
+        for i, j in zip(first.tolist(), second.tolist())
+    ]
@@ -0,0 +1,148 @@
+"""
+Relocation charts: one birth moment cast for many places.
+
+Planet positions depend only on the moment, so they are computed once
+(from the sky tier, see src.core.sky_cache); only houses and angles
+depend on the place. Each location then costs one houses_ex call, and
+the house placement of every planet at every location is resolved in
+one NumPy expression instead of the per-planet _get_house_for_position
+loop.
+
+Placidus houses are undefined near the poles (houses_ex fails there);
+such locations are reported as invalid rather than failing the request.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import PLANETS, _calculate_jd
+from src.core.sky_cache import compute_houses, sky_positions
+from src.models import RelocationData
+
+# Upper bound on locations per request (a 1° world grid is ~65k)
+MAX_LOCATIONS = 20000
+
+# House number of a planet where houses are undefined
+NO_HOUSE = 0
+
+
+def house_placements(longitudes: np.ndarray, cusps: np.ndarray) -> np.ndarray:
+    """
+    House (1-12) of each planet at each location.
+
+    Same rule as _get_house_for_position: the first house i (1-11) with
+    cusp_i <= longitude < cusp_i+1, allowing for the 0°/360° wrap, and
+    house 12 otherwise.
+
+    Args:
+        longitudes: (P,) planet longitudes in [0, 360) shared by every
+            location, or (L, P) longitudes per location
+        cusps: (L, 12) cusp longitudes per location
+
+    Returns:
+        (L, P) int8 array of house numbers
+    """
+    lon = np.asarray(longitudes, dtype=float)
+    lon = (lon[None, :] if lon.ndim == 1 else lon)[:, :, None]
+    start = np.asarray(cusps, dtype=float)[:, None, :11]
+    end = np.asarray(cusps, dtype=float)[:, None, 1:12]
+
+    after_start = lon >= start
+    before_end = lon < end
+    inside = np.where(start <= end, after_start & before_end, after_start | before_end)
+
+    first = inside.argmax(axis=2)
+    return np.where(inside.any(axis=2), first + 1, 12).astype(np.int8)
+
+
+def grid_locations(
+    lat_min: float,
+    lat_max: float,
+    lon_min: float,
+    lon_max: float,
+    step: float,
+) -> List[Tuple[float, float]]:
+    """
+    (latitude, longitude) of a regular grid, row by row from the south-west.
+
+    Both edges are included where the step lands on them.
+    """
+    if step <= 0:
+        raise ValueError("step must be positive")
+    if lat_min > lat_max or lon_min > lon_max:
+        raise ValueError("grid minimum must not exceed maximum")
+
+    def axis(low: float, high: float) -> np.ndarray:
+        count = int(np.floor((high - low) / step + 1e-9)) + 1
+        if count > MAX_LOCATIONS:
+            raise ValueError(f"at most {MAX_LOCATIONS} locations per request")
+        return low + step * np.arange(count)
+
+    lats, lons = axis(lat_min, lat_max), axis(lon_min, lon_max)
+    if len(lats) * len(lons) > MAX_LOCATIONS:
+        raise ValueError(f"at most {MAX_LOCATIONS} locations per request")
+    return [(float(lat), float(lon)) for lat in lats for lon in lons]
+
+
+def relocate(
+    jd: float,
+    locations: Sequence[Tuple[float, float]],
+) -> RelocationData:
+    """
+    Houses and angles of one moment at many locations.
+
+    Args:
+        jd: Julian Day (UT)
+        locations: (latitude, longitude) pairs
+
+    Returns:
+        RelocationData with one column entry per location, in input order
+    """
+    if not locations:
+        raise ValueError("at least one location is required")
+    if len(locations) > MAX_LOCATIONS:
+        raise ValueError(f"at most {MAX_LOCATIONS} locations per request")
+
+    sky = sky_positions(jd)
+    names = [name for name, lon, speed in sky[: len(PLANETS)]]
+    planet_lons = np.array([lon for name, lon, speed in sky[: len(PLANETS)]])
+
+    cusps = np.zeros((len(locations), 12))
+    valid = np.zeros(len(locations), dtype=bool)
+    ascendant: List[Optional[float]] = []
+    midheaven: List[Optional[float]] = []
+    for k, (latitude, longitude) in enumerate(locations):
+        try:
+            cusp_values, asc_lon, mc_lon = compute_houses(jd, latitude, longitude)
+        except swe.Error:
+            ascendant.append(None)
+            midheaven.append(None)
+            continue
+        cusps[k] = cusp_values
+        valid[k] = True
+        ascendant.append(asc_lon)
+        midheaven.append(mc_lon)
+
+    houses = np.where(valid[:, None], house_placements(planet_lons, cusps), NO_HOUSE)
+
+    return RelocationData(
+        planets=names,
+        planet_longitudes=planet_lons.tolist(),
+        latitudes=[float(lat) for lat, lon in locations],
+        longitudes=[float(lon) for lat, lon in locations],
+        ascendant=ascendant,
+        midheaven=midheaven,
+        cusps=[row if ok else None for row, ok in zip(cusps.tolist(), valid.tolist())],
+        houses={name: houses[:, p].tolist() for p, name in enumerate(names)},
+    )
+
+
+def calculate_relocation(
+    date_str: str,
+    time_str: str,
+    locations: Sequence[Tuple[float, float]],
+) -> RelocationData:
+    """Relocation columns for a birth moment (UT); see relocate."""
+    return relocate(_calculate_jd(date_str, time_str), locations)
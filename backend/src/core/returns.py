@@ -0,0 +1,119 @@
+"""
+Solar and lunar returns: the moments the Sun or Moon regains its natal longitude.
+
+Each return is solved by Newton's method on the longitude, using the
+speed that calc_ut returns alongside it (FLG_SPEED), so every iteration
+costs a single ephemeris call. The first return is seeded from the mean
+motion and each later one from the previous return plus the mean period;
+neither body is ever retrograde, so two or three iterations reach the
+tolerance.
+
+Each return is cast as a full chart for the chosen location with
+build_compact_chart.
+"""
+
+from typing import Dict, List, Tuple
+
+from src.core.calculations import PLANETS, _calculate_jd
+from src.core.compact import build_compact_chart
+from src.core.ingress import TIME_TOLERANCE_DAYS, body_position, jd_to_iso, wrap_degrees
+from src.core.sky_cache import sky_positions
+from src.models import ReturnChart
+
+# Mean period in days of the returning bodies (tropical year and month)
+RETURN_PERIODS: Dict[str, float] = {
+    "Sun": 365.242190,
+    "Moon": 27.321582,
+}
+
+# Newton iterations per return before giving up
+MAX_ITERATIONS = 12
+
+# Longest range of years per request
+MAX_RETURN_YEARS = 100
+
+
+def _solve_return(body_id: int, target: float, guess: float) -> float:
+    """Time near `guess` at which the body is at longitude `target`."""
+    t = guess
+    for _ in range(MAX_ITERATIONS):
+        lon, speed = body_position(t, body_id)
+        step = wrap_degrees(lon - target) / speed
+        t -= step
+        if abs(step) < TIME_TOLERANCE_DAYS:
+            return t
+    raise ValueError(f"Return did not converge near JD {guess:.1f}")
+
+
+def find_returns(body: str, target: float, start_jd: float, end_jd: float) -> List[float]:
+    """
+    Julian Days (UT) in [start_jd, end_jd) at which `body` is at `target`.
+
+    Args:
+        body: "Sun" or "Moon"
+        target: Ecliptic longitude (degrees) to return to
+        start_jd, end_jd: Search range
+    """
+    if body not in RETURN_PERIODS:
+        raise ValueError(f"Returns are supported for {', '.join(RETURN_PERIODS)}")
+    body_id = PLANETS[body]
+    period = RETURN_PERIODS[body]
+
+    lon, speed = body_position(start_jd, body_id)
+    guess = start_jd + (target - lon) % 360 / 360 * period
+    found: List[float] = []
+    while True:
+        t = _solve_return(body_id, target, guess)
+        # A seed just past start_jd can converge to the return before it
+        if t < start_jd:
+            guess = t + period
+            continue
+        if t >= end_jd:
+            return found
+        found.append(t)
+        guess = t + period
+
+
+def return_charts(
+    natal_jd: float,
+    body: str,
+    start_jd: float,
+    end_jd: float,
+    latitude: float,
+    longitude: float,
+) -> List[ReturnChart]:
+    """Returns of a natal body in [start_jd, end_jd), each as a chart for the place."""
+    natal = {name: lon for name, lon, speed in sky_positions(natal_jd)}
+    if body not in natal:
+        raise ValueError(f"Unknown body {body!r}")
+    return [
+        ReturnChart(
+            time=jd_to_iso(jd),
+            chart=build_compact_chart(jd, latitude, longitude).to_chart_data(),
+        )
+        for jd in find_returns(body, natal[body], start_jd, end_jd)
+    ]
+
+
+def calculate_returns(
+    date_str: str,
+    time_str: str,
+    body: str,
+    start_year: int,
+    end_year: int,
+    location: Tuple[float, float],
+) -> List[ReturnChart]:
+    """
+    Solar or lunar returns of a birth (UT) from start_year through end_year.
+
+    Args:
+        location: (latitude, longitude) the return charts are cast for
+    """
+    if end_year < start_year:
+        raise ValueError("end_year must not be before start_year")
+    if end_year - start_year + 1 > MAX_RETURN_YEARS:
+        raise ValueError(f"at most {MAX_RETURN_YEARS} years per request")
+    natal_jd = _calculate_jd(date_str, time_str)
+    start_jd = _calculate_jd(f"{start_year:04d}-01-01", "00:00:00")
+    end_jd = _calculate_jd(f"{end_year + 1:04d}-01-01", "00:00:00")
+    return return_charts(natal_jd, body, start_jd, end_jd, *location)
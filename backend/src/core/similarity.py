@@ -0,0 +1,259 @@
+"""
+Nearest-chart similarity index.
+
+Each chart becomes a fixed-length vector: for every body in `VECTOR_BODIES`
+its longitude is embedded on the unit circle as a (sin, cos) pair, so 359°
+and 1° are close. The distance between two charts is a weighted sum of
+per-body chord distances,
+
+    d(a, b) = Σ w_k · (2 − 2·cos(λa_k − λb_k))
+
+which is 0 for identical charts and grows monotonically with each body's
+angular separation. Because every pair lies on the unit circle, d expands
+to 2·Σw − 2·(w ⊙ a)·b, so a top-k query is one matrix-vector product over
+the stored vectors followed by a partial sort.
+
+On disk an index is a directory with a raw float32 matrix (`vectors.f32`),
+the matching int64 chart ids (`ids.i64`) and `meta.json`. Both data files
+are append-only, so inserts are cheap; readers memory-map them and pick up
+new rows on `refresh()`.
+"""
+
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.calculations import PLANETS
+from src.core.compact import POINT_NAMES, CompactChart
+from src.models import ChartData
+
+# Bodies embedded in the vector, in order
+VECTOR_BODIES: Tuple[str, ...] = tuple(PLANETS) + POINT_NAMES
+
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.i64"
+META_FILE = "meta.json"
+
+# Rows scored per matrix-vector product, bounding temporary memory
+QUERY_BLOCK_ROWS = 1 << 20
+
+ChartLike = Union[ChartData, CompactChart, Dict]
+
+
+def _longitudes(chart: ChartLike) -> Dict[str, float]:
+    """Body name -> longitude for ChartData, its JSON dict, or CompactChart."""
+    if isinstance(chart, CompactChart):
+        return dict(zip(chart.names(), chart.longitudes))
+    if isinstance(chart, dict):
+        chart = ChartData.model_validate(chart)
+    return {body.name: body.longitude for body in [*chart.planets, *chart.points]}
+
+
+def chart_vector(chart: ChartLike, bodies: Sequence[str] = VECTOR_BODIES) -> np.ndarray:
+    """
+    Embed a chart as (sin, cos) pairs of its body longitudes.
+
+    Args:
+        chart: ChartData (or its JSON dict) or CompactChart
+        bodies: Bodies to embed, in order
+
+    Returns:
+        float32 vector of length 2 * len(bodies)
+    """
+    longitudes = _longitudes(chart)
+    missing = [name for name in bodies if name not in longitudes]
+    if missing:
+        raise ValueError(f"Chart has no position for: {', '.join(missing)}")
+    radians = np.radians([longitudes[name] for name in bodies])
+    vector = np.empty(2 * len(bodies), dtype=np.float32)
+    vector[0::2] = np.sin(radians)
+    vector[1::2] = np.cos(radians)
+    return vector
+
+
+def circular_distance(
+    a: np.ndarray,
+    b: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+) -> float:
+    """Weighted chord distance between two chart vectors (see module docs)."""
+    per_body = ((a - b) ** 2).reshape(-1, 2).sum(axis=1)
+    if weights is None:
+        return float(per_body.sum())
+    return float(per_body @ weights)
+
+
+class SimilarityIndex:
+    """
+    Memory-mapped chart vectors answering weighted top-k queries.
+
+    Args:
+        directory: Index directory (created by `create`)
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.bodies: Tuple[str, ...] = tuple(meta["bodies"])
+        self.dimension = 2 * len(self.bodies)
+        self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self.refresh()
+
+    @classmethod
+    def create(
+        cls,
+        directory: str,
+        bodies: Sequence[str] = VECTOR_BODIES,
+    ) -> "SimilarityIndex":
+        """Create an empty index directory."""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "bodies": list(bodies)}, f, indent=2)
+        for name in (VECTORS_FILE, IDS_FILE):
+            open(os.path.join(directory, name), "wb").close()
+        return cls(directory)
+
+    @classmethod
+    def build(
+        cls,
+        directory: str,
+        charts: Iterable[Tuple[int, ChartLike]],
+        bodies: Sequence[str] = VECTOR_BODIES,
+        batch_size: int = 10000,
+    ) -> "SimilarityIndex":
+        """Create an index from (chart id, chart) pairs, streaming in batches."""
+        index = cls.create(directory, bodies)
+        batch: List[Tuple[int, ChartLike]] = []
+        for item in charts:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                index.add_many(batch, refresh=False)
+                batch = []
+        if batch:
+            index.add_many(batch, refresh=False)
+        index.refresh()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def refresh(self) -> None:
+        """Re-map the data files to see rows appended since opening."""
+        row_bytes = self.dimension * 4
+        vectors_path = os.path.join(self.directory, VECTORS_FILE)
+        ids_path = os.path.join(self.directory, IDS_FILE)
+        # A concurrent append may have written vectors before ids (or only
+        # part of a row); only rows complete in both files are visible
+        count = min(os.path.getsize(vectors_path) // row_bytes, os.path.getsize(ids_path) // 8)
+        if count == 0:
+            self._vectors = np.empty((0, self.dimension), dtype=np.float32)
+            self._ids = np.empty(0, dtype=np.int64)
+            return
+        self._vectors = np.memmap(
+            vectors_path, dtype=np.float32, mode="r", shape=(count, self.dimension)
+        )
+        self._ids = np.memmap(ids_path, dtype=np.int64, mode="r", shape=(count,))
+
+    def add(self, chart_id: int, chart: ChartLike) -> None:
+        """Append one chart."""
+        self.add_many([(chart_id, chart)])
+
+    def add_many(self, items: Sequence[Tuple[int, ChartLike]], refresh: bool = True) -> None:
+        """Append several charts in one write per file."""
+        if not items:
+            return
+        vectors = np.stack([chart_vector(chart, self.bodies) for _, chart in items])
+        ids = np.fromiter((chart_id for chart_id, _ in items), dtype=np.int64, count=len(items))
+        with open(os.path.join(self.directory, VECTORS_FILE), "ab") as f:
+            f.write(vectors.tobytes())
+        with open(os.path.join(self.directory, IDS_FILE), "ab") as f:
+            f.write(ids.tobytes())
+        if refresh:
+            self.refresh()
+
+    def weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Per-body weights in index order.
+
+        Bodies not named in `weights` get weight 1; unknown names are
+        rejected.
+        """
+        weights = weights or {}
+        unknown = set(weights) - set(self.bodies)
+        if unknown:
+            raise ValueError(f"Unknown bodies in weights: {', '.join(sorted(unknown))}")
+        result = np.array([weights.get(name, 1.0) for name in self.bodies], dtype=np.float32)
+        if (result < 0).any():
+            raise ValueError("Weights must be non-negative")
+        return result
+
+    def query(
+        self,
+        chart: ChartLike,
+        k: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+        exclude_id: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        The `k` charts nearest to `chart`.
+
+        Args:
+            chart: Query chart
+            k: Number of neighbours
+            weights: Optional per-body weights, e.g. {"Sun": 2, "Moon": 2}
+            exclude_id: Chart id to leave out (typically the query itself)
+
+        Returns:
+            (chart id, distance) pairs, nearest first
+        """
+        if k <= 0 or len(self) == 0:
+            return []
+        w = self.weight_vector(weights)
+        # d = 2·Σw − 2·(w ⊙ q)·x, so the nearest rows have the largest score
+        query = chart_vector(chart, self.bodies) * np.repeat(w, 2)
+        wanted = k + (1 if exclude_id is not None else 0)
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, len(self), QUERY_BLOCK_ROWS):
+            scores = self._vectors[start : start + QUERY_BLOCK_ROWS] @ query
+            if len(scores) > wanted:
+                top = np.argpartition(scores, -wanted)[-wanted:]
+            else:
+                top = np.arange(len(scores))
+            best_scores = np.concatenate([best_scores, scores[top]])
+            best_rows = np.concatenate([best_rows, top + start])
+            if len(best_scores) > wanted:
+                keep = np.argpartition(best_scores, -wanted)[-wanted:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        total_weight = 2.0 * float(w.sum())
+        results = []
+        for n in np.argsort(-best_scores, kind="stable"):
+            chart_id = int(self._ids[best_rows[n]])
+            if chart_id == exclude_id:
+                continue
+            # Clamp float32 rounding just below zero for identical charts
+            distance = max(0.0, total_weight - 2.0 * float(best_scores[n]))
+            results.append((chart_id, distance))
+            if len(results) == k:
+                break
+        return results
+
+
+def angular_distance_degrees(distance: float, total_weight: float) -> float:
+    """
+    Express a distance as the equivalent uniform angular separation.
+
+    The separation θ (degrees) that every body would need for the given
+    distance; useful for choosing a "similar enough" threshold.
+    """
+    if total_weight <= 0:
+        return 0.0
+    cos_theta = max(-1.0, min(1.0, 1.0 - distance / (2.0 * total_weight)))
+    return math.degrees(math.acos(cos_theta))
@@ -0,0 +1,253 @@
+"""
+Two-tier cache for chart computation.
+
+Geocentric planet positions depend only on the moment, not on the birth
+place, while house cusps and angles depend on both. The two are cached
+separately:
+
+- sky tier: planet (and extended body) longitudes and speeds, keyed on
+  the Julian Day quantized to one second;
+- houses tier: cusps, Ascendant and Midheaven, keyed on the quantized
+  Julian Day and the rounded coordinates.
+
+Charts sharing a birth moment in different cities then share the sky
+tier, and only houses and house placement are computed per chart. Each
+tier reports its own hit rate. `planet_positions` is the cached
+counterpart of calculations.get_planet_positions.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+import swisseph as swe
+
+from src.core.calculations import (
+    EXTENDED_BODIES,
+    PLANETS,
+    _calculate_jd,
+    _degrees_to_sign_components,
+    _get_house_for_position,
+)
+from src.models import Planet
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+# One quantum of the cache key: the API takes times to the second
+JD_QUANTUM_DAYS = 1.0 / 86400
+
+# Coordinates are rounded to 1e-4° (~10 m) in the houses key
+COORDINATE_DECIMALS = 4
+
+DEFAULT_SKY_ENTRIES = 4096
+DEFAULT_HOUSE_ENTRIES = 4096
+
+# Extended bodies already reported as unavailable
+_unavailable_bodies = set()
+
+# (name, longitude, speed) per body
+SkyPositions = Tuple[Tuple[str, float, float], ...]
+# (12 cusps, Ascendant, Midheaven)
+HousePositions = Tuple[Tuple[float, ...], float, float]
+
+
+class LRUCache:
+    """
+    Thread-safe LRU map with hit/miss counters.
+
+    Args:
+        max_entries: Capacity; 0 disables caching (every lookup misses)
+    """
+
+    def __init__(self, max_entries: int):
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        """Cached value of `key`, computing (outside the lock) on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]  # type: ignore[return-value]
+            self._misses += 1
+
+        value = compute()
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def resize(self, max_entries: int) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be >= 0")
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def metrics(self) -> Dict[str, object]:
+        """Snapshot of cache counters."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+sky_tier = LRUCache(DEFAULT_SKY_ENTRIES)
+house_tier = LRUCache(DEFAULT_HOUSE_ENTRIES)
+
+
+def quantize_jd(jd: float) -> int:
+    """Cache key of a Julian Day: whole seconds since JD 0."""
+    return round(jd / JD_QUANTUM_DAYS)
+
+
+def _extended_positions(jd: float) -> List[Tuple[str, float, float]]:
+    """
+    (name, longitude, speed) of the extended bodies available here.
+
+    Bodies whose ephemeris file is missing are skipped, with one warning
+    per body per process.
+    """
+    found = []
+    for name, body_id in EXTENDED_BODIES.items():
+        try:
+            coords, ret_flag = swe.calc_ut(jd, body_id)
+        except swe.Error as e:
+            if name not in _unavailable_bodies:
+                _unavailable_bodies.add(name)
+                logger.warning(f"Skipping {name}: {e}")
+            continue
+        lon = coords[0] % 360
+        found.append((name, lon, coords[3]))
+        if name == "North Node":
+            found.append(("South Node", (lon + 180) % 360, coords[3]))
+    return found
+
+
+def _compute_sky(jd: float, extended: bool) -> SkyPositions:
+    positions = []
+    for planet_name, planet_id in PLANETS.items():
+        coords, ret_flag = swe.calc_ut(jd, planet_id)
+        positions.append((planet_name, coords[0] % 360, coords[3]))
+    if extended:
+        positions.extend(_extended_positions(jd))
+    return tuple(positions)
+
+
+def sky_positions(jd: float, extended: bool = False) -> SkyPositions:
+    """
+    Planet positions at a moment, from the sky tier.
+
+    Args:
+        jd: Julian Day (UT); moments within the same second share an entry
+        extended: Also include the extended bodies after the planets
+
+    Returns:
+        (name, longitude, speed) per body, planets in PLANETS order
+    """
+    key = quantize_jd(jd)
+    return sky_tier.get_or_compute(
+        (key, extended), lambda: _compute_sky(key * JD_QUANTUM_DAYS, extended)
+    )
+
+
+def planet_positions(
+    date_str: str,
+    time_str: str,
+    house_cusps: Sequence[float],
+) -> List[Planet]:
+    """
+    Planet models at a moment (UT), read through the sky tier.
+
+    Args:
+        date_str: Date (YYYY-MM-DD)
+        time_str: Time (HH:MM:SS)
+        house_cusps: The 12 house cusp longitudes used for house placement
+
+    Returns:
+        One Planet per body of PLANETS, as from get_planet_positions
+    """
+    planets = []
+    for name, lon, speed in sky_positions(_calculate_jd(date_str, time_str)):
+        sign, degree, minute = _degrees_to_sign_components(lon)
+        planets.append(
+            Planet(
+                name=name,
+                longitude=lon,
+                sign=sign,
+                degree=degree,
+                minute=minute,
+                house=_get_house_for_position(lon, house_cusps),
+            )
+        )
+    return planets
+
+
+def compute_houses(jd: float, latitude: float, longitude: float) -> HousePositions:
+    """
+    Placidus cusps, Ascendant and Midheaven at the exact moment, uncached.
+
+    For searches over many moments or places that would only churn the
+    houses tier; see house_positions for the cached lookup.
+    """
+    cusp_values, ascmc = swe.houses_ex(jd, latitude, longitude, b"P")
+    return tuple(lon % 360 for lon in cusp_values[:12]), ascmc[0] % 360, ascmc[1] % 360
+
+
+def house_positions(jd: float, latitude: float, longitude: float) -> HousePositions:
+    """
+    Placidus cusps, Ascendant and Midheaven, from the houses tier.
+
+    Returns:
+        (12 cusp longitudes, Ascendant, Midheaven)
+    """
+    key = quantize_jd(jd)
+    latitude = round(latitude, COORDINATE_DECIMALS)
+    longitude = round(longitude, COORDINATE_DECIMALS)
+    return house_tier.get_or_compute(
+        (key, latitude, longitude),
+        lambda: compute_houses(key * JD_QUANTUM_DAYS, latitude, longitude),
+    )
+
+
+def configure(
+    sky_entries: Optional[int] = None,
+    house_entries: Optional[int] = None,
+) -> None:
+    """Resize the tiers (0 disables a tier)."""
+    if sky_entries is not None:
+        sky_tier.resize(sky_entries)
+    if house_entries is not None:
+        house_tier.resize(house_entries)
+
+
+def cache_metrics() -> Dict[str, Dict[str, object]]:
+    """Per-tier counters and hit rates."""
+    return {"sky": sky_tier.metrics(), "houses": house_tier.metrics()}
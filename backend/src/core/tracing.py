@@ -0,0 +1,441 @@
+"""
+Lightweight request-scoped tracing with OpenTelemetry-compatible export.
+
+A trace is started per request (or per batch job) with `start_trace`; code
+anywhere below it opens nested spans with `span`. Only sampled traces do
+any work: outside a sampled trace `span` returns a shared no-op object, so
+the hot path pays a single context-variable lookup.
+
+Finished traces are exported as OTLP/JSON `resourceSpans` documents, one per
+line, which the OpenTelemetry Collector's `otlpjsonfile` receiver (or any
+OTLP/JSON consumer) can ingest. The file exporter encodes and writes on a
+background thread, so ending a trace never blocks the event loop on disk.
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "astro-chart-backend"
+SCOPE_NAME = "src.core.tracing"
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class _Trace:
+    """Spans collected for one sampled trace until the root span ends."""
+
+    __slots__ = ("trace_id", "spans", "lock")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.lock = threading.Lock()
+
+
+class Span:
+    """A timed operation within a sampled trace."""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status_code",
+        "status_message",
+    )
+
+    def __init__(
+        self,
+        trace: _Trace,
+        name: str,
+        parent_id: Optional[str],
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None,
+    ):
+        self.trace = trace
+        self.span_id = _random_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, exc: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        self.end_ns = time.time_ns() if end_ns is None else end_ns
+        with self.trace.lock:
+            self.trace.spans.append(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode as an OTLP/JSON span."""
+        encoded: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_id:
+            encoded["parentSpanId"] = self.parent_id
+        if self.status_message:
+            encoded["status"]["message"] = self.status_message
+        return encoded
+
+
+class _NoopSpan:
+    """Stand-in yielded outside sampled traces; every call is a no-op."""
+
+    __slots__ = ()
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, exc: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _random_id(num_bytes: int) -> str:
+    return f"{random.getrandbits(num_bytes * 8):0{num_bytes * 2}x}"
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode one attribute as an OTLP/JSON KeyValue."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class InMemorySpanExporter:
+    """Keeps exported spans in memory (tests, debugging)."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter:
+    """
+    Appends one OTLP/JSON `resourceSpans` document per trace to a file.
+
+    `export` only queues the spans; a daemon thread encodes and appends
+    them. When `max_pending` traces are waiting, further traces are
+    dropped (and counted in `dropped`) rather than held in memory.
+
+    Args:
+        path: Output file
+        service_name: `service.name` resource attribute
+        max_pending: Traces that may wait for the writer thread
+    """
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str = SERVICE_NAME,
+        max_pending: int = 1000,
+    ):
+        self.path = path
+        self.service_name = service_name
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(max_pending)
+        self._writer = threading.Thread(target=self._write_loop, name="span-export", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every queued trace is written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued traces and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Drain whatever else is waiting into the same file write
+            while batch[-1] is not None and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            lines = [self._encode(spans) for spans in batch if spans is not None]
+            try:
+                if lines:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("".join(line + "\n" for line in lines))
+            except OSError as e:
+                logger.warning(f"Could not write traces to {self.path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _encode(self, spans: List[Span]) -> str:
+        document = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", self.service_name)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SCOPE_NAME},
+                            "spans": [s.to_otlp() for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        return json.dumps(document, separators=(",", ":"))
+
+
+class Tracer:
+    """
+    Head-based sampling tracer.
+
+    Args:
+        exporter: Receives the spans of each finished sampled trace; None
+            disables tracing entirely
+        sample_ratio: Fraction (0-1) of new traces to sample
+        trust_parent: Follow the sampled flag of an incoming traceparent;
+            otherwise callers cannot force sampling and every trace is
+            sampled by `sample_ratio`
+    """
+
+    def __init__(
+        self,
+        exporter: Any = None,
+        sample_ratio: float = 0.0,
+        trust_parent: bool = False,
+    ):
+        if not 0.0 <= sample_ratio <= 1.0:
+            raise ValueError("sample_ratio must be between 0 and 1")
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.trust_parent = trust_parent
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_ratio > 0
+
+    def _sampled(self, parent: Optional[Tuple[str, str, bool]]) -> bool:
+        if self.exporter is None:
+            return False
+        if parent is not None and self.trust_parent:
+            return parent[2]
+        return self.sample_ratio > 0 and random.random() < self.sample_ratio
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        kind: int = SPAN_KIND_SERVER,
+        **attributes: Any,
+    ) -> Iterator[Any]:
+        """
+        Open the root span of a request, deciding whether to sample it.
+
+        An incoming W3C `traceparent` header continues the caller's trace
+        when it is sampled; its sampled flag is only followed with
+        `trust_parent`.
+        """
+        parent = parse_traceparent(traceparent) if traceparent else None
+        if not self._sampled(parent):
+            yield NOOP_SPAN
+            return
+
+        trace = _Trace(parent[0] if parent else _random_id(16))
+        root = Span(trace, name, parent[1] if parent else None, kind, attributes)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as exc:
+            root.set_error(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            root.end()
+            self.exporter.export(sorted(trace.spans, key=lambda s: s.start_ns))
+
+
+@contextmanager
+def _child_span(parent: Span, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    child = Span(parent.trace, name, parent.span_id, attributes=attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.set_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+class _NoopContext:
+    """Reusable context manager for unsampled code paths."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP_CONTEXT = _NoopContext()
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """
+    Context manager for a nested span under the current sampled span.
+
+    Outside a sampled trace this returns a shared no-op context manager.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP_CONTEXT
+    return _child_span(parent, name, attributes)
+
+
+def record_span(
+    name: str,
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+    **attributes: Any,
+) -> None:
+    """
+    Record an already finished operation as a child of the current span.
+
+    `start_ns` defaults to the parent's start and `end_ns` to now, which
+    covers work done before the current code gained control (for example
+    request parsing and validation).
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    child = Span(
+        parent.trace,
+        name,
+        parent.span_id,
+        attributes=attributes,
+        start_ns=parent.start_ns if start_ns is None else start_ns,
+    )
+    child.end(end_ns)
+
+
+def current_span() -> Any:
+    """The innermost active span, or the no-op span."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def parse_traceparent(header: str) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header.
+
+    Returns:
+        (trace id, parent span id, sampled) or None when malformed
+    """
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 0x01)
+
+
+def format_traceparent(active: Any) -> Optional[str]:
+    """W3C traceparent for a sampled span (None for the no-op span)."""
+    if active.trace_id is None:
+        return None
+    return f"00-{active.trace_id}-{active.span_id}-01"
+
+
+def tracer_from_env() -> Tracer:
+    """
+    Build the tracer from TRACE_FILE, TRACE_SAMPLE_RATIO and TRACE_TRUST_PARENT.
+
+    Tracing stays off unless TRACE_FILE names an output file. Set
+    TRACE_TRUST_PARENT=1 only behind a proxy that strips or sets
+    traceparent, since a trusted sampled flag lets a client force tracing.
+    """
+    path = os.environ.get("TRACE_FILE")
+    ratio = float(os.environ.get("TRACE_SAMPLE_RATIO", "0.01"))
+    trust_parent = os.environ.get("TRACE_TRUST_PARENT", "").lower() in ("1", "true", "yes")
+    return Tracer(FileSpanExporter(path) if path else None, ratio, trust_parent)
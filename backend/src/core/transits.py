@@ -0,0 +1,184 @@
+"""
+Daily transit-to-natal scan over all stored charts.
+
+The transiting positions of a day are the same for every user, so they are
+computed once. The natal longitudes of all users are packed into one
+(users × bodies) matrix; each block of rows is compared with every
+transiting body in a single vectorized step, and the hits are yielded
+block by block so results can be streamed while the scan runs.
+
+A packed matrix lives in a directory as `natal.npy` (float32 longitudes),
+`ids.npy` (int64 user ids) and `meta.json` (body names), and is
+memory-mapped when loaded.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from src.core.calculations import PLANETS
+
+# Transit aspects use tighter orbs than natal aspects
+TRANSIT_ASPECTS: Dict[int, Tuple[str, float]] = {
+    0: ("Conjunction", 1.0),
+    60: ("Sextile", 1.0),
+    90: ("Square", 1.0),
+    120: ("Trine", 1.0),
+    180: ("Opposition", 1.0),
+}
+
+NATAL_FILE = "natal.npy"
+IDS_FILE = "ids.npy"
+META_FILE = "meta.json"
+
+# Rows compared per vectorized step (rows × natal bodies × transits floats)
+SCAN_BLOCK_ROWS = 65536
+
+
+class TransitHits(NamedTuple):
+    """Hits of one block, as parallel arrays (one entry per hit)."""
+
+    user_ids: np.ndarray
+    natal_bodies: np.ndarray
+    transit_bodies: np.ndarray
+    aspects: np.ndarray
+    orbs: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+
+class NatalMatrix:
+    """
+    Natal longitudes of many users, one row per user.
+
+    Args:
+        ids: int64 user id per row
+        longitudes: float32 array (rows × len(bodies)), degrees 0-360
+        bodies: Natal body name per column
+    """
+
+    def __init__(self, ids: np.ndarray, longitudes: np.ndarray, bodies: Sequence[str]):
+        if longitudes.shape != (len(ids), len(bodies)):
+            raise ValueError("longitudes must have one row per id and one column per body")
+        self.ids = ids
+        self.longitudes = longitudes
+        self.bodies: Tuple[str, ...] = tuple(bodies)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[int, Sequence[float]]],
+        bodies: Sequence[str],
+    ) -> "NatalMatrix":
+        """Pack (user id, longitudes in `bodies` order) rows."""
+        ids: List[int] = []
+        values: List[Sequence[float]] = []
+        for user_id, longitudes in rows:
+            ids.append(user_id)
+            values.append(longitudes)
+        matrix = np.asarray(values, dtype=np.float32).reshape(len(ids), len(bodies))
+        return cls(np.asarray(ids, dtype=np.int64), matrix, bodies)
+
+    def save(self, directory: str) -> None:
+        """Write the matrix for later memory-mapped loading."""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, NATAL_FILE), self.longitudes.astype(np.float32))
+        np.save(os.path.join(directory, IDS_FILE), self.ids.astype(np.int64))
+        with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "bodies": list(self.bodies)}, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "NatalMatrix":
+        """Load a saved matrix, memory-mapped unless `mmap` is False."""
+        mode = "r" if mmap else None
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(
+            np.load(os.path.join(directory, IDS_FILE), mmap_mode=mode),
+            np.load(os.path.join(directory, NATAL_FILE), mmap_mode=mode),
+            meta["bodies"],
+        )
+
+
+def transiting_positions(
+    jd: float,
+    bodies: Optional[Dict[str, int]] = None,
+) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Positions of the transiting bodies at one moment, computed once.
+
+    Returns:
+        (body names, float64 longitudes)
+    """
+    bodies = bodies or PLANETS
+    longitudes = np.empty(len(bodies))
+    for n, body_id in enumerate(bodies.values()):
+        coords, ret_flag = swe.calc_ut(jd, body_id)
+        longitudes[n] = coords[0] % 360
+    return tuple(bodies), longitudes
+
+
+def scan_transits(
+    natal: NatalMatrix,
+    transits: np.ndarray,
+    aspects: Optional[Dict[int, Tuple[str, float]]] = None,
+    block_rows: int = SCAN_BLOCK_ROWS,
+) -> Iterator[TransitHits]:
+    """
+    Match transiting longitudes against every user's natal longitudes.
+
+    Args:
+        natal: Packed natal longitudes
+        transits: Transiting longitudes (one per transiting body)
+        aspects: Aspect table, angle -> (name, orb); defaults to
+            TRANSIT_ASPECTS
+        block_rows: Users compared per vectorized step
+
+    Yields:
+        TransitHits per block (possibly empty), ordered by user then body;
+        `aspects` holds the aspect angle, and body fields are column
+        indices into `natal.bodies` and `transits`
+    """
+    aspects = aspects or TRANSIT_ASPECTS
+    transits = np.asarray(transits, dtype=np.float32)
+
+    for start in range(0, len(natal), block_rows):
+        block = np.asarray(natal.longitudes[start : start + block_rows])
+        # (rows, natal bodies, transits) separations in 0-180
+        separation = np.abs(block[:, :, None] - transits[None, None, :])
+        np.minimum(separation, 360 - separation, out=separation)
+
+        parts = []
+        for angle, (_, orb) in aspects.items():
+            offset = np.abs(separation - np.float32(angle))
+            rows, natal_bodies, transit_bodies = np.nonzero(offset <= orb)
+            parts.append(
+                (
+                    rows,
+                    natal_bodies,
+                    transit_bodies,
+                    np.full(len(rows), angle, dtype=np.int16),
+                    offset[rows, natal_bodies, transit_bodies],
+                )
+            )
+        rows, natal_bodies, transit_bodies, angles, orbs = (
+            np.concatenate(column) for column in zip(*parts)
+        )
+        # Group each user's hits together, in body order
+        order = np.lexsort((transit_bodies, natal_bodies, rows))
+        rows, natal_bodies, transit_bodies = rows[order], natal_bodies[order], transit_bodies[order]
+        angles, orbs = angles[order], orbs[order]
+        yield TransitHits(
+            user_ids=np.asarray(natal.ids[start + rows]),
+            natal_bodies=natal_bodies.astype(np.int8),
+            transit_bodies=transit_bodies.astype(np.int8),
+            aspects=angles,
+            orbs=orbs,
+        )
@@ -2,12 +2,36 @@
 
 from .chart import (
     Aspect,
+    AspectPattern,
     BirthInput,
     ChartData,
+    Eclipse,
+    ElectionalConstraint,
+    ElectionalInput,
+    ElectionalWindow,
+    EphemerisEvent,
+    HarmonicData,
+    HarmonicInput,
     House,
+    Location,
+    LunarCalendarData,
+    LunarPhase,
     NatalChart,
     Planet,
+    PlanetStatus,
     Point,
+    ProgressionAspect,
+    ProgressionData,
+    ProgressionInput,
+    RelationshipChart,
+    RelationshipInput,
+    RelocationData,
+    RelocationGrid,
+    RelocationInput,
+    ReturnChart,
+    ReturnInput,
+    StarConjunction,
+    VoidOfCourse,
 )
 
 __all__ = [
@@ -16,6 +40,30 @@ __all__ = [
     "Point",
     "House",
     "Aspect",
+    "AspectPattern",
     "ChartData",
+    "EphemerisEvent",
+    "PlanetStatus",
+    "LunarPhase",
+    "VoidOfCourse",
+    "Eclipse",
+    "LunarCalendarData",
+    "Location",
+    "RelocationGrid",
+    "RelocationInput",
+    "RelocationData",
+    "ElectionalConstraint",
+    "ElectionalInput",
+    "ElectionalWindow",
+    "ProgressionInput",
+    "ProgressionAspect",
+    "ProgressionData",
+    "ReturnInput",
+    "ReturnChart",
+    "RelationshipInput",
+    "RelationshipChart",
+    "StarConjunction",
+    "HarmonicInput",
+    "HarmonicData",
     "NatalChart",  # Legacy alias for backward compatibility
 ]
@@ -1,9 +1,9 @@
 """Data models for the astro chart generator."""
 
 from datetime import date, time
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class Planet(BaseModel):
@@ -107,6 +107,30 @@ class Aspect(BaseModel):
         }
 
 
+class AspectPattern(BaseModel):
+    """Represents a multi-body aspect pattern (Grand Trine, T-Square, ...)."""
+
+    type: str = Field(
+        ...,
+        description=(
+            "Pattern type (Grand Trine, T-Square, Grand Cross, Yod, Kite, Stellium)"
+        ),
+    )
+    bodies: List[str] = Field(..., description="Planets/points forming the pattern")
+    apex: Optional[str] = Field(
+        None, description="Focal body (T-Square, Yod, Kite), if any"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "type": "T-Square",
+                "bodies": ["Sun", "Moon", "Mars"],
+                "apex": "Mars",
+            }
+        }
+
+
 class ChartData(BaseModel):
     """Represents complete astrological chart data."""
 
@@ -118,6 +142,13 @@ class ChartData(BaseModel):
     )
     houses: List[House] = Field(..., description="List of 12 house cusps")
     aspects: List[Aspect] = Field(..., description="List of aspects")
+    patterns: List[AspectPattern] = Field(
+        default_factory=list, description="Aspect patterns formed by the aspects"
+    )
+    computed: List[str] = Field(
+        default_factory=lambda: ["planets", "points", "houses", "aspects"],
+        description="Parts of the chart that were computed; the others are left empty",
+    )
 
     class Config:
         json_schema_extra = {
@@ -160,6 +191,140 @@ class ChartData(BaseModel):
         }
 
 
+class EphemerisEvent(BaseModel):
+    """Represents a sign ingress or a station of a planet."""
+
+    time: str = Field(..., description="Moment of the event (UTC, ISO 8601)")
+    sign: str = Field(..., description="Zodiac sign the planet is in after the event")
+    retrograde: bool = Field(
+        ..., description="Whether the planet is retrograde after the event"
+    )
+
+
+class PlanetStatus(BaseModel):
+    """Represents a planet's sign and direction at a moment."""
+
+    name: str = Field(..., description="Planet name (e.g., 'Mars')")
+    sign: str = Field(..., description="Zodiac sign")
+    retrograde: bool = Field(..., description="Whether the planet is retrograde")
+    previous_ingress: Optional[EphemerisEvent] = Field(
+        None, description="Last sign ingress before the moment, within the index range"
+    )
+    next_ingress: Optional[EphemerisEvent] = Field(
+        None, description="First sign ingress after the moment, within the index range"
+    )
+    previous_station: Optional[EphemerisEvent] = Field(
+        None, description="Last station before the moment, within the index range"
+    )
+    next_station: Optional[EphemerisEvent] = Field(
+        None, description="First station after the moment, within the index range"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Mercury",
+                "sign": "Pisces",
+                "retrograde": False,
+                "previous_ingress": {
+                    "time": "2005-02-16T17:45:44Z",
+                    "sign": "Pisces",
+                    "retrograde": False,
+                },
+                "next_ingress": {
+                    "time": "2005-03-05T01:33:52Z",
+                    "sign": "Aries",
+                    "retrograde": False,
+                },
+                "previous_station": {
+                    "time": "2004-12-20T06:29:07Z",
+                    "sign": "Sagittarius",
+                    "retrograde": False,
+                },
+                "next_station": {
+                    "time": "2005-03-20T00:14:26Z",
+                    "sign": "Aries",
+                    "retrograde": True,
+                },
+            }
+        }
+
+
+class LunarPhase(BaseModel):
+    """Represents an exact lunar phase."""
+
+    time: str = Field(..., description="Moment of the phase (UTC, ISO 8601)")
+    phase: str = Field(
+        ..., description="Phase (New Moon, First Quarter, Full Moon, Last Quarter)"
+    )
+    sign: str = Field(..., description="Zodiac sign of the Moon")
+
+
+class VoidOfCourse(BaseModel):
+    """Represents a void-of-course Moon period."""
+
+    start: str = Field(..., description="Last major aspect of the Moon (UTC, ISO 8601)")
+    end: str = Field(..., description="Moon's next sign ingress (UTC, ISO 8601)")
+    planet: Optional[str] = Field(
+        None, description="Planet of the last aspect (None if the whole sign is void)"
+    )
+    aspect: Optional[str] = Field(None, description="Type of the last aspect")
+    sign: str = Field(..., description="Sign the Moon enters at the end")
+
+
+class Eclipse(BaseModel):
+    """Represents a solar or lunar eclipse."""
+
+    time: str = Field(..., description="Moment of greatest eclipse (UTC, ISO 8601)")
+    begin: str = Field(..., description="First contact (UTC, ISO 8601)")
+    end: str = Field(..., description="Last contact (UTC, ISO 8601)")
+    kind: str = Field(..., description="Solar or Lunar")
+    type: str = Field(
+        ..., description="Eclipse type (Total, Annular, Hybrid, Partial, Penumbral)"
+    )
+
+
+class LunarCalendarData(BaseModel):
+    """Represents the lunar calendar events of a date range."""
+
+    phases: List[LunarPhase] = Field(..., description="Lunar phases in the range")
+    void_of_course: List[VoidOfCourse] = Field(
+        ..., description="Void-of-course periods overlapping the range"
+    )
+    eclipses: List[Eclipse] = Field(..., description="Eclipses overlapping the range")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "phases": [
+                    {
+                        "time": "2024-04-08T18:21:00Z",
+                        "phase": "New Moon",
+                        "sign": "Aries",
+                    }
+                ],
+                "void_of_course": [
+                    {
+                        "start": "2024-04-08T18:40:00Z",
+                        "end": "2024-04-09T05:15:00Z",
+                        "planet": "Mercury",
+                        "aspect": "Conjunction",
+                        "sign": "Taurus",
+                    }
+                ],
+                "eclipses": [
+                    {
+                        "time": "2024-04-08T18:17:23Z",
+                        "begin": "2024-04-08T15:42:21Z",
+                        "end": "2024-04-08T20:52:12Z",
+                        "kind": "Solar",
+                        "type": "Total",
+                    }
+                ],
+            }
+        }
+
+
 # Legacy alias for backward compatibility
 NatalChart = ChartData
 
@@ -219,3 +384,397 @@ class BirthInput(BaseModel):
                 "timezone": "America/New_York",
             }
         }
+
+
+class Location(BaseModel):
+    """Represents a place, by city or by coordinates."""
+
+    city: Optional[str] = Field(None, min_length=1, description="City name")
+    country: Optional[str] = Field(None, min_length=1, description="Country name")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, description="Latitude")
+    longitude: Optional[float] = Field(None, ge=-180, le=180, description="Longitude")
+
+    @model_validator(mode="after")
+    def validate_place(self) -> "Location":
+        """Require either city and country or latitude and longitude."""
+        has_city = self.city is not None and self.country is not None
+        has_coordinates = self.latitude is not None and self.longitude is not None
+        if not has_city and not has_coordinates:
+            raise ValueError("Give city and country, or latitude and longitude")
+        return self
+
+
+class RelocationGrid(BaseModel):
+    """Represents a regular latitude/longitude grid of relocation targets."""
+
+    lat_min: float = Field(-60.0, ge=-90, le=90, description="Southern edge")
+    lat_max: float = Field(60.0, ge=-90, le=90, description="Northern edge")
+    lon_min: float = Field(-180.0, ge=-180, le=180, description="Western edge")
+    lon_max: float = Field(180.0, ge=-180, le=180, description="Eastern edge")
+    step: float = Field(5.0, gt=0, le=90, description="Grid spacing in degrees")
+
+
+class RelocationInput(BaseModel):
+    """Represents a relocation request: one birth moment, many places."""
+
+    date: str = Field(
+        ...,
+        pattern=r"^\d{4}-\d{2}-\d{2}$",
+        description="Birth date in YYYY-MM-DD format",
+    )
+    time: str = Field(
+        ...,
+        pattern=r"^\d{2}:\d{2}:\d{2}$",
+        description="Birth time in HH:MM:SS format",
+    )
+    locations: List[Location] = Field(
+        default_factory=list, description="Places to relocate to"
+    )
+    grid: Optional[RelocationGrid] = Field(
+        None, description="Grid of places, after any listed locations"
+    )
+
+    @field_validator("date")
+    @classmethod
+    def validate_date(cls, v: str) -> str:
+        """Validate that date is a valid calendar date."""
+        return BirthInput.validate_date(v)
+
+    @field_validator("time")
+    @classmethod
+    def validate_time(cls, v: str) -> str:
+        """Validate that time is a valid time."""
+        return BirthInput.validate_time(v)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "locations": [
+                    {"city": "London", "country": "UK"},
+                    {"latitude": 35.6762, "longitude": 139.6503},
+                ],
+                "grid": {
+                    "lat_min": -60,
+                    "lat_max": 60,
+                    "lon_min": -180,
+                    "lon_max": 180,
+                    "step": 5,
+                },
+            }
+        }
+
+
+class RelocationData(BaseModel):
+    """Represents relocated houses and angles, one column entry per location."""
+
+    planets: List[str] = Field(..., description="Planet names, in column order")
+    planet_longitudes: List[float] = Field(
+        ..., description="Planet longitudes, shared by every location"
+    )
+    latitudes: List[float] = Field(..., description="Latitude per location")
+    longitudes: List[float] = Field(..., description="Longitude per location")
+    ascendant: List[Optional[float]] = Field(
+        ..., description="Ascendant per location (None where houses are undefined)"
+    )
+    midheaven: List[Optional[float]] = Field(
+        ..., description="Midheaven per location (None where houses are undefined)"
+    )
+    cusps: List[Optional[List[float]]] = Field(
+        ..., description="12 house cusps per location (None where undefined)"
+    )
+    houses: Dict[str, List[int]] = Field(
+        ...,
+        description="Planet name -> house per location (0 where undefined)",
+    )
+
+
+class ElectionalConstraint(BaseModel):
+    """Represents one condition of an electional search."""
+
+    kind: Literal["sign", "house", "aspect", "retrograde", "void_of_course"] = Field(
+        ..., description="Kind of condition"
+    )
+    body: Optional[str] = Field(
+        None, description="Planet, or Ascendant/Midheaven for sign and aspect conditions"
+    )
+    sign: Optional[str] = Field(None, description="Sign the body must be in")
+    house: Optional[int] = Field(None, ge=1, le=12, description="House the body must be in")
+    other: Optional[str] = Field(None, description="Second body of an aspect")
+    aspect: Optional[str] = Field(None, description="Aspect name (e.g., 'Trine')")
+    orb: Optional[float] = Field(
+        None, gt=0, le=15, description="Aspect orb in degrees (default: the chart orb)"
+    )
+    negate: bool = Field(False, description="Require the condition NOT to hold")
+
+    @model_validator(mode="after")
+    def validate_fields(self) -> "ElectionalConstraint":
+        """Require the fields each kind of condition needs."""
+        required = {
+            "sign": ("body", "sign"),
+            "house": ("body", "house"),
+            "aspect": ("body", "other", "aspect"),
+            "retrograde": ("body",),
+            "void_of_course": (),
+        }[self.kind]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.kind} condition needs {', '.join(missing)}")
+        return self
+
+
+class ElectionalInput(BaseModel):
+    """Represents an electional search over a date range."""
+
+    start: str = Field(
+        ...,
+        pattern=r"^\d{4}-\d{2}-\d{2}$",
+        description="First day of the search (UTC, inclusive)",
+    )
+    end: str = Field(
+        ...,
+        pattern=r"^\d{4}-\d{2}-\d{2}$",
+        description="Last day of the search (UTC, exclusive)",
+    )
+    location: Optional[Location] = Field(
+        None, description="Place of house and angle conditions"
+    )
+    constraints: List[ElectionalConstraint] = Field(
+        ..., min_length=1, max_length=16, description="Conditions that must all hold"
+    )
+    min_duration_minutes: float = Field(
+        0.0, ge=0, description="Drop windows shorter than this"
+    )
+
+    @field_validator("start", "end")
+    @classmethod
+    def validate_date(cls, v: str) -> str:
+        """Validate that dates are valid calendar dates."""
+        return BirthInput.validate_date(v)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "start": "2024-01-01",
+                "end": "2024-04-01",
+                "location": {"city": "London", "country": "UK"},
+                "constraints": [
+                    {"kind": "void_of_course", "negate": True},
+                    {"kind": "retrograde", "body": "Venus", "negate": True},
+                    {"kind": "sign", "body": "Ascendant", "sign": "Leo"},
+                ],
+            }
+        }
+
+
+class ElectionalWindow(BaseModel):
+    """Represents a time window in which every condition holds."""
+
+    start: str = Field(..., description="Window start (UTC, ISO 8601)")
+    end: str = Field(..., description="Window end (UTC, ISO 8601)")
+    duration_minutes: float = Field(..., description="Window length in minutes")
+
+
+class ProgressionInput(BaseModel):
+    """Represents a request for progressions over a range of ages."""
+
+    birth: BirthInput = Field(..., description="Natal birth data")
+    start_age: float = Field(0.0, ge=0, le=150, description="First age in years")
+    end_age: float = Field(100.0, ge=0, le=150, description="Last age in years (inclusive)")
+    step: float = Field(1.0, gt=0, le=150, description="Years between snapshots")
+
+    @model_validator(mode="after")
+    def validate_ages(self) -> "ProgressionInput":
+        """Require a non-empty age range."""
+        if self.end_age < self.start_age:
+            raise ValueError("end_age must not be before start_age")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "birth": {
+                    "date": "1990-06-15",
+                    "time": "14:30:00",
+                    "country": "USA",
+                    "city": "New York",
+                },
+                "start_age": 0,
+                "end_age": 100,
+                "step": 1,
+            }
+        }
+
+
+class ProgressionAspect(BaseModel):
+    """Represents an aspect from a progressed or directed body to a natal one."""
+
+    age: float = Field(..., description="Age in years of the snapshot")
+    method: Literal["progressed", "solar_arc"] = Field(
+        ..., description="Secondary progression or solar-arc direction"
+    )
+    body: str = Field(..., description="Progressed or directed body")
+    natal: str = Field(..., description="Natal body or angle")
+    aspect: str = Field(..., description="Aspect type")
+    orb: float = Field(..., ge=0, description="Orb in degrees")
+
+
+class ProgressionData(BaseModel):
+    """Represents progressions and directions, one column entry per age."""
+
+    ages: List[float] = Field(..., description="Age in years per snapshot")
+    dates: List[str] = Field(..., description="Calendar date (UTC) per snapshot")
+    progressed: Dict[str, List[float]] = Field(
+        ..., description="Planet -> secondary-progressed longitude per snapshot"
+    )
+    solar_arc: Dict[str, List[float]] = Field(
+        ...,
+        description="Planet or angle -> solar-arc directed longitude per snapshot",
+    )
+    aspects: List[ProgressionAspect] = Field(
+        ..., description="Aspects to the natal chart, by age"
+    )
+
+
+class ReturnInput(BaseModel):
+    """Represents a request for solar or lunar returns over a range of years."""
+
+    birth: BirthInput = Field(..., description="Natal birth data")
+    body: Literal["Sun", "Moon"] = Field("Sun", description="Sun (solar) or Moon (lunar) returns")
+    start_year: int = Field(..., ge=1, le=9998, description="First year of the range")
+    end_year: int = Field(..., ge=1, le=9998, description="Last year of the range (inclusive)")
+    location: Optional[Location] = Field(
+        None, description="Place the return charts are cast for (default: birth place)"
+    )
+
+    @model_validator(mode="after")
+    def validate_years(self) -> "ReturnInput":
+        """Require a non-empty year range."""
+        if self.end_year < self.start_year:
+            raise ValueError("end_year must not be before start_year")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "birth": {
+                    "date": "1990-06-15",
+                    "time": "14:30:00",
+                    "country": "USA",
+                    "city": "New York",
+                },
+                "body": "Moon",
+                "start_year": 2024,
+                "end_year": 2024,
+                "location": {"city": "London", "country": "UK"},
+            }
+        }
+
+
+class ReturnChart(BaseModel):
+    """Represents one solar or lunar return."""
+
+    time: str = Field(..., description="Exact return (UTC, ISO 8601)")
+    chart: ChartData = Field(..., description="Chart of the return for the chosen place")
+
+
+class RelationshipInput(BaseModel):
+    """Represents the births of a couple or group for relationship charts."""
+
+    members: List[BirthInput] = Field(
+        ...,
+        min_length=2,
+        max_length=50,
+        description="Births; every pair gets a chart",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "members": [
+                    {
+                        "date": "1990-06-15",
+                        "time": "14:30:00",
+                        "country": "USA",
+                        "city": "New York",
+                    },
+                    {
+                        "date": "1988-11-02",
+                        "time": "08:15:00",
+                        "country": "UK",
+                        "city": "London",
+                    },
+                ]
+            }
+        }
+
+
+class RelationshipChart(BaseModel):
+    """Represents the composite or Davison chart of one pair."""
+
+    first: int = Field(..., ge=0, description="Index of the first member")
+    second: int = Field(..., ge=0, description="Index of the second member")
+    chart: ChartData = Field(..., description="Relationship chart of the pair")
+
+
+class HarmonicInput(BaseModel):
+    """Represents a request for the harmonic spectra of a batch of births."""
+
+    births: List[BirthInput] = Field(
+        ..., min_length=1, max_length=1000, description="Births to analyse"
+    )
+    harmonics: Optional[List[int]] = Field(
+        None,
+        min_length=1,
+        description="Harmonic numbers, 1-180 (default: all of 1-180)",
+    )
+    orb: float = Field(
+        8.0, gt=0, le=30, description="Conjunction orb in degrees in the harmonic chart"
+    )
+    include_charts: bool = Field(
+        False,
+        description="Also return the longitudes of every harmonic chart "
+        "(at most 50 births)",
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "births": [
+                    {
+                        "date": "1990-06-15",
+                        "time": "14:30:00",
+                        "country": "USA",
+                        "city": "New York",
+                    }
+                ],
+                "harmonics": [1, 4, 5, 7, 9],
+                "orb": 8.0,
+            }
+        }
+
+
+class HarmonicData(BaseModel):
+    """Represents the harmonic spectrum of one chart, one entry per harmonic."""
+
+    harmonics: List[int] = Field(..., description="Harmonic numbers")
+    strengths: List[float] = Field(
+        ...,
+        description="Summed conjunction weight (1 - separation / orb) of all body pairs "
+        "in each harmonic chart",
+    )
+    charts: Optional[Dict[str, List[float]]] = Field(
+        None, description="Body -> longitude in each harmonic chart, if requested"
+    )
+
+
+class StarConjunction(BaseModel):
+    """Represents a conjunction of a chart body with a fixed star."""
+
+    body: str = Field(..., description="Planet or point name")
+    star: str = Field(..., description="Star name (e.g., 'Regulus')")
+    nomenclature: str = Field(..., description="Star designation (e.g., 'alLeo')")
+    star_longitude: float = Field(..., ge=0, le=360, description="Star's ecliptic longitude")
+    orb: float = Field(..., ge=0, description="Distance in longitude in degrees")
+    magnitude: float = Field(..., description="Visual magnitude of the star")
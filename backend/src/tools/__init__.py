@@ -0,0 +1 @@
+"""Command-line tools for the astro chart generator."""
@@ -0,0 +1,648 @@
+"""
+Accuracy-vs-speed regression harness for chart engines.
+
+An engine is any function `(date, time, latitude, longitude) -> ChartData`.
+The harness builds a deterministic corpus of birth inputs, computes the
+reference chart of each one straight from Swiss Ephemeris (no caches, no
+sorted sweep; see `reference_chart`) and compares engines against it,
+reporting the largest angular error, sign, degree and house mismatches,
+aspect and pattern set differences, and the speedup over the reference.
+
+The corpus mixes five categories, in equal shares:
+
+- random: any moment from 1900 to 2100, latitudes within ±60°;
+- extreme_latitude: latitudes from 60° to 90° north or south, where
+  Placidus houses fail past the polar circles (an engine must then fail
+  too);
+- wraparound: the Sun or Moon within two minutes of 0° Aries;
+- sign_edge: the Sun or Moon within two minutes of a sign boundary;
+- cusp_edge: a planet exactly on the Midheaven (the 10th cusp).
+
+A sign, degree, house or aspect mismatch whose reference value lies
+within the angle tolerance of the boundary it crossed (a cusp, a sign or
+minute boundary, an orb limit) follows from an error the gate already
+accepts; it is reported under `boundary_mismatches` and not gated.
+
+A reference can be recorded once to a JSON-lines file and later engines,
+or a new Swiss Ephemeris build (engine `reference`), compared against
+it. `compare` exits with status 1 when an engine exceeds the thresholds,
+so the same command gates releases.
+
+Usage:
+    python -m src.tools.accuracy record reference.jsonl --cases 5000
+    python -m src.tools.accuracy compare --reference reference.jsonl \\
+        --engine compact --engine sections
+    python -m src.tools.accuracy compare --cases 1000 \\
+        --engine mypackage.fast:chart --max-angle-error 0.01
+"""
+
+import argparse
+import importlib
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import swisseph as swe
+
+from src.core import sky_cache
+from src.core.aspects import separation
+from src.core.calculations import (
+    MAJOR_ASPECTS,
+    PLANETS,
+    _calculate_jd,
+    _degrees_to_sign_components,
+    _degrees_to_zodiac_sign,
+    _get_house_for_position,
+    get_aspects,
+    get_astrological_points,
+    get_house_cusps,
+    get_planet_positions,
+)
+from src.core.compact import POINT_NAMES, build_compact_chart
+from src.core.ingress import jd_to_iso
+from src.core.patterns import detect_patterns
+from src.models import Aspect, ChartData, House, Planet, Point
+
+# (category, date, time, latitude, longitude)
+Case = Tuple[str, str, str, float, float]
+Engine = Callable[[str, str, float, float], ChartData]
+
+CATEGORIES = ("random", "extreme_latitude", "wraparound", "sign_edge", "cusp_edge")
+
+START_JD = 2415020.5  # 1900-01-01
+END_JD = 2488069.5  # 2100-01-01
+
+# Edge cases fall within this many seconds of the crossing
+EDGE_SECONDS = 120
+
+# Default gate: one arcsecond and no mismatches of any kind
+DEFAULT_MAX_ANGLE_ERROR = 1.0 / 3600
+DEFAULT_MAX_MISMATCHES = 0
+
+
+def _case_at(category: str, jd: float, latitude: float, longitude: float) -> Case:
+    """A case at `jd`, rounded to the second like API input."""
+    date_str, time_str = jd_to_iso(jd).rstrip("Z").split("T")
+    return category, date_str, time_str, latitude, longitude
+
+
+def _on_midheaven(jd: float, target: float, latitude: float, longitude: float) -> float:
+    """Geographic longitude near `longitude` at which the Midheaven is at `target`."""
+    for _ in range(8):
+        mc = swe.houses_ex(jd, latitude, longitude, b"P")[1][1]
+        # The MC advances about one degree per degree of geographic longitude
+        longitude += (target - mc + 180) % 360 - 180
+        longitude = (longitude + 180) % 360 - 180
+    return longitude
+
+
+def generate_cases(count: int, seed: int = 0) -> List[Case]:
+    """
+    Deterministic corpus of `count` birth inputs, categories in rotation.
+
+    The same count and seed always give the same corpus.
+    """
+    rng = random.Random(seed)
+    cases = []
+    for n in range(count):
+        category = CATEGORIES[n % len(CATEGORIES)]
+        jd = rng.uniform(START_JD, END_JD)
+        latitude = rng.uniform(-60, 60)
+        longitude = rng.uniform(-180, 180)
+        if category == "extreme_latitude":
+            latitude = rng.choice((-1, 1)) * rng.uniform(60, 90)
+        elif category in ("wraparound", "sign_edge"):
+            target = 0.0 if category == "wraparound" else 30.0 * rng.randrange(1, 12)
+            if rng.random() < 0.5:
+                crossing = swe.solcross_ut(target, jd)
+            else:
+                crossing = swe.mooncross_ut(target, jd)
+            jd = crossing + rng.uniform(-EDGE_SECONDS, EDGE_SECONDS) / 86400
+        elif category == "cusp_edge":
+            # Round first so the planet is placed for the moment actually charted
+            jd = _calculate_jd(*_case_at(category, jd, 0, 0)[1:3])
+            planet_id = rng.choice(list(PLANETS.values()))
+            target = swe.calc_ut(jd, planet_id)[0][0] % 360
+            longitude = _on_midheaven(jd, target, latitude, longitude)
+        cases.append(_case_at(category, jd, latitude, longitude))
+    return cases
+
+
+def reference_chart(
+    date_str: str,
+    time_str: str,
+    latitude: float,
+    longitude: float,
+) -> ChartData:
+    """
+    Chart straight from Swiss Ephemeris, with none of the fast paths.
+
+    One calc_ut per planet and one houses_ex per chart with no caching,
+    and aspects from the plain pair loop over MAJOR_ASPECTS (first
+    matching aspect in table order).
+    """
+    jd = _calculate_jd(date_str, time_str)
+    cusp_values, ascmc = swe.houses_ex(jd, latitude, longitude, b"P")
+    cusps = [lon % 360 for lon in cusp_values[:12]]
+
+    planets = []
+    for name, planet_id in PLANETS.items():
+        lon = swe.calc_ut(jd, planet_id)[0][0] % 360
+        sign, degree, minute = _degrees_to_sign_components(lon)
+        planets.append(
+            Planet(
+                name=name,
+                longitude=lon,
+                sign=sign,
+                degree=degree,
+                minute=minute,
+                house=_get_house_for_position(lon, cusps),
+            )
+        )
+
+    asc_lon, mc_lon = ascmc[0] % 360, ascmc[1] % 360
+    points = []
+    for name, lon in zip(
+        POINT_NAMES, (asc_lon, (asc_lon + 180) % 360, mc_lon, (mc_lon + 180) % 360)
+    ):
+        sign, degree, minute = _degrees_to_sign_components(lon)
+        points.append(Point(name=name, longitude=lon, sign=sign, degree=degree, minute=minute))
+
+    bodies = [(body.name, body.longitude) for body in [*planets, *points]]
+    aspects = []
+    for i in range(len(bodies)):
+        for j in range(i + 1, len(bodies)):
+            distance = separation(bodies[i][1], bodies[j][1])
+            for angle, (aspect_name, orb) in MAJOR_ASPECTS.items():
+                if abs(distance - angle) <= orb:
+                    aspects.append(
+                        Aspect(
+                            planet1=bodies[i][0],
+                            planet2=bodies[j][0],
+                            type=aspect_name,
+                            orb=abs(distance - angle),
+                        )
+                    )
+                    break
+
+    chart = ChartData(
+        planets=planets,
+        points=points,
+        houses=[
+            House(number=n, longitude=lon, sign=_degrees_to_zodiac_sign(lon))
+            for n, lon in enumerate(cusps, start=1)
+        ],
+        aspects=aspects,
+    )
+    chart.patterns = detect_patterns(chart)
+    return chart
+
+
+def _sections_chart(
+    date_str: str,
+    time_str: str,
+    latitude: float,
+    longitude: float,
+) -> ChartData:
+    """Chart from the public per-section helpers of src.core.calculations."""
+    houses = get_house_cusps(date_str, time_str, latitude, longitude)
+    planets = get_planet_positions(
+        date_str, time_str, latitude, longitude, [h.longitude for h in houses]
+    )
+    points = get_astrological_points(date_str, time_str, latitude, longitude)
+    chart = ChartData(
+        planets=planets,
+        points=points,
+        houses=houses,
+        aspects=get_aspects(planets, points),
+    )
+    chart.patterns = detect_patterns(chart)
+    return chart
+
+
+def _compact_chart(
+    date_str: str,
+    time_str: str,
+    latitude: float,
+    longitude: float,
+) -> ChartData:
+    jd = _calculate_jd(date_str, time_str)
+    return build_compact_chart(jd, latitude, longitude, patterns=True).to_chart_data()
+
+
+ENGINES: Dict[str, Engine] = {
+    "reference": reference_chart,
+    "sections": _sections_chart,
+    "compact": _compact_chart,
+}
+
+
+def load_engine(spec: str) -> Engine:
+    """An engine by name (see ENGINES) or as "module:function"."""
+    if spec in ENGINES:
+        return ENGINES[spec]
+    module_name, sep, attribute = spec.partition(":")
+    if not sep:
+        raise ValueError(
+            f"Unknown engine {spec!r}: use one of {', '.join(ENGINES)} or module:function"
+        )
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+# Chart of a case, or the error it raised
+Outcome = Tuple[Optional[ChartData], Optional[str]]
+
+
+def run_engine(engine: Engine, cases: Sequence[Case]) -> Tuple[List[Outcome], float]:
+    """
+    Run an engine over every case from empty caches.
+
+    Returns:
+        (outcome per case, seconds taken)
+    """
+    sky_cache.sky_tier.clear()
+    sky_cache.house_tier.clear()
+    outcomes: List[Outcome] = []
+    started = time.perf_counter()
+    for _, date_str, time_str, latitude, longitude in cases:
+        try:
+            outcomes.append((engine(date_str, time_str, latitude, longitude), None))
+        except Exception as e:
+            outcomes.append((None, f"{type(e).__name__}: {e}"))
+    return outcomes, time.perf_counter() - started
+
+
+def _aspect_set(chart: ChartData) -> Dict[Tuple[frozenset, str], float]:
+    return {(frozenset((a.planet1, a.planet2)), a.type): a.orb for a in chart.aspects}
+
+
+def _pattern_set(chart: ChartData) -> set:
+    return {(p.type, tuple(sorted(p.bodies)), p.apex) for p in chart.patterns}
+
+
+def _to_grid(lon: float, step: float) -> float:
+    """Distance from a longitude to the nearest multiple of `step` degrees."""
+    offset = lon % step
+    return min(offset, step - offset)
+
+
+_ORB_LIMITS = {name: orb for name, orb in MAJOR_ASPECTS.values()}
+
+
+def compare_charts(
+    expected: ChartData,
+    actual: ChartData,
+    tolerance: float = DEFAULT_MAX_ANGLE_ERROR,
+) -> Dict[str, Any]:
+    """
+    Differences between a reference chart and an engine's chart.
+
+    Bodies are matched by name and houses by number. Mismatches at a
+    boundary within `tolerance` degrees of the reference value are
+    counted as boundary_mismatches only.
+
+    Returns:
+        Mismatch counts, the largest angular error (degrees) and the body
+        it was found on, and the largest orb error of the shared aspects
+    """
+    diff: Dict[str, Any] = {
+        "max_angle_error": 0.0,
+        "worst_body": None,
+        "missing_bodies": 0,
+        "sign_mismatches": 0,
+        "degree_mismatches": 0,
+        "house_mismatches": 0,
+        "aspects_missing": 0,
+        "aspects_extra": 0,
+        "boundary_mismatches": 0,
+    }
+
+    def angle(name: str, lon1: float, lon2: float) -> None:
+        error = separation(lon1, lon2)
+        if error > diff["max_angle_error"]:
+            diff["max_angle_error"] = error
+            diff["worst_body"] = name
+
+    def mismatch(counter: str, distance_to_boundary: float) -> None:
+        diff["boundary_mismatches" if distance_to_boundary <= tolerance else counter] += 1
+
+    cusp_longitudes = [house.longitude for house in expected.houses]
+    for kind in ("planets", "points"):
+        found = {body.name: body for body in getattr(actual, kind)}
+        for body in getattr(expected, kind):
+            other = found.get(body.name)
+            if other is None:
+                diff["missing_bodies"] += 1
+                continue
+            angle(body.name, body.longitude, other.longitude)
+            if body.sign != other.sign:
+                mismatch("sign_mismatches", _to_grid(body.longitude, 30))
+            elif (body.degree, body.minute) != (other.degree, other.minute):
+                mismatch("degree_mismatches", _to_grid(body.longitude, 1 / 60))
+            if kind == "planets" and body.house != other.house:
+                mismatch(
+                    "house_mismatches",
+                    min(separation(body.longitude, cusp) for cusp in cusp_longitudes),
+                )
+
+    cusps = {house.number: house for house in actual.houses}
+    for house in expected.houses:
+        other = cusps.get(house.number)
+        if other is None:
+            diff["missing_bodies"] += 1
+            continue
+        angle(f"House {house.number}", house.longitude, other.longitude)
+        if house.sign != other.sign:
+            mismatch("sign_mismatches", _to_grid(house.longitude, 30))
+
+    expected_aspects, actual_aspects = _aspect_set(expected), _aspect_set(actual)
+    for counter, aspects, others in (
+        ("aspects_missing", expected_aspects, actual_aspects),
+        ("aspects_extra", actual_aspects, expected_aspects),
+    ):
+        for key, orb in aspects.items():
+            if key not in others:
+                # Two longitudes each off by up to `tolerance`
+                mismatch(counter, abs(_ORB_LIMITS[key[1]] - orb) / 2)
+    diff["max_orb_error"] = max(
+        (
+            abs(orb - actual_aspects[key])
+            for key, orb in expected_aspects.items()
+            if key in actual_aspects
+        ),
+        default=0.0,
+    )
+    diff["pattern_mismatch"] = _pattern_set(expected) != _pattern_set(actual)
+    return diff
+
+
+# Counters summed over cases; any of them above the gate fails it
+MISMATCH_COUNTERS = (
+    "error_mismatches",
+    "missing_bodies",
+    "sign_mismatches",
+    "degree_mismatches",
+    "house_mismatches",
+    "aspect_mismatches",
+    "pattern_mismatches",
+)
+
+
+def evaluate(
+    cases: Sequence[Case],
+    reference: Sequence[Outcome],
+    outcomes: Sequence[Outcome],
+    tolerance: float = DEFAULT_MAX_ANGLE_ERROR,
+) -> Dict[str, Any]:
+    """Aggregate the differences of an engine's outcomes from the reference."""
+    report: Dict[str, Any] = {name: 0 for name in MISMATCH_COUNTERS}
+    report.update(
+        {
+            "cases": len(cases),
+            "expected_errors": 0,
+            "boundary_mismatches": 0,
+            "aspects_missing": 0,
+            "aspects_extra": 0,
+            "max_angle_error": 0.0,
+            "max_orb_error": 0.0,
+            "worst": None,
+        }
+    )
+    by_category = {
+        category: {"cases": 0, "mismatched_cases": 0, "max_angle_error": 0.0}
+        for category in CATEGORIES
+    }
+
+    for case, (expected, _), (actual, _) in zip(cases, reference, outcomes):
+        category = by_category.setdefault(
+            case[0], {"cases": 0, "mismatched_cases": 0, "max_angle_error": 0.0}
+        )
+        category["cases"] += 1
+        if expected is None or actual is None:
+            if expected is None and actual is None:
+                report["expected_errors"] += 1
+            else:
+                report["error_mismatches"] += 1
+                category["mismatched_cases"] += 1
+            continue
+
+        diff = compare_charts(expected, actual, tolerance)
+        for name in ("missing_bodies", "sign_mismatches", "degree_mismatches", "house_mismatches"):
+            report[name] += diff[name]
+        report["aspects_missing"] += diff["aspects_missing"]
+        report["aspects_extra"] += diff["aspects_extra"]
+        aspects_differ = bool(diff["aspects_missing"] or diff["aspects_extra"])
+        report["aspect_mismatches"] += aspects_differ
+        if diff["pattern_mismatch"]:
+            # Patterns are built from the aspects: boundary aspects explain them
+            if aspects_differ or not diff["boundary_mismatches"]:
+                report["pattern_mismatches"] += 1
+            else:
+                diff["boundary_mismatches"] += 1
+        report["boundary_mismatches"] += diff["boundary_mismatches"]
+        report["max_orb_error"] = max(report["max_orb_error"], diff["max_orb_error"])
+        if diff["max_angle_error"] > report["max_angle_error"]:
+            report["max_angle_error"] = diff["max_angle_error"]
+            report["worst"] = {
+                "category": case[0],
+                "date": case[1],
+                "time": case[2],
+                "latitude": case[3],
+                "longitude": case[4],
+                "body": diff["worst_body"],
+            }
+        category["max_angle_error"] = max(category["max_angle_error"], diff["max_angle_error"])
+        if (
+            diff["missing_bodies"]
+            or diff["sign_mismatches"]
+            or diff["degree_mismatches"]
+            or diff["house_mismatches"]
+            or aspects_differ
+            or (diff["pattern_mismatch"] and not diff["boundary_mismatches"])
+        ):
+            category["mismatched_cases"] += 1
+
+    report["by_category"] = by_category
+    return report
+
+
+def compare_engines(
+    cases: Sequence[Case],
+    reference: Sequence[Outcome],
+    engines: Dict[str, Engine],
+    max_angle_error: float = DEFAULT_MAX_ANGLE_ERROR,
+    max_mismatches: int = DEFAULT_MAX_MISMATCHES,
+    min_speedup: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Compare engines against reference outcomes and apply the gate.
+
+    Speedups are relative to `reference_chart` timed on the same corpus in
+    this process.
+
+    Returns:
+        {"engines": report per engine, "reference_us_per_chart": ...,
+        "regressions": ["engine: metric", ...]}
+    """
+    _, reference_seconds = run_engine(reference_chart, cases)
+    reference_us = reference_seconds / len(cases) * 1e6
+
+    reports = {}
+    regressions = []
+    for name, engine in engines.items():
+        outcomes, seconds = run_engine(engine, cases)
+        report = evaluate(cases, reference, outcomes, max_angle_error)
+        report["us_per_chart"] = round(seconds / len(cases) * 1e6, 1)
+        report["speedup"] = round(reference_seconds / seconds, 2) if seconds else None
+        reports[name] = report
+
+        if report["max_angle_error"] > max_angle_error:
+            regressions.append(f"{name}: max_angle_error")
+        regressions.extend(
+            f"{name}: {counter}"
+            for counter in MISMATCH_COUNTERS
+            if report[counter] > max_mismatches
+        )
+        if min_speedup is not None and (report["speedup"] or 0) < min_speedup:
+            regressions.append(f"{name}: speedup")
+
+    return {
+        "cases": len(cases),
+        "reference_us_per_chart": round(reference_us, 1),
+        "thresholds": {
+            "max_angle_error": max_angle_error,
+            "max_mismatches": max_mismatches,
+            "min_speedup": min_speedup,
+        },
+        "engines": reports,
+        "regressions": regressions,
+    }
+
+
+def write_reference(
+    path: str,
+    cases: Sequence[Case],
+    outcomes: Sequence[Outcome],
+    settings: Dict[str, Any],
+) -> None:
+    """Write a corpus and its reference outcomes as JSON lines (settings first)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({**settings, "swisseph": swe.version}) + "\n")
+        for (category, date_str, time_str, latitude, longitude), (chart, error) in zip(
+            cases, outcomes
+        ):
+            record = {
+                "category": category,
+                "date": date_str,
+                "time": time_str,
+                "latitude": latitude,
+                "longitude": longitude,
+                "chart": None if chart is None else chart.model_dump(),
+                "error": error,
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def read_reference(path: str) -> Tuple[Dict[str, Any], List[Case], List[Outcome]]:
+    """Read a file written by write_reference: (settings, cases, outcomes)."""
+    with open(path, encoding="utf-8") as f:
+        lines: Iterable[str] = (line for line in f if line.strip())
+        settings = json.loads(next(lines))
+        cases: List[Case] = []
+        outcomes: List[Outcome] = []
+        for line in lines:
+            record = json.loads(line)
+            cases.append(
+                (
+                    record["category"],
+                    record["date"],
+                    record["time"],
+                    record["latitude"],
+                    record["longitude"],
+                )
+            )
+            chart = record["chart"]
+            outcomes.append(
+                (None if chart is None else ChartData.model_validate(chart), record["error"])
+            )
+    return settings, cases, outcomes
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.accuracy",
+        description="Compare chart engines against a Swiss Ephemeris reference.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Write a corpus and its reference charts")
+    record.add_argument("reference_file", help="Output JSON-lines file")
+    record.add_argument("--cases", type=int, default=5000)
+    record.add_argument("--seed", type=int, default=0)
+
+    compare = commands.add_parser("compare", help="Compare engines against the reference")
+    compare.add_argument("--reference", help="File written by `record` (default: compute now)")
+    compare.add_argument("--cases", type=int, default=1000, help="Corpus size without --reference")
+    compare.add_argument("--seed", type=int, default=0)
+    compare.add_argument(
+        "--engine",
+        action="append",
+        help=f"{', '.join(ENGINES)} or module:function; repeatable (default: compact)",
+    )
+    compare.add_argument(
+        "--max-angle-error",
+        type=float,
+        default=DEFAULT_MAX_ANGLE_ERROR,
+        help="Largest tolerated angular error in degrees",
+    )
+    compare.add_argument(
+        "--max-mismatches",
+        type=int,
+        default=DEFAULT_MAX_MISMATCHES,
+        help="Largest tolerated count of each kind of mismatch",
+    )
+    compare.add_argument("--min-speedup", type=float, help="Required speedup over the reference")
+    compare.add_argument("--output", "-o", help="Report path (default: stdout)")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "record":
+        cases = generate_cases(args.cases, args.seed)
+        outcomes, _ = run_engine(reference_chart, cases)
+        write_reference(
+            args.reference_file, cases, outcomes, {"cases": args.cases, "seed": args.seed}
+        )
+        print(f"{len(cases)} cases written to {args.reference_file}", file=sys.stderr)
+        return 0
+
+    if args.reference:
+        _, cases, reference = read_reference(args.reference)
+    else:
+        cases = generate_cases(args.cases, args.seed)
+        reference, _ = run_engine(reference_chart, cases)
+    engines = {spec: load_engine(spec) for spec in args.engine or ["compact"]}
+    result = compare_engines(
+        cases,
+        reference,
+        engines,
+        max_angle_error=args.max_angle_error,
+        max_mismatches=args.max_mismatches,
+        min_speedup=args.min_speedup,
+    )
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if result["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
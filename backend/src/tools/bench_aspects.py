@@ -0,0 +1,98 @@
+"""
+Compare the pair loop and the sorted sweep of src.core.aspects.
+
+Times both aspect searches on random longitudes for a range of body
+counts (the default 14-body chart and the 22-body extended chart
+included), with the major and the quincunx tables, and reports
+microseconds per search as JSON. Each size also records which search
+`find_aspects` picks (SWEEP_MIN_BODIES) and whether that is the faster
+one.
+
+Usage:
+    python -m src.tools.bench_aspects --sizes 14,22,40,100
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.core.aspects import SWEEP_MIN_BODIES, AspectTable, _pair_aspects, _sweep_aspects
+from src.core.calculations import MAJOR_ASPECTS, PLANETS
+from src.core.compact import BODY_NAMES, POINT_NAMES
+from src.core.patterns import MINOR_ASPECTS
+
+# Bodies of the default chart (planets and angles) and of the extended chart
+DEFAULT_SIZE = len(PLANETS) + len(POINT_NAMES)
+EXTENDED_SIZE = len(BODY_NAMES)
+
+TABLES: Dict[str, AspectTable] = {"major": MAJOR_ASPECTS, "quincunx": MINOR_ASPECTS}
+
+
+def _time(search: Callable[..., Any], charts: List[List[float]], table: AspectTable) -> float:
+    """Mean microseconds per search over `charts`, best of three passes."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for longitudes in charts:
+            search(longitudes, table)
+        best = min(best, time.perf_counter() - started)
+    return round(best / len(charts) * 1e6, 1)
+
+
+def run_benchmark(sizes: Sequence[int], charts: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """Benchmark both searches for every size and table."""
+    rng = random.Random(seed)
+    results: Dict[str, Any] = {
+        "default_bodies": DEFAULT_SIZE,
+        "extended_bodies": EXTENDED_SIZE,
+        "sweep_min_bodies": SWEEP_MIN_BODIES,
+        "tables": {},
+    }
+    for name, table in TABLES.items():
+        rows = []
+        for size in sizes:
+            sample = [[rng.uniform(0, 360) for _ in range(size)] for _ in range(charts)]
+            pair_us = _time(_pair_aspects, sample, table)
+            sweep_us = _time(_sweep_aspects, sample, table)
+            chosen = "sweep" if size >= SWEEP_MIN_BODIES else "pair"
+            rows.append(
+                {
+                    "bodies": size,
+                    "pair_us": pair_us,
+                    "sweep_us": sweep_us,
+                    "chosen": chosen,
+                    "chosen_is_faster": (pair_us <= sweep_us) == (chosen == "pair"),
+                }
+            )
+        results["tables"][name] = rows
+    return results
+
+
+def _sizes(text: str) -> List[int]:
+    return sorted({int(part) for part in text.split(",") if part.strip()})
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.bench_aspects",
+        description="Compare the pair-loop and sorted-sweep aspect searches.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=[DEFAULT_SIZE, EXTENDED_SIZE, 30, 40, 60, 100],
+        help='Body counts, e.g. "14,22,40,100"',
+    )
+    parser.add_argument("--charts", type=int, default=200, help="Random charts per size")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_benchmark(args.sizes, args.charts), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Compare the pydantic and compact chart representations.
+
+Builds the same set of charts as `ChartData` (the original per-section
+helpers) and as `CompactChart`, and reports build time, retained memory
+per chart and pickled size as JSON. The `selections` section times the
+common field selections of /chart (`fields`/`bodies`) against the full
+chart, each starting from empty caches.
+
+Usage:
+    python -m src.tools.bench_compact --charts 2000
+"""
+
+import argparse
+import gc
+import json
+import pickle
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.core import sky_cache
+from src.core.calculations import (
+    CITY_COORDS,
+    get_aspects,
+    get_astrological_points,
+    get_house_cusps,
+    get_planet_positions,
+)
+from src.core.compact import calculate_compact_chart
+from src.models import ChartData
+
+Case = Tuple[str, str, str, str]
+
+# name -> (fields, bodies) as accepted by calculate_compact_chart
+SELECTIONS: Dict[str, Tuple[Optional[List[str]], Optional[List[str]]]] = {
+    "full": (None, None),
+    "full_patterns": (["planets", "points", "houses", "aspects", "patterns"], None),
+    "planets": (["planets"], None),
+    "planets_points": (["planets", "points"], None),
+    "sun_moon_ascendant": (["planets", "points"], ["Sun", "Moon", "Ascendant"]),
+    "houses": (["houses"], None),
+    "aspects": (["aspects"], None),
+}
+
+
+def _legacy_chart(date_str: str, time_str: str, country: str, city: str) -> ChartData:
+    latitude, longitude = CITY_COORDS[(city, country)]
+    houses = get_house_cusps(date_str, time_str, latitude, longitude)
+    planets = get_planet_positions(
+        date_str, time_str, latitude, longitude, [h.longitude for h in houses]
+    )
+    points = get_astrological_points(date_str, time_str, latitude, longitude)
+    return ChartData(
+        planets=planets,
+        points=points,
+        houses=houses,
+        aspects=get_aspects(planets, points),
+    )
+
+
+def _cases(count: int) -> List[Case]:
+    locations = sorted(CITY_COORDS)
+    cases = []
+    for n in range(count):
+        city, country = locations[n % len(locations)]
+        year = 1950 + n % 70
+        month = 1 + n % 12
+        day = 1 + n % 28
+        cases.append(
+            (f"{year:04d}-{month:02d}-{day:02d}", f"{n % 24:02d}:{n % 60:02d}:00", country, city)
+        )
+    return cases
+
+
+def _measure(build: Callable[..., Any], cases: List[Case]) -> Dict[str, float]:
+    """Time `build` over `cases` and measure the memory its results retain."""
+    started = time.perf_counter()
+    for case in cases:
+        build(*case)
+    elapsed = time.perf_counter() - started
+
+    # Separate pass: tracemalloc slows allocation-heavy code considerably
+    gc.collect()
+    tracemalloc.start()
+    charts = [build(*case) for case in cases]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pickled = sum(len(pickle.dumps(chart)) for chart in charts[:100])
+    return {
+        "us_per_chart": round(elapsed / len(cases) * 1e6, 1),
+        "bytes_per_chart": round(retained / len(cases)),
+        "pickle_bytes_per_chart": round(pickled / min(len(charts), 100)),
+    }
+
+
+def _measure_selection(
+    fields: Optional[List[str]],
+    bodies: Optional[List[str]],
+    cases: List[Case],
+) -> Dict[str, float]:
+    """Time a field selection through to ChartData, from empty caches."""
+    sky_cache.sky_tier.clear()
+    sky_cache.house_tier.clear()
+    return _measure(
+        lambda *case: calculate_compact_chart(*case, fields=fields, bodies=bodies).to_chart_data(),
+        cases,
+    )
+
+
+def run_benchmark(count: int = 1000) -> Dict[str, Any]:
+    """Benchmark both representations and the field selections over `count` charts."""
+    cases = _cases(count)
+    # Warm up the ephemeris and imports before timing
+    _legacy_chart(*cases[0])
+    calculate_compact_chart(*cases[0])
+
+    return {
+        "charts": count,
+        "chart_data": _measure(_legacy_chart, cases),
+        "compact": _measure(calculate_compact_chart, cases),
+        "compact_to_chart_data": _measure(
+            lambda *case: calculate_compact_chart(*case).to_chart_data(), cases
+        ),
+        "selections": {
+            name: _measure_selection(fields, bodies, cases)
+            for name, (fields, bodies) in SELECTIONS.items()
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.bench_compact",
+        description="Compare the pydantic and compact chart representations.",
+    )
+    parser.add_argument("--charts", type=int, default=1000, help="Charts to build per variant")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_benchmark(args.charts), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
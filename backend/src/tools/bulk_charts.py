@@ -0,0 +1,390 @@
+"""
+Bulk natal chart computation from CSV or Parquet birth records.
+
+Streams the input in fixed-size chunks, computes each chunk in a worker
+process with `calculate_compact_chart` (no pydantic models), and writes one
+flat columnar part file per chunk (per-body longitude, sign and house, point
+and cusp longitudes, and the aspect and aspect-pattern lists). Only a
+bounded number of chunks is in flight, so memory stays constant regardless
+of input size.
+
+Part files are written atomically, so an interrupted run can be restarted
+with the same arguments and continues after the last completed chunks.
+
+Input records need `date` (YYYY-MM-DD), `time` (HH:MM:SS), `country` and
+`city` columns; an optional `id` column is copied to the output. Parquet
+input/output requires the optional `pyarrow` package.
+
+`--fields` and `--bodies` compute only part of each chart (see
+src.core.compact.build_partial_chart); the schema stays the same and the
+columns of the parts not computed are left empty. The pattern columns are
+only filled when `patterns` is among the fields.
+
+Usage:
+    python -m src.tools.bulk_charts births.csv out/ --format parquet \\
+        --chunk-size 10000 --workers 8
+    python -m src.tools.bulk_charts births.csv out/ --fields planets \\
+        --bodies Sun,Moon
+    python -m src.tools.bulk_charts births.csv out/ \\
+        --fields planets,points,houses,aspects,patterns
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from src.core.calculations import PLANETS, ZODIAC_SIGNS
+from src.core.compact import (
+    ASPECT_NAMES,
+    POINT_NAMES,
+    calculate_compact_chart,
+    chart_selection,
+)
+from src.core.patterns import PATTERN_TYPES
+
+logger = logging.getLogger(__name__)
+
+INPUT_FIELDS = ("date", "time", "country", "city")
+MANIFEST_NAME = "_manifest.json"
+
+# List-valued columns (joined with CSV_LIST_SEPARATOR in CSV output)
+LIST_COLUMNS = (
+    "aspect_body1",
+    "aspect_body2",
+    "aspect_type",
+    "aspect_orb",
+    "pattern_type",
+    "pattern_bodies",
+    "pattern_apex",
+)
+# Separator between the bodies of one pattern in `pattern_bodies`
+PATTERN_BODY_SEPARATOR = "/"
+CSV_LIST_SEPARATOR = ";"
+
+
+def _column_prefix(name: str) -> str:
+    return name.lower().replace(" ", "_")
+
+
+def output_columns() -> List[str]:
+    """Flat output schema, in column order."""
+    columns = ["id", *INPUT_FIELDS]
+    for name in PLANETS:
+        prefix = _column_prefix(name)
+        columns += [f"{prefix}_longitude", f"{prefix}_sign", f"{prefix}_house"]
+    for name in POINT_NAMES:
+        prefix = _column_prefix(name)
+        columns += [f"{prefix}_longitude", f"{prefix}_sign"]
+    columns += [f"house_{n}_longitude" for n in range(1, 13)]
+    columns += ["aspect_body1", "aspect_body2", "aspect_type", "aspect_orb"]
+    columns += ["pattern_type", "pattern_bodies", "pattern_apex", "error"]
+    return columns
+
+
+def _chart_row(
+    record: Dict[str, Any],
+    fields: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Compute one record (or the selected parts of it) into a flat output row."""
+    record_id = record.get("id")
+    row: Dict[str, Any] = {"id": None if record_id is None else str(record_id)}
+    for field in INPUT_FIELDS:
+        value = record.get(field)
+        row[field] = None if value is None else str(value)
+
+    try:
+        chart = calculate_compact_chart(
+            str(record["date"]),
+            str(record["time"]),
+            str(record["country"]),
+            str(record["city"]),
+            fields=fields,
+            bodies=bodies,
+        )
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+        for name in LIST_COLUMNS:
+            row[name] = []
+        return row
+
+    names = chart.names()
+    for slot in chart.field_slots("planets"):
+        prefix = _column_prefix(names[slot])
+        row[f"{prefix}_longitude"] = chart.longitudes[slot]
+        row[f"{prefix}_sign"] = ZODIAC_SIGNS[chart.signs[slot]]
+        row[f"{prefix}_house"] = chart.houses[slot]
+    for slot in chart.field_slots("points"):
+        prefix = _column_prefix(names[slot])
+        row[f"{prefix}_longitude"] = chart.longitudes[slot]
+        row[f"{prefix}_sign"] = ZODIAC_SIGNS[chart.signs[slot]]
+    for n, lon in enumerate(chart.cusps, start=1):
+        row[f"house_{n}_longitude"] = lon
+    aspects = list(chart.iter_aspects()) if "aspects" in chart.fields else []
+    row["aspect_body1"] = [names[i] for i, _, _, _ in aspects]
+    row["aspect_body2"] = [names[j] for _, j, _, _ in aspects]
+    row["aspect_type"] = [ASPECT_NAMES[code] for _, _, code, _ in aspects]
+    row["aspect_orb"] = [orb for _, _, _, orb in aspects]
+    row["pattern_type"] = [PATTERN_TYPES[code] for code, _, _ in chart.patterns]
+    row["pattern_bodies"] = [
+        PATTERN_BODY_SEPARATOR.join(names[i] for i in bodies) for _, bodies, _ in chart.patterns
+    ]
+    row["pattern_apex"] = [names[apex] if apex >= 0 else "" for _, _, apex in chart.patterns]
+    row["error"] = None
+    return row
+
+
+def _part_path(output_dir: str, index: int, fmt: str) -> str:
+    return os.path.join(output_dir, f"part-{index:06d}.{fmt}")
+
+
+def _write_csv(path: str, rows: List[Dict[str, Any]]) -> None:
+    columns = output_columns()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            flat = dict(row)
+            for name in LIST_COLUMNS:
+                flat[name] = CSV_LIST_SEPARATOR.join(str(v) for v in row.get(name) or [])
+            writer.writerow(flat)
+
+
+def _parquet_schema() -> Any:
+    """Explicit schema, so chunks made only of failed rows still match."""
+    import pyarrow as pa
+
+    fields = []
+    for name in output_columns():
+        if name == "aspect_orb":
+            kind = pa.list_(pa.float64())
+        elif name in LIST_COLUMNS:
+            kind = pa.list_(pa.string())
+        elif name.endswith("_longitude"):
+            kind = pa.float64()
+        elif name.endswith("_house"):
+            kind = pa.int8()
+        else:
+            kind = pa.string()
+        fields.append(pa.field(name, kind))
+    return pa.schema(fields)
+
+
+def _write_parquet(path: str, rows: List[Dict[str, Any]]) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    table = pa.table(
+        {name: [row.get(name) for row in rows] for name in schema.names}, schema=schema
+    )
+    pq.write_table(table, path)
+
+
+def compute_chunk(
+    index: int,
+    records: List[Dict[str, Any]],
+    output_dir: str,
+    fmt: str,
+    fields: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Compute one chunk and write its part file atomically.
+
+    Runs in a worker process; only the row count travels back.
+    """
+    rows = [_chart_row(record, fields, bodies) for record in records]
+    path = _part_path(output_dir, index, fmt)
+    tmp_path = f"{path}.tmp"
+    if fmt == "parquet":
+        _write_parquet(tmp_path, rows)
+    else:
+        _write_csv(tmp_path, rows)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def read_records(
+    path: str,
+    input_format: str = "auto",
+    batch_size: int = 10000,
+) -> Iterator[Dict[str, Any]]:
+    """Stream birth records from a CSV or Parquet file."""
+    if input_format == "auto":
+        input_format = "parquet" if path.endswith((".parquet", ".pq")) else "csv"
+
+    if input_format == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet input requires the 'pyarrow' package") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def _chunks(records: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _check_manifest(output_dir: str, settings: Dict[str, Any], resume: bool) -> None:
+    """Refuse to resume into a directory written with different settings."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if resume and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous != settings:
+            raise ValueError(
+                f"{output_dir} was written with different settings; "
+                "use a new output directory or --no-resume"
+            )
+        return
+    if not resume:
+        for name in os.listdir(output_dir):
+            if name.startswith("part-"):
+                os.remove(os.path.join(output_dir, name))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+
+
+def run_bulk(
+    input_path: str,
+    output_dir: str,
+    output_format: str = "csv",
+    input_format: str = "auto",
+    chunk_size: int = 10000,
+    workers: Optional[int] = None,
+    resume: bool = True,
+    fields: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+) -> Dict[str, int]:
+    """
+    Compute charts for every record of `input_path` into `output_dir`.
+
+    `fields` and `bodies` restrict each chart to part of its output (see
+    src.core.compact.chart_selection); by default charts are complete.
+
+    Returns:
+        Counts of chunks computed and skipped and rows written this run
+    """
+    if output_format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown output format: {output_format}")
+    if output_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("Parquet output requires the 'pyarrow' package") from e
+
+    settings: Dict[str, Any] = {
+        "input": os.path.abspath(input_path),
+        "chunk_size": chunk_size,
+        "format": output_format,
+        "columns": output_columns(),
+    }
+    if fields is not None or bodies is not None:
+        # Validate up front rather than failing every row in the workers
+        fields, bodies = chart_selection(fields, bodies)
+        settings["fields"] = list(fields)
+        settings["bodies"] = list(bodies)
+
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    _check_manifest(output_dir, settings, resume)
+
+    stats = {"chunks_computed": 0, "chunks_skipped": 0, "rows": 0}
+    max_in_flight = workers * 2
+    in_flight: Dict[Future, int] = {}
+    started = time.perf_counter()
+
+    def drain(return_when: str) -> None:
+        done, _ = wait(list(in_flight), return_when=return_when)
+        for future in done:
+            index = in_flight.pop(future)
+            stats["rows"] += future.result()
+            stats["chunks_computed"] += 1
+            logger.info(
+                f"Chunk {index} done ({stats['rows']} rows, "
+                f"{stats['rows'] / (time.perf_counter() - started):.0f} rows/s)"
+            )
+
+    records = read_records(input_path, input_format, batch_size=chunk_size)
+    # spawn: forking after pyarrow has started its thread pools can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for index, chunk in enumerate(_chunks(records, chunk_size)):
+            if resume and os.path.exists(_part_path(output_dir, index, output_format)):
+                stats["chunks_skipped"] += 1
+                continue
+            if len(in_flight) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+            future = executor.submit(
+                compute_chunk, index, chunk, output_dir, output_format, fields, bodies
+            )
+            in_flight[future] = index
+        while in_flight:
+            drain(FIRST_COMPLETED)
+
+    return stats
+
+
+def _name_list(value: Optional[str]) -> Optional[List[str]]:
+    return None if value is None else [name.strip() for name in value.split(",")]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.bulk_charts",
+        description="Compute natal charts for CSV/Parquet birth records.",
+    )
+    parser.add_argument("input", help="CSV or Parquet file of birth records")
+    parser.add_argument("output_dir", help="Directory for part files")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--input-format", choices=["auto", "csv", "parquet"], default="auto")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Recompute everything instead of skipping completed chunks",
+    )
+    parser.add_argument(
+        "--fields",
+        help="Comma-separated chart parts to compute: planets, points, houses, aspects, patterns",
+    )
+    parser.add_argument("--bodies", help="Comma-separated planets and angles to compute")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    stats = run_bulk(
+        args.input,
+        args.output_dir,
+        output_format=args.format,
+        input_format=args.input_format,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        resume=not args.no_resume,
+        fields=_name_list(args.fields),
+        bodies=_name_list(args.bodies),
+    )
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
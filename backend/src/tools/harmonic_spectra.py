@@ -0,0 +1,134 @@
+"""
+Harmonic spectra of CSV or Parquet birth records, for research exports.
+
+Streams the input in chunks (same record format as src.tools.bulk_charts),
+computes the natal longitudes of each record from the cache tiers and
+the spectra of the whole chunk in one vectorized pass
+(src.core.harmonics.harmonic_strengths), and writes one CSV row per
+record: the input fields, one `h<N>` strength column per harmonic and an
+`error` column for records that could not be computed.
+
+Usage:
+    python -m src.tools.harmonic_spectra births.csv spectra.csv \\
+        --harmonics 1-180 --orb 8
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.core.calculations import _calculate_jd, _get_city_coordinates
+from src.core.harmonics import (
+    DEFAULT_ORB,
+    birth_longitudes,
+    harmonic_range,
+    harmonic_strengths,
+)
+from src.tools.bulk_charts import INPUT_FIELDS, _chunks, read_records
+
+
+def parse_harmonics(text: str) -> List[int]:
+    """Harmonic numbers from e.g. "1-12,16,24"."""
+    harmonics = []
+    for part in text.split(","):
+        low, sep, high = part.strip().partition("-")
+        if sep:
+            harmonics.extend(range(int(low), int(high) + 1))
+        else:
+            harmonics.append(int(low))
+    return harmonic_range(harmonics).tolist()
+
+
+def spectrum_rows(
+    records: List[Dict[str, Any]],
+    harmonics: Sequence[int],
+    orb: float = DEFAULT_ORB,
+) -> List[Dict[str, Any]]:
+    """Spectrum rows of a chunk of records, in input order."""
+    rows = []
+    longitudes = []
+    computed = []
+    for record in records:
+        record_id = record.get("id")
+        row: Dict[str, Any] = {"id": None if record_id is None else str(record_id)}
+        for field in INPUT_FIELDS:
+            value = record.get(field)
+            row[field] = None if value is None else str(value)
+        try:
+            latitude, longitude = _get_city_coordinates(str(record["city"]), str(record["country"]))
+            jd = _calculate_jd(str(record["date"]), str(record["time"]))
+            longitudes.append(birth_longitudes((jd, latitude, longitude)))
+            computed.append(row)
+            row["error"] = None
+        except Exception as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        rows.append(row)
+
+    if computed:
+        strengths = harmonic_strengths(np.stack(longitudes), harmonics, orb)
+        for row, values in zip(computed, np.round(strengths, 6).tolist()):
+            row.update({f"h{h}": value for h, value in zip(harmonics, values)})
+    return rows
+
+
+def run_spectra(
+    input_path: str,
+    output_path: str,
+    harmonics: Optional[Sequence[int]] = None,
+    orb: float = DEFAULT_ORB,
+    input_format: str = "auto",
+    chunk_size: int = 10000,
+) -> Dict[str, int]:
+    """
+    Write the harmonic spectrum of every record of `input_path` as CSV.
+
+    Returns:
+        Counts of rows written and of rows with an error
+    """
+    harmonics = harmonic_range(harmonics).tolist()
+    columns = ["id", *INPUT_FIELDS, *(f"h{h}" for h in harmonics), "error"]
+    stats = {"rows": 0, "errors": 0}
+    records = read_records(input_path, input_format, batch_size=chunk_size)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for chunk in _chunks(records, chunk_size):
+            rows = spectrum_rows(chunk, harmonics, orb)
+            writer.writerows(rows)
+            stats["rows"] += len(rows)
+            stats["errors"] += sum(row["error"] is not None for row in rows)
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.harmonic_spectra",
+        description="Compute harmonic spectra for CSV/Parquet birth records.",
+    )
+    parser.add_argument("input", help="CSV or Parquet file of birth records")
+    parser.add_argument("output", help="Output CSV file")
+    parser.add_argument("--harmonics", default="1-180", help='e.g. "1-12,16,24"')
+    parser.add_argument("--orb", type=float, default=DEFAULT_ORB)
+    parser.add_argument("--input-format", choices=["auto", "csv", "parquet"], default="auto")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    stats = run_spectra(
+        args.input,
+        args.output,
+        harmonics=parse_harmonics(args.harmonics),
+        orb=args.orb,
+        input_format=args.input_format,
+        chunk_size=args.chunk_size,
+    )
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
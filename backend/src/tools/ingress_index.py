@@ -0,0 +1,72 @@
+"""
+Build and query the sign-ingress and retrograde-station index.
+
+Usage:
+    python -m src.tools.ingress_index build ingress.npz --start 1800 --end 2200
+    python -m src.tools.ingress_index query ingress.npz --date 2005-03-01 \\
+        --body Mercury
+
+Point the API at the built file with INGRESS_INDEX_FILE.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional, Sequence
+
+from src.core.calculations import PLANETS, _calculate_jd
+from src.core.ingress import (
+    DEFAULT_END_YEAR,
+    DEFAULT_START_YEAR,
+    IngressIndex,
+    planet_status,
+)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.ingress_index",
+        description="Build and query the sign-ingress and station index.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Compute the index over a range of years")
+    build.add_argument("index_file", help="Output .npz file")
+    build.add_argument("--start", type=int, default=DEFAULT_START_YEAR, help="First year")
+    build.add_argument("--end", type=int, default=DEFAULT_END_YEAR, help="Year the range ends")
+
+    query = commands.add_parser("query", help="Look up planets at one moment")
+    query.add_argument("index_file")
+    query.add_argument("--date", required=True, help="YYYY-MM-DD")
+    query.add_argument("--time", default="12:00:00", help="UT time")
+    query.add_argument("--body", action="append", default=[], help="Planet (repeatable)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        index = IngressIndex.build_years(args.start, args.end)
+        index.save(args.index_file)
+        print(
+            json.dumps(
+                {
+                    "bodies": len(index.bodies),
+                    "events": index.event_count(),
+                    "bytes": os.path.getsize(args.index_file),
+                    "seconds": round(time.perf_counter() - started, 1),
+                }
+            )
+        )
+    else:
+        index = IngressIndex.load(args.index_file)
+        jd = _calculate_jd(args.date, args.time)
+        statuses = [planet_status(index, name, jd) for name in args.body or PLANETS]
+        print(json.dumps([status.model_dump() for status in statuses], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,512 @@
+"""
+Local load generator and latency-percentile harness for the /chart API.
+
+Drives the FastAPI app either in-process (ASGI transport, no network) or
+over a real local socket (uvicorn on 127.0.0.1), or against an already
+running server, and writes a JSON report with throughput and a latency
+histogram. Two reports can be compared to spot regressions before a
+release.
+
+Usage:
+    python -m src.tools.loadtest run --mode inprocess --concurrency 16 \\
+        --duration 10 --repeat-rate 0.3 --output baseline.json
+    python -m src.tools.loadtest run --mode socket --output candidate.json
+    python -m src.tools.loadtest compare baseline.json candidate.json
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bounds (ms) of the latency histogram buckets, 1-2-5 series
+HISTOGRAM_BOUNDS_MS = [
+    0.1, 0.2, 0.5,
+    1, 2, 5,
+    10, 20, 50,
+    100, 200, 500,
+    1000, 2000, 5000,
+    10000,
+]
+
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+# Default city weights: every city the calculator knows, equally likely
+DEFAULT_CITIES = {
+    ("New York", "USA"): 1.0,
+    ("Los Angeles", "USA"): 1.0,
+    ("London", "UK"): 1.0,
+    ("Paris", "France"): 1.0,
+    ("Sydney", "Australia"): 1.0,
+    ("Tokyo", "Japan"): 1.0,
+    ("Berlin", "Germany"): 1.0,
+    ("Madrid", "Spain"): 1.0,
+}
+
+
+class RequestMix:
+    """
+    Deterministic stream of /chart payloads.
+
+    Args:
+        repeat_rate: Probability (0-1) that a request repeats one of a small
+            set of "hot" payloads, as when a shared link goes viral
+        cities: Mapping of (city, country) to relative weight
+        start_year: First birth year of the date spread
+        end_year: Last birth year of the date spread
+        hot_set: Number of distinct payloads repeated requests draw from
+        seed: Random seed, so two runs send the same sequence
+    """
+
+    def __init__(
+        self,
+        repeat_rate: float = 0.0,
+        cities: Optional[Dict[Tuple[str, str], float]] = None,
+        start_year: int = 1950,
+        end_year: int = 2010,
+        hot_set: int = 16,
+        seed: int = 0,
+    ):
+        if not 0.0 <= repeat_rate <= 1.0:
+            raise ValueError("repeat_rate must be between 0 and 1")
+        if end_year < start_year:
+            raise ValueError("end_year must not be before start_year")
+        self.repeat_rate = repeat_rate
+        self.cities = dict(cities or DEFAULT_CITIES)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.hot_set = max(1, hot_set)
+        self.seed = seed
+
+    def _random_payload(self, rng: random.Random) -> Dict[str, str]:
+        first = dt.date(self.start_year, 1, 1)
+        span = (dt.date(self.end_year, 12, 31) - first).days
+        birth_date = first + dt.timedelta(days=rng.randint(0, span))
+        seconds = rng.randrange(86400)
+        (city, country), = rng.choices(
+            list(self.cities), weights=list(self.cities.values())
+        )
+        return {
+            "date": birth_date.isoformat(),
+            "time": f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}",
+            "country": country,
+            "city": city,
+        }
+
+    def payloads(self) -> Iterator[Dict[str, str]]:
+        """Yield payloads forever."""
+        rng = random.Random(self.seed)
+        hot = [self._random_payload(rng) for _ in range(self.hot_set)]
+        while True:
+            if self.repeat_rate and rng.random() < self.repeat_rate:
+                yield rng.choice(hot)
+            else:
+                yield self._random_payload(rng)
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-friendly description for the report."""
+        return {
+            "repeat_rate": self.repeat_rate,
+            "cities": {f"{c}/{k}": w for (c, k), w in self.cities.items()},
+            "start_year": self.start_year,
+            "end_year": self.end_year,
+            "hot_set": self.hot_set,
+            "seed": self.seed,
+        }
+
+
+def parse_cities(spec: str) -> Dict[Tuple[str, str], float]:
+    """
+    Parse a city distribution like "New York/USA=5,London/UK=1".
+
+    The weight is optional and defaults to 1.
+    """
+    cities = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        location, _, weight = item.partition("=")
+        city, sep, country = location.partition("/")
+        if not sep:
+            raise ValueError(f"City must be written as City/Country: {item!r}")
+        cities[(city.strip(), country.strip())] = float(weight) if weight else 1.0
+    if not cities:
+        raise ValueError("City distribution is empty")
+    return cities
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * pct / 100))
+    return sorted_values[min(len(sorted_values), rank) - 1]
+
+
+def latency_histogram(latencies_ms: Sequence[float]) -> List[Dict[str, Any]]:
+    """Bucket latencies into HISTOGRAM_BOUNDS_MS (non-cumulative counts)."""
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for value in latencies_ms:
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    bounds: List[Any] = list(HISTOGRAM_BOUNDS_MS) + ["+Inf"]
+    return [{"le": bound, "count": count} for bound, count in zip(bounds, counts)]
+
+
+def build_report(
+    samples: Sequence[Tuple[float, int]],
+    elapsed: float,
+    config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Summarize raw (latency seconds, status code) samples.
+
+    Status 0 marks a transport-level failure (connection error, timeout).
+    """
+    statuses: Dict[str, int] = {}
+    ok_latencies = []
+    for latency, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        if status == 200:
+            ok_latencies.append(latency * 1000.0)
+    ok_latencies.sort()
+
+    latency = {
+        "min": ok_latencies[0] if ok_latencies else 0.0,
+        "mean": sum(ok_latencies) / len(ok_latencies) if ok_latencies else 0.0,
+        "max": ok_latencies[-1] if ok_latencies else 0.0,
+    }
+    for pct in PERCENTILES:
+        latency[f"p{pct:g}"] = percentile(ok_latencies, pct)
+
+    return {
+        "config": config,
+        "summary": {
+            "requests": len(samples),
+            "ok": len(ok_latencies),
+            "status_counts": statuses,
+            "error_rate": 1.0 - len(ok_latencies) / len(samples) if samples else 0.0,
+            "elapsed_s": elapsed,
+            "throughput_rps": len(ok_latencies) / elapsed if elapsed > 0 else 0.0,
+        },
+        "latency_ms": latency,
+        "histogram_ms": latency_histogram(ok_latencies),
+    }
+
+
+async def _drive(
+    client: Any,
+    mix: RequestMix,
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int] = None,
+) -> Tuple[List[Tuple[float, int]], float]:
+    """Run `concurrency` closed-loop workers until the deadline."""
+    payloads = mix.payloads()
+    samples: List[Tuple[float, int]] = []
+    issued = 0
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def worker() -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline:
+            if max_requests is not None and issued >= max_requests:
+                return
+            issued += 1
+            payload = next(payloads)
+            sent = time.perf_counter()
+            try:
+                response = await client.post("/chart", json=payload)
+                status = response.status_code
+            except Exception:
+                status = 0
+            samples.append((time.perf_counter() - sent, status))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+class _LocalServer:
+    """
+    Serve the app with uvicorn on an ephemeral 127.0.0.1 port.
+
+    The server runs in a child process so it does not compete with the
+    load generator for the GIL, which would distort the latencies.
+    """
+
+    def __init__(self, client_rate: Optional[str]):
+        # uvicorn's --fd assumes a Unix socket (no TCP_NODELAY), so pick a
+        # free port and let uvicorn bind it itself
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self._env = dict(os.environ)
+        if client_rate is not None:
+            self._env["CHART_CLIENT_RATE"] = client_rate
+        self._process: Optional[subprocess.Popen] = None
+        # Server logs go to a file so per-request INFO lines stay off the console
+        self._log = tempfile.TemporaryFile()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "_LocalServer":
+        import httpx
+
+        self._process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "src.api.main:app",
+                "--host", "127.0.0.1", "--port", str(self.port),
+                "--log-level", "warning", "--no-access-log",
+            ],
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+            env=self._env,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                self._log.seek(0)
+                output = self._log.read().decode(errors="replace")[-2000:]
+                raise RuntimeError(f"Local server failed to start:\n{output}")
+            try:
+                if httpx.get(f"{self.url}/health", timeout=1).status_code == 200:
+                    return self
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+        self.__exit__()
+        raise RuntimeError("Local server did not become ready")
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._log.close()
+
+
+def _load_app(client_rate: Optional[str]) -> Any:
+    """Import the app, optionally overriding the per-client rate limit."""
+    if client_rate is not None:
+        os.environ["CHART_CLIENT_RATE"] = client_rate
+    from src.api.main import app
+
+    # Per-request INFO logs would dominate the measurement
+    logging.getLogger("src.api.main").setLevel(logging.WARNING)
+    return app
+
+
+def run_load_test(
+    mode: str = "inprocess",
+    concurrency: int = 8,
+    duration: float = 10.0,
+    mix: Optional[RequestMix] = None,
+    url: Optional[str] = None,
+    max_requests: Optional[int] = None,
+    timeout: float = 30.0,
+    client_rate: Optional[str] = "0",
+) -> Dict[str, Any]:
+    """
+    Run one load test and return its report.
+
+    Args:
+        mode: "inprocess" (ASGI transport), "socket" (local uvicorn) or
+            "url" (an already running server at `url`)
+        concurrency: Number of closed-loop workers
+        duration: Seconds to run
+        mix: Request mix; defaults to unique requests over all cities
+        url: Base URL for mode "url"
+        max_requests: Optional cap on the number of requests
+        timeout: Per-request timeout in seconds
+        client_rate: CHART_CLIENT_RATE override for the local app ("0"
+            disables per-client limiting); None keeps the environment
+
+    Returns:
+        Report dictionary (see build_report)
+    """
+    import httpx
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    mix = mix or RequestMix()
+    config = {
+        "mode": mode,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "max_requests": max_requests,
+        "mix": mix.describe(),
+    }
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def drive(**client_kwargs: Any) -> Tuple[List[Tuple[float, int]], float]:
+        async with httpx.AsyncClient(timeout=timeout, limits=limits, **client_kwargs) as client:
+            return await _drive(client, mix, concurrency, duration, max_requests)
+
+    if mode == "inprocess":
+        transport = httpx.ASGITransport(app=_load_app(client_rate))
+        samples, elapsed = asyncio.run(drive(transport=transport, base_url="http://loadtest"))
+    elif mode == "socket":
+        with _LocalServer(client_rate) as server:
+            config["url"] = server.url
+            samples, elapsed = asyncio.run(drive(base_url=server.url))
+    elif mode == "url":
+        if not url:
+            raise ValueError("mode 'url' requires a url")
+        config["url"] = url
+        samples, elapsed = asyncio.run(drive(base_url=url))
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    return build_report(samples, elapsed, config)
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    tolerance: float = 0.10,
+) -> Dict[str, Any]:
+    """
+    Compare two reports metric by metric.
+
+    A metric regresses when latency grows, or throughput drops, by more
+    than `tolerance` (a fraction of the baseline value), or when the error
+    rate grows by more than `tolerance` percentage points.
+    """
+    metrics: Dict[str, Dict[str, float]] = {}
+    regressions = []
+
+    def add(name: str, before: float, after: float, higher_is_better: bool) -> None:
+        change = (after - before) / before if before else 0.0
+        metrics[name] = {"baseline": before, "candidate": after, "change": change}
+        worse = -change if higher_is_better else change
+        if worse > tolerance:
+            regressions.append(name)
+
+    add(
+        "throughput_rps",
+        baseline["summary"]["throughput_rps"],
+        candidate["summary"]["throughput_rps"],
+        higher_is_better=True,
+    )
+    for key in baseline["latency_ms"]:
+        if key in candidate["latency_ms"]:
+            add(
+                f"latency_ms.{key}",
+                baseline["latency_ms"][key],
+                candidate["latency_ms"][key],
+                higher_is_better=False,
+            )
+
+    error_before = baseline["summary"]["error_rate"]
+    error_after = candidate["summary"]["error_rate"]
+    metrics["error_rate"] = {
+        "baseline": error_before,
+        "candidate": error_after,
+        "change": error_after - error_before,
+    }
+    if error_after - error_before > tolerance:
+        regressions.append("error_rate")
+
+    return {"tolerance": tolerance, "metrics": metrics, "regressions": regressions}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.loadtest",
+        description="Local load generator for the /chart API.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run a load test and write a JSON report")
+    run.add_argument("--mode", choices=["inprocess", "socket", "url"], default="inprocess")
+    run.add_argument("--url", help="Base URL for --mode url")
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    run.add_argument("--max-requests", type=int)
+    run.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout")
+    run.add_argument("--repeat-rate", type=float, default=0.0)
+    run.add_argument("--hot-set", type=int, default=16)
+    run.add_argument("--cities", help='Weighted cities, e.g. "New York/USA=5,London/UK=1"')
+    run.add_argument("--start-year", type=int, default=1950)
+    run.add_argument("--end-year", type=int, default=2010)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument(
+        "--client-rate",
+        default="0",
+        help="Per-client rate limit for the local app (0 disables; 'env' keeps CHART_CLIENT_RATE)",
+    )
+    run.add_argument("--output", "-o", help="Report path (default: stdout)")
+
+    compare = commands.add_parser("compare", help="Compare two JSON reports")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--tolerance", type=float, default=0.10)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "run":
+        mix = RequestMix(
+            repeat_rate=args.repeat_rate,
+            cities=parse_cities(args.cities) if args.cities else None,
+            start_year=args.start_year,
+            end_year=args.end_year,
+            hot_set=args.hot_set,
+            seed=args.seed,
+        )
+        report = run_load_test(
+            mode=args.mode,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            mix=mix,
+            url=args.url,
+            max_requests=args.max_requests,
+            timeout=args.timeout,
+            client_rate=None if args.client_rate == "env" else args.client_rate,
+        )
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        summary, latency = report["summary"], report["latency_ms"]
+        print(
+            f"{summary['requests']} requests, {summary['throughput_rps']:.1f} req/s, "
+            f"p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+            f"p99 {latency['p99']:.2f} ms",
+            file=sys.stderr,
+        )
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+    result = compare_reports(baseline, candidate, args.tolerance)
+    print(json.dumps(result, indent=2))
+    return 1 if result["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
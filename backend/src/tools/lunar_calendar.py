@@ -0,0 +1,66 @@
+"""
+Build and query the precomputed lunar calendar tables.
+
+Usage:
+    python -m src.tools.lunar_calendar build calendar.npz --start 1900 --end 2100
+    python -m src.tools.lunar_calendar query calendar.npz \\
+        --from 2024-04-01 --to 2024-05-01
+
+Point the API at the built file with LUNAR_CALENDAR_FILE.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional, Sequence
+
+from src.core.calculations import _calculate_jd
+from src.core.lunar_calendar import DEFAULT_END_YEAR, DEFAULT_START_YEAR, LunarCalendar
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.lunar_calendar",
+        description="Build and query lunar phase, void-of-course and eclipse tables.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Compute the tables over a range of years")
+    build.add_argument("calendar_file", help="Output .npz file")
+    build.add_argument("--start", type=int, default=DEFAULT_START_YEAR, help="First year")
+    build.add_argument("--end", type=int, default=DEFAULT_END_YEAR, help="Year the range ends")
+
+    query = commands.add_parser("query", help="List the events of a date range")
+    query.add_argument("calendar_file")
+    query.add_argument("--from", dest="start", required=True, help="YYYY-MM-DD (inclusive)")
+    query.add_argument("--to", dest="end", required=True, help="YYYY-MM-DD (exclusive)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+        calendar = LunarCalendar.build_years(args.start, args.end)
+        calendar.save(args.calendar_file)
+        print(
+            json.dumps(
+                {
+                    **calendar.event_counts(),
+                    "bytes": os.path.getsize(args.calendar_file),
+                    "seconds": round(time.perf_counter() - started, 1),
+                }
+            )
+        )
+    else:
+        calendar = LunarCalendar.load(args.calendar_file)
+        data = calendar.between(
+            _calculate_jd(args.start, "00:00:00"), _calculate_jd(args.end, "00:00:00")
+        )
+        print(data.model_dump_json(indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
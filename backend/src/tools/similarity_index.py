@@ -0,0 +1,102 @@
+"""
+Build and query the nearest-chart similarity index.
+
+Charts are read as JSON lines, one `{"id": <int>, "chart": <ChartData>}`
+object per line (the `chart` value is the /chart response body).
+
+Usage:
+    python -m src.tools.similarity_index build index/ charts.jsonl
+    python -m src.tools.similarity_index add index/ new_charts.jsonl
+    python -m src.tools.similarity_index query index/ chart.json -k 10 \\
+        --weight Sun=2 --weight Moon=2
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from src.core.similarity import SimilarityIndex
+
+
+def read_charts(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Stream (chart id, ChartData dict) pairs from a JSON lines file."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                yield int(record["id"]), record["chart"]
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: expected id and chart") from e
+
+
+def parse_weights(values: Sequence[str]) -> Dict[str, float]:
+    """Parse repeated `Body=weight` options."""
+    weights = {}
+    for value in values:
+        name, sep, weight = value.partition("=")
+        if not sep:
+            raise ValueError(f"Expected Body=weight, got {value!r}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.similarity_index",
+        description="Build and query the nearest-chart similarity index.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Create an index from a JSON lines file")
+    build.add_argument("index_dir")
+    build.add_argument("charts", help="JSON lines of {id, chart}")
+
+    add = commands.add_parser("add", help="Append charts to an existing index")
+    add.add_argument("index_dir")
+    add.add_argument("charts", help="JSON lines of {id, chart}")
+
+    query = commands.add_parser("query", help="Find the charts nearest to one chart")
+    query.add_argument("index_dir")
+    query.add_argument("chart", help="JSON file holding one ChartData")
+    query.add_argument("-k", type=int, default=10)
+    query.add_argument(
+        "--weight", action="append", default=[], help="Body=weight (repeatable)"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = SimilarityIndex.build(args.index_dir, read_charts(args.charts))
+        print(json.dumps({"charts": len(index)}))
+    elif args.command == "add":
+        index = SimilarityIndex(args.index_dir)
+        before = len(index)
+        charts = list(read_charts(args.charts))
+        index.add_many(charts)
+        print(json.dumps({"added": len(index) - before, "charts": len(index)}))
+    else:
+        index = SimilarityIndex(args.index_dir)
+        with open(args.chart, encoding="utf-8") as f:
+            chart = json.load(f)
+        started = time.perf_counter()
+        results = index.query(chart, k=args.k, weights=parse_weights(args.weight))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(
+            json.dumps(
+                {
+                    "query_ms": round(elapsed_ms, 2),
+                    "results": [{"id": i, "distance": d} for i, d in results],
+                },
+                indent=2,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Daily transit alerts for all users.
+
+`pack` turns `bulk_charts` output (CSV or Parquet part files) into a
+memory-mappable natal matrix; `scan` computes one day's transiting
+positions once and streams every user's transit-to-natal hits, one JSON
+line per user with hits (or one CSV row per hit).
+
+Usage:
+    python -m src.tools.bulk_charts users.csv charts/ --format parquet
+    python -m src.tools.transit_alerts pack charts/ natal/
+    python -m src.tools.transit_alerts scan natal/ --date 2026-10-19 \\
+        --output alerts.jsonl
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from typing import IO, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.calculations import PLANETS, _calculate_jd
+from src.core.compact import POINT_NAMES
+from src.core.transits import (
+    TRANSIT_ASPECTS,
+    NatalMatrix,
+    TransitHits,
+    scan_transits,
+    transiting_positions,
+)
+from src.tools.bulk_charts import _column_prefix, read_records
+
+logger = logging.getLogger(__name__)
+
+# Natal bodies packed from bulk output
+NATAL_BODIES = tuple(PLANETS) + POINT_NAMES
+
+
+def _bulk_rows(output_dir: str, stats: dict) -> Iterator[Tuple[int, list]]:
+    """(user id, natal longitudes) from every bulk part file of a directory."""
+    columns = [f"{_column_prefix(name)}_longitude" for name in NATAL_BODIES]
+    for name in sorted(os.listdir(output_dir)):
+        if not name.startswith("part-") or name.endswith(".tmp"):
+            continue
+        for record in read_records(os.path.join(output_dir, name)):
+            try:
+                if record.get("error"):
+                    raise ValueError(record["error"])
+                yield int(record["id"]), [float(record[column]) for column in columns]
+            except (KeyError, TypeError, ValueError):
+                stats["skipped"] += 1
+
+
+def pack(bulk_dir: str, natal_dir: str) -> dict:
+    """Pack bulk chart output into a natal matrix directory."""
+    stats = {"users": 0, "skipped": 0}
+    matrix = NatalMatrix.from_rows(_bulk_rows(bulk_dir, stats), NATAL_BODIES)
+    matrix.save(natal_dir)
+    stats["users"] = len(matrix)
+    return stats
+
+
+def _user_groups(hits: TransitHits) -> Iterator[Tuple[int, slice]]:
+    """(user id, slice of its hits) for a user-ordered block."""
+    if not len(hits):
+        return
+    starts = np.flatnonzero(np.diff(hits.user_ids)) + 1
+    bounds = [0, *starts.tolist(), len(hits)]
+    for begin, end in zip(bounds, bounds[1:]):
+        yield int(hits.user_ids[begin]), slice(begin, end)
+
+
+def write_hits(
+    out: IO[str],
+    blocks: Iterator[TransitHits],
+    natal_bodies: Sequence[str],
+    transit_bodies: Sequence[str],
+    fmt: str = "jsonl",
+) -> dict:
+    """Stream hits as JSON lines (one per user) or CSV (one row per hit)."""
+    names = {angle: name for angle, (name, _) in TRANSIT_ASPECTS.items()}
+    stats = {"users_with_hits": 0, "hits": 0}
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(["id", "transit", "natal", "aspect", "orb"])
+
+    for hits in blocks:
+        stats["hits"] += len(hits)
+        for user_id, part in _user_groups(hits):
+            stats["users_with_hits"] += 1
+            entries = zip(
+                hits.transit_bodies[part].tolist(),
+                hits.natal_bodies[part].tolist(),
+                hits.aspects[part].tolist(),
+                hits.orbs[part].tolist(),
+            )
+            if writer is not None:
+                for transit, natal, angle, orb in entries:
+                    writer.writerow(
+                        [
+                            user_id,
+                            transit_bodies[transit],
+                            natal_bodies[natal],
+                            names.get(angle, angle),
+                            round(orb, 4),
+                        ]
+                    )
+            else:
+                record = {
+                    "id": user_id,
+                    "hits": [
+                        {
+                            "transit": transit_bodies[transit],
+                            "natal": natal_bodies[natal],
+                            "aspect": names.get(angle, angle),
+                            "orb": round(orb, 4),
+                        }
+                        for transit, natal, angle, orb in entries
+                    ],
+                }
+                out.write(json.dumps(record, separators=(",", ":")) + "\n")
+    return stats
+
+
+def scan(
+    natal_dir: str,
+    date_str: str,
+    time_str: str = "12:00:00",
+    out: Optional[IO[str]] = None,
+    fmt: str = "jsonl",
+) -> dict:
+    """Scan one day's transits against every packed natal chart."""
+    natal = NatalMatrix.load(natal_dir)
+    transit_bodies, transits = transiting_positions(_calculate_jd(date_str, time_str))
+    started = time.perf_counter()
+    stats = write_hits(
+        out or sys.stdout, scan_transits(natal, transits), natal.bodies, transit_bodies, fmt
+    )
+    stats["users"] = len(natal)
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.transit_alerts",
+        description="Daily transit-to-natal alerts for all users.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = commands.add_parser("pack", help="Pack bulk_charts output into a natal matrix")
+    pack_parser.add_argument("bulk_dir")
+    pack_parser.add_argument("natal_dir")
+
+    scan_parser = commands.add_parser("scan", help="Stream one day's transit hits")
+    scan_parser.add_argument("natal_dir")
+    scan_parser.add_argument("--date", required=True, help="YYYY-MM-DD")
+    scan_parser.add_argument("--time", default="12:00:00", help="UT time of the transits")
+    scan_parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    scan_parser.add_argument("--output", help="Output file (default: stdout)")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "pack":
+        stats = pack(args.bulk_dir, args.natal_dir)
+    elif args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            stats = scan(args.natal_dir, args.date, args.time, out, args.format)
+    else:
+        stats = scan(args.natal_dir, args.date, args.time, sys.stdout, args.format)
+    logger.info(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,26 @@
 """Pytest configuration and fixtures."""
 
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 
-from src.api.main import app
+# Disable per-client rate limiting so the whole suite can share one client id
+os.environ.setdefault("CHART_CLIENT_RATE", "0")
+
+from src.api.main import app  # noqa: E402
 
 
 @pytest.fixture
 def client():
     """Provide a test client for the FastAPI app."""
     return TestClient(app)
+
+
+@pytest.fixture
+def one_request_per_client(monkeypatch):
+    """Rate-limit every client to a single request."""
+    from src.api import main
+    from src.api.admission import ClientRateLimiter
+
+    monkeypatch.setattr(main.admission, "rate_limiter", ClientRateLimiter(rate=0.001, burst=1))
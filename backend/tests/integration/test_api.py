@@ -1,5 +1,9 @@
 """Integration tests for the chart API endpoint."""
 
+import math
+
+import pytest
+
 
 class TestChartEndpoint:
     """Tests for the /chart API endpoint."""
@@ -176,3 +180,825 @@ class TestChartEndpoint:
         assert "planets" in data
         assert "houses" in data
         assert "aspects" in data
+
+
+class TestChartFieldSelection:
+    """Tests for the fields and bodies options of /chart."""
+
+    PAYLOAD = {
+        "date": "1990-06-15",
+        "time": "14:30:00",
+        "country": "USA",
+        "city": "New York",
+    }
+
+    def test_full_chart_lists_default_parts(self, client):
+        """Test that a chart without a selection computes everything but patterns."""
+        response = client.post("/chart", json=self.PAYLOAD)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["computed"] == ["planets", "points", "houses", "aspects"]
+        assert data["patterns"] == []
+
+    def test_patterns_on_request(self, client):
+        """Test that patterns are added when requested."""
+        response = client.post(
+            "/chart?fields=planets,points,houses,aspects,patterns", json=self.PAYLOAD
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["computed"][-1] == "patterns"
+        assert len(data["planets"]) == 10
+
+    def test_selected_fields_and_bodies(self, client):
+        """Test that comma-separated fields and bodies restrict the response."""
+        response = client.post(
+            "/chart?fields=planets,points&bodies=Sun,Moon,Ascendant", json=self.PAYLOAD
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["name"] for p in data["planets"]] == ["Sun", "Moon"]
+        assert [p["name"] for p in data["points"]] == ["Ascendant"]
+        assert data["houses"] == data["aspects"] == []
+        assert data["computed"] == ["planets", "points"]
+
+    def test_repeated_fields(self, client):
+        """Test that fields may also be repeated."""
+        response = client.post("/chart?fields=houses&fields=aspects", json=self.PAYLOAD)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["houses"]) == 12
+        assert data["planets"] == []
+        assert data["computed"] == ["houses", "aspects"]
+
+    def test_rejects_unknown_field(self, client):
+        """Test that an unknown field is a 400."""
+        response = client.post("/chart?fields=planets,stars", json=self.PAYLOAD)
+
+        assert response.status_code == 400
+
+
+class TestAdmissionControl:
+    """Tests for load shedding on the /chart endpoint."""
+
+    def test_rate_limited_client_gets_429(self, client, monkeypatch):
+        """Test that a client over its token bucket gets 429 with Retry-After."""
+        from src.api import main
+        from src.api.admission import ClientRateLimiter
+
+        monkeypatch.setattr(
+            main.admission, "rate_limiter", ClientRateLimiter(rate=0.001, burst=1)
+        )
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+        headers = {"X-Real-IP": "203.0.113.7"}
+
+        first = client.post("/chart", json=payload, headers=headers)
+        second = client.post("/chart", json=payload, headers=headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert int(second.headers["Retry-After"]) >= 1
+
+    def test_spoofed_forwarded_for_is_still_limited(self, client, monkeypatch):
+        """Test that a new X-Forwarded-For per request does not reset the bucket."""
+        from src.api import main
+        from src.api.admission import ClientRateLimiter
+
+        monkeypatch.setattr(
+            main.admission, "rate_limiter", ClientRateLimiter(rate=0.001, burst=1)
+        )
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+        # nginx appends the real address after whatever the client sent
+        first = client.post(
+            "/chart",
+            json=payload,
+            headers={"X-Forwarded-For": "198.51.100.1, 203.0.113.9", "X-Real-IP": "203.0.113.9"},
+        )
+        second = client.post(
+            "/chart",
+            json=payload,
+            headers={"X-Forwarded-For": "198.51.100.2, 203.0.113.9", "X-Real-IP": "203.0.113.9"},
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+
+    def test_metrics_endpoint_exposes_admission(self, client):
+        """Test GET /metrics reports admission counters."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        admission = response.json()["admission"]
+        assert "queue_wait_seconds" in admission
+        assert "rejected_queue_full" in admission
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight coalescing on the /chart endpoint."""
+
+    def test_identical_concurrent_requests_compute_once(self, monkeypatch):
+        """Test that concurrent identical requests share one calculation."""
+        import asyncio
+        import threading
+        import time
+
+        import httpx
+
+        from src.api import main
+
+        calls = 0
+        lock = threading.Lock()
+        real_calculate = main.calculate_compact_chart
+
+        def slow_calculate(*args):
+            nonlocal calls
+            with lock:
+                calls += 1
+            time.sleep(0.05)
+            return real_calculate(*args)
+
+        monkeypatch.setattr(main, "calculate_compact_chart", slow_calculate)
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+
+        async def burst():
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                return await asyncio.gather(*(ac.post("/chart", json=payload) for _ in range(20)))
+
+        responses = asyncio.run(burst())
+
+        assert all(r.status_code == 200 for r in responses)
+        assert len({r.text for r in responses}) == 1
+        assert calls == 1
+
+
+class TestProfiling:
+    """Tests for on-demand profiling of /chart."""
+
+    def test_admin_token_profiles_request(self, client, monkeypatch, tmp_path):
+        """Test that the admin header stores a profile covering the calculation."""
+        from src.api import main
+        from src.api.profiling import ProfileStore, RequestProfiler
+        from src.core import sky_cache
+
+        monkeypatch.setattr(
+            main,
+            "profiler",
+            RequestProfiler(ProfileStore(str(tmp_path)), admin_token="secret"),
+        )
+        # Start cold, so the profile includes the ephemeris calls
+        monkeypatch.setattr(sky_cache, "sky_tier", sky_cache.LRUCache(16))
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+
+        response = client.post("/chart", json=payload, headers={"X-Profile-Token": "secret"})
+
+        assert response.status_code == 200
+        assert len(response.json()["planets"]) == 10
+        profile_id = response.headers["X-Profile-Id"]
+
+        report = client.get(
+            f"/admin/profiles/{profile_id}", headers={"X-Profile-Token": "secret"}
+        )
+        assert report.status_code == 200
+        assert "calculate_compact_chart" in report.text
+        assert "calc_ut" in report.text
+        assert "model_dump_json" in report.text
+
+        bad_sort = client.get(
+            f"/admin/profiles/{profile_id}",
+            params={"sort": "bogus"},
+            headers={"X-Profile-Token": "secret"},
+        )
+        assert bad_sort.status_code == 400
+
+    def test_profiles_require_token(self, client):
+        """Test that profile endpoints refuse requests without the token."""
+        assert client.get("/admin/profiles").status_code == 403
+        assert "X-Profile-Id" not in client.post(
+            "/chart",
+            json={
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            headers={"X-Profile-Token": "guess"},
+        ).headers
+
+
+class TestTracing:
+    """Tests for request tracing on /chart."""
+
+    def test_sampled_request_exports_spans(self, client, monkeypatch):
+        """Test that a sampled request exports API and calculation spans."""
+        from src.api import main
+        from src.core.tracing import InMemorySpanExporter, Tracer
+
+        exporter = InMemorySpanExporter()
+        monkeypatch.setattr(main, "tracer", Tracer(exporter, sample_ratio=1.0))
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+
+        response = client.post("/chart", json=payload)
+
+        assert response.status_code == 200
+        trace_ids = {s.trace_id for s in exporter.spans}
+        assert trace_ids == {response.headers["X-Trace-Id"]}
+        names = {s.name for s in exporter.spans}
+        assert {
+            "POST /chart",
+            "validate_input",
+            "calculate_chart",
+            "houses",
+            "aspects",
+            "encode_response",
+        } <= names
+
+
+class TestLiveSky:
+    """Tests for the live-sky WebSocket and SSE endpoints."""
+
+    def test_websocket_receives_sky(self, client):
+        """Test that a WebSocket subscriber gets the current sky."""
+        with client.websocket_connect("/sky/ws?city=London&country=UK") as websocket:
+            message = websocket.receive_json()
+
+        assert message["type"] == "sky"
+        assert len(message["planets"]) == 10
+        assert message["location"]["city"] == "london"
+        assert len(message["points"]) == 4
+
+    def test_websocket_rejects_unknown_city(self, client):
+        """Test that an unknown city closes the WebSocket instead of subscribing."""
+        from starlette.websockets import WebSocketDisconnect
+
+        with client.websocket_connect("/sky/ws?city=Atlantis&country=Nowhere") as websocket:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+
+        assert closed.value.code == 1008
+        assert client.get("/metrics").json()["live_sky"]["subscribers"] == 0
+
+    def test_sse_rejects_unknown_city(self, client):
+        """Test that an unknown city is a 400 on the SSE stream."""
+        response = client.get("/sky/stream", params={"city": "Atlantis", "country": "Nowhere"})
+
+        assert response.status_code == 400
+
+    def test_websocket_subscribers_share_computation(self, client):
+        """Test that concurrent WebSocket clients see the same tick."""
+        # One event loop for both connections, as under uvicorn
+        with client:
+            with client.websocket_connect("/sky/ws") as first:
+                with client.websocket_connect("/sky/ws") as second:
+                    assert first.receive_text() == second.receive_text()
+
+            assert client.get("/metrics").json()["live_sky"]["subscribers"] == 0
+
+    def test_sse_stream_sends_sky_event(self):
+        """Test the Server-Sent Events variant."""
+        import asyncio
+
+        from src.api import main
+
+        class _Request:
+            async def is_disconnected(self):
+                return False
+
+        async def first_event():
+            response = await main.live_sky_stream(_Request(), city="Paris", country="France")
+            assert response.media_type == "text/event-stream"
+            body = response.body_iterator
+            try:
+                return await body.__anext__()
+            finally:
+                await body.aclose()
+
+        event = asyncio.run(first_event())
+
+        assert event.startswith("event: sky\ndata: ")
+        assert '"city":"paris"' in event
+
+
+class TestEphemerisStatus:
+    """Tests for the /ephemeris/status endpoint."""
+
+    def test_answers_from_index(self, client, monkeypatch):
+        """Test sign, retrograde and next station for Mercury."""
+        from src.core import ingress
+
+        index = ingress.IngressIndex.build_years(2005, 2006)
+        monkeypatch.setattr(ingress, "_default_index", index)
+
+        response = client.get(
+            "/ephemeris/status", params={"date": "2005-03-01", "body": "Mercury"}
+        )
+
+        assert response.status_code == 200
+        (status,) = response.json()
+        assert status["sign"] == "Pisces"
+        assert status["retrograde"] is False
+        assert status["next_station"]["retrograde"] is True
+
+        outside = client.get("/ephemeris/status", params={"date": "1990-01-01"})
+        assert outside.status_code == 400
+
+    def test_rejects_impossible_dates(self, client, monkeypatch):
+        """Test that dates and times matching the patterns but not the calendar are a 400."""
+        from src.core import ingress
+
+        index = ingress.IngressIndex.build_years(2005, 2006)
+        monkeypatch.setattr(ingress, "_default_index", index)
+
+        for params in (
+            {"date": "2005-02-31"},
+            {"date": "2005-13-45"},
+            {"date": "2005-03-01", "time": "25:61:00"},
+        ):
+            response = client.get("/ephemeris/status", params=params)
+            assert response.status_code == 400, params
+
+    def test_unavailable_without_index(self, client, monkeypatch):
+        """Test that the endpoint returns 503 when no index is installed."""
+        from src.core import ingress
+
+        monkeypatch.delenv(ingress.INDEX_FILE_ENV, raising=False)
+        monkeypatch.setattr(ingress, "_default_index", None)
+
+        response = client.get("/ephemeris/status", params={"date": "2005-03-01"})
+
+        assert response.status_code == 503
+
+
+class TestLunarCalendar:
+    """Tests for the /calendar endpoint."""
+
+    def test_serves_month_from_tables(self, client, monkeypatch):
+        """Test phases, void-of-course periods and eclipses of April 2024."""
+        from src.core import lunar_calendar
+
+        calendar = lunar_calendar.LunarCalendar.build(2460400.5, 2460436.5)
+        monkeypatch.setattr(lunar_calendar, "_default_calendar", calendar)
+
+        response = client.get("/calendar", params={"start": "2024-04-01", "end": "2024-05-01"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["phase"] for p in data["phases"]] == [
+            "Last Quarter",
+            "New Moon",
+            "First Quarter",
+            "Full Moon",
+        ]
+        assert len(data["void_of_course"]) >= 12
+        assert [e["type"] for e in data["eclipses"]] == ["Total"]
+
+        too_long = client.get("/calendar", params={"start": "2024-04-01", "end": "2025-05-01"})
+        assert too_long.status_code == 400
+
+    def test_rejects_impossible_dates(self, client, monkeypatch):
+        """Test that dates matching YYYY-MM-DD but not on the calendar are a 400."""
+        from src.core import lunar_calendar
+
+        calendar = lunar_calendar.LunarCalendar.build(2460400.5, 2460436.5)
+        monkeypatch.setattr(lunar_calendar, "_default_calendar", calendar)
+
+        response = client.get("/calendar", params={"start": "2024-13-45", "end": "2024-05-01"})
+
+        assert response.status_code == 400
+        assert "valid calendar date" in response.json()["detail"]
+
+    def test_unavailable_without_tables(self, client, monkeypatch):
+        """Test that the endpoint returns 503 when no calendar is installed."""
+        from src.core import lunar_calendar
+
+        monkeypatch.delenv(lunar_calendar.CALENDAR_FILE_ENV, raising=False)
+        monkeypatch.setattr(lunar_calendar, "_default_calendar", None)
+
+        response = client.get("/calendar", params={"start": "2024-04-01", "end": "2024-05-01"})
+
+        assert response.status_code == 503
+
+
+class TestAstrocartography:
+    """Tests for the /astrocartography endpoint."""
+
+    def test_returns_geojson_lines(self, client):
+        """Test that the endpoint returns 40 line features."""
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+
+        response = client.post("/astrocartography", json=payload, params={"resolution": 2})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["type"] == "FeatureCollection"
+        assert len(data["features"]) == 40
+        assert client.post(
+            "/astrocartography", json=payload, params={"resolution": 0}
+        ).status_code == 422
+
+    def test_rate_limited(self, client, one_request_per_client):
+        """Test that /astrocartography goes through admission control."""
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "country": "USA",
+            "city": "New York",
+        }
+        params = {"resolution": 5}
+
+        assert client.post("/astrocartography", json=payload, params=params).status_code == 200
+        assert client.post("/astrocartography", json=payload, params=params).status_code == 429
+
+
+class TestRelocation:
+    """Tests for the /relocation endpoint."""
+
+    def test_returns_columns_per_location(self, client):
+        """Test that listed locations and the grid share one set of columns."""
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "locations": [
+                {"city": "London", "country": "UK"},
+                {"latitude": 35.6762, "longitude": 139.6503},
+            ],
+            "grid": {"lat_min": 80, "lat_max": 85, "lon_min": 0, "lon_max": 10, "step": 5},
+        }
+
+        response = client.post("/relocation", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["latitudes"]) == len(data["cusps"]) == 2 + 2 * 3
+        assert data["latitudes"][:2] == [51.5074, 35.6762]
+        assert len(data["houses"]["Sun"]) == 8
+        # Placidus is undefined at 80°N and beyond
+        assert data["cusps"][2] is None and data["houses"]["Sun"][2] == 0
+
+    def test_rejects_oversized_grid(self, client):
+        """Test that too many locations is a 400."""
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "grid": {"lat_min": -90, "lat_max": 90, "lon_min": -180, "lon_max": 180, "step": 0.5},
+        }
+
+        response = client.post("/relocation", json=payload)
+
+        assert response.status_code == 400
+
+    def test_rate_limited(self, client, one_request_per_client):
+        """Test that /relocation goes through admission control."""
+        payload = {
+            "date": "1990-06-15",
+            "time": "14:30:00",
+            "locations": [{"city": "London", "country": "UK"}],
+        }
+
+        assert client.post("/relocation", json=payload).status_code == 200
+        assert client.post("/relocation", json=payload).status_code == 429
+
+
+class TestElectional:
+    """Tests for the /electional endpoint."""
+
+    def test_returns_windows(self, client):
+        """Test a search combining exact and sampled conditions."""
+        payload = {
+            "start": "2024-01-01",
+            "end": "2024-01-08",
+            "location": {"city": "London", "country": "UK"},
+            "constraints": [
+                {"kind": "void_of_course", "negate": True},
+                {"kind": "retrograde", "body": "Venus", "negate": True},
+                {"kind": "sign", "body": "Ascendant", "sign": "Leo"},
+            ],
+        }
+
+        response = client.post("/electional", json=payload)
+
+        assert response.status_code == 200
+        windows = response.json()
+        assert 5 <= len(windows) <= 8
+        assert all(w["start"] < w["end"] and w["duration_minutes"] > 0 for w in windows)
+
+    def test_rejects_incomplete_constraint(self, client):
+        """Test that missing fields are a 422 and a missing location a 400."""
+        payload = {
+            "start": "2024-01-01",
+            "end": "2024-01-08",
+            "constraints": [{"kind": "sign", "body": "Moon"}],
+        }
+        assert client.post("/electional", json=payload).status_code == 422
+
+        payload["constraints"] = [{"kind": "house", "body": "Moon", "house": 10}]
+        assert client.post("/electional", json=payload).status_code == 400
+
+
+class TestProgressions:
+    """Tests for the /progressions endpoint."""
+
+    def test_returns_snapshots(self, client):
+        """Test that each age gets a column entry."""
+        payload = {
+            "birth": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            "start_age": 20,
+            "end_age": 30,
+            "step": 2,
+        }
+
+        response = client.post("/progressions", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ages"] == [20, 22, 24, 26, 28, 30]
+        assert len(data["progressed"]["Moon"]) == 6
+        assert len(data["solar_arc"]["Ascendant"]) == 6
+        assert {a["method"] for a in data["aspects"]} <= {"progressed", "solar_arc"}
+
+    def test_rejects_reversed_range(self, client):
+        """Test that an end before the start is a 422."""
+        payload = {
+            "birth": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            "start_age": 30,
+            "end_age": 20,
+        }
+
+        assert client.post("/progressions", json=payload).status_code == 422
+
+    def test_rate_limited(self, client, one_request_per_client):
+        """Test that /progressions goes through admission control."""
+        payload = {
+            "birth": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            "start_age": 20,
+            "end_age": 20,
+        }
+
+        assert client.post("/progressions", json=payload).status_code == 200
+        assert client.post("/progressions", json=payload).status_code == 429
+
+
+class TestReturns:
+    """Tests for the /returns endpoint."""
+
+    def test_returns_solar_return_charts(self, client):
+        """Test one solar return per year, relocated."""
+        payload = {
+            "birth": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            "body": "Sun",
+            "start_year": 2020,
+            "end_year": 2022,
+            "location": {"latitude": 35.6762, "longitude": 139.6503},
+        }
+
+        response = client.post("/returns", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["time"][:7] for item in data] == ["2020-06", "2021-06", "2022-06"]
+        assert len(data[0]["chart"]["houses"]) == 12
+
+    def test_rejects_unsupported_body(self, client):
+        """Test that only the Sun and Moon are accepted."""
+        payload = {
+            "birth": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            "body": "Mars",
+            "start_year": 2020,
+            "end_year": 2020,
+        }
+
+        assert client.post("/returns", json=payload).status_code == 422
+
+    def test_rate_limited(self, client, one_request_per_client):
+        """Test that /returns goes through admission control."""
+        payload = {
+            "birth": {
+                "date": "1990-06-15",
+                "time": "14:30:00",
+                "country": "USA",
+                "city": "New York",
+            },
+            "body": "Sun",
+            "start_year": 2020,
+            "end_year": 2020,
+        }
+
+        assert client.post("/returns", json=payload).status_code == 200
+        assert client.post("/returns", json=payload).status_code == 429
+
+
+class TestRelationshipCharts:
+    """Tests for the /composite and /davison endpoints."""
+
+    MEMBERS = [
+        {"date": "1990-06-15", "time": "14:30:00", "country": "USA", "city": "New York"},
+        {"date": "1988-11-02", "time": "08:15:00", "country": "UK", "city": "London"},
+        {"date": "1995-03-21", "time": "23:00:00", "country": "Japan", "city": "Tokyo"},
+    ]
+
+    def test_all_pairs(self, client):
+        """Test that a group of three gets three charts from both endpoints."""
+        for path in ("/composite", "/davison"):
+            response = client.post(path, json={"members": self.MEMBERS})
+
+            assert response.status_code == 200
+            data = response.json()
+            assert [(p["first"], p["second"]) for p in data] == [(0, 1), (0, 2), (1, 2)]
+            assert len(data[0]["chart"]["planets"]) == 10
+
+    def test_rejects_single_member(self, client):
+        """Test that one member is a 422."""
+        response = client.post("/composite", json={"members": self.MEMBERS[:1]})
+
+        assert response.status_code == 422
+
+    def test_rate_limited(self, client, one_request_per_client):
+        """Test that both endpoints go through admission control."""
+        payload = {"members": self.MEMBERS[:2]}
+
+        assert client.post("/composite", json=payload).status_code == 200
+        assert client.post("/composite", json=payload).status_code == 429
+        assert client.post("/davison", json=payload).status_code == 429
+
+
+class TestFixedStars:
+    """Tests for the /fixed-stars endpoint."""
+
+    PAYLOAD = {
+        "date": "2000-08-23",
+        "time": "12:00:00",
+        "country": "USA",
+        "city": "New York",
+    }
+
+    def test_returns_conjunctions(self, client, monkeypatch):
+        """Test conjunctions from an installed catalog."""
+        from src.core import fixed_stars
+
+        catalog = fixed_stars.StarCatalog(
+            ["Regulus"],
+            ["alLeo"],
+            [math.radians(152.0929625)],
+            [math.radians(11.967208)],
+            [-248.73e-3 / 206264.806],
+            [5.59e-3 / 206264.806],
+            [1.40],
+        )
+        monkeypatch.setattr(fixed_stars, "_default_catalog", catalog)
+
+        response = client.post("/fixed-stars", json=self.PAYLOAD, params={"orb": 1.5})
+
+        assert response.status_code == 200
+        assert [(c["body"], c["star"]) for c in response.json()] == [("Sun", "Regulus")]
+
+    def test_matching_runs_off_the_event_loop(self, client, monkeypatch):
+        """Test that the catalog pass runs in the threadpool, not on the event loop."""
+        import asyncio
+
+        from src.api import main
+        from src.core import fixed_stars
+
+        catalog = fixed_stars.StarCatalog(["Regulus"], ["alLeo"], [2.65], [0.2], [0], [0], [1.4])
+        monkeypatch.setattr(fixed_stars, "_default_catalog", catalog)
+        on_loop = []
+        real = main.chart_conjunctions
+
+        def conjunctions(*args):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return real(*args)
+
+        monkeypatch.setattr(main, "chart_conjunctions", conjunctions)
+
+        assert client.post("/fixed-stars", json=self.PAYLOAD).status_code == 200
+        assert on_loop == [False]
+
+    def test_unavailable_without_catalog(self, client, monkeypatch):
+        """Test that the endpoint returns 503 when no catalog is installed."""
+        from src.core import fixed_stars
+
+        monkeypatch.delenv(fixed_stars.CATALOG_FILE_ENV, raising=False)
+        monkeypatch.setattr(fixed_stars, "_default_catalog", None)
+
+        assert client.post("/fixed-stars", json=self.PAYLOAD).status_code == 503
+
+    def test_rate_limited(self, client, monkeypatch, one_request_per_client):
+        """Test that /fixed-stars goes through admission control."""
+        from src.core import fixed_stars
+
+        catalog = fixed_stars.StarCatalog(["Regulus"], ["alLeo"], [2.65], [0.2], [0], [0], [1.4])
+        monkeypatch.setattr(fixed_stars, "_default_catalog", catalog)
+
+        assert client.post("/fixed-stars", json=self.PAYLOAD).status_code == 200
+        assert client.post("/fixed-stars", json=self.PAYLOAD).status_code == 429
+
+
+class TestHarmonics:
+    """Tests for the /harmonics endpoint."""
+
+    BIRTH = {"date": "1990-06-15", "time": "14:30:00", "country": "USA", "city": "New York"}
+
+    def test_spectra(self, client):
+        """Test that each birth gets a spectrum over the requested harmonics."""
+        payload = {"births": [self.BIRTH, self.BIRTH], "harmonics": [1, 4, 5]}
+
+        response = client.post("/harmonics", json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 2
+        assert data[0]["harmonics"] == [1, 4, 5]
+        assert data[0]["strengths"] == data[1]["strengths"]
+        assert data[0]["charts"] is None
+
+    def test_default_harmonics_with_charts(self, client):
+        """Test the full 1-180 range with the harmonic charts included."""
+        response = client.post(
+            "/harmonics", json={"births": [self.BIRTH], "include_charts": True}
+        )
+
+        assert response.status_code == 200
+        data = response.json()[0]
+        assert len(data["strengths"]) == 180
+        assert len(data["charts"]["Midheaven"]) == 180
+
+    def test_rejects_out_of_range_harmonic(self, client):
+        """Test that a harmonic above 180 is a 400."""
+        response = client.post("/harmonics", json={"births": [self.BIRTH], "harmonics": [181]})
+
+        assert response.status_code == 400
+
+    def test_caps_births_with_charts(self, client):
+        """Test that include_charts is refused for more than 50 births."""
+        payload = {"births": [self.BIRTH] * 51, "include_charts": True}
+
+        assert client.post("/harmonics", json=payload).status_code == 400
+
+    def test_rate_limited(self, client, one_request_per_client):
+        """Test that /harmonics goes through admission control."""
+        payload = {"births": [self.BIRTH], "harmonics": [1, 4, 5]}
+
+        assert client.post("/harmonics", json=payload).status_code == 200
+        assert client.post("/harmonics", json=payload).status_code == 429
@@ -0,0 +1,126 @@
+"""Unit tests for the accuracy regression harness."""
+
+import swisseph as swe
+
+from src.core.aspects import separation
+from src.core.calculations import _calculate_jd
+from src.tools.accuracy import (
+    CATEGORIES,
+    compare_charts,
+    compare_engines,
+    generate_cases,
+    main,
+    read_reference,
+    reference_chart,
+    run_engine,
+)
+
+
+def shifted_sun_chart(date_str, time_str, latitude, longitude):
+    """An engine with the Sun half a degree off."""
+    chart = reference_chart(date_str, time_str, latitude, longitude)
+    chart.planets[0].longitude = (chart.planets[0].longitude + 0.5) % 360
+    return chart
+
+
+class TestCorpus:
+    """Tests for the generated corpus."""
+
+    def test_deterministic_for_a_seed(self):
+        """Test that the same seed gives the same corpus and categories rotate."""
+        cases = generate_cases(20, seed=3)
+
+        assert cases == generate_cases(20, seed=3)
+        assert cases != generate_cases(20, seed=4)
+        assert [case[0] for case in cases[:5]] == list(CATEGORIES)
+
+    def test_edge_categories(self):
+        """Test that edge cases sit on the boundaries they target."""
+        for category, date_str, time_str, latitude, longitude in generate_cases(50):
+            jd = _calculate_jd(date_str, time_str)
+            if category == "extreme_latitude":
+                assert 60 <= abs(latitude) <= 90
+            elif category in ("wraparound", "sign_edge"):
+                # Within two minutes of the crossing; the Moon moves ~0.5°/h
+                sun = swe.calc_ut(jd, swe.SUN)[0][0] % 30
+                moon = swe.calc_ut(jd, swe.MOON)[0][0] % 30
+                assert min(sun, 30 - sun, moon, 30 - moon) < 0.02
+            elif category == "cusp_edge":
+                mc = swe.houses_ex(jd, latitude, longitude, b"P")[1][1]
+                chart = reference_chart(date_str, time_str, latitude, longitude)
+                assert min(separation(p.longitude, mc) for p in chart.planets) < 1e-6
+
+
+class TestCompareCharts:
+    """Tests for chart-to-chart comparison."""
+
+    CASE = ("1990-06-15", "14:30:00", 40.7128, -74.006)
+
+    def test_identical_charts(self):
+        """Test that a chart compared with itself has no differences."""
+        chart = reference_chart(*self.CASE)
+
+        diff = compare_charts(chart, chart)
+
+        assert diff["max_angle_error"] == 0.0
+        assert diff["sign_mismatches"] == diff["house_mismatches"] == 0
+        assert diff["aspects_missing"] == diff["aspects_extra"] == 0
+        assert not diff["pattern_mismatch"]
+
+    def test_reports_angle_error(self):
+        """Test that a displaced body is found and measured."""
+        expected = reference_chart(*self.CASE)
+        actual = shifted_sun_chart(*self.CASE)
+
+        diff = compare_charts(expected, actual)
+
+        assert abs(diff["max_angle_error"] - 0.5) < 1e-9
+        assert diff["worst_body"] == "Sun"
+
+    def test_boundary_mismatch_is_not_gated(self):
+        """Test that a sign flip within the tolerance counts as a boundary mismatch."""
+        expected = reference_chart(*self.CASE)
+        actual = reference_chart(*self.CASE)
+        for chart, lon in ((expected, 59.99999), (actual, 60.00001)):
+            body = chart.planets[5]
+            body.longitude = lon
+            body.sign, body.degree, body.minute = (
+                ("Taurus", 29, 59) if lon < 60 else ("Gemini", 0, 0)
+            )
+
+        diff = compare_charts(expected, actual, tolerance=1e-4)
+
+        assert diff["sign_mismatches"] == 0
+        assert diff["boundary_mismatches"] >= 1
+        assert compare_charts(expected, actual, tolerance=1e-6)["sign_mismatches"] == 1
+
+
+class TestCompareEngines:
+    """Tests for engine runs and the release gate."""
+
+    def test_reference_passes_and_shifted_engine_fails(self):
+        """Test that the gate flags an engine with a displaced planet."""
+        cases = generate_cases(10)
+        reference, _ = run_engine(reference_chart, cases)
+
+        result = compare_engines(
+            cases, reference, {"reference": reference_chart, "shifted": shifted_sun_chart}
+        )
+
+        assert result["engines"]["reference"]["max_angle_error"] == 0.0
+        assert result["regressions"][0] == "shifted: max_angle_error"
+        assert all(r.startswith("shifted") for r in result["regressions"])
+        assert result["engines"]["shifted"]["expected_errors"] > 0
+
+    def test_record_and_compare(self, tmp_path, capsys):
+        """Test the CLI round trip through a recorded reference."""
+        path = str(tmp_path / "reference.jsonl")
+
+        assert main(["record", path, "--cases", "10"]) == 0
+        settings, cases, outcomes = read_reference(path)
+        assert settings["cases"] == 10 and len(cases) == 10
+        assert cases == generate_cases(10)
+
+        assert main(["compare", "--reference", path, "--engine", "compact"]) == 0
+        spec = f"{__name__}:shifted_sun_chart"
+        assert main(["compare", "--reference", path, "--engine", spec]) == 1
@@ -0,0 +1,145 @@
+"""Unit tests for admission control and load shedding."""
+
+import asyncio
+
+import pytest
+
+from src.api.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    ClientRateLimiter,
+    TokenBucket,
+)
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_bucket_allows_burst_then_rejects(self):
+        """Test that a full bucket allows `capacity` requests then rejects."""
+        bucket = TokenBucket(rate=1.0, capacity=3, now=0.0)
+
+        assert all(bucket.try_acquire(0.0)[0] for _ in range(3))
+        acquired, wait = bucket.try_acquire(0.0)
+
+        assert not acquired
+        assert wait == pytest.approx(1.0)
+
+    def test_bucket_refills_over_time(self):
+        """Test that tokens refill at the configured rate."""
+        bucket = TokenBucket(rate=2.0, capacity=1, now=0.0)
+        bucket.try_acquire(0.0)
+
+        assert not bucket.try_acquire(0.1)[0]
+        assert bucket.try_acquire(0.6)[0]
+
+
+class TestClientRateLimiter:
+    """Tests for per-client rate limiting."""
+
+    def test_clients_are_limited_independently(self):
+        """Test that one client's usage does not affect another."""
+        limiter = ClientRateLimiter(rate=1.0, burst=1)
+        limiter.check("a", now=0.0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            limiter.check("a", now=0.0)
+        assert exc_info.value.status_code == 429
+
+        limiter.check("b", now=0.0)
+
+    def test_limiter_bounds_tracked_clients(self):
+        """Test that the least recently seen clients are evicted."""
+        limiter = ClientRateLimiter(rate=1.0, burst=1, max_clients=2)
+        for client in ("a", "b", "c"):
+            limiter.check(client, now=0.0)
+
+        assert len(limiter) == 2
+
+
+class TestAdmissionController:
+    """Tests for bounded concurrency with a deadline-limited queue."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency blocks run at once."""
+        controller = AdmissionController(max_concurrency=2, max_queue=10, queue_timeout=5)
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            async with controller.admit():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(work() for _ in range(6)))
+
+        assert peak == 2
+        assert controller.metrics()["admitted"] == 6
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_immediately(self):
+        """Test that requests beyond the queue are shed with 503."""
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit():
+                pass
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.reason == "queue_full"
+        assert int(exc_info.value.retry_after_header) >= 1
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert controller.metrics()["rejected_queue_full"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_deadline_rejects(self):
+        """Test that waiting longer than queue_timeout is shed with 503."""
+        controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=0.01)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit():
+                pass
+
+        assert exc_info.value.reason == "queue_timeout"
+        release.set()
+        await holder
+
+        metrics = controller.metrics()
+        assert metrics["waiting"] == 0
+        assert metrics["active"] == 0
+        assert metrics["rejected_timeout"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_is_recorded(self):
+        """Test that queue-time metrics are exposed."""
+        controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=5)
+
+        async with controller.admit() as waited:
+            assert waited >= 0
+
+        wait_metrics = controller.metrics()["queue_wait_seconds"]
+        assert wait_metrics["count"] == 1
+        assert wait_metrics["buckets"]["+Inf"] == 1
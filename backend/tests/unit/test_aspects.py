@@ -0,0 +1,139 @@
+"""Unit tests for the sorted-sweep aspect and midpoint finder."""
+
+import random
+
+import pytest
+
+from src.core import aspects
+from src.core.aspects import (
+    MIDPOINT_ASPECTS,
+    SWEEP_MIN_BODIES,
+    find_aspects,
+    find_midpoint_aspects,
+    midpoint,
+    midpoints,
+    separation,
+)
+from src.core.calculations import MAJOR_ASPECTS
+from src.tools.bench_aspects import DEFAULT_SIZE, EXTENDED_SIZE
+
+
+def _brute_aspects(longitudes, aspects):
+    """Reference pair loop (the original get_aspects algorithm)."""
+    found = []
+    for i in range(len(longitudes)):
+        for j in range(i + 1, len(longitudes)):
+            diff = separation(longitudes[i], longitudes[j])
+            for angle, (_, orb) in aspects.items():
+                offset = abs(diff - angle)
+                if offset <= orb:
+                    found.append((i, j, angle, offset))
+                    break
+    return found
+
+
+def _brute_midpoint_aspects(longitudes, aspects):
+    found = []
+    for i, j, mid in midpoints(longitudes):
+        for body, lon in enumerate(longitudes):
+            if body in (i, j):
+                continue
+            diff = separation(lon, mid)
+            for angle, (_, orb) in aspects.items():
+                offset = abs(diff - angle)
+                if offset <= orb:
+                    found.append((body, i, j, angle, offset))
+                    break
+    return sorted(found)
+
+
+@pytest.fixture(params=["pair", "sweep"])
+def search(request, monkeypatch):
+    """Run find_aspects through the pair loop, then through the sweep."""
+    if request.param == "sweep":
+        monkeypatch.setattr(aspects, "SWEEP_MIN_BODIES", 0)
+    return request.param
+
+
+class TestFindAspects:
+    """Tests for the pair-loop and sweep aspect finder."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    @pytest.mark.parametrize("count", [2, 14, 60])
+    def test_matches_pair_loop(self, search, seed, count):
+        """Test that both searches find exactly the pair-loop aspects."""
+        rng = random.Random(seed)
+        longitudes = [rng.uniform(0, 360) for _ in range(count)]
+
+        assert find_aspects(longitudes, MAJOR_ASPECTS) == _brute_aspects(
+            longitudes, MAJOR_ASPECTS
+        )
+
+    def test_wraparound_at_zero(self, search):
+        """Test aspects whose orb window crosses 0 degrees."""
+        longitudes = [359.0, 2.0, 181.0, 62.5]
+
+        assert find_aspects(longitudes, MAJOR_ASPECTS) == _brute_aspects(
+            longitudes, MAJOR_ASPECTS
+        )
+        assert (0, 1, 0, pytest.approx(3.0)) in find_aspects(longitudes, MAJOR_ASPECTS)
+
+    def test_exact_orb_boundary(self, search):
+        """Test that a separation exactly at the orb limit is included."""
+        longitudes = [10.0, 18.0, 76.0]
+
+        assert find_aspects(longitudes, MAJOR_ASPECTS) == _brute_aspects(
+            longitudes, MAJOR_ASPECTS
+        )
+        assert (0, 1, 0, 8.0) in find_aspects(longitudes, MAJOR_ASPECTS)
+
+    def test_empty_and_single(self, search):
+        """Test degenerate inputs."""
+        assert find_aspects([], MAJOR_ASPECTS) == []
+        assert find_aspects([123.0], MAJOR_ASPECTS) == []
+
+    def test_default_chart_uses_pair_loop(self, monkeypatch):
+        """Test that charts below the sweep threshold never sort and bisect."""
+
+        def no_sweep(*args):
+            raise AssertionError("sweep used below SWEEP_MIN_BODIES")
+
+        monkeypatch.setattr(aspects, "_sweep_aspects", no_sweep)
+        rng = random.Random(0)
+
+        assert DEFAULT_SIZE < EXTENDED_SIZE < SWEEP_MIN_BODIES
+        for count in (DEFAULT_SIZE, EXTENDED_SIZE):
+            longitudes = [rng.uniform(0, 360) for _ in range(count)]
+            assert find_aspects(longitudes, MAJOR_ASPECTS) == _brute_aspects(
+                longitudes, MAJOR_ASPECTS
+            )
+
+
+class TestMidpoints:
+    """Tests for midpoints and midpoint aspects."""
+
+    def test_shorter_arc_midpoint(self):
+        """Test that the midpoint is taken on the shorter arc."""
+        assert midpoint(10.0, 50.0) == pytest.approx(30.0)
+        assert midpoint(350.0, 20.0) == pytest.approx(5.0)
+        assert midpoint(20.0, 350.0) == pytest.approx(5.0)
+
+    def test_midpoint_count(self):
+        """Test that every pair yields one midpoint."""
+        assert len(midpoints([0.0, 90.0, 180.0, 270.0])) == 6
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_midpoint_aspects_match_brute_force(self, seed):
+        """Test the sweep against an exhaustive body x midpoint scan."""
+        rng = random.Random(seed)
+        longitudes = [rng.uniform(0, 360) for _ in range(25)]
+
+        assert find_midpoint_aspects(longitudes) == _brute_midpoint_aspects(
+            longitudes, MIDPOINT_ASPECTS
+        )
+
+    def test_body_not_reported_against_own_midpoint(self):
+        """Test that a midpoint's own bodies are excluded."""
+        # 0 and 180 have midpoint 90 (or 270), which squares both of them
+        for body, i, j, _, _ in find_midpoint_aspects([0.0, 180.0, 90.0]):
+            assert body not in (i, j)
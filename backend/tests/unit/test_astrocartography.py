@@ -0,0 +1,92 @@
+"""Unit tests for the astrocartography engine."""
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.core.astrocartography import (
+    ANGLES,
+    _split_antimeridian,
+    astrocartography_lines,
+    calculate_astrocartography,
+)
+from src.core.calculations import PLANETS, _calculate_jd, get_planet_positions
+
+DATE, TIME = "1990-06-15", "14:30:00"
+
+
+@pytest.fixture(scope="module")
+def lines():
+    return calculate_astrocartography(DATE, TIME, resolution=1.0, max_latitude=60.0)
+
+
+def _angle_longitude(jd, lat, lon, angle):
+    cusps, ascmc = swe.houses_ex(jd, lat, lon, b"E")
+    asc, mc = ascmc[0], ascmc[1]
+    return {"ASC": asc, "DSC": asc + 180, "MC": mc, "IC": mc + 180}[angle] % 360
+
+
+class TestAstrocartography:
+    """Tests for the analytic angularity lines."""
+
+    def test_one_feature_per_planet_and_angle(self, lines):
+        """Test the GeoJSON layout."""
+        assert lines["type"] == "FeatureCollection"
+        keys = [(f["properties"]["planet"], f["properties"]["angle"]) for f in lines["features"]]
+        assert keys == [(planet, angle) for planet in PLANETS for angle in ANGLES]
+        assert all(f["geometry"]["type"] == "MultiLineString" for f in lines["features"])
+
+    def test_lines_agree_with_houses_ex(self, lines):
+        """Test that each line point puts the planet on that angle."""
+        jd = _calculate_jd(DATE, TIME)
+        for feature in lines["features"]:
+            planet, angle = feature["properties"]["planet"], feature["properties"]["angle"]
+            target = swe.calc_ut(jd, PLANETS[planet])[0][0]
+            for line in feature["geometry"]["coordinates"]:
+                for lon, lat in line[::4]:
+                    found = _angle_longitude(jd, lat, lon, angle)
+                    assert abs((found - target + 180) % 360 - 180) < 0.05, (planet, angle)
+
+    def test_horizon_lines_end_where_planet_is_circumpolar(self):
+        """Test that ASC and DSC meet at the circumpolar latitude."""
+        jd = _calculate_jd(DATE, TIME)
+        planets = get_planet_positions(DATE, TIME, 0.0, 0.0, [30.0 * n for n in range(12)])
+        sun = [p for p in planets if p.name == "Sun"]
+
+        result = astrocartography_lines(jd, sun, resolution=2.0)
+
+        asc, dsc = (f["geometry"]["coordinates"] for f in result["features"][:2])
+        top = max(point[1] for line in asc for point in line)
+        assert top == max(point[1] for line in dsc for point in line)
+        # Sun near the June solstice: circumpolar beyond ~66.6°
+        assert 66 < top < 67
+
+    def test_finer_resolution_adds_points(self):
+        """Test that the resolution controls the number of points."""
+        coarse = calculate_astrocartography(DATE, TIME, resolution=2.0)
+        fine = calculate_astrocartography(DATE, TIME, resolution=0.25)
+
+        def count(result):
+            return sum(len(line) for f in result["features"] for line in f["geometry"]["coordinates"])
+
+        assert count(fine) > 6 * count(coarse)
+
+    def test_rejects_bad_resolution(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError):
+            calculate_astrocartography(DATE, TIME, resolution=0)
+
+
+class TestSplitAntimeridian:
+    """Tests for splitting polylines at ±180°."""
+
+    def test_crossing_is_interpolated_onto_both_edges(self):
+        """Test that a crossing produces two pieces meeting at the border."""
+        points = np.array([[170.0, 0.0], [178.0, 1.0], [-176.0, 2.0], [-170.0, 3.0]])
+
+        pieces = _split_antimeridian(points)
+
+        assert len(pieces) == 2
+        assert pieces[0][-1][0] == 180.0 and pieces[1][0][0] == -180.0
+        assert pieces[0][-1][1] == pytest.approx(1.0 + 2 / 6)
+        assert pieces[1][0][1] == pieces[0][-1][1]
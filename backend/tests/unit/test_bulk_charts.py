@@ -0,0 +1,113 @@
+"""Unit tests for the bulk chart CLI."""
+
+import csv
+import os
+
+import pytest
+
+from src.tools.bulk_charts import main, output_columns, run_bulk
+
+RECORDS = [
+    ("1", "1990-06-15", "14:30:00", "USA", "New York"),
+    ("2", "1985-01-01", "00:00:00", "UK", "London"),
+    ("3", "2000-12-31", "23:59:59", "Japan", "Tokyo"),
+    ("4", "not-a-date", "12:00:00", "France", "Paris"),
+    ("5", "1970-07-04", "06:15:00", "Spain", "Madrid"),
+]
+
+
+@pytest.fixture
+def births_csv(tmp_path):
+    path = tmp_path / "births.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "date", "time", "country", "city"])
+        writer.writerows(RECORDS)
+    return str(path)
+
+
+def _read_parts(output_dir):
+    rows = []
+    for name in sorted(os.listdir(output_dir)):
+        if name.startswith("part-"):
+            with open(os.path.join(output_dir, name), newline="") as f:
+                rows.extend(csv.DictReader(f))
+    return rows
+
+
+class TestRunBulk:
+    """Tests for chunked bulk computation."""
+
+    def test_writes_flat_columns_per_chunk(self, births_csv, tmp_path):
+        """Test that every record lands in a flat row, chunked into parts."""
+        output_dir = str(tmp_path / "out")
+
+        stats = run_bulk(births_csv, output_dir, chunk_size=2, workers=2)
+
+        assert stats == {"chunks_computed": 3, "chunks_skipped": 0, "rows": 5}
+        rows = _read_parts(output_dir)
+        assert [r["id"] for r in rows] == ["1", "2", "3", "4", "5"]
+        assert list(rows[0]) == output_columns()
+        assert rows[0]["sun_sign"] == "Gemini"
+        assert 1 <= int(rows[0]["moon_house"]) <= 12
+        assert len(rows[0]["aspect_type"].split(";")) == len(rows[0]["aspect_orb"].split(";"))
+        assert len(rows[0]["pattern_type"].split(";")) == len(rows[0]["pattern_apex"].split(";"))
+        assert rows[3]["error"]
+        assert rows[3]["sun_longitude"] == ""
+
+    def test_resume_skips_completed_chunks(self, births_csv, tmp_path):
+        """Test that a rerun only computes missing chunks."""
+        output_dir = str(tmp_path / "out")
+        run_bulk(births_csv, output_dir, chunk_size=2, workers=1)
+        os.remove(os.path.join(output_dir, "part-000001.csv"))
+
+        stats = run_bulk(births_csv, output_dir, chunk_size=2, workers=1)
+
+        assert stats == {"chunks_computed": 1, "chunks_skipped": 2, "rows": 2}
+        assert len(_read_parts(output_dir)) == 5
+
+    def test_resume_rejects_changed_settings(self, births_csv, tmp_path):
+        """Test that resuming with a different chunk size is refused."""
+        output_dir = str(tmp_path / "out")
+        run_bulk(births_csv, output_dir, chunk_size=2, workers=1)
+
+        with pytest.raises(ValueError):
+            run_bulk(births_csv, output_dir, chunk_size=3, workers=1)
+
+        stats = run_bulk(births_csv, output_dir, chunk_size=3, workers=1, resume=False)
+        assert stats["chunks_computed"] == 2
+
+    def test_field_selection_leaves_other_columns_empty(self, births_csv, tmp_path):
+        """Test that --fields/--bodies compute only the selected columns."""
+        output_dir = str(tmp_path / "out")
+
+        assert main([births_csv, output_dir, "--fields", "planets", "--bodies", "Sun, Moon"]) == 0
+
+        row = _read_parts(output_dir)[0]
+        assert list(row) == output_columns()
+        assert row["sun_sign"] == "Gemini"
+        assert 1 <= int(row["moon_house"]) <= 12
+        assert row["mercury_longitude"] == ""
+        assert row["ascendant_longitude"] == row["house_1_longitude"] == ""
+        assert row["aspect_type"] == row["pattern_type"] == ""
+
+    def test_resume_rejects_changed_selection(self, births_csv, tmp_path):
+        """Test that resuming with a different field selection is refused."""
+        output_dir = str(tmp_path / "out")
+        run_bulk(births_csv, output_dir, chunk_size=2, workers=1, fields=["planets"])
+
+        with pytest.raises(ValueError):
+            run_bulk(births_csv, output_dir, chunk_size=2, workers=1)
+
+    def test_parquet_round_trip(self, births_csv, tmp_path):
+        """Test Parquet output with list-typed aspect columns."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output_dir = str(tmp_path / "out")
+
+        assert main([births_csv, output_dir, "--format", "parquet", "--chunk-size", "10"]) == 0
+
+        table = pq.read_table(os.path.join(output_dir, "part-000000.parquet"))
+        assert table.num_rows == 5
+        row = table.slice(0, 1).to_pylist()[0]
+        assert isinstance(row["aspect_orb"], list)
+        assert row["sun_house"] == int(row["sun_house"])
@@ -0,0 +1,299 @@
+"""Unit tests for the compact array-backed chart representation."""
+
+import ast
+import pickle
+
+import pytest
+
+from src.core import compact
+from src.core.calculations import (
+    _calculate_jd,
+    _get_city_coordinates,
+    get_aspects,
+    get_astrological_points,
+    get_house_cusps,
+    get_planet_positions,
+)
+from src.core.compact import (
+    ASPECT_NAMES,
+    CHART_FIELDS,
+    DEFAULT_FIELDS,
+    NO_HOUSE,
+    build_compact_chart,
+    build_partial_chart,
+    calculate_compact_chart,
+    chart_selection,
+)
+from src.core.patterns import detect_patterns
+from src.models import ChartData
+
+CASES = [
+    ("1990-06-15", "14:30:00", "USA", "New York"),
+    ("2000-01-01", "00:00:00", "UK", "London"),
+    ("1985-12-31", "23:59:59", "Japan", "Tokyo"),
+    ("1972-03-21", "06:15:00", "Taiwan", "Taipei"),
+    ("2024-02-29", "12:00:00", "Nowhere", "Unknown City"),
+]
+
+
+def _legacy_chart(date_str, time_str, country, city, patterns=False):
+    """The chart as composed from the original per-section helpers."""
+    latitude, longitude = _get_city_coordinates(city, country)
+    houses = get_house_cusps(date_str, time_str, latitude, longitude)
+    planets = get_planet_positions(
+        date_str, time_str, latitude, longitude, [h.longitude for h in houses]
+    )
+    points = get_astrological_points(date_str, time_str, latitude, longitude)
+    chart = ChartData(
+        planets=planets,
+        points=points,
+        houses=houses,
+        aspects=get_aspects(planets, points),
+    )
+    if patterns:
+        chart.patterns = detect_patterns(chart)
+        chart.computed = list(CHART_FIELDS)
+    return chart
+
+
+class TestCompactChart:
+    """Tests for CompactChart construction and conversion."""
+
+    @pytest.mark.parametrize("case", CASES)
+    def test_matches_legacy_chart(self, case):
+        """Test that conversion reproduces the original ChartData exactly."""
+        compact = calculate_compact_chart(*case)
+
+        assert compact.to_chart_data() == _legacy_chart(*case)
+
+    @pytest.mark.parametrize("case", CASES)
+    def test_matches_legacy_chart_with_patterns(self, case):
+        """Test that requesting patterns reproduces the original detection."""
+        compact = calculate_compact_chart(*case, fields=CHART_FIELDS)
+
+        assert compact.to_chart_data() == _legacy_chart(*case, patterns=True)
+
+    def test_patterns_are_opt_in(self, monkeypatch):
+        """Test that a chart without a selection skips pattern detection."""
+
+        def no_patterns(*args):
+            raise AssertionError("patterns detected")
+
+        monkeypatch.setattr(compact, "find_chart_patterns", no_patterns)
+
+        chart = calculate_compact_chart(*CASES[0])
+
+        assert chart.fields == DEFAULT_FIELDS
+        assert chart.to_chart_data().computed == list(DEFAULT_FIELDS)
+
+    def test_patterns_follow_fields(self):
+        """Test that patterns are only emitted when "patterns" was computed."""
+        chart = calculate_compact_chart(*CASES[0], fields=CHART_FIELDS)
+        assert chart.patterns and chart.to_chart_data().patterns
+
+        chart.fields = DEFAULT_FIELDS
+        data = chart.to_chart_data()
+
+        assert data.patterns == []
+        assert data.computed == list(DEFAULT_FIELDS)
+
+    def test_layout(self):
+        """Test the slot layout of a default chart."""
+        chart = calculate_compact_chart(*CASES[0])
+
+        assert len(chart) == 14
+        assert chart.names()[:2] == ["Sun", "Moon"]
+        assert chart.names()[10:] == ["Ascendant", "Descendant", "Midheaven", "Imum Coeli"]
+        assert len(chart.cusps) == 12
+        assert all(1 <= house <= 12 for house in chart.houses[:10])
+        assert all(house == NO_HOUSE for house in chart.houses[10:])
+        assert len(chart.aspects) == 3 * chart.aspect_count
+
+    def test_slot_lookup(self):
+        """Test name-based accessors."""
+        chart = calculate_compact_chart(*CASES[0])
+
+        slot = chart.slot("Mars")
+        assert chart.names()[slot] == "Mars"
+        assert chart.longitude_of("Mars") == chart.longitudes[slot]
+        assert chart.signs[slot] == int(chart.longitudes[slot] // 30)
+
+    def test_iter_aspects(self):
+        """Test that aspect triples decode to valid slots and types."""
+        chart = calculate_compact_chart(*CASES[0])
+
+        for i, j, code, orb in chart.iter_aspects():
+            assert 0 <= i < j < len(chart)
+            assert 0 <= code < len(ASPECT_NAMES)
+            assert orb >= 0
+
+    def test_pickle_round_trip(self):
+        """Test that a chart survives pickling and stays small."""
+        chart = calculate_compact_chart(*CASES[1])
+
+        payload = pickle.dumps(chart)
+        restored = pickle.loads(payload)
+
+        assert restored.to_chart_data() == chart.to_chart_data()
+        assert restored.jd == chart.jd
+        assert len(payload) < len(pickle.dumps(chart.to_chart_data()))
+
+    def test_build_from_julian_day(self):
+        """Test building directly from a Julian Day and coordinates."""
+        latitude, longitude = _get_city_coordinates("London", "UK")
+        jd = _calculate_jd("2000-01-01", "00:00:00")
+
+        chart = build_compact_chart(jd, latitude, longitude)
+
+        assert chart.jd == jd
+        assert (chart.latitude, chart.longitude) == (latitude, longitude)
+
+
+class TestLayering:
+    """Tests for the module layering of the calculation modules."""
+
+    def test_calculations_does_not_import_its_dependents(self):
+        """Test that calculations, at any depth, imports none of the modules built on it."""
+        from src.core import calculations
+
+        with open(calculations.__file__, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        imported = {
+            node.module for node in ast.walk(tree) if isinstance(node, ast.ImportFrom)
+        } | {
+            alias.name
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Import)
+            for alias in node.names
+        }
+
+        assert not imported & {"src.core.compact", "src.core.sky_cache", "src.core.ingress"}
+
+
+class TestExtendedBodies:
+    """Tests for charts with the extended body set."""
+
+    def test_extended_bodies_follow_the_angles(self):
+        """Test that available extended bodies are appended with houses."""
+        chart = calculate_compact_chart(*CASES[0], extended=True)
+        names = chart.names()
+
+        assert names[:14] == calculate_compact_chart(*CASES[0]).names()
+        # Nodes and Lilith need no extra ephemeris files
+        assert {"North Node", "South Node", "Lilith"} <= set(names[14:])
+        assert all(1 <= house <= 12 for house in chart.houses[14:])
+        south = chart.longitude_of("South Node")
+        assert south == pytest.approx((chart.longitude_of("North Node") + 180) % 360)
+
+    def test_extended_chart_data_lists_bodies_as_planets(self):
+        """Test that extended bodies convert to Planet entries."""
+        data = calculate_compact_chart(*CASES[0], extended=True).to_chart_data()
+
+        assert "North Node" in [planet.name for planet in data.planets]
+        assert len(data.points) == 4
+
+    def test_midpoint_aspects_use_body_names(self):
+        """Test that midpoint aspects are reported by name."""
+        chart = calculate_compact_chart(*CASES[0], extended=True)
+
+        for body, first, second, aspect, orb in chart.midpoint_aspects():
+            assert body not in (first, second)
+            assert aspect in ("Conjunction", "Semi-square", "Square", "Sesquiquadrate", "Opposition")
+            assert orb <= 1.5
+
+
+class TestPartialChart:
+    """Tests for charts computed from a field and body selection."""
+
+    @pytest.fixture
+    def moment(self):
+        latitude, longitude = _get_city_coordinates("New York", "USA")
+        return _calculate_jd("1990-06-15", "14:30:00"), latitude, longitude
+
+    def test_full_selection_matches_full_chart(self, moment):
+        """Test that selecting everything reproduces build_compact_chart."""
+        partial = build_partial_chart(*moment, list(CHART_FIELDS))
+        full = build_compact_chart(*moment, patterns=True)
+
+        assert partial.to_chart_data() == full.to_chart_data()
+        assert build_partial_chart(*moment).fields == DEFAULT_FIELDS
+
+    def test_subset_matches_full_chart(self, moment):
+        """Test that selected bodies keep the positions and houses of the full chart."""
+        full = build_compact_chart(*moment).to_chart_data()
+
+        data = build_partial_chart(
+            *moment, ["planets", "points"], ["Sun", "Moon", "Ascendant"]
+        ).to_chart_data()
+
+        assert data.planets == full.planets[:2]
+        assert data.points == full.points[:1]
+        assert data.houses == data.aspects == data.patterns == []
+        assert data.computed == ["planets", "points"]
+
+    def test_aspects_among_selected_bodies(self, moment):
+        """Test that aspects are limited to the selected bodies."""
+        selected = {"Sun", "Moon", "Mars", "Venus"}
+        full = build_compact_chart(*moment).to_chart_data()
+
+        data = build_partial_chart(*moment, ["aspects"], sorted(selected)).to_chart_data()
+
+        assert data.planets == data.points == []
+        assert data.aspects == [
+            a for a in full.aspects if {a.planet1, a.planet2} <= selected
+        ]
+
+    def test_skips_unneeded_ephemeris_calls(self, moment, monkeypatch):
+        """Test that only the selected planets are computed and houses are skipped."""
+        calls = []
+        real_calc_ut = compact.swe.calc_ut
+
+        def counting_calc_ut(jd, body_id, *args):
+            calls.append(body_id)
+            return real_calc_ut(jd, body_id, *args)
+
+        def no_houses(*args):
+            raise AssertionError("houses computed")
+
+        monkeypatch.setattr(compact.swe, "calc_ut", counting_calc_ut)
+        monkeypatch.setattr(compact, "house_positions", no_houses)
+
+        chart = build_partial_chart(*moment, ["aspects"], ["Sun", "Moon"])
+
+        assert len(calls) == 2
+        assert chart.names() == ["Sun", "Moon"]
+        assert len(chart.cusps) == 0
+
+    def test_houses_only(self, moment):
+        """Test that a houses-only chart has cusps and no bodies."""
+        chart = build_partial_chart(*moment, ["houses"])
+
+        assert len(chart) == 0
+        assert list(chart.cusps) == list(build_compact_chart(*moment).cusps)
+
+    def test_pickle_keeps_fields(self, moment):
+        """Test that the computed fields survive pickling."""
+        chart = build_partial_chart(*moment, ["planets"], ["Sun"])
+
+        assert pickle.loads(pickle.dumps(chart)).fields == ("planets",)
+
+    def test_selection_is_normalized(self):
+        """Test that fields and bodies come back in canonical order."""
+        assert chart_selection(["aspects", "planets"], ["Ascendant", "Moon", "Sun"]) == (
+            ("planets", "aspects"),
+            ("Sun", "Moon", "Ascendant"),
+        )
+
+    @pytest.mark.parametrize(
+        "fields, bodies",
+        [(["planets", "stars"], None), ([], None), (None, ["Sun", "Vulcan"]), (None, [])],
+    )
+    def test_rejects_invalid_selection(self, fields, bodies):
+        """Test that unknown or empty selections raise ValueError."""
+        with pytest.raises(ValueError):
+            chart_selection(fields, bodies)
+
+    def test_rejects_extended_selection(self):
+        """Test that extended bodies are not combined with a selection."""
+        with pytest.raises(ValueError):
+            calculate_compact_chart(*CASES[0], extended=True, fields=["planets"])
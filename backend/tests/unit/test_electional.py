@@ -0,0 +1,102 @@
+"""Unit tests for the electional search."""
+
+import pytest
+import swisseph as swe
+
+from src.core.calculations import _calculate_jd
+from src.core.electional import search_windows
+from src.core.lunar_calendar import build_voids
+from src.models import ElectionalConstraint
+
+START = _calculate_jd("2024-01-01", "00:00:00")
+LONDON = (51.5074, -0.1278)
+
+
+def _covered(windows, jd):
+    return any(start <= jd <= end for start, end in windows)
+
+
+class TestSearchWindows:
+    """Tests for interval search, pruning and refinement."""
+
+    def test_matches_minute_by_minute_scan(self):
+        """Test the windows against a brute-force scan of every ten minutes."""
+        constraints = [
+            ElectionalConstraint(kind="sign", body="Ascendant", sign="Leo"),
+            ElectionalConstraint(kind="retrograde", body="Mercury", negate=True),
+        ]
+        end = START + 5
+
+        windows = search_windows(START, end, constraints, *LONDON)
+
+        # Mercury stations direct on 2 January, so the first evening is out
+        assert len(windows) == 4
+        for k in range(int(5 * 144)):
+            jd = START + k / 144
+            asc = swe.houses_ex(jd, *LONDON, b"P")[1][0]
+            speed = swe.calc_ut(jd, swe.MERCURY, swe.FLG_SPEED)[0][3]
+            expected = int(asc // 30) == 4 and speed >= 0
+            if any(abs(jd - t) < 2 / 86400 for w in windows for t in w):
+                continue
+            assert _covered(windows, jd) == expected, jd
+
+    def test_boundaries_are_refined_to_seconds(self):
+        """Test that each window edge is where the Ascendant enters or leaves Leo."""
+        constraints = [ElectionalConstraint(kind="sign", body="Ascendant", sign="Leo")]
+
+        windows = search_windows(START, START + 2, constraints, *LONDON)
+
+        for start, end in windows:
+            assert swe.houses_ex(start, *LONDON, b"P")[1][0] == pytest.approx(120.0, abs=0.01)
+            assert swe.houses_ex(end, *LONDON, b"P")[1][0] == pytest.approx(150.0, abs=0.01)
+
+    def test_void_of_course_is_exact(self):
+        """Test that void periods come straight from the lunar tables."""
+        constraints = [ElectionalConstraint(kind="void_of_course")]
+
+        windows = search_windows(START, START + 30, constraints)
+
+        voids = build_voids(START, START + 33)
+        expected = [
+            (max(s, START), min(e, START + 30))
+            for s, e in zip(voids.starts.tolist(), voids.ends.tolist())
+            if s < START + 30 and e > START
+        ]
+        assert windows == expected
+
+    def test_negation_complements(self):
+        """Test that negate splits the range into complementary windows."""
+        moon_in_aries = ElectionalConstraint(kind="sign", body="Moon", sign="Aries")
+        not_in_aries = ElectionalConstraint(kind="sign", body="Moon", sign="Aries", negate=True)
+
+        inside = search_windows(START, START + 30, [moon_in_aries])
+        outside = search_windows(START, START + 30, [not_in_aries])
+
+        assert len(inside) == 1 and len(outside) == 2
+        total = sum(e - s for s, e in inside) + sum(e - s for s, e in outside)
+        assert total == pytest.approx(30, abs=1e-4)
+
+    def test_contradiction_finds_nothing(self):
+        """Test that exclusive conditions intersect to no window."""
+        constraints = [
+            ElectionalConstraint(kind="sign", body="Sun", sign="Capricorn"),
+            ElectionalConstraint(kind="sign", body="Sun", sign="Aquarius"),
+        ]
+
+        assert search_windows(START, START + 60, constraints) == []
+
+    def test_min_duration_drops_short_windows(self):
+        """Test the minimum window length."""
+        constraints = [ElectionalConstraint(kind="sign", body="Ascendant", sign="Aries")]
+
+        assert search_windows(START, START + 3, constraints, *LONDON)
+        assert search_windows(START, START + 3, constraints, *LONDON, min_duration_days=0.1) == []
+
+    def test_rejects_invalid_constraints(self):
+        """Test validation of bodies, locations and ranges."""
+        with pytest.raises(ValueError, match="location"):
+            search_windows(START, START + 1, [ElectionalConstraint(kind="house", body="Moon", house=1)])
+        with pytest.raises(ValueError, match="Unknown body"):
+            search_windows(START, START + 1, [ElectionalConstraint(kind="retrograde", body="Vulcan")])
+        with pytest.raises(ValueError, match="longer"):
+            search_windows(START, START + 400, [ElectionalConstraint(kind="void_of_course")])
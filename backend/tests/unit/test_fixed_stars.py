@@ -0,0 +1,109 @@
+"""Unit tests for the fixed-star catalog index."""
+
+import math
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.core.calculations import _calculate_jd, calculate_natal_chart
+from src.core.fixed_stars import StarCatalog, chart_conjunctions
+
+# sefstars.txt format (Hipparcos, ICRS)
+STAR_LINES = """\
+# name,nomenclature,equinox,RA h,m,s,Dec d,m,s,pm RA,pm Dec,rv,parallax,mag,DM zone,DM number
+Aldebaran,alTau,ICRS,04,35,55.2390,+16,30,33.488,63.45,-188.94,54.26,48.94,0.86,16,629
+Regulus,alLeo,ICRS,10,08,22.3110,+11,58,01.950,-248.73,5.59,5.9,41.13,1.40,12,2149
+Spica,alVir,ICRS,13,25,11.5790,-11,09,40.750,-42.35,-30.67,1.0,13.06,0.97,-10,3672
+Antares,alSco,ICRS,16,29,24.4600,-26,25,55.210,-12.11,-23.30,-3.4,5.89,1.06,-26,11359
+Sirius,alCMa,ICRS,06,45,08.9170,-16,42,58.020,-546.01,-1223.07,-5.5,379.21,-1.46,-16,1591
+Algol,bePer,ICRS,03,08,10.1320,+40,57,20.330,2.99,-1.66,4.0,35.14,2.12,40,673
+Fomalhaut,alPsA,ICRS,22,57,39.0470,-29,37,20.050,328.95,-164.67,6.5,129.81,1.16,-30,19370
+Old Star,xxOld,1950,01,00,00.0,+00,00,00.0,0,0,0,0,5.0,0,0
+"""
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    (tmp_path / "sefstars.txt").write_text(STAR_LINES)
+    return tmp_path
+
+
+@pytest.fixture
+def catalog(catalog_dir):
+    return StarCatalog.load(str(catalog_dir / "sefstars.txt"))
+
+
+class TestStarCatalog:
+    """Tests for catalog loading and vectorized positions."""
+
+    def test_loads_j2000_stars_only(self, catalog):
+        """Test parsing, skipping comments and other equinoxes."""
+        assert len(catalog) == 7
+        assert catalog.names[1] == "Regulus" and catalog.nomenclature[1] == "alLeo"
+        assert catalog.ra[1] == pytest.approx(math.radians(15 * (10 + 8 / 60 + 22.311 / 3600)))
+        assert catalog.dec[3] < 0
+
+    @pytest.mark.parametrize("date", ["1850-01-01", "2000-01-01", "2024-06-01", "2150-01-01"])
+    def test_positions_match_swe_fixstar(self, catalog, catalog_dir, date):
+        """Test precession and proper motion against swe.fixstar_ut."""
+        jd = _calculate_jd(date, "00:00:00")
+        positions = catalog.positions(jd)
+
+        swe.set_ephe_path(str(catalog_dir))
+        try:
+            expected = [swe.fixstar_ut(name, jd)[0][:2] for name in catalog.names]
+        finally:
+            swe.set_ephe_path()
+        for slot, star in enumerate(positions.order.tolist()):
+            lon, lat = expected[star]
+            # Catalog positions ignore annual aberration (< 0.006°) and use
+            # the epoch within 15 days
+            assert abs((positions.longitudes[slot] - lon + 180) % 360 - 180) < 0.012
+            assert positions.latitudes[slot] == pytest.approx(lat, abs=0.012)
+        assert np.all(np.diff(positions.longitudes) >= 0)
+
+    def test_positions_are_cached_per_epoch(self, catalog):
+        """Test that nearby moments share one computation."""
+        jd = _calculate_jd("2024-06-01", "00:00:00")
+
+        assert catalog.positions(jd) is catalog.positions(jd + 1)
+
+
+class TestConjunctions:
+    """Tests for binary-search conjunction lookups."""
+
+    def test_finds_stars_in_orb_ordered_by_distance(self, catalog):
+        """Test hits, orbs and the magnitude filter."""
+        jd = _calculate_jd("2000-01-01", "12:00:00")
+        positions = catalog.positions(jd)
+        regulus = float(positions.longitudes[positions.order.tolist().index(1)])
+
+        hits = catalog.conjunctions([regulus + 0.4, 10.0], jd, orb=1.0)
+
+        assert [(k, catalog.names[star]) for k, star, _ in hits] == [(0, "Regulus")]
+        assert hits[0][2] == pytest.approx(-0.4)
+        assert catalog.conjunctions([regulus], jd, max_magnitude=1.0) == []
+
+    def test_window_wraps_at_aries(self):
+        """Test a star just below 360° found from a longitude just above 0°."""
+        catalog = StarCatalog(["Zero"], ["ze"], [0.0], [0.0], [0.0], [0.0], [3.0])
+        jd = 2451545.0
+        star_lon = float(catalog.positions(jd).longitudes[0])
+        assert star_lon > 359.9
+
+        hits = catalog.conjunctions([0.5, 359.5, 180.0], jd, orb=1.0)
+
+        assert [k for k, star, distance in hits] == [0, 1]
+        assert hits[0][2] == pytest.approx(star_lon - 360.5)
+
+    def test_chart_conjunctions(self, catalog):
+        """Test conjunctions of a chart's planets and points."""
+        chart = calculate_natal_chart("2000-08-23", "12:00:00", "USA", "New York")
+        jd = _calculate_jd("2000-08-23", "12:00:00")
+
+        found = chart_conjunctions(catalog, chart, jd, orb=1.5)
+
+        sun = next(c for c in found if c.body == "Sun")
+        assert sun.star == "Regulus" and sun.orb < 1.5
+        assert sun.star_longitude == pytest.approx(149.84, abs=0.05)
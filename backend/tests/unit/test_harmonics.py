@@ -0,0 +1,129 @@
+"""Unit tests for harmonic charts and spectra."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from src.core import harmonics
+from src.core.aspects import separation
+from src.core.calculations import _calculate_jd, _get_city_coordinates
+from src.core.harmonics import (
+    HARMONIC_BODIES,
+    MAX_HARMONIC,
+    harmonic_charts,
+    harmonic_range,
+    harmonic_spectra,
+    harmonic_strengths,
+)
+from src.tools.harmonic_spectra import main, parse_harmonics
+
+
+def _pair_loop(longitudes, harmonic, orb):
+    """Strength of one harmonic from the plain pair loop."""
+    total = 0.0
+    for i in range(len(longitudes)):
+        for j in range(i + 1, len(longitudes)):
+            distance = separation(
+                longitudes[i] * harmonic % 360, longitudes[j] * harmonic % 360
+            )
+            total += max(0.0, 1.0 - distance / orb)
+    return total
+
+
+class TestHarmonicStrengths:
+    """Tests for the vectorized harmonic computation."""
+
+    def test_harmonic_charts(self):
+        """Test that harmonic charts multiply longitudes modulo 360."""
+        charts = harmonic_charts(np.array([[10.0, 200.0]]), [1, 2, 5])
+
+        assert charts.shape == (1, 3, 2)
+        assert charts[0].tolist() == [[10.0, 200.0], [20.0, 40.0], [50.0, 280.0]]
+
+    def test_matches_pair_loop(self):
+        """Test that a batch matches the per-harmonic pair loop."""
+        longitudes = np.random.default_rng(1).uniform(0, 360, (4, 12))
+
+        strengths = harmonic_strengths(longitudes, harmonic_range(), orb=6.0)
+
+        assert strengths.shape == (4, MAX_HARMONIC)
+        for k in range(4):
+            for h in (1, 2, 7, 45, 180):
+                assert strengths[k, h - 1] == pytest.approx(_pair_loop(longitudes[k], h, 6.0))
+
+    def test_square_is_conjunct_in_fourth_harmonic(self):
+        """Test that a square becomes an exact conjunction in harmonic 4."""
+        strengths = harmonic_strengths(np.array([0.0, 90.0]), [1, 3, 4, 8])
+
+        assert strengths.tolist() == pytest.approx([0.0, 0.0, 1.0, 1.0])
+
+    def test_blocks_do_not_change_results(self, monkeypatch):
+        """Test that splitting a batch into blocks gives the same spectra."""
+        longitudes = np.random.default_rng(2).uniform(0, 360, (5, 12))
+        whole = harmonic_strengths(longitudes, [1, 5, 9])
+
+        monkeypatch.setattr(harmonics, "BLOCK_CHARTS", 2)
+
+        assert np.array_equal(harmonic_strengths(longitudes, [1, 5, 9]), whole)
+
+    @pytest.mark.parametrize("values", [[], [0], [MAX_HARMONIC + 1]])
+    def test_rejects_invalid_harmonics(self, values):
+        """Test that empty or out-of-range harmonics raise ValueError."""
+        with pytest.raises(ValueError):
+            harmonic_range(values)
+
+    def test_rejects_invalid_orb(self):
+        """Test that the orb must be below 180."""
+        with pytest.raises(ValueError):
+            harmonic_strengths(np.zeros(3), [1], orb=180)
+
+
+class TestHarmonicSpectra:
+    """Tests for spectra of births."""
+
+    def test_spectra_of_births(self):
+        """Test one spectrum per birth, with optional harmonic charts."""
+        births = [
+            (_calculate_jd("1990-06-15", "14:30:00"), *_get_city_coordinates("New York", "USA")),
+            (_calculate_jd("1985-01-01", "00:00:00"), *_get_city_coordinates("London", "UK")),
+        ]
+
+        results = harmonic_spectra(births, [1, 2, 3], include_charts=True)
+
+        assert len(results) == 2
+        assert results[0].harmonics == [1, 2, 3]
+        assert len(results[0].strengths) == 3
+        assert list(results[0].charts) == list(HARMONIC_BODIES)
+        sun = results[0].charts["Sun"]
+        assert sun[1] == pytest.approx(sun[0] * 2 % 360)
+        assert harmonic_spectra(births[:1], [1])[0].charts is None
+
+
+class TestHarmonicSpectraCli:
+    """Tests for the research export CLI."""
+
+    def test_parse_harmonics(self):
+        """Test ranges and single harmonics."""
+        assert parse_harmonics("1-3, 7,12") == [1, 2, 3, 7, 12]
+
+    def test_writes_one_row_per_record(self, tmp_path):
+        """Test that every record gets a row and failures keep their error."""
+        source = tmp_path / "births.csv"
+        with open(source, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "date", "time", "country", "city"])
+            writer.writerow(["1", "1990-06-15", "14:30:00", "USA", "New York"])
+            writer.writerow(["2", "not-a-date", "12:00:00", "UK", "London"])
+            writer.writerow(["3", "1985-01-01", "00:00:00", "UK", "London"])
+        output = tmp_path / "spectra.csv"
+
+        assert main([str(source), str(output), "--harmonics", "1-4", "--chunk-size", "2"]) == 0
+
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["id"] for row in rows] == ["1", "2", "3"]
+        assert list(rows[0])[5:] == ["h1", "h2", "h3", "h4", "error"]
+        assert float(rows[0]["h1"]) >= 0
+        assert rows[1]["error"] and rows[1]["h1"] == ""
+        assert rows[2]["error"] == ""
@@ -0,0 +1,93 @@
+"""Unit tests for the sign-ingress and station index."""
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.core import ingress
+from src.core.calculations import PLANETS
+from src.core.ingress import IngressIndex, get_planet_signs, jd_to_iso, planet_status
+
+
+@pytest.fixture(scope="module")
+def index():
+    return IngressIndex.build_years(2004, 2006)
+
+
+def _direct(name, jd):
+    coords, ret_flag = swe.calc_ut(jd, PLANETS[name], swe.FLG_SPEED)
+    return int(coords[0] % 360 // 30), coords[3] < 0
+
+
+class TestIngressIndex:
+    """Tests for building and querying the index."""
+
+    def test_matches_ephemeris_at_random_moments(self, index):
+        """Test that sign and retrograde lookups agree with calc_ut."""
+        moments = np.random.default_rng(3).uniform(index.start_jd, index.end_jd, 500)
+        for jd in moments:
+            for name in PLANETS:
+                assert (index.sign(name, jd), index.is_retrograde(name, jd)) == _direct(name, jd)
+
+    def test_events_are_sorted_and_exact(self, index):
+        """Test that each ingress lies on a sign boundary, within a second."""
+        events = index.events["Mars"]
+        assert (np.diff(events.ingress_jds) > 0).all()
+        for jd, sign in zip(events.ingress_jds[1:], events.ingress_signs[1:]):
+            before, _ = _direct("Mars", jd - 2.0 / 86400)
+            after, _ = _direct("Mars", jd + 2.0 / 86400)
+            assert before != after
+            assert after == sign
+
+    def test_state_reports_surrounding_events(self, index):
+        """Test Mercury's next station before its March 2005 retrograde."""
+        jd = swe.julday(2005, 3, 1, 0.0)
+
+        state = index.state("Mercury", jd)
+
+        assert state.previous_ingress[0] < jd < state.next_ingress[0]
+        assert state.next_station[1] is True
+        assert jd_to_iso(state.next_station[0]).startswith("2005-03-")
+        assert index.state("Mercury", index.start_jd).previous_ingress is None
+
+    def test_rejects_moments_outside_the_range(self, index):
+        """Test that lookups outside the indexed range raise ValueError."""
+        with pytest.raises(ValueError):
+            index.sign("Sun", index.end_jd + 1)
+        with pytest.raises(ValueError):
+            index.sign("Ceres", index.start_jd)
+
+    def test_save_and_load_round_trip(self, index, tmp_path):
+        """Test that a saved index answers the same queries."""
+        path = str(tmp_path / "ingress.npz")
+        index.save(path)
+
+        loaded = IngressIndex.load(path)
+
+        jd = swe.julday(2005, 7, 4, 12.0)
+        assert loaded.bodies == index.bodies
+        assert loaded.event_count() == index.event_count()
+        assert planet_status(loaded, "Moon", jd) == planet_status(index, "Moon", jd)
+
+
+class TestSignFastPath:
+    """Tests for sign-only lookups through the installed index."""
+
+    def test_index_and_ephemeris_agree(self, index, monkeypatch):
+        """Test that get_planet_signs gives the same answer with the index."""
+        monkeypatch.delenv(ingress.INDEX_FILE_ENV, raising=False)
+        monkeypatch.setattr(ingress, "_default_index", None)
+        direct = get_planet_signs("2005-03-01", "12:00:00")
+
+        monkeypatch.setattr(ingress, "_default_index", index)
+        indexed = get_planet_signs("2005-03-01", "12:00:00")
+        outside = get_planet_signs("1990-01-01", "12:00:00")
+
+        assert indexed == direct
+        assert direct["Sun"] == "Pisces"
+        assert outside["Sun"] == "Capricorn"
+
+    def test_jd_to_iso_rounds_to_seconds(self):
+        """Test timestamp formatting, including rounding up to midnight."""
+        assert jd_to_iso(2451545.0) == "2000-01-01T12:00:00Z"
+        assert jd_to_iso(2451545.5 - 0.1 / 86400) == "2000-01-02T00:00:00Z"
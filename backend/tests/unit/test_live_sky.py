@@ -0,0 +1,162 @@
+"""Unit tests for the shared live-sky feed."""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api import live_sky
+from src.api.live_sky import (
+    SkyBroadcaster,
+    Subscriber,
+    SubscriberLimitError,
+    encode_sky,
+    location_key,
+)
+
+
+@pytest.fixture
+def counted_planets(monkeypatch):
+    """Count planet computations while still computing real positions."""
+    calls = []
+    real = live_sky.compute_planets
+
+    def compute(moment):
+        calls.append(moment)
+        return real(moment)
+
+    monkeypatch.setattr(live_sky, "compute_planets", compute)
+    return calls
+
+
+class TestSubscriber:
+    """Tests for the one-slot mailbox."""
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_keeps_only_latest(self):
+        """Test that an unread message is replaced, not queued."""
+        subscriber = Subscriber(None)
+
+        assert subscriber.offer("tick-1")
+        assert not subscriber.offer("tick-2")
+        assert not subscriber.offer("tick-3")
+
+        assert await subscriber.next_message() == "tick-3"
+        assert subscriber.dropped == 2
+        assert await subscriber.next_message(timeout=0.01) is None
+
+
+class TestSkyBroadcaster:
+    """Tests for compute-once fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_one_computation_per_tick_for_all_subscribers(self, counted_planets):
+        """Test that many subscribers share a single planet computation."""
+        feed = SkyBroadcaster(tick_seconds=3600)
+        subscribers = [feed.subscribe() for _ in range(50)]
+
+        messages = await asyncio.gather(*(s.next_message(timeout=5) for s in subscribers))
+
+        assert len(counted_planets) == 1
+        assert len(set(messages)) == 1
+        assert feed.metrics()["subscribers"] == 50
+        for subscriber in subscribers:
+            feed.unsubscribe(subscriber)
+
+    @pytest.mark.asyncio
+    async def test_late_subscriber_reuses_current_tick(self, counted_planets):
+        """Test that joining mid-tick does not recompute the sky."""
+        feed = SkyBroadcaster(tick_seconds=3600)
+        first = feed.subscribe()
+        await first.next_message(timeout=5)
+
+        late = feed.subscribe()
+        located = feed.subscribe(location_key("London", "UK"))
+        late_message = await late.next_message(timeout=5)
+        located_message = json.loads(await located.next_message(timeout=5))
+
+        assert len(counted_planets) == 1
+        assert json.loads(late_message)["time"] == located_message["time"]
+        assert "points" in located_message
+        for subscriber in (first, late, located):
+            feed.unsubscribe(subscriber)
+
+    @pytest.mark.asyncio
+    async def test_ticks_advance(self, counted_planets):
+        """Test that a new sky is published every tick."""
+        feed = SkyBroadcaster(tick_seconds=0.05)
+        subscriber = feed.subscribe()
+
+        times = set()
+        for _ in range(3):
+            times.add(json.loads(await subscriber.next_message(timeout=5))["time"])
+        feed.unsubscribe(subscriber)
+
+        assert len(counted_planets) >= 3
+        assert feed.metrics()["ticks"] >= 3
+
+    @pytest.mark.asyncio
+    async def test_task_stops_with_last_subscriber(self):
+        """Test that the background task only runs while subscribed."""
+        feed = SkyBroadcaster(tick_seconds=3600)
+        subscriber = feed.subscribe()
+        await subscriber.next_message(timeout=5)
+        task = feed._task
+
+        feed.unsubscribe(subscriber)
+        await asyncio.sleep(0)
+
+        assert feed._task is None
+        assert task.cancelled() or task.done()
+
+    @pytest.mark.asyncio
+    async def test_subscriber_limit(self):
+        """Test that subscriptions beyond the limit are refused."""
+        feed = SkyBroadcaster(tick_seconds=3600, max_subscribers=1)
+        subscriber = feed.subscribe()
+
+        with pytest.raises(SubscriberLimitError):
+            feed.subscribe()
+        feed.unsubscribe(subscriber)
+
+
+class TestLocationKey:
+    """Tests for subscriber location normalisation."""
+
+    def test_known_city_is_normalised(self):
+        """Test that a known city is folded to its CITY_COORDS key."""
+        assert location_key(" Tokyo", "JAPAN ") == ("tokyo", "japan")
+        assert location_key(None, "UK") is None
+
+    def test_unknown_city_is_rejected(self):
+        """Test that an unknown city does not get a location of its own."""
+        with pytest.raises(ValueError, match="Unknown location"):
+            location_key("Atlantis", "Nowhere")
+
+
+class TestEncodeSky:
+    """Tests for message encoding."""
+
+    def test_location_free_message_has_no_houses(self):
+        """Test the planets-only message."""
+        moment = datetime(2024, 3, 20, 12, 0, tzinfo=timezone.utc)
+        message = json.loads(encode_sky(moment, live_sky.compute_planets(moment), None))
+
+        assert message["time"] == "2024-03-20T12:00:00Z"
+        assert [p["name"] for p in message["planets"]][:2] == ["Sun", "Moon"]
+        assert "house" not in message["planets"][0]
+        assert "points" not in message
+
+    def test_location_message_has_angles_and_houses(self):
+        """Test the location-specific message."""
+        moment = datetime(2024, 3, 20, 12, 0, tzinfo=timezone.utc)
+        planets = live_sky.compute_planets(moment)
+        message = json.loads(encode_sky(moment, planets, location_key(" Tokyo", "JAPAN ")))
+
+        assert message["location"]["city"] == "tokyo"
+        assert message["location"]["known"] is True
+        assert [p["name"] for p in message["points"]][0] == "Ascendant"
+        assert len(message["houses"]) == 12
+        assert all(1 <= p["house"] <= 12 for p in message["planets"])
+        assert [p["longitude"] for p in message["planets"]] == [p["longitude"] for p in planets]
@@ -0,0 +1,103 @@
+"""Unit tests for the load generator and latency harness."""
+
+import itertools
+
+import pytest
+
+from src.tools.loadtest import (
+    RequestMix,
+    build_report,
+    compare_reports,
+    latency_histogram,
+    parse_cities,
+    percentile,
+    run_load_test,
+)
+
+
+class TestRequestMix:
+    """Tests for payload generation."""
+
+    def test_mix_is_deterministic_for_a_seed(self):
+        """Test that the same seed yields the same request sequence."""
+        first = list(itertools.islice(RequestMix(seed=7).payloads(), 20))
+        second = list(itertools.islice(RequestMix(seed=7).payloads(), 20))
+
+        assert first == second
+
+    def test_mix_respects_date_spread_and_cities(self):
+        """Test that payloads stay inside the configured distribution."""
+        mix = RequestMix(cities={("Tokyo", "Japan"): 1.0}, start_year=2000, end_year=2001)
+
+        for payload in itertools.islice(mix.payloads(), 50):
+            assert payload["city"] == "Tokyo"
+            assert payload["date"][:4] in {"2000", "2001"}
+            assert len(payload["time"]) == 8
+
+    def test_full_repeat_rate_uses_hot_set(self):
+        """Test that repeat_rate=1 only draws from the hot set."""
+        mix = RequestMix(repeat_rate=1.0, hot_set=3)
+        payloads = list(itertools.islice(mix.payloads(), 100))
+
+        assert len({tuple(p.values()) for p in payloads}) <= 3
+
+    def test_parse_cities(self):
+        """Test the weighted city distribution syntax."""
+        cities = parse_cities("New York/USA=5, London/UK")
+
+        assert cities == {("New York", "USA"): 5.0, ("London", "UK"): 1.0}
+        with pytest.raises(ValueError):
+            parse_cities("London")
+
+
+class TestReport:
+    """Tests for percentiles, histograms and run comparison."""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([], 50) == 0.0
+
+    def test_histogram_counts_every_sample(self):
+        """Test that every latency lands in exactly one bucket."""
+        histogram = latency_histogram([0.05, 3, 3, 70000])
+
+        assert sum(b["count"] for b in histogram) == 4
+        assert histogram[-1] == {"le": "+Inf", "count": 1}
+
+    def test_report_separates_errors(self):
+        """Test that non-200 responses count as errors, not latency."""
+        report = build_report([(0.010, 200), (0.020, 200), (0.001, 503)], 1.0, {})
+
+        assert report["summary"]["ok"] == 2
+        assert report["summary"]["status_counts"] == {"200": 2, "503": 1}
+        assert report["latency_ms"]["max"] == pytest.approx(20.0)
+
+    def test_compare_flags_regressions(self):
+        """Test that slower or lower-throughput candidates are flagged."""
+        baseline = build_report([(0.010, 200)] * 10, 1.0, {})
+        candidate = build_report([(0.020, 200)] * 5, 1.0, {})
+
+        result = compare_reports(baseline, candidate, tolerance=0.1)
+
+        assert "throughput_rps" in result["regressions"]
+        assert "latency_ms.p99" in result["regressions"]
+        assert compare_reports(baseline, baseline)["regressions"] == []
+
+
+class TestRunLoadTest:
+    """Tests for driving the app in-process."""
+
+    def test_inprocess_run_produces_report(self):
+        """Test a short in-process run against the real app."""
+        report = run_load_test(
+            mode="inprocess", concurrency=2, duration=5.0, max_requests=6
+        )
+
+        assert report["summary"]["requests"] == 6
+        assert report["summary"]["ok"] == 6
+        assert report["latency_ms"]["p50"] > 0
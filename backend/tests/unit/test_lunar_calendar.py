@@ -0,0 +1,121 @@
+"""Unit tests for the precomputed lunar calendar."""
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.core.calculations import PLANETS
+from src.core.ingress import wrap_degrees
+from src.core.lunar_calendar import (
+    ASPECTED_PLANETS,
+    NO_PLANET,
+    VOID_ELONGATIONS,
+    LunarCalendar,
+    _elongation,
+)
+
+
+@pytest.fixture(scope="module")
+def calendar():
+    return LunarCalendar.build_years(2024, 2025)
+
+
+def _jd(year, month, day):
+    return swe.julday(year, month, day, 0.0)
+
+
+class TestPhases:
+    """Tests for the quarter phase table."""
+
+    def test_phases_are_exact_and_cycle(self, calendar):
+        """Test that phases hit their elongation and follow each other in order."""
+        phases = calendar.phases
+        assert 48 <= len(phases.jds) <= 52
+        assert (np.diff(phases.phases.astype(int)) % 4 == 1).all()
+        for jd, phase in zip(phases.jds, phases.phases):
+            assert abs(wrap_degrees(_elongation(jd, swe.SUN) - 90 * int(phase))) < 1e-3
+
+    def test_april_2024_new_moon(self, calendar):
+        """Test the New Moon of the 8 April 2024 total solar eclipse."""
+        data = calendar.between(_jd(2024, 4, 8), _jd(2024, 4, 9))
+
+        assert [(p.phase, p.sign) for p in data.phases] == [("New Moon", "Aries")]
+        assert data.phases[0].time.startswith("2024-04-08T18:2")
+
+
+class TestVoidOfCourse:
+    """Tests for the void-of-course table."""
+
+    def test_no_aspect_inside_a_void_period(self, calendar):
+        """Test that each period starts on an exact aspect and has none after it."""
+        voids = calendar.voids
+        rows = np.random.default_rng(5).choice(len(voids.starts), 10, replace=False)
+        for row in rows:
+            start, end = voids.starts[row], voids.ends[row]
+            planet = voids.planets[row]
+            assert start < end
+            if planet != NO_PLANET:
+                body_id = PLANETS[ASPECTED_PLANETS[planet]]
+                offsets = [
+                    abs(wrap_degrees(_elongation(start, body_id) - elongation))
+                    for elongation, angle in VOID_ELONGATIONS
+                    if angle == voids.aspects[row]
+                ]
+                assert min(offsets) < 1e-3
+            # Sample the period: no elongation may cross an aspect angle
+            samples = np.linspace(start + (end - start) * 1e-3, end, 40)
+            for name in ASPECTED_PLANETS:
+                body_id = PLANETS[name]
+                values = [_elongation(t, body_id) for t in samples]
+                gained = (values[-1] - values[0]) % 360
+                for elongation, _ in VOID_ELONGATIONS:
+                    assert not 0 < (elongation - values[0]) % 360 <= gained
+
+    def test_periods_end_at_sign_ingresses(self, calendar):
+        """Test that periods are ordered and end when the Moon changes sign."""
+        voids = calendar.voids
+        assert (voids.starts[1:] >= voids.ends[:-1]).all()
+        end = float(voids.ends[10])
+        before = swe.calc_ut(end - 1e-4, swe.MOON)[0][0] // 30
+        after = swe.calc_ut(end + 1e-4, swe.MOON)[0][0] // 30
+        assert (before + 1) % 12 == after == voids.signs[10]
+
+
+class TestEclipsesAndQueries:
+    """Tests for eclipses, range queries and storage."""
+
+    def test_eclipses_of_2024(self, calendar):
+        """Test the four eclipses of 2024 and their types."""
+        data = calendar.between(calendar.start_jd, calendar.end_jd)
+
+        assert [(e.kind, e.type, e.time[:10]) for e in data.eclipses] == [
+            ("Lunar", "Penumbral", "2024-03-25"),
+            ("Solar", "Total", "2024-04-08"),
+            ("Lunar", "Partial", "2024-09-18"),
+            ("Solar", "Annular", "2024-10-02"),
+        ]
+
+    def test_void_query_includes_overlapping_periods(self, calendar):
+        """Test that a period spanning the range start is returned."""
+        voids = calendar.voids
+        middle = float(voids.starts[20] + voids.ends[20]) / 2
+
+        rows = calendar.void_rows(middle, middle + 0.001)
+
+        assert (rows.start, rows.stop) == (20, 21)
+
+    def test_rejects_ranges_outside_the_tables(self, calendar):
+        """Test that queries beyond the precomputed range raise ValueError."""
+        with pytest.raises(ValueError):
+            calendar.between(_jd(2023, 12, 1), _jd(2024, 1, 15))
+
+    def test_save_and_load_round_trip(self, calendar, tmp_path):
+        """Test that saved tables answer the same query."""
+        path = str(tmp_path / "calendar.npz")
+        calendar.save(path)
+
+        loaded = LunarCalendar.load(path)
+
+        start, end = _jd(2024, 6, 1), _jd(2024, 7, 1)
+        assert loaded.event_counts() == calendar.event_counts()
+        assert loaded.between(start, end) == calendar.between(start, end)
@@ -0,0 +1,124 @@
+"""Unit tests for aspect-pattern detection."""
+
+import itertools
+import random
+
+from src.core.aspects import find_aspects
+from src.core.calculations import MAJOR_ASPECTS, MINOR_ASPECTS
+from src.core.compact import CHART_FIELDS, calculate_compact_chart
+from src.core.patterns import (
+    PATTERN_CODES,
+    AspectGraph,
+    detect_patterns,
+    detect_patterns_batch,
+    find_patterns,
+)
+
+
+def _graph(longitudes, names=None):
+    """Aspect graph of bare longitudes, as the chart builder makes it."""
+    names = names or [f"B{i}" for i in range(len(longitudes))]
+    edges = [(i, j, MAJOR_ASPECTS[a][0]) for i, j, a, _ in find_aspects(longitudes, MAJOR_ASPECTS)]
+    edges += [(i, j, MINOR_ASPECTS[a][0]) for i, j, a, _ in find_aspects(longitudes, MINOR_ASPECTS)]
+    return AspectGraph(names, edges)
+
+
+def _types(longitudes, names=None):
+    return find_patterns(_graph(longitudes, names))
+
+
+def _brute_triangles(graph, aspect):
+    """Reference: every 3-combination whose pairs all share `aspect`."""
+    rows = graph.adjacency[aspect]
+    return [
+        (a, b, c)
+        for a, b, c in itertools.combinations(range(len(graph.names)), 3)
+        if rows[a] >> b & 1 and rows[a] >> c & 1 and rows[b] >> c & 1
+    ]
+
+
+class TestFindPatterns:
+    """Tests for each pattern motif."""
+
+    def test_grand_trine(self):
+        """Test three bodies 120 degrees apart."""
+        found = _types([10.0, 130.0, 250.0])
+
+        assert found == [(PATTERN_CODES["Grand Trine"], (0, 1, 2), -1)]
+
+    def test_t_square_apex(self):
+        """Test an opposition squared by a third body."""
+        found = _types([0.0, 180.0, 90.0])
+
+        assert found == [(PATTERN_CODES["T-Square"], (0, 1, 2), 2)]
+
+    def test_grand_cross_suppresses_its_t_squares(self):
+        """Test that a Grand Cross is reported once, without T-Squares."""
+        found = _types([0.0, 90.0, 180.0, 270.0])
+
+        assert found == [(PATTERN_CODES["Grand Cross"], (0, 1, 2, 3), -1)]
+
+    def test_yod(self):
+        """Test a sextile with both ends quincunx to an apex."""
+        found = _types([0.0, 60.0, 210.0])
+
+        assert found == [(PATTERN_CODES["Yod"], (0, 1, 2), 2)]
+
+    def test_kite(self):
+        """Test a Grand Trine with a body opposing one corner."""
+        found = _types([0.0, 120.0, 240.0, 180.0])
+
+        assert (PATTERN_CODES["Grand Trine"], (0, 1, 2), -1) in found
+        assert (PATTERN_CODES["Kite"], (0, 1, 2, 3), 0) in found
+
+    def test_stellium_is_maximal_clique(self):
+        """Test that mutually conjunct bodies form one maximal stellium."""
+        # 0-4-7 are mutually conjunct; 14 is conjunct 7 only
+        found = _types([0.0, 4.0, 7.0, 14.0])
+
+        assert found == [(PATTERN_CODES["Stellium"], (0, 1, 2), -1)]
+
+    def test_mirror_points_are_ignored(self):
+        """Test that ASC/DSC do not create patterns by construction."""
+        names = ["Ascendant", "Descendant", "Mars"]
+
+        assert _types([0.0, 180.0, 90.0], names) == []
+
+    def test_triangles_match_brute_force(self):
+        """Test Grand Trines against an exhaustive 3-combination scan."""
+        rng = random.Random(3)
+        longitudes = [rng.uniform(0, 360) for _ in range(60)]
+        graph = _graph(longitudes)
+
+        found = [
+            bodies
+            for code, bodies, _ in find_patterns(graph)
+            if code == PATTERN_CODES["Grand Trine"]
+        ]
+
+        assert found == _brute_triangles(graph, "Trine")
+
+
+class TestDetectPatterns:
+    """Tests for ChartData-level detection."""
+
+    def test_chart_data_matches_compact(self):
+        """Test that detecting on ChartData agrees with the compact builder."""
+        for year in range(1960, 1990):
+            chart = calculate_compact_chart(
+                f"{year}-03-01", "06:00:00", "USA", "New York", fields=CHART_FIELDS
+            )
+            data = chart.to_chart_data()
+
+            assert detect_patterns(data) == data.patterns
+
+    def test_batch(self):
+        """Test detection over a batch of charts."""
+        charts = [
+            calculate_compact_chart(
+                f"{year}-07-01", "12:00:00", "UK", "London", fields=CHART_FIELDS
+            ).to_chart_data()
+            for year in (1970, 1980, 1990)
+        ]
+
+        assert detect_patterns_batch(charts) == [chart.patterns for chart in charts]
@@ -0,0 +1,95 @@
+"""Unit tests for request profiling."""
+
+import random
+
+import pytest
+
+from src.api.profiling import ProfileStore, RequestProfiler
+
+
+def _busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfileStore:
+    """Tests for the rotating profile store."""
+
+    def test_store_rotates_old_files(self, tmp_path):
+        """Test that only the newest max_files profiles are kept."""
+        store = ProfileStore(str(tmp_path), max_files=2)
+        profiler = RequestProfiler(store)
+
+        ids = []
+        for _ in range(3):
+            _, stats = profiler.run(_busy, 100)
+            ids.append(store.save(stats, "request"))
+
+        assert len(store.list_ids()) == 2
+        assert ids[0] not in store.list_ids()
+
+    def test_load_text_reports_functions(self, tmp_path):
+        """Test that a stored profile renders as a pstats report."""
+        store = ProfileStore(str(tmp_path))
+        _, stats = RequestProfiler(store).run(_busy, 1000)
+
+        text = store.load_text(store.save(stats, "request"))
+
+        assert "_busy" in text
+        assert "_busy" in store.load_text(store.list_ids()[0], sort="tottime")
+
+    def test_unknown_sort_is_a_value_error(self, tmp_path):
+        """Test that an unknown sort key is not mistaken for a missing profile."""
+        store = ProfileStore(str(tmp_path))
+        _, stats = RequestProfiler(store).run(_busy, 1000)
+        profile_id = store.save(stats, "request")
+
+        with pytest.raises(ValueError, match="sort must be one of"):
+            store.load_text(profile_id, sort="bogus")
+
+    def test_invalid_ids_are_rejected(self, tmp_path):
+        """Test that ids outside the generated format are refused."""
+        store = ProfileStore(str(tmp_path))
+
+        with pytest.raises(KeyError):
+            store.path("../../etc/passwd")
+
+
+class TestRequestProfiler:
+    """Tests for on-demand and sampled profiling."""
+
+    def test_authorization_requires_configured_token(self, tmp_path):
+        """Test that profiling is off without a token and gated with one."""
+        store = ProfileStore(str(tmp_path))
+
+        assert not RequestProfiler(store).authorized("anything")
+        profiler = RequestProfiler(store, admin_token="secret")
+        assert profiler.authorized("secret")
+        assert not profiler.authorized("wrong")
+        assert not profiler.authorized(None)
+
+    def test_sample_rate_is_a_percentage(self, tmp_path):
+        """Test that sampling selects roughly sample_rate percent."""
+        profiler = RequestProfiler(
+            ProfileStore(str(tmp_path)), sample_rate=10, rng=random.Random(1)
+        )
+
+        hits = sum(profiler.should_sample() for _ in range(10000))
+
+        assert 800 < hits < 1200
+        assert not RequestProfiler(ProfileStore(str(tmp_path))).should_sample()
+
+    def test_samples_are_aggregated_per_file(self, tmp_path):
+        """Test that sampled profiles are merged and flushed per file."""
+        store = ProfileStore(str(tmp_path))
+        profiler = RequestProfiler(store, sample_rate=100, samples_per_file=3)
+
+        flushed = []
+        for _ in range(4):
+            _, stats = profiler.run(_busy, 100)
+            flushed.append(profiler.record_sample(stats))
+
+        assert flushed[:2] == [None, None]
+        assert flushed[2] is not None
+        assert flushed[3] is None
+        assert profiler.flush() is not None
+        assert len(store.list_ids()) == 2
@@ -0,0 +1,108 @@
+"""Unit tests for progressions and solar-arc directions."""
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from src.core.calculations import PLANETS, _calculate_jd
+from src.core.progressions import (
+    MAX_SNAPSHOTS,
+    PROGRESSION_ASPECTS,
+    age_range,
+    aspect_hits,
+    calculate_progressions,
+    progress,
+)
+
+NEW_YORK = (40.7128, -74.0060)
+
+
+@pytest.fixture(scope="module")
+def result():
+    return calculate_progressions("1990-06-15", "14:30:00", "USA", "New York", 0, 100, 1)
+
+
+class TestProgress:
+    """Tests for batched progressions."""
+
+    def test_progressed_positions_are_one_day_per_year(self, result):
+        """Test the day-for-a-year positions against calc_ut."""
+        jd = _calculate_jd("1990-06-15", "14:30:00")
+
+        # Ages are counted in tropical years, so dates drift off the birthday
+        assert len(result.ages) == 101 and result.dates[30] == "2020-06-14"
+        for age in (0, 30, 100):
+            for name, body_id in PLANETS.items():
+                expected = swe.calc_ut(jd + age, body_id)[0][0] % 360
+                assert result.progressed[name][age] == pytest.approx(expected)
+
+    def test_solar_arc_moves_everything_by_the_sun_arc(self, result):
+        """Test that every directed point moves by the progressed Sun's arc."""
+        arc = (result.progressed["Sun"][40] - result.progressed["Sun"][0]) % 360
+
+        assert result.solar_arc["Sun"][40] == pytest.approx(result.progressed["Sun"][40])
+        for name, directed in result.solar_arc.items():
+            assert (directed[40] - directed[0]) % 360 == pytest.approx(arc)
+
+    def test_aspects_match_a_direct_check(self, result):
+        """Test the vectorized aspects against a pairwise check at one age."""
+        age = 50
+        natal = {name: longitudes[0] for name, longitudes in result.solar_arc.items()}
+        expected = set()
+        for body in PLANETS:
+            for point, natal_lon in natal.items():
+                if point == body:
+                    continue
+                sep = abs((result.progressed[body][age] - natal_lon + 180) % 360 - 180)
+                for angle, (aspect, orb) in PROGRESSION_ASPECTS.items():
+                    if abs(sep - angle) <= orb:
+                        expected.add((body, point, aspect))
+
+        found = {
+            (a.body, a.natal, a.aspect)
+            for a in result.aspects
+            if a.age == age and a.method == "progressed"
+        }
+        assert found == expected
+
+    def test_skips_self_aspects(self, result):
+        """Test that no progressed or directed body is aspected to its own natal place."""
+        assert {a.method for a in result.aspects} == {"progressed", "solar_arc"}
+        assert all(a.body != a.natal for a in result.aspects)
+        assert [a.age for a in result.aspects] == sorted(a.age for a in result.aspects)
+
+    def test_rejects_empty_ages(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError):
+            progress(2448058.1, *NEW_YORK, [])
+
+
+class TestAspectHits:
+    """Tests for the vectorized aspect matcher."""
+
+    def test_finds_wrapped_conjunction(self):
+        """Test separation across 0° Aries and hit ordering."""
+        moving = np.array([[359.5, 90.0], [10.0, 180.5]])
+        natal = np.array([0.2, 0.0])
+
+        snapshots, bodies, points, angles, orbs = aspect_hits(moving, natal, PROGRESSION_ASPECTS)
+
+        assert list(zip(snapshots, bodies, points, angles)) == [
+            (0, 0, 0, 0),
+            (0, 0, 1, 0),
+            (0, 1, 0, 90),
+            (0, 1, 1, 90),
+            (1, 1, 0, 180),
+            (1, 1, 1, 180),
+        ]
+        assert orbs[0] == pytest.approx(0.7)
+
+
+class TestAgeRange:
+    """Tests for age ranges."""
+
+    def test_inclusive_range_and_cap(self):
+        """Test inclusive ends and the snapshot cap."""
+        assert age_range(20, 22, 0.5).tolist() == [20, 20.5, 21, 21.5, 22]
+        with pytest.raises(ValueError, match=str(MAX_SNAPSHOTS)):
+            age_range(0, 100, 0.01)
@@ -0,0 +1,105 @@
+"""Unit tests for composite and Davison charts."""
+
+import numpy as np
+import pytest
+
+from src.core import sky_cache
+from src.core.calculations import _get_house_for_position, calculate_natal_chart
+from src.core.compact import DEFAULT_FIELDS, build_compact_chart
+from src.core.relationship import (
+    MAX_GROUP_SIZE,
+    birth_of,
+    composite_charts,
+    davison_charts,
+    midpoints,
+)
+from src.core.sky_cache import LRUCache
+from src.models import BirthInput
+
+NEW_YORK = BirthInput(date="1990-06-15", time="14:30:00", country="USA", city="New York")
+LONDON = BirthInput(date="1988-11-02", time="08:15:00", country="UK", city="London")
+TOKYO = BirthInput(date="1995-03-21", time="23:00:00", country="Japan", city="Tokyo")
+PARIS = BirthInput(date="1979-12-31", time="06:45:00", country="France", city="Paris")
+
+
+class TestMidpoints:
+    """Tests for shorter-arc midpoints."""
+
+    def test_wraps_across_aries(self):
+        """Test midpoints on both sides of 0°."""
+        first = np.array([350.0, 10.0, 100.0, 0.0])
+        second = np.array([10.0, 350.0, 200.0, 180.0 - 1e-9])
+
+        assert midpoints(first, second) == pytest.approx([0.0, 0.0, 150.0, 90.0])
+
+
+class TestComposite:
+    """Tests for composite charts."""
+
+    def test_midpoints_of_the_natal_charts(self):
+        """Test bodies, cusps and houses against the two natal charts."""
+        (pair,) = composite_charts([birth_of(NEW_YORK), birth_of(LONDON)])
+        a = calculate_natal_chart(NEW_YORK.date, NEW_YORK.time, NEW_YORK.country, NEW_YORK.city)
+        b = calculate_natal_chart(LONDON.date, LONDON.time, LONDON.country, LONDON.city)
+
+        assert (pair.first, pair.second) == (0, 1)
+        chart = pair.chart
+        cusps = midpoints(
+            np.array([h.longitude for h in a.houses]), np.array([h.longitude for h in b.houses])
+        )
+        assert [h.longitude for h in chart.houses] == pytest.approx(cusps.tolist())
+        for planet, pa, pb in zip(chart.planets, a.planets, b.planets):
+            expected = midpoints(np.array([pa.longitude]), np.array([pb.longitude]))[0]
+            assert planet.longitude == pytest.approx(expected)
+            assert planet.house == _get_house_for_position(planet.longitude, list(cusps))
+        asc = next(p for p in chart.points if p.name == "Ascendant")
+        assert asc.longitude == pytest.approx(
+            midpoints(np.array([a.points[0].longitude]), np.array([b.points[0].longitude]))[0]
+        )
+
+    def test_same_fields_as_davison(self):
+        """Test that composite charts, like Davison charts, leave patterns out."""
+        births = [birth_of(NEW_YORK), birth_of(LONDON)]
+
+        (composite,) = composite_charts(births)
+        (davison,) = davison_charts(births)
+
+        assert composite.chart.computed == davison.chart.computed == list(DEFAULT_FIELDS)
+        assert composite.chart.patterns == davison.chart.patterns == []
+
+    def test_group_computes_each_member_once(self, monkeypatch):
+        """Test all pairs of a group from one natal computation per member."""
+        monkeypatch.setattr(sky_cache, "sky_tier", LRUCache(64))
+        births = [birth_of(member) for member in (NEW_YORK, LONDON, TOKYO, PARIS)]
+
+        pairs = composite_charts(births)
+
+        assert [(p.first, p.second) for p in pairs] == [
+            (0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)
+        ]
+        assert sky_cache.sky_tier.metrics()["misses"] == 4
+        (alone,) = composite_charts([births[1], births[3]])
+        assert alone.chart == pairs[4].chart
+
+    def test_rejects_bad_group_sizes(self):
+        """Test the group size limits."""
+        with pytest.raises(ValueError):
+            composite_charts([birth_of(NEW_YORK)])
+        with pytest.raises(ValueError):
+            composite_charts([birth_of(NEW_YORK)] * (MAX_GROUP_SIZE + 1))
+
+
+class TestDavison:
+    """Tests for Davison charts."""
+
+    def test_chart_of_midpoint_time_and_place(self):
+        """Test that the Davison chart is the chart of the midpoints."""
+        (jd1, lat1, lon1), (jd2, lat2, lon2) = birth_of(NEW_YORK), birth_of(TOKYO)
+
+        (pair,) = davison_charts([birth_of(NEW_YORK), birth_of(TOKYO)])
+
+        # New York and Tokyo are closer across the antimeridian
+        longitude = ((lon1 + lon2 + 360) / 2 + 180) % 360 - 180
+        assert longitude == pytest.approx(-147.1779, abs=1e-4)
+        expected = build_compact_chart((jd1 + jd2) / 2, (lat1 + lat2) / 2, longitude)
+        assert pair.chart == expected.to_chart_data()
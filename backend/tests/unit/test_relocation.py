@@ -0,0 +1,83 @@
+"""Unit tests for the relocation grid."""
+
+import numpy as np
+import pytest
+
+from src.core.calculations import PLANETS, _calculate_jd, _get_house_for_position
+from src.core.compact import build_compact_chart
+from src.core.relocation import (
+    MAX_LOCATIONS,
+    grid_locations,
+    house_placements,
+    relocate,
+)
+
+JD = _calculate_jd("1990-06-15", "14:30:00")
+
+
+class TestHousePlacements:
+    """Tests for the vectorized house placement."""
+
+    def test_matches_scalar_placement(self):
+        """Test agreement with _get_house_for_position, wrapped cusps included."""
+        rng = np.random.default_rng(7)
+        longitudes = np.concatenate([rng.uniform(0, 360, 200), [0.0, 30.0, 359.999]])
+        cusps = np.array(
+            [
+                [30.0 * n for n in range(12)],
+                [(350.0 + 30.0 * n) % 360 for n in range(12)],
+                [(100.0 + 25.0 * n + (n > 5) * 30.0) % 360 for n in range(12)],
+            ]
+        )
+
+        placed = house_placements(longitudes, cusps)
+
+        expected = [[_get_house_for_position(lon, list(row)) for lon in longitudes] for row in cusps]
+        assert placed.tolist() == expected
+
+
+class TestRelocate:
+    """Tests for relocating one moment to many places."""
+
+    def test_agrees_with_single_charts(self):
+        """Test that each location matches its own compact chart."""
+        locations = [(51.5074, -0.1278), (35.6762, 139.6503), (-33.8688, 151.2093)]
+
+        result = relocate(JD, locations)
+
+        assert result.planets == list(PLANETS)
+        for k, (lat, lon) in enumerate(locations):
+            chart = build_compact_chart(JD, lat, lon)
+            assert result.cusps[k] == list(chart.cusps)
+            assert [result.houses[name][k] for name in PLANETS] == list(chart.houses[: len(PLANETS)])
+            assert result.ascendant[k] == chart.longitudes[len(PLANETS)]
+
+    def test_polar_locations_are_invalid(self):
+        """Test that undefined houses are reported, not raised."""
+        result = relocate(JD, [(85.0, 0.0), (10.0, 0.0)])
+
+        assert result.cusps[0] is None and result.ascendant[0] is None
+        assert {houses[0] for houses in result.houses.values()} == {0}
+        assert result.cusps[1] is not None
+
+    def test_rejects_empty_locations(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError):
+            relocate(JD, [])
+
+
+class TestGridLocations:
+    """Tests for grid generation."""
+
+    def test_includes_both_edges(self):
+        """Test the row-major grid layout."""
+        grid = grid_locations(-10, 10, 0, 20, 10)
+
+        assert len(grid) == 9
+        assert grid[0] == (-10.0, 0.0) and grid[-1] == (10.0, 20.0)
+        assert grid[1] == (-10.0, 10.0)
+
+    def test_rejects_oversized_grid(self):
+        """Test the location cap."""
+        with pytest.raises(ValueError, match=str(MAX_LOCATIONS)):
+            grid_locations(-90, 90, -180, 180, 0.5)
@@ -0,0 +1,72 @@
+"""Unit tests for solar and lunar returns."""
+
+import pytest
+import swisseph as swe
+
+from src.core.calculations import _calculate_jd
+from src.core.returns import calculate_returns, find_returns
+
+NATAL_JD = _calculate_jd("1990-06-15", "14:30:00")
+START = _calculate_jd("2020-01-01", "00:00:00")
+
+
+def _longitude(jd, body_id):
+    return swe.calc_ut(jd, body_id)[0][0]
+
+
+class TestFindReturns:
+    """Tests for the Newton return solver."""
+
+    def test_lunar_returns_of_a_decade(self):
+        """Test that every lunar return is exact and none is missed."""
+        target = _longitude(NATAL_JD, swe.MOON)
+
+        found = find_returns("Moon", target, START, START + 3652.5)
+
+        assert len(found) == 134
+        for jd in found:
+            assert abs((_longitude(jd, swe.MOON) - target + 180) % 360 - 180) < 1e-4
+        gaps = [b - a for a, b in zip(found, found[1:])]
+        assert 26.5 < min(gaps) and max(gaps) < 28.5
+
+    def test_solar_return_is_near_the_birthday(self):
+        """Test the solar return of one year."""
+        target = _longitude(NATAL_JD, swe.SUN)
+
+        found = find_returns("Sun", target, START, START + 366)
+
+        assert len(found) == 1
+        assert found[0] - _calculate_jd("2020-06-15", "00:00:00") == pytest.approx(0.5, abs=1)
+
+    def test_return_at_range_start_is_kept(self):
+        """Test that a range starting at a return includes it once."""
+        target = _longitude(START, swe.MOON)
+
+        found = find_returns("Moon", target, START, START + 30)
+
+        assert len(found) == 2 and found[0] == pytest.approx(START, abs=1e-5)
+
+    def test_rejects_other_bodies(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError):
+            find_returns("Mars", 0.0, START, START + 10)
+
+
+class TestCalculateReturns:
+    """Tests for return charts."""
+
+    def test_charts_are_cast_for_the_location(self):
+        """Test that each return carries a chart whose Moon is at the natal place."""
+        returns = calculate_returns("1990-06-15", "14:30:00", "Moon", 2024, 2024, (51.5074, -0.1278))
+
+        assert len(returns) == 13
+        natal_moon = _longitude(NATAL_JD, swe.MOON)
+        for item in returns:
+            moon = next(p for p in item.chart.planets if p.name == "Moon")
+            assert moon.longitude == pytest.approx(natal_moon, abs=1e-4)
+            assert item.time.startswith("2024-")
+
+    def test_rejects_long_ranges(self):
+        """Test the year cap."""
+        with pytest.raises(ValueError):
+            calculate_returns("1990-06-15", "14:30:00", "Sun", 1900, 2100, (0.0, 0.0))
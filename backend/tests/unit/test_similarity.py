@@ -0,0 +1,156 @@
+"""Unit tests for the nearest-chart similarity index."""
+
+import math
+import os
+
+import numpy as np
+import pytest
+
+from src.core.compact import calculate_compact_chart
+from src.core.similarity import (
+    IDS_FILE,
+    VECTOR_BODIES,
+    VECTORS_FILE,
+    SimilarityIndex,
+    angular_distance_degrees,
+    chart_vector,
+    circular_distance,
+)
+
+CHARTS = [
+    calculate_compact_chart(
+        f"{1960 + n}-{1 + n % 12:02d}-{1 + n % 28:02d}", "12:00:00", "UK", "London"
+    )
+    for n in range(40)
+]
+
+
+class TestChartVector:
+    """Tests for chart embedding and distance."""
+
+    def test_vector_is_unit_circle_pairs(self):
+        """Test that each body embeds as a unit (sin, cos) pair."""
+        vector = chart_vector(CHARTS[0])
+
+        assert vector.shape == (2 * len(VECTOR_BODIES),)
+        norms = (vector.reshape(-1, 2) ** 2).sum(axis=1)
+        assert np.allclose(norms, 1.0, atol=1e-6)
+
+    def test_chart_data_and_compact_agree(self):
+        """Test that ChartData, its JSON dict and CompactChart embed alike."""
+        data = CHARTS[0].to_chart_data()
+
+        assert np.array_equal(chart_vector(data), chart_vector(CHARTS[0]))
+        assert np.array_equal(chart_vector(data.model_dump()), chart_vector(CHARTS[0]))
+
+    def test_distance_is_circular(self):
+        """Test that 359 and 1 degrees are as close as 1 and 3 degrees."""
+        near_zero = np.array([math.sin(math.radians(359)), math.cos(math.radians(359))])
+        one = np.array([math.sin(math.radians(1)), math.cos(math.radians(1))])
+        three = np.array([math.sin(math.radians(3)), math.cos(math.radians(3))])
+
+        assert circular_distance(near_zero, one) == pytest.approx(circular_distance(one, three))
+
+    def test_missing_body_rejected(self):
+        """Test that a chart lacking an embedded body is rejected."""
+        data = CHARTS[0].to_chart_data().model_dump()
+        data["points"] = []
+
+        with pytest.raises(ValueError, match="Ascendant"):
+            chart_vector(data)
+
+    def test_angular_distance_degrees(self):
+        """Test conversion of a distance to a uniform separation."""
+        # Every body 60 degrees off: each contributes 2 - 2cos(60) = 1
+        assert angular_distance_degrees(14.0, 14.0) == pytest.approx(60.0)
+
+
+class TestSimilarityIndex:
+    """Tests for building, querying and extending the index."""
+
+    def _build(self, tmp_path, charts=CHARTS):
+        return SimilarityIndex.build(str(tmp_path / "index"), enumerate(charts), batch_size=7)
+
+    def test_query_matches_brute_force(self, tmp_path):
+        """Test top-k against exhaustive weighted distances."""
+        index = self._build(tmp_path)
+        weights = {"Sun": 3.0, "Moon": 2.0, "Ascendant": 0.0}
+        w = index.weight_vector(weights)
+        query = chart_vector(CHARTS[5])
+
+        expected = sorted(
+            range(len(CHARTS)),
+            key=lambda n: circular_distance(query, chart_vector(CHARTS[n]), w),
+        )[:5]
+        results = index.query(CHARTS[5], k=5, weights=weights)
+
+        assert [chart_id for chart_id, _ in results] == expected
+        for chart_id, distance in results:
+            exact = circular_distance(query, chart_vector(CHARTS[chart_id]), w)
+            assert distance == pytest.approx(exact, abs=1e-4)
+
+    def test_query_finds_itself_first(self, tmp_path):
+        """Test that a stored chart is its own nearest neighbour."""
+        index = self._build(tmp_path)
+
+        chart_id, distance = index.query(CHARTS[12], k=1)[0]
+
+        assert chart_id == 12
+        assert distance == pytest.approx(0.0, abs=1e-5)
+
+    def test_exclude_id(self, tmp_path):
+        """Test leaving the query chart out of its own results."""
+        index = self._build(tmp_path)
+
+        results = index.query(CHARTS[12], k=3, exclude_id=12)
+
+        assert len(results) == 3
+        assert 12 not in [chart_id for chart_id, _ in results]
+
+    def test_incremental_insert_and_reopen(self, tmp_path):
+        """Test that appended charts are queryable and persisted."""
+        index = self._build(tmp_path, CHARTS[:10])
+        index.add(1000, CHARTS[30])
+
+        assert len(index) == 11
+        assert index.query(CHARTS[30], k=1)[0][0] == 1000
+
+        reopened = SimilarityIndex(str(tmp_path / "index"))
+        assert len(reopened) == 11
+
+    def test_reader_refresh_sees_other_writer(self, tmp_path):
+        """Test that a reader picks up rows appended by another handle."""
+        writer = self._build(tmp_path, CHARTS[:10])
+        reader = SimilarityIndex(str(tmp_path / "index"))
+
+        writer.add_many([(500, CHARTS[20]), (501, CHARTS[21])])
+        assert len(reader) == 10
+        reader.refresh()
+        assert len(reader) == 12
+
+    def test_partial_row_is_ignored(self, tmp_path):
+        """Test that a torn append does not expose a partial row."""
+        index = self._build(tmp_path, CHARTS[:3])
+        with open(os.path.join(index.directory, VECTORS_FILE), "ab") as f:
+            f.write(b"\0" * 10)
+        with open(os.path.join(index.directory, IDS_FILE), "ab") as f:
+            f.write(b"\0" * 8)
+
+        index.refresh()
+
+        assert len(index) == 3
+
+    def test_empty_index(self, tmp_path):
+        """Test querying an index with no charts."""
+        index = SimilarityIndex.create(str(tmp_path / "empty"))
+
+        assert index.query(CHARTS[0], k=5) == []
+
+    def test_weight_validation(self, tmp_path):
+        """Test that unknown bodies and negative weights are rejected."""
+        index = self._build(tmp_path, CHARTS[:3])
+
+        with pytest.raises(ValueError, match="Unknown"):
+            index.weight_vector({"Vulcan": 1.0})
+        with pytest.raises(ValueError, match="non-negative"):
+            index.weight_vector({"Sun": -1.0})
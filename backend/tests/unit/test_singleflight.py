@@ -0,0 +1,155 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from src.api.singleflight import SingleFlight, chart_request_key
+from src.models import BirthInput
+
+
+class TestChartRequestKey:
+    """Tests for request key normalization."""
+
+    def test_key_ignores_location_case_and_whitespace(self):
+        """Test that equivalent locations map to the same key."""
+        first = BirthInput(date="1990-06-15", time="14:30:00", country="USA", city="New York")
+        second = BirthInput(
+            date="1990-06-15", time="14:30:00", country=" usa", city="new york "
+        )
+
+        assert chart_request_key(first) == chart_request_key(second)
+
+
+class TestSingleFlight:
+    """Tests for in-flight deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_computation(self):
+        """Test that identical concurrent calls run the function once."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def compute(value):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        results = await asyncio.gather(*(flights.do("k", compute, 21) for _ in range(50)))
+
+        assert results == [42] * 50
+        assert calls == 1
+        assert flights.metrics() == {"in_flight": 0, "leaders": 1, "coalesced": 49}
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        """Test that a settled computation is not reused."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("k", compute) == 1
+        assert await flights.do("k", compute) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        """Test that every waiter receives the computation's exception."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flights.do("k", fail) for _ in range(5)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_affect_others(self):
+        """Test that one waiter leaving keeps the computation running."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "done"
+
+        leaving = asyncio.create_task(flights.do("k", compute))
+        staying = asyncio.create_task(flights.do("k", compute))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await staying == "done"
+        assert leaving.cancelled()
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_computation_is_cancelled(self):
+        """Test that the computation is cancelled once all waiters leave."""
+        flights = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def compute():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flights.do("k", compute))
+        await started.wait()
+        waiter.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_caller_after_abandonment_starts_afresh(self):
+        """Test that a caller arriving while the abandoned task unwinds is not cancelled."""
+        flights = SingleFlight()
+        started = asyncio.Event()
+
+        async def compute():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def succeed():
+            return "ok"
+
+        waiter = asyncio.create_task(flights.do("k", compute))
+        await started.wait()
+        waiter.cancel()
+        # The waiter leaves and cancels the task, which has not settled yet
+        await asyncio.sleep(0)
+
+        assert await flights.do("k", succeed) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_computation_releases_key(self):
+        """Test that cancelling the computation itself leaves nothing stuck."""
+        flights = SingleFlight()
+
+        async def compute():
+            raise asyncio.CancelledError()
+
+        with pytest.raises(asyncio.CancelledError):
+            await flights.do("k", compute)
+
+        async def succeed():
+            return "ok"
+
+        assert await flights.do("k", succeed) == "ok"
@@ -0,0 +1,103 @@
+"""Unit tests for the two-tier sky/houses cache."""
+
+import pytest
+
+from src.core import sky_cache
+from src.core.calculations import _calculate_jd, get_planet_positions
+from src.core.compact import build_compact_chart
+from src.core.sky_cache import (
+    LRUCache,
+    house_positions,
+    planet_positions,
+    quantize_jd,
+    sky_positions,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_tiers(monkeypatch):
+    monkeypatch.setattr(sky_cache, "sky_tier", LRUCache(8))
+    monkeypatch.setattr(sky_cache, "house_tier", LRUCache(8))
+
+
+class TestLRUCache:
+    """Tests for the cache container."""
+
+    def test_evicts_least_recently_used(self):
+        """Test LRU order and hit/miss counting."""
+        cache = LRUCache(2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        assert cache.get_or_compute("a", lambda: -1) == 1
+        cache.get_or_compute("c", lambda: 3)
+
+        assert cache.get_or_compute("b", lambda: 22) == 22
+        assert cache.metrics() == {
+            "entries": 2,
+            "max_entries": 2,
+            "hits": 1,
+            "misses": 4,
+            "hit_rate": 0.2,
+        }
+
+    def test_zero_capacity_disables_caching(self):
+        """Test that a zero-size tier always computes."""
+        cache = LRUCache(0)
+        calls = []
+        for _ in range(3):
+            cache.get_or_compute("k", lambda: calls.append(1))
+
+        assert len(calls) == 3
+        assert len(cache) == 0
+
+
+class TestTiers:
+    """Tests for the sky and houses tiers."""
+
+    def test_same_moment_in_two_cities_shares_sky(self):
+        """Test that a second city hits the sky tier and misses houses."""
+        jd = _calculate_jd("1990-06-15", "14:30:00")
+
+        london = build_compact_chart(jd, 51.5074, -0.1278)
+        tokyo = build_compact_chart(jd, 35.6762, 139.6503)
+
+        metrics = sky_cache.cache_metrics()
+        assert metrics["sky"]["hits"] == 1 and metrics["sky"]["misses"] == 1
+        assert metrics["houses"]["hits"] == 0 and metrics["houses"]["misses"] == 2
+        assert list(london.longitudes[:10]) == list(tokyo.longitudes[:10])
+        assert list(london.cusps) != list(tokyo.cusps)
+
+    def test_cached_chart_equals_uncached(self, monkeypatch):
+        """Test that cached positions give the same chart as fresh ones."""
+        jd = _calculate_jd("2000-01-01", "12:00:00")
+        first = build_compact_chart(jd, 40.7128, -74.0060)
+        again = build_compact_chart(jd, 40.7128, -74.0060)
+
+        monkeypatch.setattr(sky_cache, "sky_tier", LRUCache(0))
+        monkeypatch.setattr(sky_cache, "house_tier", LRUCache(0))
+        fresh = build_compact_chart(jd, 40.7128, -74.0060)
+
+        assert again.to_chart_data() == first.to_chart_data() == fresh.to_chart_data()
+
+    def test_planet_positions_match_direct_calculation(self):
+        """Test that cached Planet models match get_planet_positions."""
+        cusps = [30.0 * n for n in range(12)]
+
+        cached = planet_positions("1990-06-15", "14:30:00", cusps)
+        direct = get_planet_positions("1990-06-15", "14:30:00", 0.0, 0.0, cusps)
+
+        assert [p.name for p in cached] == [p.name for p in direct]
+        for a, b in zip(cached, direct):
+            assert a.longitude == pytest.approx(b.longitude, abs=1e-9)
+            assert (a.sign, a.house) == (b.sign, b.house)
+        planet_positions("1990-06-15", "14:30:00", cusps)
+        assert sky_cache.cache_metrics()["sky"]["hits"] == 1
+
+    def test_keys_are_quantized_to_the_second(self):
+        """Test that moments within one second share an entry."""
+        jd = _calculate_jd("1990-06-15", "14:30:00")
+
+        assert quantize_jd(jd + 0.2 / 86400) == quantize_jd(jd)
+        assert sky_positions(jd + 0.2 / 86400) is sky_positions(jd)
+        assert sky_positions(jd + 1.0 / 86400) is not sky_positions(jd)
+        assert house_positions(jd, 51.50741, 0.0) is house_positions(jd, 51.50739, 0.0)
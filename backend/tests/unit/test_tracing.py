@@ -0,0 +1,168 @@
+"""Unit tests for request tracing."""
+
+import json
+import threading
+
+from src.core.calculations import calculate_natal_chart
+from src.core.tracing import (
+    NOOP_SPAN,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    Tracer,
+    current_span,
+    format_traceparent,
+    parse_traceparent,
+    record_span,
+    span,
+)
+
+
+class TestSampling:
+    """Tests for head-based sampling."""
+
+    def test_unsampled_spans_are_noops(self):
+        """Test that spans outside a sampled trace do nothing."""
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter, sample_ratio=0.0)
+
+        with tracer.start_trace("root") as root:
+            with span("child") as child:
+                child.set_attribute("ignored", True)
+
+        assert root is NOOP_SPAN
+        assert child is NOOP_SPAN
+        assert exporter.spans == []
+
+    def test_no_exporter_disables_tracing(self):
+        """Test that a tracer without exporter never samples."""
+        with Tracer(None, sample_ratio=1.0).start_trace("root") as root:
+            assert root is NOOP_SPAN
+
+    def test_traceparent_continues_trace(self):
+        """Test that a sampled W3C traceparent is honoured when trusted."""
+        exporter = InMemorySpanExporter()
+        header = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        with Tracer(exporter, sample_ratio=0.0, trust_parent=True).start_trace("root", header):
+            pass
+
+        assert exporter.spans[0].trace_id == "0af7651916cd43dd8448eb211c80319c"
+        assert exporter.spans[0].parent_id == "b7ad6b7169203331"
+
+    def test_untrusted_traceparent_cannot_force_sampling(self):
+        """Test that the incoming sampled flag is ignored unless trusted."""
+        exporter = InMemorySpanExporter()
+        header = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        with Tracer(exporter, sample_ratio=0.0).start_trace("root", header) as root:
+            assert root is NOOP_SPAN
+        with Tracer(exporter, sample_ratio=1.0).start_trace("root", header):
+            pass
+
+        # A trace sampled locally still joins the caller's trace
+        assert [s.trace_id for s in exporter.spans] == ["0af7651916cd43dd8448eb211c80319c"]
+
+    def test_parse_traceparent_rejects_malformed(self):
+        """Test that malformed headers are ignored."""
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent("00-" + "0" * 32 + "-b7ad6b7169203331-01") is None
+
+
+class TestSpans:
+    """Tests for nested spans and export."""
+
+    def test_spans_nest_under_root(self):
+        """Test parent/child relationships and attributes."""
+        exporter = InMemorySpanExporter()
+
+        with Tracer(exporter, sample_ratio=1.0).start_trace("root") as root:
+            record_span("before")
+            with span("outer", size=3):
+                with span("inner") as inner:
+                    inner.set_attribute("hit", True)
+                assert current_span().name == "outer"
+
+        by_name = {s.name: s for s in exporter.spans}
+        assert by_name["outer"].parent_id == root.span_id
+        assert by_name["inner"].parent_id == by_name["outer"].span_id
+        assert by_name["before"].start_ns == root.start_ns
+        assert by_name["inner"].attributes == {"hit": True}
+        assert format_traceparent(root).endswith("-01")
+
+    def test_errors_mark_span_status(self):
+        """Test that exceptions set an error status."""
+        exporter = InMemorySpanExporter()
+
+        try:
+            with Tracer(exporter, sample_ratio=1.0).start_trace("root"):
+                with span("failing"):
+                    raise ValueError("bad")
+        except ValueError:
+            pass
+
+        assert all(s.status_code == 2 for s in exporter.spans)
+
+    def test_calculation_stages_are_traced(self):
+        """Test that calculate_natal_chart emits one span per stage."""
+        exporter = InMemorySpanExporter()
+
+        with Tracer(exporter, sample_ratio=1.0).start_trace("root"):
+            calculate_natal_chart("1990-06-15", "14:30:00", "USA", "New York")
+
+        names = {s.name for s in exporter.spans}
+        assert {"location_lookup", "julian_day", "houses", "planets", "points", "aspects"} <= names
+        planets = next(s for s in exporter.spans if s.name == "planets")
+        assert planets.attributes["body_count"] == 10
+
+    def test_file_exporter_writes_otlp_json(self, tmp_path):
+        """Test that traces are written as OTLP/JSON lines."""
+        path = tmp_path / "traces.jsonl"
+
+        exporter = FileSpanExporter(str(path))
+        with Tracer(exporter, sample_ratio=1.0).start_trace("root", n=1):
+            with span("child", ok=True, ratio=0.5, label="x"):
+                pass
+        exporter.flush()
+
+        document = json.loads(path.read_text().splitlines()[0])
+        spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == ["root", "child"]
+        child_attributes = {a["key"]: a["value"] for a in spans[1]["attributes"]}
+        assert child_attributes == {
+            "ok": {"boolValue": True},
+            "ratio": {"doubleValue": 0.5},
+            "label": {"stringValue": "x"},
+        }
+        assert spans[0]["attributes"][0]["value"] == {"intValue": "1"}
+
+    def test_file_exporter_writes_off_the_calling_thread(self, tmp_path):
+        """Test that export only queues, and drops traces once the queue is full."""
+        path = tmp_path / "traces.jsonl"
+        exporter = FileSpanExporter(str(path), max_pending=1)
+        entered, release = threading.Event(), threading.Event()
+        encode = exporter._encode
+
+        def slow_encode(spans):
+            entered.set()
+            release.wait(5)
+            return encode(spans)
+
+        exporter._encode = slow_encode
+        tracer = Tracer(exporter, sample_ratio=1.0)
+        with tracer.start_trace("first"):
+            pass
+        assert entered.wait(5)
+        # The writer is busy: one trace waits, the next is dropped
+        for name in ("second", "third"):
+            with tracer.start_trace(name):
+                pass
+
+        assert exporter.dropped == 1
+        assert not path.exists()
+        release.set()
+        exporter.close()
+        names = [
+            json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"]
+            for line in path.read_text().splitlines()
+        ]
+        assert names == ["first", "second"]
@@ -0,0 +1,137 @@
+"""Unit tests for the daily transit scan."""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from src.core.transits import (
+    TRANSIT_ASPECTS,
+    NatalMatrix,
+    scan_transits,
+    transiting_positions,
+)
+from src.tools.bulk_charts import run_bulk
+from src.tools.transit_alerts import NATAL_BODIES, main
+
+
+def _brute_force(natal, transits):
+    hits = []
+    for row, user_id in enumerate(natal.ids):
+        for i in range(len(natal.bodies)):
+            for t, transit in enumerate(transits):
+                diff = abs(float(natal.longitudes[row, i]) - float(transit)) % 360
+                separation = min(diff, 360 - diff)
+                for angle, (_, orb) in TRANSIT_ASPECTS.items():
+                    if abs(separation - angle) <= orb:
+                        hits.append((int(user_id), i, t, angle))
+    return sorted(hits)
+
+
+def _collect(blocks):
+    hits = []
+    for block in blocks:
+        hits.extend(
+            zip(
+                block.user_ids.tolist(),
+                block.natal_bodies.tolist(),
+                block.transit_bodies.tolist(),
+                block.aspects.tolist(),
+            )
+        )
+    return hits
+
+
+@pytest.fixture
+def natal():
+    rng = np.random.default_rng(7)
+    longitudes = rng.uniform(0, 360, (300, 5)).astype(np.float32)
+    return NatalMatrix(np.arange(1000, 1300, dtype=np.int64), longitudes, "ABCDE")
+
+
+class TestScanTransits:
+    """Tests for the vectorized transit-to-natal scan."""
+
+    def test_matches_brute_force(self, natal):
+        """Test that blockwise hits equal a pairwise loop, grouped by user."""
+        transits = np.random.default_rng(8).uniform(0, 360, 10)
+
+        hits = _collect(scan_transits(natal, transits, block_rows=64))
+
+        assert hits == _brute_force(natal, transits)
+        assert hits
+
+    def test_wraps_around_zero_degrees(self):
+        """Test that separations are measured across 0° Aries."""
+        natal = NatalMatrix(np.array([1]), np.array([[359.5]], dtype=np.float32), ["Sun"])
+
+        (block,) = scan_transits(natal, np.array([0.3, 89.8]))
+
+        assert block.aspects.tolist() == [0, 90]
+        assert block.orbs[0] == pytest.approx(0.8, abs=1e-4)
+
+    def test_transiting_positions_cover_planets(self):
+        """Test that the transiting positions are normalised longitudes."""
+        names, longitudes = transiting_positions(2451545.0)
+
+        assert names[0] == "Sun"
+        assert len(names) == len(longitudes) == 10
+        assert 279 < longitudes[0] < 281
+        assert ((longitudes >= 0) & (longitudes < 360)).all()
+
+
+class TestNatalMatrix:
+    """Tests for storing the packed natal matrix."""
+
+    def test_save_and_load_memory_mapped(self, natal, tmp_path):
+        """Test that a saved matrix loads memory-mapped and scans the same."""
+        natal.save(str(tmp_path))
+
+        loaded = NatalMatrix.load(str(tmp_path))
+
+        assert isinstance(loaded.longitudes, np.memmap)
+        assert loaded.bodies == natal.bodies
+        assert np.array_equal(loaded.ids, natal.ids)
+        transits = np.array([10.0, 200.0])
+        assert _collect(scan_transits(loaded, transits)) == _collect(
+            scan_transits(natal, transits)
+        )
+
+    def test_rejects_mismatched_shapes(self):
+        """Test that rows and columns must match ids and bodies."""
+        with pytest.raises(ValueError):
+            NatalMatrix(np.arange(3), np.zeros((2, 4), dtype=np.float32), "ABCD")
+
+
+class TestTransitAlertsCli:
+    """Tests for packing bulk output and streaming alerts."""
+
+    def test_pack_and_scan(self, tmp_path):
+        """Test that bulk output packs, skips failed rows and scans per user."""
+        births = tmp_path / "births.csv"
+        with open(births, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "date", "time", "country", "city"])
+            writer.writerow(["1", "1990-06-15", "14:30:00", "USA", "New York"])
+            writer.writerow(["2", "not-a-date", "12:00:00", "UK", "London"])
+            writer.writerow(["3", "2000-01-01", "12:00:00", "UK", "London"])
+        run_bulk(str(births), str(tmp_path / "bulk"), chunk_size=2, workers=1)
+
+        assert main(["pack", str(tmp_path / "bulk"), str(tmp_path / "natal")]) == 0
+        natal = NatalMatrix.load(str(tmp_path / "natal"))
+        assert natal.ids.tolist() == [1, 3]
+        assert natal.bodies == NATAL_BODIES
+
+        output = tmp_path / "alerts.jsonl"
+        # The natal chart of user 3 is the sky of 2000-01-01 itself
+        args = ["scan", str(tmp_path / "natal"), "--date", "2000-01-01", "--output", str(output)]
+        assert main(args) == 0
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        user3 = next(record for record in records if record["id"] == 3)
+        assert {
+            "transit": "Sun",
+            "natal": "Sun",
+            "aspect": "Conjunction",
+            "orb": 0.0,
+        } in user3["hits"]